@@ -163,6 +163,12 @@ from app.views import load_user_from_request
 
 register_blusprints(app)
 
+# Periodic maintenance tasks, registered with Celery on import
+from app.iris_engine.maintenance.blob_store import task_maintain_blob_store
+from app.iris_engine.maintenance.generations import task_compact_generations
+from app.iris_engine.maintenance.partitions import task_maintain_partitions
+from app.iris_engine.maintenance.rollups import task_refresh_rollups
+
 from app.post_init import run_post_init
 
 try:
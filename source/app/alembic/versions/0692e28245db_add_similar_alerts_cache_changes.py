@@ -0,0 +1,62 @@
+"""Add similar alerts cache changes
+
+Revision ID: 0692e28245db
+Revises: 6dfd83fe9709
+Create Date: 2026-10-19 10:26:03.841957
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table
+from app.alembic.alembic_utils import _table_has_column
+
+# revision identifiers, used by Alembic.
+revision = '0692e28245db'
+down_revision = '6dfd83fe9709'
+branch_labels = None
+depends_on = None
+
+# Statement level trigger, logging once each alert whose entries a statement deleted
+_LOG_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION log_similar_alerts_cache_deletions() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO similar_alerts_cache_deletion (alert_id) SELECT DISTINCT alert_id FROM old_rows;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade():
+    if not _table_has_column('similar_alerts_cache', 'txid'):
+        # Existing entries keep a null transaction, they are only loaded by the full builds of the index
+        op.add_column('similar_alerts_cache', sa.Column('txid', sa.BigInteger, nullable=True))
+        op.execute(text('ALTER TABLE similar_alerts_cache ALTER COLUMN txid SET DEFAULT txid_current()'))
+        op.create_index('ix_similar_alerts_cache_txid', 'similar_alerts_cache', ['txid'])
+
+    if not _has_table('similar_alerts_cache_deletion'):
+        op.create_table('similar_alerts_cache_deletion',
+                        sa.Column('id', sa.BigInteger, primary_key=True, autoincrement=True),
+                        sa.Column('alert_id', sa.BigInteger, nullable=False),
+                        sa.Column('txid', sa.BigInteger, nullable=False, server_default=text('txid_current()')),
+                        sa.Column('deleted_at', sa.DateTime, nullable=False, server_default=text('now()')))
+        op.create_index('ix_similar_alerts_cache_deletion_txid', 'similar_alerts_cache_deletion', ['txid'])
+
+    op.execute(text(_LOG_FUNCTION_DDL))
+    op.execute(text('DROP TRIGGER IF EXISTS similar_alerts_cache_delete_log_deletions ON similar_alerts_cache'))
+    op.execute(text("""
+        CREATE TRIGGER similar_alerts_cache_delete_log_deletions AFTER DELETE ON similar_alerts_cache
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE PROCEDURE log_similar_alerts_cache_deletions()
+    """))
+
+
+def downgrade():
+    op.execute(text('DROP TRIGGER IF EXISTS similar_alerts_cache_delete_log_deletions ON similar_alerts_cache'))
+    op.execute(text('DROP FUNCTION IF EXISTS log_similar_alerts_cache_deletions()'))
+    op.execute(text('DROP TABLE IF EXISTS similar_alerts_cache_deletion'))
+
+    if _table_has_column('similar_alerts_cache', 'txid'):
+        op.drop_column('similar_alerts_cache', 'txid')
@@ -0,0 +1,107 @@
+"""Log alerts generation writes
+
+Revision ID: 2a85207a8977
+Revises: 8c625ec96f47
+Create Date: 2026-10-19 14:02:51.736120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table
+
+# revision identifiers, used by Alembic.
+revision = '2a85207a8977'
+down_revision = '8c625ec96f47'
+branch_labels = None
+depends_on = None
+
+# Statement level triggers append a row per customer, so that concurrent writers never update the same counter
+_LOG_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION bump_alerts_generation() RETURNS trigger AS $$
+DECLARE
+    changed_rows text;
+    customers text;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed_rows := 'SELECT * FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        changed_rows := 'SELECT * FROM old_rows';
+    ELSE
+        changed_rows := 'SELECT * FROM new_rows UNION ALL SELECT * FROM old_rows';
+    END IF;
+
+    IF TG_TABLE_NAME = 'alerts' THEN
+        customers := format('SELECT DISTINCT c.%I AS customer_id FROM (%s) c', TG_ARGV[0], changed_rows);
+    ELSE
+        customers := format('SELECT DISTINCT a.alert_customer_id AS customer_id FROM (%s) c '
+                            || 'JOIN alerts a ON a.alert_id = c.%I', changed_rows, TG_ARGV[0]);
+    END IF;
+
+    EXECUTE format('INSERT INTO alerts_generation_log (customer_id) '
+                   || 'SELECT customer_id FROM (%s) customers WHERE customer_id IS NOT NULL', customers);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Function of the previous revision, incrementing the counters in place
+_BUMP_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION bump_alerts_generation() RETURNS trigger AS $$
+DECLARE
+    changed_rows text;
+    customers text;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed_rows := 'SELECT * FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        changed_rows := 'SELECT * FROM old_rows';
+    ELSE
+        changed_rows := 'SELECT * FROM new_rows UNION ALL SELECT * FROM old_rows';
+    END IF;
+
+    IF TG_TABLE_NAME = 'alerts' THEN
+        customers := format('SELECT DISTINCT c.%I AS customer_id FROM (%s) c', TG_ARGV[0], changed_rows);
+    ELSE
+        customers := format('SELECT DISTINCT a.alert_customer_id AS customer_id FROM (%s) c '
+                            || 'JOIN alerts a ON a.alert_id = c.%I', changed_rows, TG_ARGV[0]);
+    END IF;
+
+    -- Locking the counters in a stable order prevents deadlocks between concurrent writers
+    EXECUTE format('INSERT INTO alerts_generation (customer_id, generation) '
+                   || 'SELECT customer_id, 1 FROM (%s) customers WHERE customer_id IS NOT NULL ORDER BY customer_id '
+                   || 'ON CONFLICT (customer_id) DO UPDATE SET generation = alerts_generation.generation + 1',
+                   customers);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+_COMPACT_LOG_SQL = """
+WITH moved AS (DELETE FROM alerts_generation_log RETURNING customer_id)
+INSERT INTO alerts_generation (customer_id, generation)
+SELECT customer_id, count(*) FROM moved GROUP BY customer_id ORDER BY customer_id
+ON CONFLICT (customer_id) DO UPDATE SET generation = alerts_generation.generation + EXCLUDED.generation
+"""
+
+
+def upgrade():
+    if not _has_table('alerts_generation_log'):
+        op.create_table('alerts_generation_log',
+                        sa.Column('id', sa.BigInteger, primary_key=True, autoincrement=True),
+                        sa.Column('customer_id', sa.BigInteger, nullable=False))
+        op.create_index('ix_alerts_generation_log_customer_id', 'alerts_generation_log', ['customer_id'])
+
+    # The triggers of the previous revision call the function by name, so replacing it is enough
+    op.execute(text(_LOG_FUNCTION_DDL))
+
+
+def downgrade():
+    op.execute(text(_BUMP_FUNCTION_DDL))
+
+    if _has_table('alerts_generation_log'):
+        op.execute(text(_COMPACT_LOG_SQL))
+        op.execute(text('DROP TABLE alerts_generation_log'))
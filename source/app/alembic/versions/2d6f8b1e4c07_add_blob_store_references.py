@@ -0,0 +1,38 @@
+"""Add blob store references
+
+Revision ID: 2d6f8b1e4c07
+Revises: f1b7c3e9a2d4
+Create Date: 2026-10-18 17:48:32.190544
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.alembic.alembic_utils import _table_has_column
+from app.alembic.alembic_utils import index_exists
+
+# revision identifiers, used by Alembic.
+revision = '2d6f8b1e4c07'
+down_revision = 'f1b7c3e9a2d4'
+branch_labels = None
+depends_on = None
+
+_REFERENCE_COLUMNS = [
+    ('alerts', 'alert_source_content_ref'),
+    ('cases_events', 'event_raw_ref')
+]
+
+
+def upgrade():
+    # The existing payloads are moved to the blob store by batches, by the blob store maintenance task
+    for table_name, column_name in _REFERENCE_COLUMNS:
+        if not _table_has_column(table_name, column_name):
+            op.add_column(table_name, sa.Column(column_name, sa.Text, nullable=True))
+
+        if not index_exists(table_name, f'ix_{table_name}_{column_name}'):
+            op.create_index(f'ix_{table_name}_{column_name}', table_name, [column_name])
+
+
+def downgrade():
+    # The references are kept, as dropping them would lose the payloads moved to the blob store
+    pass
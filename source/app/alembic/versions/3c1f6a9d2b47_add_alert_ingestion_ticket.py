@@ -0,0 +1,44 @@
+"""Add alert ingestion ticket table
+
+Revision ID: 3c1f6a9d2b47
+Revises: e5d79b8c4a55
+Create Date: 2026-10-18 09:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.alembic.alembic_utils import _has_table
+
+# revision identifiers, used by Alembic.
+revision = '3c1f6a9d2b47'
+down_revision = 'e5d79b8c4a55'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not _has_table('alert_ingestion_ticket'):
+        op.create_table(
+            'alert_ingestion_ticket',
+            sa.Column('ticket_id', sa.BigInteger, primary_key=True),
+            sa.Column('ticket_uuid', postgresql.UUID(as_uuid=True), server_default=sa.text('gen_random_uuid()'),
+                      nullable=False, unique=True),
+            sa.Column('status', sa.Text, nullable=False),
+            sa.Column('payload', sa.JSON, nullable=True),
+            sa.Column('alerts_count', sa.Integer, nullable=False),
+            sa.Column('alert_ids', sa.JSON, nullable=True),
+            sa.Column('error', sa.JSON, nullable=True),
+            sa.Column('user_id', sa.BigInteger, sa.ForeignKey('user.id'), nullable=False),
+            sa.Column('created_at', sa.DateTime, server_default=sa.func.now(), nullable=False),
+            sa.Column('processed_at', sa.DateTime, nullable=True)
+        )
+        op.create_index('ix_alert_ingestion_ticket_status_created_at', 'alert_ingestion_ticket',
+                        ['status', 'created_at'])
+
+
+def downgrade():
+    if _has_table('alert_ingestion_ticket'):
+        op.drop_index('ix_alert_ingestion_ticket_status_created_at', table_name='alert_ingestion_ticket')
+        op.drop_table('alert_ingestion_ticket')
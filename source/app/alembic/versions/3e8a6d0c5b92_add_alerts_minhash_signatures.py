@@ -0,0 +1,49 @@
+"""Add alerts MinHash signatures and LSH buckets
+
+Revision ID: 3e8a6d0c5b92
+Revises: 7b2d9e4f1a36
+Create Date: 2026-10-18 21:47:31.204816
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table
+from app.alembic.alembic_utils import index_exists
+
+# revision identifiers, used by Alembic.
+revision = '3e8a6d0c5b92'
+down_revision = '7b2d9e4f1a36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not _has_table('alert_minhash_signatures'):
+        op.create_table('alert_minhash_signatures',
+                        sa.Column('alert_id', sa.BigInteger,
+                                  sa.ForeignKey('alerts.alert_id', ondelete='CASCADE'), primary_key=True),
+                        sa.Column('customer_id', sa.BigInteger, nullable=False),
+                        sa.Column('text_signature', sa.LargeBinary),
+                        sa.Column('iocs_signature', sa.LargeBinary),
+                        sa.Column('created_at', sa.DateTime, nullable=False, server_default=text('now()')))
+
+    if not _has_table('alert_lsh_buckets'):
+        op.create_table('alert_lsh_buckets',
+                        sa.Column('id', sa.BigInteger, primary_key=True),
+                        sa.Column('customer_id', sa.BigInteger, nullable=False),
+                        sa.Column('bucket_hash', sa.BigInteger, nullable=False),
+                        sa.Column('alert_id', sa.BigInteger,
+                                  sa.ForeignKey('alerts.alert_id', ondelete='CASCADE'), nullable=False))
+
+    if not index_exists('alert_lsh_buckets', 'ix_alert_lsh_buckets_customer_bucket'):
+        op.create_index('ix_alert_lsh_buckets_customer_bucket', 'alert_lsh_buckets', ['customer_id', 'bucket_hash'])
+
+    if not index_exists('alert_lsh_buckets', 'ix_alert_lsh_buckets_alert_id'):
+        op.create_index('ix_alert_lsh_buckets_alert_id', 'alert_lsh_buckets', ['alert_id'])
+
+
+def downgrade():
+    op.execute(text('DROP TABLE IF EXISTS alert_lsh_buckets'))
+    op.execute(text('DROP TABLE IF EXISTS alert_minhash_signatures'))
@@ -0,0 +1,107 @@
+"""Log cases generation writes
+
+Revision ID: 5895afaeb3c2
+Revises: 2a85207a8977
+Create Date: 2026-10-19 14:37:08.215694
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table
+
+# revision identifiers, used by Alembic.
+revision = '5895afaeb3c2'
+down_revision = '2a85207a8977'
+branch_labels = None
+depends_on = None
+
+# Statement level triggers append a row per client, as for the alerts generation
+_LOG_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION bump_cases_generation() RETURNS trigger AS $$
+DECLARE
+    changed_rows text;
+    clients text;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed_rows := 'SELECT * FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        changed_rows := 'SELECT * FROM old_rows';
+    ELSE
+        changed_rows := 'SELECT * FROM new_rows UNION ALL SELECT * FROM old_rows';
+    END IF;
+
+    IF TG_TABLE_NAME = 'cases' THEN
+        clients := format('SELECT DISTINCT c.%I AS client_id FROM (%s) c', TG_ARGV[0], changed_rows);
+    ELSE
+        clients := format('SELECT DISTINCT cs.client_id AS client_id FROM (%s) c '
+                          || 'JOIN cases cs ON cs.case_id = c.%I', changed_rows, TG_ARGV[0]);
+    END IF;
+
+    EXECUTE format('INSERT INTO cases_generation_log (client_id) '
+                   || 'SELECT client_id FROM (%s) clients WHERE client_id IS NOT NULL', clients);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Function of the previous revision, incrementing the counters in place
+_BUMP_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION bump_cases_generation() RETURNS trigger AS $$
+DECLARE
+    changed_rows text;
+    clients text;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed_rows := 'SELECT * FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        changed_rows := 'SELECT * FROM old_rows';
+    ELSE
+        changed_rows := 'SELECT * FROM new_rows UNION ALL SELECT * FROM old_rows';
+    END IF;
+
+    IF TG_TABLE_NAME = 'cases' THEN
+        clients := format('SELECT DISTINCT c.%I AS client_id FROM (%s) c', TG_ARGV[0], changed_rows);
+    ELSE
+        clients := format('SELECT DISTINCT cs.client_id AS client_id FROM (%s) c '
+                          || 'JOIN cases cs ON cs.case_id = c.%I', changed_rows, TG_ARGV[0]);
+    END IF;
+
+    -- Locking the counters in a stable order prevents deadlocks between concurrent writers
+    EXECUTE format('INSERT INTO cases_generation (client_id, generation) '
+                   || 'SELECT client_id, 1 FROM (%s) clients WHERE client_id IS NOT NULL ORDER BY client_id '
+                   || 'ON CONFLICT (client_id) DO UPDATE SET generation = cases_generation.generation + 1',
+                   clients);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+_COMPACT_LOG_SQL = """
+WITH moved AS (DELETE FROM cases_generation_log RETURNING client_id)
+INSERT INTO cases_generation (client_id, generation)
+SELECT client_id, count(*) FROM moved GROUP BY client_id ORDER BY client_id
+ON CONFLICT (client_id) DO UPDATE SET generation = cases_generation.generation + EXCLUDED.generation
+"""
+
+
+def upgrade():
+    if not _has_table('cases_generation_log'):
+        op.create_table('cases_generation_log',
+                        sa.Column('id', sa.BigInteger, primary_key=True, autoincrement=True),
+                        sa.Column('client_id', sa.BigInteger, nullable=False))
+        op.create_index('ix_cases_generation_log_client_id', 'cases_generation_log', ['client_id'])
+
+    # The triggers of the previous revisions call the function by name, so replacing it is enough
+    op.execute(text(_LOG_FUNCTION_DDL))
+
+
+def downgrade():
+    op.execute(text(_BUMP_FUNCTION_DDL))
+
+    if _has_table('cases_generation_log'):
+        op.execute(text(_COMPACT_LOG_SQL))
+        op.execute(text('DROP TABLE cases_generation_log'))
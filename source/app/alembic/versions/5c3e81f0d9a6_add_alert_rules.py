@@ -0,0 +1,53 @@
+"""Add alert rules
+
+Revision ID: 5c3e81f0d9a6
+Revises: 9a4e2c7d1f58
+Create Date: 2026-10-18 20:12:09.641205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table
+
+# revision identifiers, used by Alembic.
+revision = '5c3e81f0d9a6'
+down_revision = '9a4e2c7d1f58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not _has_table('alert_rules'):
+        op.create_table('alert_rules',
+                        sa.Column('rule_id', sa.BigInteger, primary_key=True),
+                        sa.Column('rule_name', sa.Text, nullable=False),
+                        sa.Column('rule_description', sa.Text),
+                        sa.Column('rule_enabled', sa.Boolean, nullable=False, server_default=text('true')),
+                        sa.Column('rule_order', sa.Integer, nullable=False, server_default=text('0')),
+                        sa.Column('rule_customer_id', sa.BigInteger,
+                                  sa.ForeignKey('client.client_id', ondelete='CASCADE'), nullable=True),
+                        sa.Column('rule_conditions', sa.JSON, nullable=False),
+                        sa.Column('rule_action', sa.Text, nullable=False),
+                        sa.Column('rule_owner_id', sa.BigInteger, sa.ForeignKey('user.id', ondelete='SET NULL'),
+                                  nullable=True),
+                        sa.Column('rule_hit_count', sa.BigInteger, nullable=False, server_default=text('0')),
+                        sa.Column('rule_last_hit_at', sa.DateTime),
+                        sa.Column('rule_created_at', sa.DateTime, nullable=False, server_default=text('now()')),
+                        sa.Column('rule_updated_at', sa.DateTime, nullable=False, server_default=text('now()')))
+
+    if not _has_table('alert_rule_aggregates'):
+        op.create_table('alert_rule_aggregates',
+                        sa.Column('rule_id', sa.BigInteger, sa.ForeignKey('alert_rules.rule_id', ondelete='CASCADE'),
+                                  primary_key=True),
+                        sa.Column('customer_id', sa.BigInteger, primary_key=True),
+                        sa.Column('alert_title', sa.Text, primary_key=True),
+                        sa.Column('bucket_start', sa.DateTime, primary_key=True),
+                        sa.Column('alerts_count', sa.BigInteger, nullable=False, server_default=text('0')),
+                        sa.Column('last_seen_at', sa.DateTime, nullable=False, server_default=text('now()')))
+
+
+def downgrade():
+    op.drop_table('alert_rule_aggregates')
+    op.drop_table('alert_rules')
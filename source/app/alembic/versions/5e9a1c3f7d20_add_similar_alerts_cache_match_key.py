@@ -0,0 +1,61 @@
+"""Add similar alerts cache match key
+
+Revision ID: 5e9a1c3f7d20
+Revises: a4c8e2f6b1d9
+Create Date: 2026-10-18 12:41:36.220871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table, _table_has_column, index_exists
+
+# revision identifiers, used by Alembic.
+revision = '5e9a1c3f7d20'
+down_revision = 'a4c8e2f6b1d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not _has_table('similar_alerts_cache'):
+        return
+
+    if not _table_has_column('similar_alerts_cache', 'match_key_hash'):
+        op.add_column('similar_alerts_cache', sa.Column('match_key_hash', sa.BigInteger, nullable=True))
+
+    # Backfill the match key of the existing entries. This must stay identical to
+    # get_similar_alerts_cache_key_hash: first 64 bits of the MD5 of 'kind|type id|normalized value'
+    op.execute(text("""
+        UPDATE similar_alerts_cache SET match_key_hash = ('x' || substr(md5(
+            CASE WHEN asset_name IS NOT NULL
+                THEN 'asset|' || coalesce(asset_type_id::text, '') || '|' || lower(btrim(asset_name, E' \\t\\r\\n'))
+                ELSE 'ioc|' || coalesce(ioc_type_id::text, '') || '|' || lower(btrim(ioc_value, E' \\t\\r\\n'))
+            END
+        ), 1, 16))::bit(64)::bigint
+        WHERE match_key_hash IS NULL
+    """))
+
+    if not index_exists('similar_alerts_cache', 'ix_similar_alerts_cache_customer_key_created'):
+        op.create_index('ix_similar_alerts_cache_customer_key_created', 'similar_alerts_cache',
+                        ['customer_id', 'match_key_hash', 'created_at'])
+
+    if not index_exists('similar_alerts_cache', 'ix_similar_alerts_cache_alert_id'):
+        op.create_index('ix_similar_alerts_cache_alert_id', 'similar_alerts_cache', ['alert_id'])
+
+    if not index_exists('similar_alerts_cache', 'ix_similar_alerts_cache_created_at'):
+        op.create_index('ix_similar_alerts_cache_created_at', 'similar_alerts_cache', ['created_at'])
+
+
+def downgrade():
+    if not _has_table('similar_alerts_cache'):
+        return
+
+    for index_name in ['ix_similar_alerts_cache_customer_key_created', 'ix_similar_alerts_cache_alert_id',
+                       'ix_similar_alerts_cache_created_at']:
+        if index_exists('similar_alerts_cache', index_name):
+            op.drop_index(index_name, table_name='similar_alerts_cache')
+
+    if _table_has_column('similar_alerts_cache', 'match_key_hash'):
+        op.drop_column('similar_alerts_cache', 'match_key_hash')
@@ -0,0 +1,141 @@
+"""Append rollup dirty hours
+
+Revision ID: 6dc964aa4292
+Revises: 5895afaeb3c2
+Create Date: 2026-10-19 15:21:44.690318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table
+from app.alembic.alembic_utils import _table_has_column
+
+# revision identifiers, used by Alembic.
+revision = '6dc964aa4292'
+down_revision = '5895afaeb3c2'
+branch_labels = None
+depends_on = None
+
+# Source table, its time column, the rollup table and the table of its dirty hours
+_ROLLUPS = [
+    ('alerts', 'alert_creation_time', 'alerts_rollup', 'alerts_rollup_dirty_hours'),
+    ('cases', 'initial_date', 'cases_rollup', 'cases_rollup_dirty_hours')
+]
+
+# Only the cases rollup can be missing, from databases upgraded while its creation was left out of 8d3b5f7a2c19
+_CASES_ROLLUP_DIMENSIONS = [
+    sa.Column('client_id', sa.BigInteger),
+    sa.Column('status_id', sa.Integer),
+    sa.Column('severity_id', sa.Integer),
+    sa.Column('classification_id', sa.Integer),
+    sa.Column('owner_id', sa.Integer),
+    sa.Column('cases_count', sa.BigInteger, nullable=False)
+]
+
+# Statement level triggers append the hours of each write, without any unique key, so that concurrent writers of
+# the same hour never wait on each other. A write still uncommitted when the rollups job recomputes its hour keeps
+# its marker, which the job only deletes once visible, so the hour is recomputed again after the write commits
+_MARK_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION mark_rollup_dirty_hours() RETURNS trigger AS $$
+DECLARE
+    changed_rows text;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed_rows := 'SELECT * FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        changed_rows := 'SELECT * FROM old_rows';
+    ELSE
+        changed_rows := 'SELECT * FROM new_rows UNION ALL SELECT * FROM old_rows';
+    END IF;
+
+    EXECUTE format('INSERT INTO %I (bucket_start) '
+                   || 'SELECT DISTINCT date_trunc(''hour'', c.%I) FROM (%s) c WHERE c.%I IS NOT NULL',
+                   TG_ARGV[1], TG_ARGV[0], changed_rows, TG_ARGV[0]);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Function of the previous revision, keeping a single row per dirty hour
+_UNIQUE_MARK_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION mark_rollup_dirty_hours() RETURNS trigger AS $$
+DECLARE
+    changed_rows text;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed_rows := 'SELECT * FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        changed_rows := 'SELECT * FROM old_rows';
+    ELSE
+        changed_rows := 'SELECT * FROM new_rows UNION ALL SELECT * FROM old_rows';
+    END IF;
+
+    EXECUTE format('INSERT INTO %I (bucket_start) '
+                   || 'SELECT DISTINCT date_trunc(''hour'', c.%I) FROM (%s) c WHERE c.%I IS NOT NULL ORDER BY 1 '
+                   || 'ON CONFLICT (bucket_start) DO NOTHING',
+                   TG_ARGV[1], TG_ARGV[0], changed_rows, TG_ARGV[0]);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+_TRIGGER_TRANSITION_TABLES = {
+    'INSERT': 'NEW TABLE AS new_rows',
+    'UPDATE': 'OLD TABLE AS old_rows NEW TABLE AS new_rows',
+    'DELETE': 'OLD TABLE AS old_rows'
+}
+
+
+def upgrade():
+    op.execute(text(_MARK_FUNCTION_DDL))
+
+    if not _has_table('cases_rollup'):
+        op.create_table('cases_rollup',
+                        sa.Column('id', sa.BigInteger, primary_key=True, autoincrement=True),
+                        sa.Column('granularity', sa.Text, nullable=False),
+                        sa.Column('bucket_start', sa.DateTime, nullable=False),
+                        *_CASES_ROLLUP_DIMENSIONS)
+        op.create_index('ix_cases_rollup_granularity_bucket_start', 'cases_rollup', ['granularity', 'bucket_start'])
+
+    for table_name, time_column, _, dirty_table in _ROLLUPS:
+        if not _has_table(dirty_table):
+            op.create_table(dirty_table,
+                            sa.Column('id', sa.BigInteger, primary_key=True, autoincrement=True),
+                            sa.Column('bucket_start', sa.DateTime, nullable=False))
+            op.create_index(f'ix_{dirty_table}_bucket_start', dirty_table, ['bucket_start'])
+
+            # Every hour holding data is computed by the rollups job, the raw rows being read until then
+            op.execute(text(f"""
+                INSERT INTO {dirty_table} (bucket_start)
+                SELECT DISTINCT date_trunc('hour', {time_column}) FROM {table_name} WHERE {time_column} IS NOT NULL
+            """))
+
+        elif not _table_has_column(dirty_table, 'id'):
+            op.execute(text(f'ALTER TABLE {dirty_table} DROP CONSTRAINT {dirty_table}_pkey'))
+            op.execute(text(f'ALTER TABLE {dirty_table} ADD COLUMN id BIGSERIAL PRIMARY KEY'))
+            op.create_index(f'ix_{dirty_table}_bucket_start', dirty_table, ['bucket_start'])
+
+        for event, transition_tables in _TRIGGER_TRANSITION_TABLES.items():
+            trigger_name = f'{table_name}_{event.lower()}_mark_rollup_dirty_hours'
+            op.execute(text(f'DROP TRIGGER IF EXISTS {trigger_name} ON {table_name}'))
+            op.execute(text(f"""
+                CREATE TRIGGER {trigger_name} AFTER {event} ON {table_name}
+                REFERENCING {transition_tables}
+                FOR EACH STATEMENT EXECUTE PROCEDURE mark_rollup_dirty_hours('{time_column}', '{dirty_table}')
+            """))
+
+
+def downgrade():
+    for _, _, _, dirty_table in _ROLLUPS:
+        if _table_has_column(dirty_table, 'id'):
+            op.execute(text(f'DELETE FROM {dirty_table} duplicate USING {dirty_table} kept '
+                            f'WHERE duplicate.bucket_start = kept.bucket_start AND duplicate.id > kept.id'))
+            op.execute(text(f'DROP INDEX IF EXISTS ix_{dirty_table}_bucket_start'))
+            op.execute(text(f'ALTER TABLE {dirty_table} DROP COLUMN id'))
+            op.execute(text(f'ALTER TABLE {dirty_table} ADD PRIMARY KEY (bucket_start)'))
+
+    op.execute(text(_UNIQUE_MARK_FUNCTION_DDL))
@@ -0,0 +1,36 @@
+"""Add alert ingestion ticket claims
+
+Revision ID: 6dfd83fe9709
+Revises: b4d9e1f6a37c
+Create Date: 2026-10-19 09:12:37.504218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.alembic.alembic_utils import _table_has_column
+
+# revision identifiers, used by Alembic.
+revision = '6dfd83fe9709'
+down_revision = 'b4d9e1f6a37c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not _table_has_column('alert_ingestion_ticket', 'claimed_at'):
+        op.add_column('alert_ingestion_ticket', sa.Column('claimed_at', sa.DateTime, nullable=True))
+        # Tickets already processing are dated from their creation, so they can be detected as stale
+        op.execute(sa.text("UPDATE alert_ingestion_ticket SET claimed_at = created_at WHERE status = 'processing'"))
+
+    if not _table_has_column('alert_ingestion_ticket', 'attempts'):
+        op.add_column('alert_ingestion_ticket',
+                      sa.Column('attempts', sa.Integer, server_default=sa.text('0'), nullable=False))
+
+
+def downgrade():
+    if _table_has_column('alert_ingestion_ticket', 'attempts'):
+        op.drop_column('alert_ingestion_ticket', 'attempts')
+
+    if _table_has_column('alert_ingestion_ticket', 'claimed_at'):
+        op.drop_column('alert_ingestion_ticket', 'claimed_at')
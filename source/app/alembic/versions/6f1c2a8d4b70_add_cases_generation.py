@@ -0,0 +1,97 @@
+"""Add cases generation
+
+Revision ID: 6f1c2a8d4b70
+Revises: 3e8a6d0c5b92
+Create Date: 2026-10-18 21:12:36.905471
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table
+
+# revision identifiers, used by Alembic.
+revision = '6f1c2a8d4b70'
+down_revision = '3e8a6d0c5b92'
+branch_labels = None
+depends_on = None
+
+# Tables whose writes change the cases, with the column holding the client of the cases or the linked case
+_GENERATION_TRIGGERED_TABLES = [
+    ('cases', 'client_id'),
+    ('case_tags', 'case_id'),
+    ('cases_events', 'case_id'),
+    ('notes', 'note_case_id'),
+    ('case_tasks', 'task_case_id'),
+    ('case_assets', 'case_id'),
+    ('ioc', 'case_id')
+]
+
+# Statement level triggers, as for the alerts generation
+_BUMP_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION bump_cases_generation() RETURNS trigger AS $$
+DECLARE
+    changed_rows text;
+    clients text;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed_rows := 'SELECT * FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        changed_rows := 'SELECT * FROM old_rows';
+    ELSE
+        changed_rows := 'SELECT * FROM new_rows UNION ALL SELECT * FROM old_rows';
+    END IF;
+
+    IF TG_TABLE_NAME = 'cases' THEN
+        clients := format('SELECT DISTINCT c.%I AS client_id FROM (%s) c', TG_ARGV[0], changed_rows);
+    ELSE
+        clients := format('SELECT DISTINCT cs.client_id AS client_id FROM (%s) c '
+                          || 'JOIN cases cs ON cs.case_id = c.%I', changed_rows, TG_ARGV[0]);
+    END IF;
+
+    -- Locking the counters in a stable order prevents deadlocks between concurrent writers
+    EXECUTE format('INSERT INTO cases_generation (client_id, generation) '
+                   || 'SELECT client_id, 1 FROM (%s) clients WHERE client_id IS NOT NULL ORDER BY client_id '
+                   || 'ON CONFLICT (client_id) DO UPDATE SET generation = cases_generation.generation + 1',
+                   clients);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+_TRIGGER_TRANSITION_TABLES = {
+    'INSERT': 'NEW TABLE AS new_rows',
+    'UPDATE': 'OLD TABLE AS old_rows NEW TABLE AS new_rows',
+    'DELETE': 'OLD TABLE AS old_rows'
+}
+
+
+def upgrade():
+    if not _has_table('cases_generation'):
+        op.create_table('cases_generation',
+                        sa.Column('client_id', sa.BigInteger, primary_key=True),
+                        sa.Column('generation', sa.BigInteger, nullable=False, server_default=text('0')))
+
+    op.execute(text(_BUMP_FUNCTION_DDL))
+
+    for table_name, column_name in _GENERATION_TRIGGERED_TABLES:
+        for event, transition_tables in _TRIGGER_TRANSITION_TABLES.items():
+            trigger_name = f'{table_name}_{event.lower()}_bump_cases_generation'
+            op.execute(text(f'DROP TRIGGER IF EXISTS {trigger_name} ON {table_name}'))
+            op.execute(text(f"""
+                CREATE TRIGGER {trigger_name} AFTER {event} ON {table_name}
+                REFERENCING {transition_tables}
+                FOR EACH STATEMENT EXECUTE PROCEDURE bump_cases_generation('{column_name}')
+            """))
+
+
+def downgrade():
+    for table_name, _ in _GENERATION_TRIGGERED_TABLES:
+        for event in _TRIGGER_TRANSITION_TABLES:
+            op.execute(text(f'DROP TRIGGER IF EXISTS {table_name}_{event.lower()}_bump_cases_generation '
+                            f'ON {table_name}'))
+
+    op.execute(text('DROP FUNCTION IF EXISTS bump_cases_generation()'))
+    op.execute(text('DROP TABLE IF EXISTS cases_generation'))
@@ -0,0 +1,44 @@
+"""Add alerts deduplication columns
+
+Revision ID: 7b2d9e4f1a36
+Revises: 5c3e81f0d9a6
+Create Date: 2026-10-18 21:03:44.518027
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _table_has_column
+from app.alembic.alembic_utils import index_exists
+
+# revision identifiers, used by Alembic.
+revision = '7b2d9e4f1a36'
+down_revision = '5c3e81f0d9a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not _table_has_column('alerts', 'alert_fingerprint'):
+        op.add_column('alerts', sa.Column('alert_fingerprint', sa.BigInteger, nullable=True))
+
+    if not _table_has_column('alerts', 'alert_occurrences'):
+        op.add_column('alerts', sa.Column('alert_occurrences', sa.Integer, nullable=False,
+                                          server_default=text('1')))
+
+    # Existing alerts have no fingerprint, so they are never matched and keep a NULL last seen date
+    if not _table_has_column('alerts', 'alert_last_seen_at'):
+        op.add_column('alerts', sa.Column('alert_last_seen_at', sa.DateTime, nullable=True))
+
+    if not index_exists('alerts', 'ix_alerts_customer_fingerprint_last_seen'):
+        op.create_index('ix_alerts_customer_fingerprint_last_seen', 'alerts',
+                        ['alert_customer_id', 'alert_fingerprint', 'alert_last_seen_at'])
+
+
+def downgrade():
+    op.execute(text('DROP INDEX IF EXISTS ix_alerts_customer_fingerprint_last_seen'))
+
+    for column in ('alert_last_seen_at', 'alert_occurrences', 'alert_fingerprint'):
+        if _table_has_column('alerts', column):
+            op.drop_column('alerts', column)
@@ -0,0 +1,29 @@
+"""Add alerts keyset pagination index
+
+Revision ID: 7b2e4d9c1a83
+Revises: 3c1f6a9d2b47
+Create Date: 2026-10-18 10:04:17.552930
+
+"""
+from alembic import op
+
+from app.alembic.alembic_utils import _has_table, index_exists
+
+# revision identifiers, used by Alembic.
+revision = '7b2e4d9c1a83'
+down_revision = '3c1f6a9d2b47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Composite index matching the alerts list ordering, so that keyset pagination is an index range scan
+    if _has_table('alerts'):
+        if not index_exists('alerts', 'idx_alerts_source_event_time_alert_id'):
+            op.create_index('idx_alerts_source_event_time_alert_id', 'alerts',
+                            ['alert_source_event_time', 'alert_id'])
+
+
+def downgrade():
+    if index_exists('alerts', 'idx_alerts_source_event_time_alert_id'):
+        op.drop_index('idx_alerts_source_event_time_alert_id', table_name='alerts')
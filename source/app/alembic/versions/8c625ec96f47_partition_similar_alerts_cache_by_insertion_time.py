@@ -0,0 +1,64 @@
+"""Partition similar alerts cache by insertion time
+
+Revision ID: 8c625ec96f47
+Revises: 0692e28245db
+Create Date: 2026-10-19 11:48:20.193674
+
+"""
+from datetime import date
+
+from alembic import op
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table
+
+# revision identifiers, used by Alembic.
+revision = '8c625ec96f47'
+down_revision = '0692e28245db'
+branch_labels = None
+depends_on = None
+
+
+def _add_months(value, months):
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def upgrade():
+    if not _has_table('similar_alerts_cache_default'):
+        return
+
+    # The entries were dated from the event time supplied by the alert source, which can be in the future.
+    # They are now dated from their insertion, so the future ones are brought back to the present
+    op.execute(text('UPDATE similar_alerts_cache SET created_at = now() WHERE created_at > now()'))
+
+    # The months of the default partition rows could not get a partition, which is created from these rows.
+    # Rows older than any partition stay in the default partition until they are pruned
+    first_partition = op.get_bind().execute(text(
+        "SELECT min(child.relname) FROM pg_inherits "
+        "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+        "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+        "WHERE parent.relname = 'similar_alerts_cache' AND child.relname ~ '_p[0-9]{6}$'"
+    )).scalar()
+
+    months = op.get_bind().execute(text(
+        "SELECT DISTINCT date_trunc('month', created_at)::date FROM similar_alerts_cache_default ORDER BY 1"
+    )).scalars().all()
+
+    for month in months:
+        partition_name = f'similar_alerts_cache_p{month.year:04d}{month.month:02d}'
+        if first_partition and partition_name < first_partition:
+            continue
+
+        bounds = f"created_at >= '{month.isoformat()}' AND created_at < '{_add_months(month, 1).isoformat()}'"
+        op.execute(text(f'CREATE TABLE {partition_name} '
+                        f'(LIKE similar_alerts_cache INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+        op.execute(text(f'INSERT INTO {partition_name} SELECT * FROM similar_alerts_cache_default WHERE {bounds}'))
+        op.execute(text(f'DELETE FROM similar_alerts_cache_default WHERE {bounds}'))
+        op.execute(text(f"ALTER TABLE similar_alerts_cache ATTACH PARTITION {partition_name} "
+                        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"))
+
+
+def downgrade():
+    # The entries keep their insertion date, and the partitions created stay attached
+    pass
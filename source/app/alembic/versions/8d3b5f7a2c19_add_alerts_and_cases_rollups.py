@@ -0,0 +1,122 @@
+"""Add alerts and cases rollups
+
+Revision ID: 8d3b5f7a2c19
+Revises: 6f1c2a8d4b70
+Create Date: 2026-10-18 22:40:18.530264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table
+from app.alembic.alembic_utils import index_exists
+
+# revision identifiers, used by Alembic.
+revision = '8d3b5f7a2c19'
+down_revision = '6f1c2a8d4b70'
+branch_labels = None
+depends_on = None
+
+# Source table, its time column, the rollup table and the table of its dirty hours
+_ROLLUPS = [
+    ('alerts', 'alert_creation_time', 'alerts_rollup', 'alerts_rollup_dirty_hours'),
+    ('cases', 'initial_date', 'cases_rollup', 'cases_rollup_dirty_hours')
+]
+
+_ROLLUP_DIMENSIONS = {
+    'alerts_rollup': [
+        sa.Column('customer_id', sa.BigInteger),
+        sa.Column('status_id', sa.Integer),
+        sa.Column('severity_id', sa.Integer),
+        sa.Column('classification_id', sa.Integer),
+        sa.Column('resolution_status_id', sa.Integer),
+        sa.Column('owner_id', sa.Integer),
+        sa.Column('source', sa.Text),
+        sa.Column('alerts_count', sa.BigInteger, nullable=False)
+    ],
+    'cases_rollup': [
+        sa.Column('client_id', sa.BigInteger),
+        sa.Column('status_id', sa.Integer),
+        sa.Column('severity_id', sa.Integer),
+        sa.Column('classification_id', sa.Integer),
+        sa.Column('owner_id', sa.Integer),
+        sa.Column('cases_count', sa.BigInteger, nullable=False)
+    ]
+}
+
+# Statement level triggers, so that a batch written by a single statement marks each of its hours once
+_MARK_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION mark_rollup_dirty_hours() RETURNS trigger AS $$
+DECLARE
+    changed_rows text;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed_rows := 'SELECT * FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        changed_rows := 'SELECT * FROM old_rows';
+    ELSE
+        changed_rows := 'SELECT * FROM new_rows UNION ALL SELECT * FROM old_rows';
+    END IF;
+
+    EXECUTE format('INSERT INTO %I (bucket_start) '
+                   || 'SELECT DISTINCT date_trunc(''hour'', c.%I) FROM (%s) c WHERE c.%I IS NOT NULL ORDER BY 1 '
+                   || 'ON CONFLICT (bucket_start) DO NOTHING',
+                   TG_ARGV[1], TG_ARGV[0], changed_rows, TG_ARGV[0]);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+_TRIGGER_TRANSITION_TABLES = {
+    'INSERT': 'NEW TABLE AS new_rows',
+    'UPDATE': 'OLD TABLE AS old_rows NEW TABLE AS new_rows',
+    'DELETE': 'OLD TABLE AS old_rows'
+}
+
+
+def upgrade():
+    op.execute(text(_MARK_FUNCTION_DDL))
+
+    for table_name, time_column, rollup_table, dirty_table in _ROLLUPS:
+        if not _has_table(rollup_table):
+            op.create_table(rollup_table,
+                            sa.Column('id', sa.BigInteger, primary_key=True, autoincrement=True),
+                            sa.Column('granularity', sa.Text, nullable=False),
+                            sa.Column('bucket_start', sa.DateTime, nullable=False),
+                            *_ROLLUP_DIMENSIONS[rollup_table])
+
+        if not index_exists(rollup_table, f'ix_{rollup_table}_granularity_bucket_start'):
+            op.create_index(f'ix_{rollup_table}_granularity_bucket_start', rollup_table,
+                            ['granularity', 'bucket_start'])
+
+        if not _has_table(dirty_table):
+            op.create_table(dirty_table, sa.Column('bucket_start', sa.DateTime, primary_key=True))
+
+            # Every hour holding data is computed by the rollups job, the raw rows being read until then
+            op.execute(text(f"""
+                INSERT INTO {dirty_table} (bucket_start)
+                SELECT DISTINCT date_trunc('hour', {time_column}) FROM {table_name} WHERE {time_column} IS NOT NULL
+            """))
+
+        for event, transition_tables in _TRIGGER_TRANSITION_TABLES.items():
+            trigger_name = f'{table_name}_{event.lower()}_mark_rollup_dirty_hours'
+            op.execute(text(f'DROP TRIGGER IF EXISTS {trigger_name} ON {table_name}'))
+            op.execute(text(f"""
+                CREATE TRIGGER {trigger_name} AFTER {event} ON {table_name}
+                REFERENCING {transition_tables}
+                FOR EACH STATEMENT EXECUTE PROCEDURE mark_rollup_dirty_hours('{time_column}', '{dirty_table}')
+            """))
+
+
+def downgrade():
+    for table_name, _, rollup_table, dirty_table in _ROLLUPS:
+        for event in _TRIGGER_TRANSITION_TABLES:
+            op.execute(text(f'DROP TRIGGER IF EXISTS {table_name}_{event.lower()}_mark_rollup_dirty_hours '
+                            f'ON {table_name}'))
+
+        op.execute(text(f'DROP TABLE IF EXISTS {dirty_table}'))
+        op.execute(text(f'DROP TABLE IF EXISTS {rollup_table}'))
+
+    op.execute(text('DROP FUNCTION IF EXISTS mark_rollup_dirty_hours()'))
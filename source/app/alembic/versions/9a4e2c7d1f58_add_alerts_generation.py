@@ -0,0 +1,96 @@
+"""Add alerts generation
+
+Revision ID: 9a4e2c7d1f58
+Revises: 2d6f8b1e4c07
+Create Date: 2026-10-18 19:05:44.318027
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table
+
+# revision identifiers, used by Alembic.
+revision = '9a4e2c7d1f58'
+down_revision = '2d6f8b1e4c07'
+branch_labels = None
+depends_on = None
+
+# Tables whose writes change the alerts, with the column holding the customer of the alerts or the linked alert
+_GENERATION_TRIGGERED_TABLES = [
+    ('alerts', 'alert_customer_id'),
+    ('comments', 'comment_alert_id'),
+    ('alert_case_association', 'alert_id'),
+    ('alert_iocs_association', 'alert_id'),
+    ('alert_assets_association', 'alert_id')
+]
+
+# Statement level triggers, so that a batch of alerts written by a single statement increments the counters once
+_BUMP_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION bump_alerts_generation() RETURNS trigger AS $$
+DECLARE
+    changed_rows text;
+    customers text;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed_rows := 'SELECT * FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        changed_rows := 'SELECT * FROM old_rows';
+    ELSE
+        changed_rows := 'SELECT * FROM new_rows UNION ALL SELECT * FROM old_rows';
+    END IF;
+
+    IF TG_TABLE_NAME = 'alerts' THEN
+        customers := format('SELECT DISTINCT c.%I AS customer_id FROM (%s) c', TG_ARGV[0], changed_rows);
+    ELSE
+        customers := format('SELECT DISTINCT a.alert_customer_id AS customer_id FROM (%s) c '
+                            || 'JOIN alerts a ON a.alert_id = c.%I', changed_rows, TG_ARGV[0]);
+    END IF;
+
+    -- Locking the counters in a stable order prevents deadlocks between concurrent writers
+    EXECUTE format('INSERT INTO alerts_generation (customer_id, generation) '
+                   || 'SELECT customer_id, 1 FROM (%s) customers WHERE customer_id IS NOT NULL ORDER BY customer_id '
+                   || 'ON CONFLICT (customer_id) DO UPDATE SET generation = alerts_generation.generation + 1',
+                   customers);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+_TRIGGER_TRANSITION_TABLES = {
+    'INSERT': 'NEW TABLE AS new_rows',
+    'UPDATE': 'OLD TABLE AS old_rows NEW TABLE AS new_rows',
+    'DELETE': 'OLD TABLE AS old_rows'
+}
+
+
+def upgrade():
+    if not _has_table('alerts_generation'):
+        op.create_table('alerts_generation',
+                        sa.Column('customer_id', sa.BigInteger, primary_key=True),
+                        sa.Column('generation', sa.BigInteger, nullable=False, server_default=text('0')))
+
+    op.execute(text(_BUMP_FUNCTION_DDL))
+
+    # Transition tables are limited to triggers on a single event
+    for table_name, column_name in _GENERATION_TRIGGERED_TABLES:
+        for event, transition_tables in _TRIGGER_TRANSITION_TABLES.items():
+            trigger_name = f'{table_name}_{event.lower()}_bump_alerts_generation'
+            op.execute(text(f'DROP TRIGGER IF EXISTS {trigger_name} ON {table_name}'))
+            op.execute(text(f"""
+                CREATE TRIGGER {trigger_name} AFTER {event} ON {table_name}
+                REFERENCING {transition_tables}
+                FOR EACH STATEMENT EXECUTE PROCEDURE bump_alerts_generation('{column_name}')
+            """))
+
+
+def downgrade():
+    for table_name, _ in _GENERATION_TRIGGERED_TABLES:
+        for event in _TRIGGER_TRANSITION_TABLES:
+            op.execute(text(f'DROP TRIGGER IF EXISTS {table_name}_{event.lower()}_bump_alerts_generation '
+                            f'ON {table_name}'))
+
+    op.execute(text('DROP FUNCTION IF EXISTS bump_alerts_generation()'))
+    op.execute(text('DROP TABLE IF EXISTS alerts_generation'))
@@ -0,0 +1,55 @@
+"""Add alerts text search indexes
+
+Revision ID: a4c8e2f6b1d9
+Revises: 7b2e4d9c1a83
+Create Date: 2026-10-18 11:23:05.904112
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table, index_exists
+
+# revision identifiers, used by Alembic.
+revision = 'a4c8e2f6b1d9'
+down_revision = '7b2e4d9c1a83'
+branch_labels = None
+depends_on = None
+
+# Trigram indexes serving the substring (I)LIKE filters of the alerts list
+trigram_indexes = {
+    'idx_alerts_title_trgm': 'alert_title',
+    'idx_alerts_description_trgm': 'alert_description',
+    'idx_alerts_source_trgm': 'alert_source',
+    'idx_alerts_tags_trgm': 'alert_tags',
+    'idx_alerts_source_ref_trgm': 'alert_source_ref'
+}
+
+
+def upgrade():
+    if not _has_table('alerts'):
+        return
+
+    op.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+
+    # Built concurrently so that the alerts table stays writable during the migration
+    with op.get_context().autocommit_block():
+        for index_name, column in trigram_indexes.items():
+            if not index_exists('alerts', index_name):
+                op.execute(text(f'CREATE INDEX CONCURRENTLY {index_name} ON alerts '
+                                f'USING gin ({column} gin_trgm_ops)'))
+
+        # Must match the expression used by the keyword search of the alerts list
+        if not index_exists('alerts', 'idx_alerts_search_tsv'):
+            op.execute(text("CREATE INDEX CONCURRENTLY idx_alerts_search_tsv ON alerts "
+                            "USING gin (to_tsvector('simple', coalesce(alert_title, '') || ' ' || "
+                            "coalesce(alert_description, '')))"))
+
+
+def downgrade():
+    if not _has_table('alerts'):
+        return
+
+    for index_name in [*trigram_indexes, 'idx_alerts_search_tsv']:
+        if index_exists('alerts', index_name):
+            op.drop_index(index_name, table_name='alerts')
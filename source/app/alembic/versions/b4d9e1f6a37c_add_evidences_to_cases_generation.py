@@ -0,0 +1,44 @@
+"""Add evidences to cases generation
+
+Revision ID: b4d9e1f6a37c
+Revises: 8d3b5f7a2c19
+Create Date: 2026-10-18 23:41:52.316084
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table
+
+# revision identifiers, used by Alembic.
+revision = 'b4d9e1f6a37c'
+down_revision = '8d3b5f7a2c19'
+branch_labels = None
+depends_on = None
+
+# The live statistics rely on the cases generation to notice the new evidences
+_TRIGGER_TRANSITION_TABLES = {
+    'INSERT': 'NEW TABLE AS new_rows',
+    'UPDATE': 'OLD TABLE AS old_rows NEW TABLE AS new_rows',
+    'DELETE': 'OLD TABLE AS old_rows'
+}
+
+
+def upgrade():
+    if not _has_table('case_received_file'):
+        return
+
+    for event, transition_tables in _TRIGGER_TRANSITION_TABLES.items():
+        trigger_name = f'case_received_file_{event.lower()}_bump_cases_generation'
+        op.execute(text(f'DROP TRIGGER IF EXISTS {trigger_name} ON case_received_file'))
+        op.execute(text(f"""
+            CREATE TRIGGER {trigger_name} AFTER {event} ON case_received_file
+            REFERENCING {transition_tables}
+            FOR EACH STATEMENT EXECUTE PROCEDURE bump_cases_generation('case_id')
+        """))
+
+
+def downgrade():
+    for event in _TRIGGER_TRANSITION_TABLES:
+        op.execute(text(f'DROP TRIGGER IF EXISTS case_received_file_{event.lower()}_bump_cases_generation '
+                        f'ON case_received_file'))
@@ -0,0 +1,163 @@
+"""Partition similar alerts cache and add alerts archive
+
+Revision ID: c8d2f4a6e1b3
+Revises: 5e9a1c3f7d20
+Create Date: 2026-10-18 14:02:51.617340
+
+"""
+from datetime import date
+from datetime import datetime
+
+from alembic import op
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table
+
+# revision identifiers, used by Alembic.
+revision = 'c8d2f4a6e1b3'
+down_revision = '5e9a1c3f7d20'
+branch_labels = None
+depends_on = None
+
+# Rows older than this are left in the default partition rather than getting a partition per month
+_MAX_BACKFILL_MONTHS = 24
+
+
+def _is_partitioned(table_name):
+    return op.get_bind().execute(text(
+        "SELECT count(*) FROM pg_partitioned_table JOIN pg_class ON pg_partitioned_table.partrelid = pg_class.oid "
+        "WHERE pg_class.relname = :table_name"
+    ), {'table_name': table_name}).scalar() > 0
+
+
+def _add_months(value, months):
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _create_partitions(table_name, first_month):
+    op.execute(text(f'CREATE TABLE IF NOT EXISTS {table_name}_default PARTITION OF {table_name} DEFAULT'))
+
+    current_month = date(datetime.utcnow().year, datetime.utcnow().month, 1)
+    month = max(first_month, _add_months(current_month, -_MAX_BACKFILL_MONTHS))
+    while month <= _add_months(current_month, 2):
+        op.execute(text(f"CREATE TABLE IF NOT EXISTS {table_name}_p{month.year:04d}{month.month:02d} "
+                        f"PARTITION OF {table_name} "
+                        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"))
+        month = _add_months(month, 1)
+
+
+def upgrade():
+    if _has_table('similar_alerts_cache') and not _is_partitioned('similar_alerts_cache'):
+        # Swap the table for a monthly partitioned one. The primary key must include the partition key
+        op.execute(text('ALTER TABLE similar_alerts_cache RENAME TO similar_alerts_cache_legacy'))
+        op.execute(text('ALTER TABLE similar_alerts_cache_legacy '
+                        'RENAME CONSTRAINT similar_alerts_cache_pkey TO similar_alerts_cache_legacy_pkey'))
+        for index_name in ['ix_similar_alerts_cache_customer_key_created', 'ix_similar_alerts_cache_alert_id',
+                           'ix_similar_alerts_cache_created_at']:
+            op.execute(text(f'DROP INDEX IF EXISTS {index_name}'))
+
+        op.execute(text("""
+            CREATE TABLE similar_alerts_cache (
+                id BIGINT NOT NULL DEFAULT nextval('similar_alerts_cache_id_seq'),
+                customer_id BIGINT NOT NULL REFERENCES client (client_id),
+                asset_name TEXT,
+                ioc_value TEXT,
+                alert_id BIGINT NOT NULL REFERENCES alerts (alert_id),
+                created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+                asset_type_id INTEGER REFERENCES assets_type (asset_id),
+                ioc_type_id INTEGER REFERENCES ioc_type (type_id),
+                match_key_hash BIGINT,
+                PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at)
+        """))
+
+        first_entry = op.get_bind().execute(text('SELECT min(created_at) FROM similar_alerts_cache_legacy')).scalar()
+        first_month = date(first_entry.year, first_entry.month, 1) if first_entry else date.today().replace(day=1)
+        _create_partitions('similar_alerts_cache', first_month)
+
+        op.execute(text("""
+            INSERT INTO similar_alerts_cache (id, customer_id, asset_name, ioc_value, alert_id, created_at,
+                                              asset_type_id, ioc_type_id, match_key_hash)
+            SELECT id, customer_id, asset_name, ioc_value, alert_id, created_at,
+                   asset_type_id, ioc_type_id, match_key_hash
+            FROM similar_alerts_cache_legacy
+        """))
+
+        op.execute(text('ALTER SEQUENCE similar_alerts_cache_id_seq OWNED BY similar_alerts_cache.id'))
+        op.execute(text('DROP TABLE similar_alerts_cache_legacy'))
+
+        op.create_index('ix_similar_alerts_cache_customer_key_created', 'similar_alerts_cache',
+                        ['customer_id', 'match_key_hash', 'created_at'])
+        op.create_index('ix_similar_alerts_cache_alert_id', 'similar_alerts_cache', ['alert_id'])
+        op.create_index('ix_similar_alerts_cache_created_at', 'similar_alerts_cache', ['created_at'])
+
+    if not _has_table('alerts_archive'):
+        op.execute(text("""
+            CREATE TABLE alerts_archive (
+                alert_id BIGINT NOT NULL,
+                alert_uuid UUID NOT NULL,
+                alert_title TEXT NOT NULL,
+                alert_source TEXT,
+                alert_source_ref TEXT,
+                alert_tags TEXT,
+                alert_customer_id BIGINT NOT NULL,
+                alert_severity_id INTEGER,
+                alert_status_id INTEGER,
+                alert_resolution_status_id INTEGER,
+                alert_source_event_time TIMESTAMP WITHOUT TIME ZONE,
+                alert_creation_time TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                archived_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+                alert_data JSONB NOT NULL,
+                PRIMARY KEY (alert_id, alert_creation_time)
+            ) PARTITION BY RANGE (alert_creation_time)
+        """))
+        _create_partitions('alerts_archive', date.today().replace(day=1))
+
+        op.create_index('ix_alerts_archive_customer_creation_time', 'alerts_archive',
+                        ['alert_customer_id', 'alert_creation_time'])
+
+
+def downgrade():
+    if _has_table('alerts_archive'):
+        op.execute(text('DROP TABLE alerts_archive'))
+
+    if _has_table('similar_alerts_cache') and _is_partitioned('similar_alerts_cache'):
+        # Swap the partitioned table back for a plain one, keyed by its identifier alone
+        op.execute(text('ALTER TABLE similar_alerts_cache RENAME TO similar_alerts_cache_partitioned'))
+        op.execute(text('ALTER TABLE similar_alerts_cache_partitioned '
+                        'RENAME CONSTRAINT similar_alerts_cache_pkey TO similar_alerts_cache_partitioned_pkey'))
+        for index_name in ['ix_similar_alerts_cache_customer_key_created', 'ix_similar_alerts_cache_alert_id',
+                           'ix_similar_alerts_cache_created_at']:
+            op.execute(text(f'DROP INDEX IF EXISTS {index_name}'))
+
+        op.execute(text("""
+            CREATE TABLE similar_alerts_cache (
+                id BIGINT NOT NULL DEFAULT nextval('similar_alerts_cache_id_seq') PRIMARY KEY,
+                customer_id BIGINT NOT NULL REFERENCES client (client_id),
+                asset_name TEXT,
+                ioc_value TEXT,
+                alert_id BIGINT NOT NULL REFERENCES alerts (alert_id),
+                created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+                asset_type_id INTEGER REFERENCES assets_type (asset_id),
+                ioc_type_id INTEGER REFERENCES ioc_type (type_id),
+                match_key_hash BIGINT
+            )
+        """))
+
+        op.execute(text("""
+            INSERT INTO similar_alerts_cache (id, customer_id, asset_name, ioc_value, alert_id, created_at,
+                                              asset_type_id, ioc_type_id, match_key_hash)
+            SELECT id, customer_id, asset_name, ioc_value, alert_id, created_at,
+                   asset_type_id, ioc_type_id, match_key_hash
+            FROM similar_alerts_cache_partitioned
+        """))
+
+        # The sequence must change owner before the partitioned table is dropped along with its partitions
+        op.execute(text('ALTER SEQUENCE similar_alerts_cache_id_seq OWNED BY similar_alerts_cache.id'))
+        op.execute(text('DROP TABLE similar_alerts_cache_partitioned'))
+
+        op.create_index('ix_similar_alerts_cache_customer_key_created', 'similar_alerts_cache',
+                        ['customer_id', 'match_key_hash', 'created_at'])
+        op.create_index('ix_similar_alerts_cache_alert_id', 'similar_alerts_cache', ['alert_id'])
+        op.create_index('ix_similar_alerts_cache_created_at', 'similar_alerts_cache', ['created_at'])
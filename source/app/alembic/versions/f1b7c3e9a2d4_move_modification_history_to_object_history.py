@@ -0,0 +1,117 @@
+"""Move modification history to object history
+
+Revision ID: f1b7c3e9a2d4
+Revises: c8d2f4a6e1b3
+Create Date: 2026-10-18 16:21:07.482913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app.alembic.alembic_utils import _has_table
+from app.alembic.alembic_utils import _table_has_column
+from app.alembic.alembic_utils import index_exists
+
+# revision identifiers, used by Alembic.
+revision = 'f1b7c3e9a2d4'
+down_revision = 'c8d2f4a6e1b3'
+branch_labels = None
+depends_on = None
+
+_HISTORIZED_TABLES = [
+    ('alerts', 'alert_id'),
+    ('cases', 'case_id'),
+    ('cases_events', 'event_id'),
+    ('case_assets', 'asset_id'),
+    ('ioc', 'ioc_id'),
+    ('notes', 'note_id'),
+    ('case_tasks', 'id'),
+    ('case_received_file', 'id'),
+    ('data_store_file', 'file_id')
+]
+
+_BACKFILL_BATCH_SIZE = 5000
+
+_VIEW_DDL = """
+CREATE OR REPLACE VIEW object_modification_history AS
+SELECT object_type, object_id,
+       json_object_agg(extract(epoch FROM ts)::text,
+                       json_build_object('user', user_name, 'user_id', user_id, 'action', action)
+                       ORDER BY ts, id) AS modification_history
+FROM object_history
+GROUP BY object_type, object_id
+"""
+
+
+def _backfill_history(table_name, id_column):
+    bounds = op.get_bind().execute(text(
+        f'SELECT min({id_column}), max({id_column}) FROM {table_name} WHERE modification_history IS NOT NULL'
+    )).first()
+    if bounds[0] is None:
+        return
+
+    # The JSON keys are the epoch timestamps of the entries. Malformed entries are skipped
+    lower_id = bounds[0]
+    while lower_id <= bounds[1]:
+        upper_id = lower_id + _BACKFILL_BATCH_SIZE
+        op.get_bind().execute(text(f"""
+            INSERT INTO object_history (object_type, object_id, ts, user_name, user_id, action)
+            SELECT '{table_name}', t.{id_column}, to_timestamp(e.key::double precision), e.value->>'user',
+                   CASE WHEN e.value->>'user_id' ~ '^[0-9]+$' THEN (e.value->>'user_id')::integer END,
+                   e.value->>'action'
+            FROM {table_name} t
+            CROSS JOIN LATERAL json_each(
+                CASE WHEN json_typeof(t.modification_history::json) = 'object'
+                     THEN t.modification_history::json ELSE '{{}}'::json END
+            ) e
+            WHERE t.{id_column} >= :lower_id AND t.{id_column} < :upper_id
+              AND e.key ~ '^[0-9]+(\\.[0-9]+)?$' AND json_typeof(e.value) = 'object'
+        """), {'lower_id': lower_id, 'upper_id': upper_id})
+
+        # Clearing the migrated blobs makes the backfill restartable and releases their storage
+        op.get_bind().execute(text(f"""
+            UPDATE {table_name} SET modification_history = NULL
+            WHERE {id_column} >= :lower_id AND {id_column} < :upper_id AND modification_history IS NOT NULL
+        """), {'lower_id': lower_id, 'upper_id': upper_id})
+
+        lower_id = upper_id
+
+
+def upgrade():
+    if not _has_table('object_history'):
+        op.create_table('object_history',
+                        sa.Column('id', sa.BigInteger, primary_key=True),
+                        sa.Column('object_type', sa.Text, nullable=False),
+                        sa.Column('object_id', sa.BigInteger, nullable=False),
+                        sa.Column('ts', sa.DateTime(timezone=True), nullable=False, server_default=text('now()')),
+                        sa.Column('user_name', sa.Text),
+                        sa.Column('user_id', sa.Integer),
+                        sa.Column('action', sa.Text))
+
+    if not index_exists('object_history', 'ix_object_history_object_type_object_id_ts'):
+        op.create_index('ix_object_history_object_type_object_id_ts', 'object_history',
+                        ['object_type', 'object_id', 'ts'])
+
+    op.execute(text(_VIEW_DDL))
+
+    for table_name, id_column in _HISTORIZED_TABLES:
+        if _has_table(table_name) and _table_has_column(table_name, 'modification_history'):
+            _backfill_history(table_name, id_column)
+
+
+def downgrade():
+    # Restore the history blobs from the compatibility view before dropping the table
+    for table_name, id_column in _HISTORIZED_TABLES:
+        column_type = 'jsonb' if table_name == 'cases_events' else 'json'
+        if not _table_has_column(table_name, 'modification_history'):
+            op.execute(text(f'ALTER TABLE {table_name} ADD COLUMN modification_history {column_type}'))
+
+        op.execute(text(f"""
+            UPDATE {table_name} t SET modification_history = h.modification_history::{column_type}
+            FROM object_modification_history h
+            WHERE h.object_type = '{table_name}' AND h.object_id = t.{id_column}
+        """))
+
+    op.execute(text('DROP VIEW IF EXISTS object_modification_history'))
+    op.execute(text('DROP TABLE IF EXISTS object_history'))
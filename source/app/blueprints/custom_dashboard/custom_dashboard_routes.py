@@ -15,10 +15,15 @@ from app.datamgmt.custom_dashboard.custom_dashboard_db import (
     DashboardNotFoundError
 )
 from app.datamgmt.custom_dashboard.schema import CustomDashboardSchema
-from app.datamgmt.custom_dashboard.query_engine import execute_widget, format_widget_payload, QueryExecutionError
+from app.datamgmt.custom_dashboard.query_engine import resolve_widget_access_scope, QueryExecutionError
+from app.datamgmt.custom_dashboard.widget_cache import execute_widgets_cached, get_widgets_cache_statistics
+from app.datamgmt.custom_dashboard.widget_cache import WidgetsLiveState
+from app.iris_engine.dashboards.live_updates import LIVE_UPDATES_NAMESPACE, get_live_timeframe_args
+from app.iris_engine.dashboards.live_updates import LiveAccessRevoked, get_live_user
+from app.iris_engine.dashboards.live_updates import get_payloads_delta, live_subscribe
 from app.util import ac_api_requires, ac_requires
 
-from app import app, ac_current_user_has_permission
+from app import app, socket_io, ac_current_user_has_permission
 
 custom_dashboard_blueprint = Blueprint(
     'custom_dashboard',
@@ -89,6 +94,22 @@ def _resolve_timeframe(args):
     return start_dt, end_dt
 
 
+def _get_ordered_widgets(dashboard):
+    ordered_widgets = sorted(dashboard.widgets, key=lambda item: ((item.position or 0), item.id))
+    return ordered_widgets, [widget.definition or {} for widget in ordered_widgets]
+
+
+def _build_widget_result(widget, data, error):
+    if error is None:
+        return {'data': data}
+
+    if isinstance(error, QueryExecutionError):
+        return {'error': str(error)}
+
+    app.logger.error('Failed to execute custom dashboard widget %s', widget.widget_uuid, exc_info=error)
+    return {'error': 'Unexpected error while executing widget.'}
+
+
 @custom_dashboard_blueprint.route('/custom-dashboards')
 @ac_requires(Permissions.custom_dashboards_read, no_cid_required=True)
 def dashboard_index(caseid, url_redir):
@@ -161,28 +182,24 @@ def api_get_dashboard_data(dashboard_id):
     timeframe_tuple = (start_dt, end_dt)
     widgets_payload = []
 
-    ordered_widgets = sorted(dashboard.widgets, key=lambda item: ((item.position or 0), item.id))
+    ordered_widgets, definitions = _get_ordered_widgets(dashboard)
+
+    # The access scope is resolved once in the request, as the widgets run outside of it
+    widgets_results = execute_widgets_cached(ordered_widgets, definitions, timeframe_tuple,
+                                             resolve_widget_access_scope())
 
-    for widget in ordered_widgets:
-        definition = widget.definition or {}
+    for widget, definition, (data, error, cached) in zip(ordered_widgets, definitions, widgets_results):
         widget_payload = {
             'widget_id': str(widget.widget_uuid),
             'name': definition.get('name') or widget.name,
             'chart_type': widget.chart_type,
-            'definition': definition
+            'definition': definition,
+            'cached': cached
         }
 
         layout = definition.get('layout') if isinstance(definition.get('layout'), dict) else {}
         widget_payload['layout'] = layout
-
-        try:
-            result = execute_widget(definition, timeframe_tuple)
-            widget_payload['data'] = format_widget_payload(result, definition, timeframe_tuple)
-        except QueryExecutionError as exc:
-            widget_payload['error'] = str(exc)
-        except Exception as exc:  # noqa: BLE001
-            widget_payload['error'] = 'Unexpected error while executing widget.'
-            app.logger.exception('Failed to execute custom dashboard widget %s', widget.widget_uuid)
+        widget_payload.update(_build_widget_result(widget, data, error))
 
         widgets_payload.append(widget_payload)
 
@@ -237,6 +254,75 @@ def api_get_dashboard_data(dashboard_id):
     return jsonify({'status': 'success', 'data': response_payload})
 
 
+@custom_dashboard_blueprint.route('/custom-dashboards/api/dashboards/<int:dashboard_id>/cache-statistics',
+                                  methods=['GET'])
+@ac_api_requires(Permissions.custom_dashboards_read)
+def api_get_dashboard_cache_statistics(dashboard_id):
+    try:
+        dashboard = get_dashboard_for_user(dashboard_id, current_user.id)
+    except DashboardNotFoundError:
+        return jsonify({'status': 'failure', 'message': 'Dashboard not found'}), 404
+    except DashboardAccessError:
+        return jsonify({'status': 'failure', 'message': 'Access denied'}), 403
+
+    return jsonify({'status': 'success', 'data': get_widgets_cache_statistics(dashboard.widgets)})
+
+
+@socket_io.on('subscribe_dashboard', namespace=LIVE_UPDATES_NAMESPACE)
+def socket_subscribe_dashboard(data):
+    if not ac_current_user_has_permission(Permissions.custom_dashboards_read):
+        return {'status': 'failure', 'message': 'Access denied'}
+
+    data = data if isinstance(data, dict) else {}
+    try:
+        dashboard_id = int(data.get('dashboard_id'))
+        get_dashboard_for_user(dashboard_id, current_user.id)
+    except (TypeError, ValueError, DashboardNotFoundError):
+        return {'status': 'failure', 'message': 'Dashboard not found'}
+    except DashboardAccessError:
+        return {'status': 'failure', 'message': 'Access denied'}
+
+    try:
+        _resolve_timeframe(get_live_timeframe_args(data))
+    except ValueError as exc:
+        return {'status': 'failure', 'message': str(exc)}
+
+    user_id = current_user.id
+    live_state = WidgetsLiveState()
+    digests = {}
+
+    # Only the widgets whose data changed are pushed, the deleted widgets being listed as removed.
+    # The permissions, the dashboard access and the access scope are checked again on each refresh
+    def refresh():
+        user = get_live_user(user_id, Permissions.custom_dashboards_read)
+        try:
+            dashboard = get_dashboard_for_user(dashboard_id, user_id)
+        except (DashboardNotFoundError, DashboardAccessError):
+            raise LiveAccessRevoked()
+
+        ordered_widgets, definitions = _get_ordered_widgets(dashboard)
+        results = live_state.refresh(ordered_widgets, definitions, _resolve_timeframe(get_live_timeframe_args(data)),
+                                     resolve_widget_access_scope(user))
+
+        changed, removed = get_payloads_delta(
+            digests,
+            {str(widget.widget_uuid): _build_widget_result(widget, widget_data, widget_error)
+             for widget, widget_data, widget_error in results},
+            keys=[str(widget.widget_uuid) for widget in ordered_widgets]
+        )
+        if not changed and not removed:
+            return None
+
+        return {
+            'dashboard_id': dashboard_id,
+            'widgets': [{'widget_id': widget_id, **result} for widget_id, result in changed.items()],
+            'removed': removed
+        }
+
+    live_subscribe(f'dashboard-{dashboard_id}', refresh)
+    return {'status': 'success', 'subscription': f'dashboard-{dashboard_id}'}
+
+
 @custom_dashboard_blueprint.route('/custom-dashboards/api/dashboards', methods=['POST'])
 @ac_api_requires(Permissions.custom_dashboards_write)
 def api_create_dashboard():
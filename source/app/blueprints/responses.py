@@ -63,6 +63,21 @@ def response_success(msg='', data=None):
     return response(200, data=content)
 
 
+def response_accepted(msg='', data=None):
+    content = {
+        "status": "success",
+        "message": msg,
+        "data": data if data is not None else []
+    }
+    return response(202, data=content)
+
+
+def response_too_many_requests(msg, retry_after):
+    resp = response_error(msg, status=429)
+    resp.headers['Retry-After'] = str(retry_after)
+    return resp
+
+
 class AlchemyEncoder(json.JSONEncoder):
 
     def default(self, obj):
@@ -16,7 +16,6 @@
 #  along with this program; if not, write to the Free Software Foundation,
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
-import json
 import marshmallow
 from datetime import datetime
 from flask import Blueprint
@@ -26,11 +25,32 @@ from typing import List
 from werkzeug import Response
 
 import app
+from app import cache
 from app import db
 from app.blueprints.case.case_comments import case_comment_update
+from app.business.alert_rules import alert_rules_apply
+from app.business.alerts import alerts_check_creation
+from app.business.alerts import alerts_check_ingestion_rate
+from app.business.alerts import alerts_create_batch
+from app.business.alerts import alerts_enqueue
+from app.business.alerts import alerts_get_filter_cache_key
+from app.business.alerts import alerts_get_ingestion_ticket
+from app.business.alerts import alerts_get_list_fields
+from app.business.alerts import alerts_get_near_duplicates
+from app.business.alerts import alerts_register_duplicate
+from app.business.alerts import alerts_update_batch
+from app.business.alerts import alerts_update_batch_in_background
+from app.business.errors import BusinessProcessingError
+from app.business.errors import ObjectNotFoundError
+from app.business.errors import PermissionDeniedError
+from app.business.errors import RateLimitedError
 from app.datamgmt.alerts.alerts_db import get_filtered_alerts, get_alert_by_id, create_case_from_alert, \
     delete_related_alerts_cache
 from app.datamgmt.alerts.alerts_db import merge_alert_in_case, unmerge_alert_from_case, cache_similar_alert
+from app.datamgmt.alerts.alerts_db import merge_alerts_in_case
+from app.datamgmt.alerts.alert_clustering_db import ALERTS_MINHASH_FIELDS
+from app.datamgmt.alerts.alert_clustering_db import cache_alert_minhash
+from app.datamgmt.alerts.alert_clustering_db import refresh_alerts_minhash
 from app.datamgmt.alerts.alerts_db import get_related_alerts, get_related_alerts_details
 from app.datamgmt.alerts.alerts_db import get_alert_comments, delete_alert_comment, get_alert_comment
 from app.datamgmt.alerts.alerts_db import delete_similar_alert_cache, delete_alerts
@@ -39,19 +59,24 @@ from app.datamgmt.case.case_db import get_case
 from app.datamgmt.manage.manage_access_control_db import check_ua_case_client
 from app.datamgmt.manage.manage_access_control_db import user_has_client_access
 from app.iris_engine.access_control.utils import ac_set_new_case_access
+from app.iris_engine.alerts.notifications import notify_alerts_changed
+from app.iris_engine.alerts.notifications import notify_alerts_ids_changed
 from app.iris_engine.module_handler.module_handler import call_modules_hook
 from app.iris_engine.utils.tracker import track_activity
 from app.models.alerts import AlertStatus
 from app.models.authorization import Permissions
 from app.schema.marshables import AlertSchema
+from app.schema.marshables import AlertIngestionTicketSchema
 from app.schema.marshables import CaseSchema
 from app.schema.marshables import CommentSchema
 from app.schema.marshables import CaseAssetsSchema
 from app.schema.marshables import IocSchema
 from app.blueprints.access_controls import ac_api_requires
 from app.blueprints.responses import response_error
+from app.blueprints.responses import response_too_many_requests
 from app.util import add_obj_history_entry
 from app.blueprints.responses import response_success
+from app.blueprints.responses import response_accepted
 
 alerts_rest_blueprint = Blueprint('alerts_rest', __name__)
 
@@ -121,6 +146,24 @@ def alerts_list_route() -> Response:
     else:
         fields = None
 
+    include_str = request.args.get('include')
+    if include_str:
+        include = [field.strip() for field in include_str.split(',') if field.strip()]
+    else:
+        include = None
+
+    try:
+        fields = alerts_get_list_fields(fields, include)
+
+    except BusinessProcessingError as e:
+        return response_error(e.get_message())
+
+    cache_key = alerts_get_filter_cache_key('alerts_filter', request.args.to_dict(flat=False), fields, current_user.id)
+    if cache_key:
+        filtered_data = cache.get(cache_key)
+        if filtered_data is not None:
+            return response_success(data=filtered_data)
+
     try:
         filtered_alerts = get_filtered_alerts(
             start_date=request.args.get('creation_start_date'),
@@ -146,7 +189,11 @@ def alerts_list_route() -> Response:
             assets=alert_assets,
             iocs=alert_iocs,
             resolution_status=request.args.get('alert_resolution_id', type=int),
-            current_user_id=current_user.id
+            current_user_id=current_user.id,
+            cursor=request.args.get('cursor'),
+            count=request.args.get('count'),
+            fields=fields,
+            search=request.args.get('search')
         )
 
     except Exception as e:
@@ -156,15 +203,7 @@ def alerts_list_route() -> Response:
     if filtered_alerts is None:
         return response_error('Filtering error')
 
-    # If fields are provided, use them in the schema
-    if fields:
-        try:
-            alert_schema = AlertSchema(only=fields)
-        except Exception as e:
-            app.app.logger.exception(f"Error selecting fields in AlertSchema: {str(e)}")
-            alert_schema = AlertSchema()
-    else:
-        alert_schema = AlertSchema()
+    alert_schema = AlertSchema(only=fields)
 
     filtered_data = {
         'total': filtered_alerts.total,
@@ -172,8 +211,12 @@ def alerts_list_route() -> Response:
         'last_page': filtered_alerts.pages,
         'current_page': filtered_alerts.page,
         'next_page': filtered_alerts.next_num if filtered_alerts.has_next else None,
+        'next_cursor': getattr(filtered_alerts, 'next_cursor', None)
     }
 
+    if cache_key:
+        cache.set(cache_key, filtered_data, timeout=app.app.config.get('ALERTS_FILTER_CACHE_TIMEOUT'))
+
     return response_success(data=filtered_data)
 
 
@@ -201,6 +244,32 @@ def alerts_add_route() -> Response:
         # Load the JSON data from the request
         data = request.get_json()
 
+        try:
+            alerts_check_ingestion_rate(data)
+        except RateLimitedError as e:
+            return response_too_many_requests(e.get_message(), e.get_retry_after())
+
+        # The alert is checked before the rules, so that a rejected alert is not counted in their hits
+        try:
+            alerts_check_creation([data])
+        except BusinessProcessingError as e:
+            return response_error(e.get_message(), data=e.get_data())
+
+        kept_alerts = alert_rules_apply([data])
+        if not kept_alerts:
+            return response_success('Alert suppressed by an alert rule')
+
+        data = kept_alerts[0]
+
+        try:
+            duplicated_alert, fingerprint = alerts_register_duplicate(data)
+        except BusinessProcessingError as e:
+            return response_error(e.get_message())
+
+        if duplicated_alert:
+            return response_success('Alert counted as an occurrence of an existing alert',
+                                    data=alert_schema.dump(duplicated_alert))
+
         iocs_list = data.pop('alert_iocs', [])
         assets_list = data.pop('alert_assets', [])
 
@@ -215,6 +284,8 @@ def alerts_add_route() -> Response:
             return response_error('User not entitled to create alerts for the client')
 
         new_alert.alert_creation_time = datetime.utcnow()
+        new_alert.alert_last_seen_at = new_alert.alert_creation_time
+        new_alert.alert_fingerprint = fingerprint
 
         new_alert.iocs = iocs
         new_alert.assets = assets
@@ -228,8 +299,10 @@ def alerts_add_route() -> Response:
 
         # Cache the alert for similarities check
         cache_similar_alert(new_alert.alert_customer_id, assets=assets_list,
-                            iocs=iocs_list, alert_id=new_alert.alert_id,
-                            creation_date=new_alert.alert_source_event_time)
+                            iocs=iocs_list, alert_id=new_alert.alert_id)
+
+        if app.app.config.get('ALERTS_CLUSTERING_ENABLED'):
+            cache_alert_minhash(new_alert)
 
         #register_related_alerts(new_alert, assets_list=assets, iocs_list=iocs)
         
@@ -237,10 +310,7 @@ def alerts_add_route() -> Response:
 
         track_activity(f"created alert #{new_alert.alert_id} - {new_alert.alert_title}", ctx_less=True)
 
-        # Emit a socket io event
-        app.socket_io.emit('new_alert', json.dumps({
-            'alert_id': new_alert.alert_id
-        }), namespace='/alerts')
+        notify_alerts_changed('new', [new_alert])
 
         # Return the newly created alert as JSON
         return response_success(data=alert_schema.dump(new_alert))
@@ -251,6 +321,98 @@ def alerts_add_route() -> Response:
         return response_error(str(e))
 
 
+@alerts_rest_blueprint.route('/alerts/batch/add', methods=['POST'])
+@ac_api_requires(Permissions.alerts_write)
+def alerts_batch_add_route() -> Response:
+    """
+    Add multiple alerts to the database in a single transaction
+
+    args:
+        caseid (str): The case id
+
+    returns:
+        Response: The response
+    """
+    if not request.json:
+        return response_error('No JSON data provided')
+
+    data = request.get_json()
+    alerts_data = data.get('alerts') if isinstance(data, dict) else data
+
+    try:
+        alerts_check_ingestion_rate(alerts_data)
+        alerts = alerts_create_batch(alerts_data)
+
+        return response_success(msg=f'{len(alerts)} alerts created',
+                                data=AlertSchema(only=['alert_id', 'alert_uuid']).dump(alerts, many=True))
+
+    except RateLimitedError as e:
+        return response_too_many_requests(e.get_message(), e.get_retry_after())
+
+    except BusinessProcessingError as e:
+        return response_error(e.get_message(), data=e.get_data())
+
+    except Exception as e:
+        app.app.logger.exception(e)
+        return response_error(str(e))
+
+
+@alerts_rest_blueprint.route('/alerts/ingest', methods=['POST'])
+@ac_api_requires(Permissions.alerts_write)
+def alerts_ingest_route() -> Response:
+    """
+    Queue one or multiple alerts for asynchronous ingestion
+
+    args:
+        caseid (str): The case id
+
+    returns:
+        Response: The response, with the ticket to track the ingestion
+    """
+    if not request.json:
+        return response_error('No JSON data provided')
+
+    data = request.get_json()
+    if isinstance(data, dict):
+        alerts_data = data.get('alerts') if 'alerts' in data else [data]
+    else:
+        alerts_data = data
+
+    try:
+        alerts_check_ingestion_rate(alerts_data)
+        ticket = alerts_enqueue(alerts_data)
+
+        return response_accepted(msg='Alerts queued for ingestion', data=AlertIngestionTicketSchema().dump(ticket))
+
+    except RateLimitedError as e:
+        return response_too_many_requests(e.get_message(), e.get_retry_after())
+
+    except BusinessProcessingError as e:
+        return response_error(e.get_message(), data=e.get_data())
+
+
+@alerts_rest_blueprint.route('/alerts/ingest/<uuid:ticket_uuid>', methods=['GET'])
+@ac_api_requires(Permissions.alerts_read)
+def alerts_ingest_status_route(ticket_uuid) -> Response:
+    """
+    Get the status of an asynchronous alerts ingestion
+
+    args:
+        caseid (str): The case id
+        ticket_uuid (uuid): The ingestion ticket uuid
+
+    returns:
+        Response: The response
+    """
+    try:
+        ticket = alerts_get_ingestion_ticket(ticket_uuid)
+
+        return response_success(data=AlertIngestionTicketSchema().dump(ticket))
+
+    except ObjectNotFoundError:
+        return response_error('Ingestion ticket not found', status=404)
+
+
 @alerts_rest_blueprint.route('/alerts/<int:alert_id>', methods=['GET'])
 @ac_api_requires(Permissions.alerts_read)
 def alerts_get_route(alert_id) -> Response:
@@ -314,17 +476,23 @@ def alerts_similarities_route(alert_id) -> Response:
     closed_alerts = request.args.get('closed-alerts', 'false').lower() == 'true'
     days_back = request.args.get('days-back', 180, type=int)
     number_of_results = request.args.get('number-of-nodes', 100, type=int)
+    include_near_duplicates = request.args.get('near-duplicates', 'false').lower() == 'true'
 
     if number_of_results < 0:
         number_of_results = 100
     if days_back < 0:
         days_back = 180
 
+    near_duplicates = None
+    if include_near_duplicates:
+        near_duplicates = alerts_get_near_duplicates(alert_id, limit=number_of_results)
+
     # Get similar alerts
     similar_alerts = get_related_alerts_details(alert.alert_customer_id, alert.assets, alert.iocs,
                                                 open_alerts=open_alerts, open_cases=open_cases,
                                                 closed_cases=closed_cases, closed_alerts=closed_alerts,
-                                                days_back=days_back, number_of_results=number_of_results)
+                                                days_back=days_back, number_of_results=number_of_results,
+                                                source_alert=alert, near_duplicates=near_duplicates)
 
     return response_success(data=similar_alerts)
 
@@ -393,6 +561,9 @@ def alerts_update_route(alert_id) -> Response:
         # Save the changes
         db.session.commit()
 
+        if set(data) & set(ALERTS_MINHASH_FIELDS):
+            refresh_alerts_minhash([updated_alert])
+
         updated_alert = call_modules_hook('on_postload_alert_update', data=updated_alert)
 
         if do_resolution_hook:
@@ -411,6 +582,8 @@ def alerts_update_route(alert_id) -> Response:
 
         db.session.commit()
 
+        notify_alerts_changed('updated', [updated_alert])
+
         # Return the updated alert as JSON
         return response_success(data=alert_schema.dump(updated_alert))
 
@@ -444,52 +617,22 @@ def alerts_batch_update_route() -> Response:
     if not updates.get('alert_tags'):
         updates.pop('alert_tags', None)
 
-    if not alert_ids:
-        return response_error('No alert IDs provided')
-
-    alert_schema = AlertSchema()
+    if data.get('alert_owner_id') == "-1" or data.get('alert_owner_id') == -1:
+        updates['alert_owner_id'] = None
 
-    # Process each alert ID
-    for alert_id in alert_ids:
-        alert = get_alert_by_id(alert_id)
-        if not alert:
-            return response_error(f'Alert with ID {alert_id} not found')
-
-        try:
-
-            activity_data = []
-            for key, value in updates.items():
-                old_value = getattr(alert, key, None)
-
-                if old_value != value:
-                    activity_data.append(f"\"{key}\"")
-
-            # Check if the user has access to the client
-            if not user_has_client_access(current_user.id, alert.alert_customer_id):
-                return response_error('User not entitled to update alerts for the client', status=403)
-
-            if getattr(alert, 'alert_owner_id') is None:
-                updates['alert_owner_id'] = current_user.id
-
-            if data.get('alert_owner_id') == "-1" or data.get('alert_owner_id') == -1:
-                updates['alert_owner_id'] = None
-
-            # Deserialize the JSON data into an Alert object
-            alert_schema.load(updates, instance=alert, partial=True)
-
-            db.session.commit()
-
-            alert = call_modules_hook('on_postload_alert_update', data=alert)
+    try:
+        # Large selections are updated in the background, the progress being reported over Socket.IO
+        if len(alert_ids) > app.app.config.get('ALERTS_BATCH_UPDATE_BACKGROUND_THRESHOLD'):
+            task_id = alerts_update_batch_in_background(alert_ids, updates)
+            return response_accepted(msg='Batch update started', data={'task_id': task_id})
 
-            if activity_data:
-                track_activity(f"updated alert #{alert_id}: {','.join(activity_data)}", ctx_less=True)
-                add_obj_history_entry(alert, f"updated alert: {','.join(activity_data)}")
+        alerts_update_batch(alert_ids, updates)
 
-            db.session.commit()
+    except PermissionDeniedError as e:
+        return response_error(e.get_message(), status=403)
 
-        except Exception as e:
-            # Handle any errors during deserialization or DB operations
-            return response_error(str(e))
+    except BusinessProcessingError as e:
+        return response_error(e.get_message(), data=e.get_data())
 
     # Return a success response
     return response_success(msg='Batch update successful')
@@ -520,6 +663,7 @@ def alerts_batch_delete_route() -> Response:
         return response_error('No alert IDs provided')
 
     # Check if the user has access to the client
+    alerts = []
     for alert_id in alert_ids:
         alert = get_alert_by_id(alert_id)
         if not alert:
@@ -528,11 +672,19 @@ def alerts_batch_delete_route() -> Response:
         if not user_has_client_access(current_user.id, alert.alert_customer_id):
             return response_error('User not entitled to delete alerts for the client', status=403)
 
+        alerts.append(alert)
+
+    # The alerts can no longer be loaded once deleted, so their identifiers are kept for the notification
+    deleted_alerts_ids = [(alert.alert_id, alert.alert_customer_id) for alert in alerts]
+
     success, logs = delete_alerts(alert_ids)
 
     if not success:
         return response_error(logs)
 
+    notify_alerts_ids_changed('deleted', deleted_alerts_ids)
+    db.session.commit()
+
     alert = call_modules_hook('on_postload_alert_delete', data={"alert_ids": alert_ids})
 
     track_activity(f"deleted alerts #{','.join(str(alert_id) for alert_id in alert_ids)}", ctx_less=True)
@@ -570,10 +722,15 @@ def alerts_delete_route(alert_id) -> Response:
         # Delete the similarity entries
         delete_related_alerts_cache([alert_id])
 
+        # The alert can no longer be loaded once deleted, so its identifiers are kept for the notification
+        deleted_alert_ids = (alert.alert_id, alert.alert_customer_id)
+
         # Delete the alert from the database
         db.session.delete(alert)
         db.session.commit()
 
+        notify_alerts_ids_changed('deleted', [deleted_alert_ids])
+
         alert = call_modules_hook('on_postload_alert_delete', data=alert_id)
 
         track_activity(f"delete alert #{alert_id}", ctx_less=True)
@@ -643,6 +800,7 @@ def alerts_escalate_route(alert_id) -> Response:
                        ctx_less=True)
 
         add_obj_history_entry(alert, f"Alert escalated to case #{case.case_id}")
+        notify_alerts_changed('updated', [alert])
 
         alert = call_modules_hook('on_postload_alert_escalate', data=alert)
 
@@ -715,6 +873,7 @@ def alerts_merge_route(alert_id) -> Response:
 
         track_activity(f"merge alert #{alert_id} into existing case #{target_case_id}", caseid=target_case_id)
         add_obj_history_entry(alert, f"Alert merged into existing case #{target_case_id}")
+        notify_alerts_changed('updated', [alert])
 
         # Return the updated alert as JSON
         return response_success(data=CaseSchema().dump(case))
@@ -770,6 +929,7 @@ def alerts_unmerge_route(alert_id) -> Response:
 
         track_activity(f"unmerge alert #{alert_id} from case #{target_case_id}", caseid=target_case_id)
         add_obj_history_entry(alert, f"Alert unmerged from case #{target_case_id}")
+        notify_alerts_changed('updated', [alert])
 
         alert = call_modules_hook('on_postload_alert_unmerge', data=alert)
 
@@ -821,7 +981,7 @@ def alerts_batch_merge_route() -> Response:
         return response_error('User not entitled to merge alerts for the case', status=403)
 
     try:
-        # Merge the alerts into a case
+        alerts_list = []
         for alert_id in parse_comma_separated_identifiers(alert_ids):
 
             alert = get_alert_by_id(alert_id)
@@ -835,10 +995,15 @@ def alerts_batch_merge_route() -> Response:
             alert.alert_status_id = AlertStatus.query.filter_by(status_name='Merged').first().status_id
             db.session.commit()
 
-            # Merge alert in the case
-            merge_alert_in_case(alert, case, iocs_list=iocs_import_list, assets_list=assets_import_list, note=None,
-                                import_as_event=import_as_event, case_tags=case_tags)
+            alerts_list.append(alert)
+
+        # Merge the alerts in the case, their IOCs and assets being imported at once
+        merge_alerts_in_case(alerts_list, case, iocs_list=iocs_import_list, assets_list=assets_import_list, note=None,
+                             import_as_event=import_as_event, case_tags=case_tags)
 
+        notify_alerts_changed('updated', alerts_list)
+
+        for alert in alerts_list:
             add_obj_history_entry(alert, f"Alert merged into existing case #{target_case_id}")
 
             alert = call_modules_hook('on_postload_alert_merge', data=alert)
@@ -926,6 +1091,8 @@ def alerts_batch_escalate_route() -> Response:
         for alert in alerts_list:
             add_obj_history_entry(alert, f"Alert escalated into new case #{case.case_id}")
 
+        notify_alerts_changed('updated', alerts_list)
+
         # Return the updated case as JSON
         return response_success(data=CaseSchema().dump(case))
 
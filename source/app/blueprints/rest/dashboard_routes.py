@@ -66,6 +66,7 @@ from app.blueprints.access_controls import not_authenticated_redirection_url
 from sqlalchemy import func
 from sqlalchemy import and_
 from sqlalchemy import distinct
+from sqlalchemy.orm import undefer
 
 from oic.oauth2.exception import GrantError
 
@@ -459,7 +460,7 @@ def get_dashboard_kpis():
         if close_time and close_time >= start_time:
             mttr_deltas.append(close_time - start_time)
 
-    cases_for_phase_query = Cases.query
+    cases_for_phase_query = Cases.query.options(undefer(Cases.modification_history))
     if case_filters:
         cases_for_phase_query = cases_for_phase_query.filter(*case_filters)
     cases_for_phase_query = cases_for_phase_query.filter(and_(Cases.initial_date >= start_dt, Cases.initial_date <= end_dt))
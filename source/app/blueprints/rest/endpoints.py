@@ -59,6 +59,10 @@ def response_api_created(data):
     return response(201, data=data)
 
 
+def response_api_accepted(data):
+    return response(202, data=data)
+
+
 def response_api_error(message, data=None):
     content = {
         'message': message
@@ -68,6 +72,12 @@ def response_api_error(message, data=None):
     return response(400, data=content)
 
 
+def response_api_too_many_requests(message, retry_after):
+    resp = response(429, data={'message': message})
+    resp.headers['Retry-After'] = str(retry_after)
+    return resp
+
+
 def response_api_not_found():
     return response(404)
 
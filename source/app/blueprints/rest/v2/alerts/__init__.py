@@ -16,35 +16,63 @@
 #  along with this program; if not, write to the Free Software Foundation,
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
+from datetime import datetime
 from flask import Blueprint, request, Response
+from flask import stream_with_context
 from flask_login import current_user
 
+from app import app
+from app import cache
 from app.blueprints.access_controls import ac_api_requires
 from app.blueprints.rest.endpoints import response_api_success, response_api_error
+from app.blueprints.rest.endpoints import response_api_created
+from app.blueprints.rest.endpoints import response_api_accepted
+from app.blueprints.rest.endpoints import response_api_not_found
+from app.blueprints.rest.endpoints import response_api_deleted
+from app.blueprints.rest.endpoints import response_api_too_many_requests
 from app.blueprints.rest.parsing import parse_comma_separated_identifiers
+from app.business.alert_rules import alert_rules_create
+from app.business.alert_rules import alert_rules_delete
+from app.business.alert_rules import alert_rules_get
+from app.business.alert_rules import alert_rules_get_aggregates
+from app.business.alert_rules import alert_rules_list
+from app.business.alert_rules import alert_rules_update
+from app.business.alerts import alerts_check_ingestion_rate
+from app.business.alerts import alerts_create_batch
+from app.business.alerts import alerts_enqueue
+from app.business.alerts import alerts_export
+from app.business.alerts import alerts_get_filter_cache_key
+from app.business.alerts import alerts_get_ingestion_statistics
+from app.business.alerts import alerts_get_ingestion_ticket
+from app.business.alerts import alerts_get_list_fields
+from app.business.alerts import alerts_get_near_duplicates
+from app.business.errors import BusinessProcessingError
+from app.business.errors import ObjectNotFoundError
+from app.business.errors import RateLimitedError
 from app.datamgmt.alerts.alerts_db import get_filtered_alerts
+from app.datamgmt.alerts.alerts_db import get_archived_alerts
 from app.models.authorization import Permissions
 from app.schema.marshables import AlertSchema
+from app.schema.marshables import AlertIngestionTicketSchema
+from app.schema.marshables import AlertArchiveSchema
+from app.schema.marshables import AlertRuleSchema
+from app.schema.marshables import AlertRuleAggregateSchema
 
 
 alerts_blueprint = Blueprint('alerts', __name__, url_prefix='/alerts')
 
+# Fields of the near duplicate alerts, enough to triage them as a group
+_NEAR_DUPLICATES_FIELDS = ('alert_id', 'alert_uuid', 'alert_title', 'alert_source', 'alert_severity_id',
+                           'alert_status_id', 'alert_owner_id', 'alert_creation_time', 'alert_occurrences')
 
-@alerts_blueprint.get('')
-@ac_api_requires(Permissions.alerts_read)
-def alerts_list_route() -> Response:
-    """
-    Get a list of alerts from the database
 
-    Args:
-        caseid (str): The case id
-
-    returns:
-        Response: The response
+def _get_alerts_filters() -> dict:
     """
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
+    Get the filter conditions of the alerts from the request arguments
 
+    raises:
+        ValueError: if an argument is invalid
+    """
     alert_ids_str = request.args.get('alert_ids')
     alert_ids = None
     if alert_ids_str:
@@ -53,7 +81,7 @@ def alerts_list_route() -> Response:
             alert_ids = parse_comma_separated_identifiers(alert_ids_str)
 
         except ValueError:
-            return response_api_error('Invalid alert id')
+            raise ValueError('Invalid alert id')
 
     alert_assets_str = request.args.get('alert_assets')
     alert_assets = None
@@ -63,7 +91,7 @@ def alerts_list_route() -> Response:
                             for alert_asset in alert_assets_str.split(',')]
 
         except ValueError:
-            return response_api_error('Invalid alert asset')
+            raise ValueError('Invalid alert asset')
 
     alert_iocs_str = request.args.get('alert_iocs')
     alert_iocs = None
@@ -73,7 +101,48 @@ def alerts_list_route() -> Response:
                           for alert_ioc in alert_iocs_str.split(',')]
 
         except ValueError:
-            return response_api_error('Invalid alert ioc')
+            raise ValueError('Invalid alert ioc')
+
+    return {
+        'start_date': request.args.get('creation_start_date'),
+        'end_date': request.args.get('creation_end_date'),
+        'source_start_date': request.args.get('source_start_date'),
+        'source_end_date': request.args.get('source_end_date'),
+        'source_reference': request.args.get('source_reference'),
+        'title': request.args.get('alert_title'),
+        'description': request.args.get('alert_description'),
+        'status': request.args.get('alert_status_id', type=int),
+        'severity': request.args.get('alert_severity_id', type=int),
+        'owner': request.args.get('alert_owner_id', type=int),
+        'source': request.args.get('alert_source'),
+        'tags': request.args.get('alert_tags'),
+        'classification': request.args.get('alert_classification_id', type=int),
+        'client': request.args.get('alert_customer_id'),
+        'case_id': request.args.get('case_id', type=int),
+        'alert_ids': alert_ids,
+        'custom_conditions': request.args.get('custom_conditions'),
+        'assets': alert_assets,
+        'iocs': alert_iocs,
+        'resolution_status': request.args.get('alert_resolution_id', type=int),
+        'current_user_id': current_user.id,
+        'search': request.args.get('search')
+    }
+
+
+@alerts_blueprint.get('')
+@ac_api_requires(Permissions.alerts_read)
+def alerts_list_route() -> Response:
+    """
+    Get a list of alerts from the database
+
+    Args:
+        caseid (str): The case id
+
+    returns:
+        Response: The response
+    """
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
 
     fields_str = request.args.get('fields')
     if fields_str:
@@ -82,44 +151,42 @@ def alerts_list_route() -> Response:
     else:
         fields = None
 
-    filtered_alerts = get_filtered_alerts(
-        start_date=request.args.get('creation_start_date'),
-        end_date=request.args.get('creation_end_date'),
-        source_start_date=request.args.get('source_start_date'),
-        source_end_date=request.args.get('source_end_date'),
-        source_reference=request.args.get('source_reference'),
-        title=request.args.get('alert_title'),
-        description=request.args.get('alert_description'),
-        status=request.args.get('alert_status_id', type=int),
-        severity=request.args.get('alert_severity_id', type=int),
-        owner=request.args.get('alert_owner_id', type=int),
-        source=request.args.get('alert_source'),
-        tags=request.args.get('alert_tags'),
-        classification=request.args.get('alert_classification_id', type=int),
-        client=request.args.get('alert_customer_id'),
-        case_id=request.args.get('case_id', type=int),
-        alert_ids=alert_ids,
-        page=page,
-        per_page=per_page,
-        sort=request.args.get('sort'),
-        custom_conditions=request.args.get('custom_conditions'),
-        assets=alert_assets,
-        iocs=alert_iocs,
-        resolution_status=request.args.get('alert_resolution_id', type=int),
-        current_user_id=current_user.id
-    )
+    include_str = request.args.get('include')
+    if include_str:
+        include = [field.strip() for field in include_str.split(',') if field.strip()]
+    else:
+        include = None
+
+    try:
+        fields = alerts_get_list_fields(fields, include)
+
+    except BusinessProcessingError as e:
+        return response_api_error(e.get_message())
+
+    cache_key = alerts_get_filter_cache_key('alerts_list', request.args.to_dict(flat=False), fields, current_user.id)
+    if cache_key:
+        filtered_data = cache.get(cache_key)
+        if filtered_data is not None:
+            return response_api_success(data=filtered_data)
+
+    try:
+        filtered_alerts = get_filtered_alerts(
+            **_get_alerts_filters(),
+            page=page,
+            per_page=per_page,
+            sort=request.args.get('sort'),
+            cursor=request.args.get('cursor'),
+            count=request.args.get('count'),
+            fields=fields
+        )
+
+    except ValueError as e:
+        return response_api_error(str(e))
 
     if filtered_alerts is None:
         return response_api_error('Filtering error')
 
-    # If fields are provided, use them in the schema
-    if fields:
-        try:
-            alert_schema = AlertSchema(only=fields)
-        except Exception as e:
-            alert_schema = AlertSchema()
-    else:
-        alert_schema = AlertSchema()
+    alert_schema = AlertSchema(only=fields)
 
     filtered_data = {
         'total': filtered_alerts.total,
@@ -127,5 +194,243 @@ def alerts_list_route() -> Response:
         'last_page': filtered_alerts.pages,
         'current_page': filtered_alerts.page,
         'next_page': filtered_alerts.next_num if filtered_alerts.has_next else None,
+        'next_cursor': getattr(filtered_alerts, 'next_cursor', None)
     }
+
+    if cache_key:
+        cache.set(cache_key, filtered_data, timeout=app.config.get('ALERTS_FILTER_CACHE_TIMEOUT'))
+
     return response_api_success(data=filtered_data)
+
+
+@alerts_blueprint.get('/export')
+@ac_api_requires(Permissions.alerts_read)
+def alerts_export_route() -> Response:
+    """
+    Stream the alerts matching the filter of the alerts list, as NDJSON (default) or CSV
+
+    returns:
+        Response: The streamed export
+    """
+    export_format = request.args.get('format', 'ndjson')
+    try:
+        chunks = alerts_export(export_format, _get_alerts_filters(), sort=request.args.get('sort', 'desc'),
+                               include_source_content=request.args.get('include') == 'alert_source_content')
+
+    except ValueError as e:
+        return response_api_error(str(e))
+
+    except BusinessProcessingError as e:
+        return response_api_error(e.get_message())
+
+    mimetype = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=alerts.{export_format}'
+
+    return response
+
+
+@alerts_blueprint.post('/batch')
+@ac_api_requires(Permissions.alerts_write)
+def alerts_batch_create_route() -> Response:
+    """
+    Create multiple alerts in a single transaction
+
+    returns:
+        Response: The response
+    """
+    request_data = request.get_json(silent=True)
+    alerts_data = request_data.get('alerts') if isinstance(request_data, dict) else request_data
+
+    try:
+        alerts_check_ingestion_rate(alerts_data)
+        alerts = alerts_create_batch(alerts_data)
+        return response_api_created(AlertSchema(only=['alert_id', 'alert_uuid']).dump(alerts, many=True))
+
+    except RateLimitedError as e:
+        return response_api_too_many_requests(e.get_message(), e.get_retry_after())
+
+    except BusinessProcessingError as e:
+        return response_api_error(e.get_message(), data=e.get_data())
+
+
+@alerts_blueprint.post('/ingestions')
+@ac_api_requires(Permissions.alerts_write)
+def alerts_ingestions_create_route() -> Response:
+    """
+    Queue alerts for asynchronous ingestion
+
+    returns:
+        Response: The response, with the ticket to track the ingestion
+    """
+    request_data = request.get_json(silent=True)
+    alerts_data = request_data.get('alerts') if isinstance(request_data, dict) else request_data
+
+    try:
+        alerts_check_ingestion_rate(alerts_data)
+        ticket = alerts_enqueue(alerts_data)
+        return response_api_accepted(AlertIngestionTicketSchema().dump(ticket))
+
+    except RateLimitedError as e:
+        return response_api_too_many_requests(e.get_message(), e.get_retry_after())
+
+    except BusinessProcessingError as e:
+        return response_api_error(e.get_message(), data=e.get_data())
+
+
+@alerts_blueprint.get('/ingestions/statistics')
+@ac_api_requires(Permissions.server_administrator)
+def alerts_ingestions_statistics_route() -> Response:
+    """
+    Get the number of alerts accepted, throttled and rejected by the rate limits and the backpressure of the
+    current process, and the number of alerts waiting in the asynchronous ingestion queue
+
+    returns:
+        Response: The response
+    """
+    return response_api_success(alerts_get_ingestion_statistics())
+
+
+@alerts_blueprint.get('/ingestions/<uuid:ticket_uuid>')
+@ac_api_requires(Permissions.alerts_read)
+def alerts_ingestions_get_route(ticket_uuid) -> Response:
+    """
+    Get the status of an asynchronous alerts ingestion
+
+    returns:
+        Response: The response
+    """
+    try:
+        ticket = alerts_get_ingestion_ticket(ticket_uuid)
+        return response_api_success(AlertIngestionTicketSchema().dump(ticket))
+
+    except ObjectNotFoundError:
+        return response_api_not_found()
+
+
+@alerts_blueprint.get('/<int:identifier>/near-duplicates')
+@ac_api_requires(Permissions.alerts_read)
+def alerts_near_duplicates_route(identifier) -> Response:
+    """
+    Get the alerts whose text or IOCs are near duplicates of the ones of an alert, with their estimated similarity
+
+    returns:
+        Response: The response
+    """
+    threshold = request.args.get('threshold', type=float)
+    if threshold is not None and not 0 <= threshold <= 1:
+        return response_api_error('The threshold must be between 0 and 1')
+
+    try:
+        near_duplicates = alerts_get_near_duplicates(identifier, threshold=threshold,
+                                                     limit=min(request.args.get('limit', 50, type=int), 500))
+
+    except ObjectNotFoundError:
+        return response_api_not_found()
+
+    alert_schema = AlertSchema(only=_NEAR_DUPLICATES_FIELDS)
+    return response_api_success([{**alert_schema.dump(alert), 'similarity': similarity}
+                                 for alert, similarity in near_duplicates])
+
+
+@alerts_blueprint.get('/archive')
+@ac_api_requires(Permissions.alerts_read)
+def alerts_archive_list_route() -> Response:
+    """
+    Search the archived alerts. Providing a creation date range restricts the search to the matching partitions.
+
+    returns:
+        Response: The response
+    """
+    archived_alerts = get_archived_alerts(
+        page=request.args.get('page', 1, type=int),
+        per_page=request.args.get('per_page', 10, type=int),
+        client=request.args.get('alert_customer_id', type=int),
+        title=request.args.get('alert_title'),
+        source_reference=request.args.get('source_reference'),
+        start_date=request.args.get('creation_start_date'),
+        end_date=request.args.get('creation_end_date'),
+        current_user_id=current_user.id
+    )
+
+    archived_data = {
+        'total': archived_alerts.total,
+        'data': AlertArchiveSchema().dump(archived_alerts, many=True),
+        'last_page': archived_alerts.pages,
+        'current_page': archived_alerts.page,
+        'next_page': archived_alerts.next_num if archived_alerts.has_next else None,
+    }
+    return response_api_success(data=archived_data)
+
+
+@alerts_blueprint.get('/rules')
+@ac_api_requires(Permissions.server_administrator)
+def alert_rules_list_route() -> Response:
+    return response_api_success(AlertRuleSchema().dump(alert_rules_list(), many=True))
+
+
+@alerts_blueprint.post('/rules')
+@ac_api_requires(Permissions.server_administrator)
+def alert_rules_create_route() -> Response:
+    try:
+        rule = alert_rules_create(request.get_json())
+        return response_api_created(AlertRuleSchema().dump(rule))
+
+    except BusinessProcessingError as e:
+        return response_api_error(e.get_message(), data=e.get_data())
+
+
+@alerts_blueprint.get('/rules/<int:identifier>')
+@ac_api_requires(Permissions.server_administrator)
+def alert_rules_get_route(identifier) -> Response:
+    try:
+        rule = alert_rules_get(identifier)
+        return response_api_success(AlertRuleSchema().dump(rule))
+
+    except ObjectNotFoundError:
+        return response_api_not_found()
+
+
+@alerts_blueprint.put('/rules/<int:identifier>')
+@ac_api_requires(Permissions.server_administrator)
+def alert_rules_update_route(identifier) -> Response:
+    try:
+        rule = alert_rules_get(identifier)
+        rule = alert_rules_update(rule, request.get_json())
+        return response_api_success(AlertRuleSchema().dump(rule))
+
+    except ObjectNotFoundError:
+        return response_api_not_found()
+
+    except BusinessProcessingError as e:
+        return response_api_error(e.get_message(), data=e.get_data())
+
+
+@alerts_blueprint.delete('/rules/<int:identifier>')
+@ac_api_requires(Permissions.server_administrator)
+def alert_rules_delete_route(identifier) -> Response:
+    try:
+        rule = alert_rules_get(identifier)
+        alert_rules_delete(rule)
+        return response_api_deleted()
+
+    except ObjectNotFoundError:
+        return response_api_not_found()
+
+
+@alerts_blueprint.get('/rules/<int:identifier>/aggregates')
+@ac_api_requires(Permissions.server_administrator)
+def alert_rules_aggregates_route(identifier) -> Response:
+    """
+    Get the alerts discarded by an aggregate rule, counted per customer, alert title and hour
+
+    returns:
+        Response: The response
+    """
+    try:
+        rule = alert_rules_get(identifier)
+        aggregates = alert_rules_get_aggregates(rule, since=request.args.get('since', type=datetime.fromisoformat))
+        return response_api_success(AlertRuleAggregateSchema().dump(aggregates, many=True))
+
+    except ObjectNotFoundError:
+        return response_api_not_found()
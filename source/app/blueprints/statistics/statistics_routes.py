@@ -4,6 +4,7 @@ from flask import redirect
 from flask import render_template
 from flask import request
 from flask import url_for
+from flask_login import current_user
 from flask_wtf import FlaskForm
 from app.util import ac_api_requires
 from app.util import ac_requires
@@ -13,6 +14,11 @@ from datetime import datetime, timedelta
 from app.models.authorization import Permissions
 from app.datamgmt.statistics.statistics_db import _build_kpi_payload, _parse_datetime_param
 from app.datamgmt.statistics.statistics_db import _build_classification_payload, _build_evidence_payload
+from app.datamgmt.statistics.statistics_db import _get_access_scope, get_statistics_generations
+from app.iris_engine.dashboards.live_updates import LIVE_UPDATES_NAMESPACE, get_live_timeframe_args
+from app.iris_engine.dashboards.live_updates import get_live_user, get_payloads_delta, live_subscribe
+from app import ac_current_user_has_permission
+from app import socket_io
 
 stats_blueprint = Blueprint(
     'stats',
@@ -104,3 +110,53 @@ def get_statistics_evidence():
     payload = _build_evidence_payload(start_dt, end_dt, client_id, severity_filter, case_status_filter)
     return response_success('', data=payload)
 
+
+def _get_int_param(data, name):
+    try:
+        return int(data.get(name)) if data.get(name) not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+@socket_io.on('subscribe_statistics', namespace=LIVE_UPDATES_NAMESPACE)
+def socket_subscribe_statistics(data):
+    if not ac_current_user_has_permission(Permissions.statistics_read):
+        return {'status': 'failure', 'message': 'Access denied'}
+
+    data = data if isinstance(data, dict) else {}
+    try:
+        _resolve_timeframe(get_live_timeframe_args(data))
+    except ValueError as exc:
+        return {'status': 'failure', 'message': str(exc)}
+
+    client_id = _get_int_param(data, 'client_id')
+    severity_filter = _get_int_param(data, 'severity_id')
+    case_status_filter = _get_int_param(data, 'case_status_id')
+
+    user_id = current_user.id
+    digests = {}
+    state = {}
+
+    # The statistics are refreshed outside of the request, so the permissions and the access scope are resolved
+    # from the database on each refresh, the subscription being closed once the user loses access
+    def refresh():
+        access_scope = _get_access_scope(get_live_user(user_id, Permissions.statistics_read))
+        start_dt, end_dt = _resolve_timeframe(get_live_timeframe_args(data))
+        version = [get_statistics_generations(access_scope, client_id), start_dt, end_dt, access_scope]
+        if state.get('version') == version:
+            return None
+
+        state['version'] = version
+        filters = (start_dt, end_dt, client_id, severity_filter, case_status_filter, access_scope)
+        changed, _ = get_payloads_delta(digests, {
+            'kpis': _build_kpi_payload(*filters),
+            'classifications': _build_classification_payload(*filters),
+            'evidence': _build_evidence_payload(*filters)
+        })
+        if not changed:
+            return None
+
+        return {'payloads': changed}
+
+    live_subscribe('statistics', refresh)
+    return {'status': 'success', 'subscription': 'statistics'}
@@ -0,0 +1,107 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from datetime import datetime
+from marshmallow.exceptions import ValidationError
+from typing import List
+
+from app.business.errors import BusinessProcessingError
+from app.business.errors import ObjectNotFoundError
+from app.datamgmt.alerts.alert_rules_db import delete_alert_rule
+from app.datamgmt.alerts.alert_rules_db import get_alert_rule
+from app.datamgmt.alerts.alert_rules_db import get_alert_rule_aggregates
+from app.datamgmt.alerts.alert_rules_db import get_alert_rules
+from app.datamgmt.alerts.alert_rules_db import record_alert_rules_hits
+from app.datamgmt.alerts.alert_rules_db import save_alert_rule
+from app.iris_engine.alerts.rules import get_alert_rules_engine
+from app.iris_engine.utils.tracker import track_activity
+from app.models.alerts import AlertRule
+from app.models.alerts import AlertRuleAggregate
+from app.schema.marshables import AlertRuleSchema
+
+
+def _check_alert_rule(rule: AlertRule):
+    if rule.rule_action == 'assign' and rule.rule_owner_id is None:
+        raise BusinessProcessingError('An assign rule requires an owner')
+
+
+def alert_rules_get(rule_id: int) -> AlertRule:
+    rule = get_alert_rule(rule_id)
+    if not rule:
+        raise ObjectNotFoundError()
+
+    return rule
+
+
+def alert_rules_list() -> List[AlertRule]:
+    return get_alert_rules()
+
+
+def alert_rules_create(request_data: dict) -> AlertRule:
+    try:
+        rule = AlertRuleSchema().load(request_data)
+    except ValidationError as e:
+        raise BusinessProcessingError('Data error', e.normalized_messages())
+
+    _check_alert_rule(rule)
+    save_alert_rule(rule)
+    track_activity(f'created alert rule #{rule.rule_id} - {rule.rule_name}', ctx_less=True)
+
+    return rule
+
+
+def alert_rules_update(rule: AlertRule, request_data: dict) -> AlertRule:
+    try:
+        rule = AlertRuleSchema().load(request_data, instance=rule, partial=True)
+    except ValidationError as e:
+        raise BusinessProcessingError('Data error', e.normalized_messages())
+
+    _check_alert_rule(rule)
+    save_alert_rule(rule)
+    track_activity(f'updated alert rule #{rule.rule_id} - {rule.rule_name}', ctx_less=True)
+
+    return rule
+
+
+def alert_rules_delete(rule: AlertRule) -> None:
+    rule_id = rule.rule_id
+    rule_name = rule.rule_name
+    delete_alert_rule(rule)
+    track_activity(f'deleted alert rule #{rule_id} - {rule_name}', ctx_less=True)
+
+
+def alert_rules_get_aggregates(rule: AlertRule, since: datetime = None) -> List[AlertRuleAggregate]:
+    return get_alert_rule_aggregates(rule.rule_id, since=since)
+
+
+def alert_rules_apply(alerts_data: list) -> list:
+    """
+    Apply the alert rules to alerts about to be ingested, before anything is written for them. Dropped and aggregated
+    alerts are removed, assigned alerts get the owner of the rule, and the hits of the rules are recorded.
+
+    args:
+        alerts_data (list): The alerts, in the format expected by /alerts/add
+
+    returns:
+        list: The alerts to create
+    """
+    alerts_data, hits, aggregates = get_alert_rules_engine().apply(alerts_data)
+    if hits:
+        record_alert_rules_hits(hits, aggregates)
+
+    return alerts_data
@@ -0,0 +1,923 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import codecs
+import csv
+import hashlib
+import io
+import json
+import math
+import uuid
+from collections import Counter
+from datetime import datetime
+from datetime import timedelta
+from celery.schedules import crontab
+from flask import session
+from flask_login import current_user
+from flask_login import login_user
+from iris_interface import IrisInterfaceStatus as IStatus
+from marshmallow.exceptions import ValidationError
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from app import app
+from app import cache
+from app import celery
+from app import db
+from app import socket_io
+from app.business.alert_rules import alert_rules_apply
+from app.business.errors import BusinessProcessingError
+from app.business.errors import ObjectNotFoundError
+from app.business.errors import PermissionDeniedError
+from app.business.errors import RateLimitedError
+from app.datamgmt.alerts.alert_clustering_db import ALERTS_MINHASH_FIELDS
+from app.datamgmt.alerts.alert_clustering_db import backfill_alerts_minhash
+from app.datamgmt.alerts.alert_clustering_db import get_alert_near_duplicates
+from app.datamgmt.alerts.alert_clustering_db import refresh_alerts_minhash
+from app.datamgmt.alerts.alerts_db import create_alerts_batch
+from app.datamgmt.alerts.alerts_db import create_alert_ingestion_ticket
+from app.datamgmt.alerts.alerts_db import get_alert_ingestion_ticket
+from app.datamgmt.alerts.alerts_db import claim_alert_ingestion_ticket
+from app.datamgmt.alerts.alerts_db import complete_alert_ingestion_ticket
+from app.datamgmt.alerts.alerts_db import fail_alert_ingestion_ticket
+from app.datamgmt.alerts.alerts_db import fail_stale_alert_ingestion_tickets
+from app.datamgmt.alerts.alerts_db import get_stale_alert_ingestion_tickets_ids
+from app.datamgmt.alerts.alerts_db import get_pending_alert_ingestions_count
+from app.datamgmt.alerts.alerts_db import prune_similar_alerts_cache
+from app.datamgmt.alerts.alerts_db import prune_similar_alerts_cache_deletions
+from app.datamgmt.alerts.alerts_db import archive_alerts
+from app.datamgmt.alerts.alerts_db import get_alert_status_by_name
+from app.datamgmt.alerts.alerts_db import get_alert_by_id
+from app.datamgmt.alerts.alerts_db import get_alerts_by_ids
+from app.datamgmt.alerts.alerts_db import get_alert_fingerprint
+from app.datamgmt.alerts.alerts_db import get_alerts_ids_by_fingerprints
+from app.datamgmt.alerts.alerts_db import register_alerts_duplicates
+from app.datamgmt.alerts.alerts_db import get_alerts_generations
+from app.datamgmt.alerts.alerts_db import get_filtered_alerts_export_rows
+from app.datamgmt.alerts.alerts_db import ALERTS_EXPORT_COLUMNS
+from app.datamgmt.alerts.alerts_db import ALERTS_EXPORT_RELATED_NAMES
+from app.datamgmt.alerts.alerts_db import get_alerts_fields_values
+from app.datamgmt.alerts.alerts_db import update_alerts_batch
+from app.datamgmt.manage.manage_access_control_db import get_user_clients_id
+from app.datamgmt.manage.manage_access_control_db import user_has_client_access
+from app.iris_engine.access_control.utils import ac_current_user_has_permission
+from app.iris_engine.access_control.utils import ac_get_effective_permissions_of_user
+from app.iris_engine.alerts.notifications import get_alerts_user_room
+from app.iris_engine.alerts.notifications import notify_alerts_changed
+from app.iris_engine.alerts.rate_limiter import get_ingestion_rate_limiter
+from app.iris_engine.module_handler.module_handler import call_modules_hook
+from app.iris_engine.utils.blob_store import get_blob_store
+from app.iris_engine.utils.tracker import track_activity
+from app.models.alerts import Alert
+from app.models.alerts import AlertIngestionTicket
+from app.models.authorization import Permissions
+from app.models.authorization import User
+from app.schema.marshables import AlertSchema
+from app.schema.marshables import CaseAssetsSchema
+from app.schema.marshables import IocSchema
+
+
+# Statuses of the alerts which can be archived
+ALERTS_ARCHIVABLE_STATUSES = ('Closed', 'Merged', 'Escalated')
+
+# Columns which can be changed by a batch update
+ALERTS_BATCH_UPDATABLE_FIELDS = ('alert_title', 'alert_description', 'alert_source', 'alert_source_ref',
+                                 'alert_source_link', 'alert_severity_id', 'alert_status_id', 'alert_note',
+                                 'alert_tags', 'alert_owner_id', 'alert_customer_id', 'alert_classification_id',
+                                 'alert_resolution_status_id', 'alert_context')
+
+# Number of alerts updated per transaction by the background batch updates
+_ALERTS_BATCH_UPDATE_CHUNK_SIZE = 500
+
+# Number of alerts whose MinHash signatures are computed per transaction by the backfill
+_ALERTS_MINHASH_BACKFILL_BATCH_SIZE = 500
+
+# Fields of the alerts list which are only serialized when explicitly requested, as they can be arbitrarily large
+ALERTS_LIST_OPTIONAL_FIELDS = ('iocs', 'assets', 'cases', 'comments', 'alert_source_content', 'modification_history')
+
+# Formats in which the alerts can be exported
+ALERTS_EXPORT_FORMATS = ('ndjson', 'csv')
+
+# Seconds a client is asked to wait when the ingestion queue is full
+_BACKPRESSURE_RETRY_AFTER = 30
+_PENDING_INGESTIONS_CACHE_KEY = 'alerts_pending_ingestions_count'
+_PENDING_INGESTIONS_CACHE_TIMEOUT = 5
+
+# A ticket still processing after this delay is considered as lost by a crashed worker, and is retried a few times
+_ALERTS_INGESTION_PROCESSING_TIMEOUT_MINUTES = 30
+_ALERTS_INGESTION_MAX_ATTEMPTS = 3
+
+
+def _load(alert_data: dict):
+    if not isinstance(alert_data, dict):
+        raise ValidationError('Expected an alert object')
+
+    alert_data = dict(alert_data)
+    iocs_list = alert_data.pop('alert_iocs', None) or []
+    assets_list = alert_data.pop('alert_assets', None) or []
+
+    iocs = IocSchema().load(iocs_list, many=True, partial=True)
+    assets = CaseAssetsSchema().load(assets_list, many=True, partial=True)
+    alert = AlertSchema().load(alert_data)
+
+    alert.iocs = iocs
+    alert.assets = assets
+
+    return alert, iocs_list, assets_list
+
+
+def _validate(alert_data: dict) -> dict:
+    if not isinstance(alert_data, dict):
+        return {'_schema': ['Expected an alert object']}
+
+    alert_data = dict(alert_data)
+    errors = {}
+
+    iocs_errors = IocSchema().validate(alert_data.pop('alert_iocs', None) or [], many=True, partial=True)
+    if iocs_errors:
+        errors['alert_iocs'] = iocs_errors
+
+    assets_errors = CaseAssetsSchema().validate(alert_data.pop('alert_assets', None) or [], many=True, partial=True)
+    if assets_errors:
+        errors['alert_assets'] = assets_errors
+
+    errors.update(AlertSchema().validate(alert_data))
+
+    return errors
+
+
+def alerts_check_creation(alerts_data: List[dict]) -> None:
+    """
+    Check that alerts are valid and that the current user is entitled to create them for their customers.
+    It is run before the alert rules, so that the hits of rejected alerts are not counted
+
+    args:
+        alerts_data (list): The alerts, in the same format as the one expected by /alerts/add
+    """
+    errors = {}
+    for index, alert_data in enumerate(alerts_data):
+        alert_errors = _validate(alert_data)
+        if alert_errors:
+            errors[index] = alert_errors
+
+    if errors:
+        raise BusinessProcessingError('Data error', errors)
+
+    customers = {alert_data.get('alert_customer_id') for alert_data in alerts_data}
+    for customer_id in customers:
+        if not user_has_client_access(current_user.id, customer_id):
+            raise BusinessProcessingError(f'User not entitled to create alerts for the client {customer_id}')
+
+
+def _check_batch_size(alerts_data):
+    if not isinstance(alerts_data, list) or not alerts_data:
+        raise BusinessProcessingError('No alerts provided')
+
+    max_batch_size = app.config.get('ALERTS_BATCH_MAX_SIZE')
+    if len(alerts_data) > max_batch_size:
+        raise BusinessProcessingError(f'Too many alerts in batch. Maximum is {max_batch_size}')
+
+
+def alerts_get_list_fields(fields: List[str] = None, include: List[str] = None) -> List[str]:
+    """
+    Get the fields serialized in the alerts list. Without explicit fields, the lightweight list projection
+    is used: every field of the alert except the optional ones, which can be added with include.
+
+    args:
+        fields (list): The sparse fieldset requested, if any
+        include (list): The optional fields to add to the projection
+
+    returns:
+        list: The fields to serialize
+    """
+    include = include or []
+    for field in include:
+        if field not in ALERTS_LIST_OPTIONAL_FIELDS:
+            raise BusinessProcessingError(f'Invalid include {field}. '
+                                          f'Expected one of {", ".join(ALERTS_LIST_OPTIONAL_FIELDS)}')
+
+    schema_fields = AlertSchema().fields.keys()
+    if fields:
+        for field in fields:
+            if field not in schema_fields:
+                raise BusinessProcessingError(f'Invalid field {field}')
+
+        return list(dict.fromkeys(fields + include))
+
+    return [field for field in schema_fields if field not in ALERTS_LIST_OPTIONAL_FIELDS or field in include]
+
+
+def alerts_get_filter_cache_key(namespace: str, filters: dict, fields: List[str], user_id: int) -> Optional[str]:
+    """
+    Get the key under which a page of filtered alerts is cached. The key covers the filter, the customers visible to
+    the user and the write counters of these customers, so that any write to their alerts leads to a new key.
+
+    args:
+        namespace (str): Identifies the shape of the cached result, such as the route producing it
+        filters (dict): The filter arguments, mapping each argument to its list of values
+        fields (list): The fields which are serialized
+        user_id (int): The ID of the user filtering the alerts
+
+    returns:
+        str: The cache key, or None if the cache is disabled
+    """
+    if not app.config.get('ALERTS_FILTER_CACHE_TIMEOUT'):
+        return None
+
+    # The case context and the cache busting argument do not change the result
+    normalized_filters = sorted((key, values) for key, values in filters.items() if key not in ('cid', '_'))
+
+    customer_ids = None
+    if not ac_current_user_has_permission(Permissions.server_administrator):
+        customer_ids = get_user_clients_id(user_id)
+        if customer_ids is not None:
+            customer_ids = sorted(customer_ids)
+
+    key = json.dumps([namespace, normalized_filters, sorted(fields), customer_ids,
+                      get_alerts_generations(customer_ids)])
+
+    return f'iris_alerts_filter_{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def _get_alerts_export_record(row) -> dict:
+    record = {}
+    for column in ALERTS_EXPORT_COLUMNS + ALERTS_EXPORT_RELATED_NAMES:
+        value = getattr(row, column)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, uuid.UUID):
+            value = str(value)
+
+        record[column] = value
+
+    return record
+
+
+def _stream_offloaded_source_content(digest: str) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    streamed = False
+    try:
+        for chunk in get_blob_store().stream(digest):
+            streamed = True
+            yield decoder.decode(chunk)
+
+    except OSError as e:
+        # Once a part of the payload is sent, the line cannot be completed
+        if streamed:
+            raise
+
+        app.logger.warning(f'Unable to read blob {digest}: {e}')
+        yield 'null'
+        return
+
+    yield decoder.decode(b'', final=True)
+
+
+def _export_alerts_ndjson(rows, include_source_content: bool) -> Iterator[str]:
+    for row in rows:
+        line = json.dumps(_get_alerts_export_record(row))
+        if not include_source_content:
+            yield f'{line}\n'
+            continue
+
+        # Offloaded payloads are stored as JSON, hence copied into the line as they are read from the blob store
+        yield f'{line[:-1]}, "alert_source_content": '
+        if row.alert_source_content_ref is None:
+            yield json.dumps(row.alert_source_content)
+        else:
+            yield from _stream_offloaded_source_content(row.alert_source_content_ref)
+        yield '}\n'
+
+
+def _get_alerts_csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+
+    # Alerts come from external sources, so their texts must not be interpreted as formulas by spreadsheets
+    if isinstance(value, str) and value.startswith(('=', '+', '-', '@', '\t', '\r')):
+        return f"'{value}"
+
+    return value
+
+
+def _export_alerts_csv(rows) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(ALERTS_EXPORT_COLUMNS + ALERTS_EXPORT_RELATED_NAMES)
+    for row in rows:
+        writer.writerow([_get_alerts_csv_value(value) for value in _get_alerts_export_record(row).values()])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def alerts_export(export_format: str, filters: dict, sort: str = 'desc',
+                  include_source_content: bool = False) -> Iterator[str]:
+    """
+    Export the alerts matching a filter. The export is produced row by row, so it can be streamed whatever the
+    number of alerts.
+
+    args:
+        export_format (str): The format of the export, one of ALERTS_EXPORT_FORMATS
+        filters (dict): The filter conditions, as accepted by get_filtered_alerts
+        sort (str): The sort order on the source event time
+        include_source_content (bool): Whether to export the source content of the alerts, only with NDJSON
+
+    returns:
+        Iterator: The chunks of the export
+    """
+    if export_format not in ALERTS_EXPORT_FORMATS:
+        raise BusinessProcessingError(f'Invalid format {export_format}. '
+                                      f'Expected one of {", ".join(ALERTS_EXPORT_FORMATS)}')
+
+    if include_source_content and export_format != 'ndjson':
+        raise BusinessProcessingError('The source content of the alerts can only be exported as NDJSON')
+
+    try:
+        rows = get_filtered_alerts_export_rows(filters, sort=sort, include_source_content=include_source_content)
+
+    except ValueError as e:
+        raise BusinessProcessingError(str(e))
+
+    if export_format == 'csv':
+        return _export_alerts_csv(rows)
+
+    return _export_alerts_ndjson(rows, include_source_content)
+
+
+def _deduplicate_alerts(alerts_data: List[dict]):
+    """
+    Group the alerts of a batch by fingerprint. The first alert of a fingerprint is created and counts the
+    following ones as occurrences, unless an open alert with the same fingerprint was seen within the
+    deduplication window, in which case all of them are counted as occurrences of the existing alert.
+    Without deduplication window, all the alerts are created.
+
+    returns:
+        tuple: The fingerprint per index, the occurrences per index of the alerts to create, the number of
+               duplicates per ID of the existing alerts, and the customers of the existing alerts
+    """
+    fields = app.config.get('ALERTS_DEDUP_FINGERPRINT_FIELDS')
+    fingerprints = {index: get_alert_fingerprint(alert_data, fields) if isinstance(alert_data, dict) else None
+                    for index, alert_data in enumerate(alerts_data)}
+
+    if not app.config.get('ALERTS_DEDUP_WINDOW'):
+        return fingerprints, {index: 1 for index in fingerprints}, {}, set()
+
+    keys = {(int(alerts_data[index].get('alert_customer_id')), fingerprint)
+            for index, fingerprint in fingerprints.items() if fingerprint is not None}
+    since = datetime.utcnow() - timedelta(seconds=app.config.get('ALERTS_DEDUP_WINDOW'))
+    existing_alerts = get_alerts_ids_by_fingerprints(keys, since, list(ALERTS_ARCHIVABLE_STATUSES))
+
+    occurrences = {}
+    first_index_by_key = {}
+    duplicates = {}
+    duplicates_customers = set()
+    for index, fingerprint in fingerprints.items():
+        if fingerprint is None:
+            occurrences[index] = 1
+            continue
+
+        key = (int(alerts_data[index].get('alert_customer_id')), fingerprint)
+        if key in existing_alerts:
+            duplicates[existing_alerts[key]] = duplicates.get(existing_alerts[key], 0) + 1
+            duplicates_customers.add(key[0])
+
+        elif key in first_index_by_key:
+            occurrences[first_index_by_key[key]] += 1
+
+        else:
+            first_index_by_key[key] = index
+            occurrences[index] = 1
+
+    return fingerprints, occurrences, duplicates, duplicates_customers
+
+
+def alerts_register_duplicate(alert_data: dict) -> Tuple[Optional[Alert], Optional[int]]:
+    """
+    Count an alert as an occurrence of an open alert with the same fingerprint seen within the
+    deduplication window, if any
+
+    args:
+        alert_data (dict): The alert, in the same format as the one expected by /alerts/add
+
+    returns:
+        tuple: The existing alert if the alert is a duplicate, and the fingerprint of the alert
+    """
+    fingerprints, _, duplicates, _ = _deduplicate_alerts([alert_data])
+    fingerprint = fingerprints[0]
+    if not duplicates:
+        return None, fingerprint
+
+    if not user_has_client_access(current_user.id, int(alert_data.get('alert_customer_id'))):
+        raise BusinessProcessingError('User not entitled to create alerts for the client')
+
+    register_alerts_duplicates(duplicates)
+    alerts = get_alerts_by_ids(list(duplicates))
+    notify_alerts_changed('updated', alerts)
+
+    return alerts[0], fingerprint
+
+
+def alerts_create_batch(alerts_data: List[dict]) -> List[Alert]:
+    """
+    Create a batch of alerts in a single transaction. The batch is rejected as a whole
+    if any of the alerts is invalid or targets a customer the user is not entitled to.
+    Hooks, activity and notifications are emitted once for the whole batch.
+    The alert rules are applied once the batch is checked, so alerts dropped or aggregated by a rule are not created.
+    When deduplication is enabled, the duplicates of open alerts are only counted as occurrences.
+
+    args:
+        alerts_data (list): The alerts, in the same format as the one expected by /alerts/add
+
+    returns:
+        list: The alerts created, followed by the existing alerts the duplicates were counted in
+    """
+    _check_batch_size(alerts_data)
+    alerts_check_creation(alerts_data)
+
+    alerts_data = alert_rules_apply(alerts_data)
+    if not alerts_data:
+        return []
+
+    fingerprints, occurrences, duplicates, duplicates_customers = _deduplicate_alerts(alerts_data)
+
+    alerts_entries = []
+    errors = {}
+    for index, alert_data in enumerate(alerts_data):
+        if index not in occurrences:
+            continue
+
+        try:
+            alert, iocs, assets = _load(alert_data)
+            alert.alert_fingerprint = fingerprints[index]
+            alert.alert_occurrences = occurrences[index]
+            alerts_entries.append((alert, iocs, assets))
+        except ValidationError as e:
+            errors[index] = e.normalized_messages()
+
+    if errors:
+        raise BusinessProcessingError('Data error', errors)
+
+    customers = {alert.alert_customer_id for alert, _, _ in alerts_entries} | duplicates_customers
+    for customer_id in customers:
+        if not user_has_client_access(current_user.id, customer_id):
+            raise BusinessProcessingError(f'User not entitled to create alerts for the client {customer_id}')
+
+    alerts = create_alerts_batch(alerts_entries, duplicates=duplicates)
+
+    if alerts:
+        alerts = call_modules_hook('on_postload_alert_create', data=alerts)
+
+        alert_ids = [alert.alert_id for alert in alerts]
+        track_activity(f"created {len(alert_ids)} alerts in batch (#{min(alert_ids)} to #{max(alert_ids)})",
+                       ctx_less=True)
+
+        notify_alerts_changed('new', alerts)
+
+    duplicated_alerts = []
+    if duplicates:
+        duplicated_alerts = get_alerts_by_ids(list(duplicates))
+        notify_alerts_changed('updated', duplicated_alerts)
+
+    return alerts + duplicated_alerts
+
+
+def alerts_get_near_duplicates(alert_id: int, threshold: float = None, limit: int = 50) -> List[Tuple[Alert, float]]:
+    """
+    Get the alerts whose text or IOCs are near duplicates of the ones of an alert, for group triage
+
+    args:
+        alert_id (int): The ID of the alert
+        threshold (float): The minimum estimated similarity, defaults to ALERTS_CLUSTERING_THRESHOLD
+        limit (int): The maximum number of alerts to return
+
+    returns:
+        list: The (alert, similarity) pairs, the most similar first
+    """
+    alert = get_alert_by_id(alert_id)
+    if not alert or not user_has_client_access(current_user.id, alert.alert_customer_id):
+        raise ObjectNotFoundError()
+
+    if threshold is None:
+        threshold = app.config.get('ALERTS_CLUSTERING_THRESHOLD')
+
+    # The candidates are checked against the current customer of the alerts, in case their buckets are outdated
+    near_duplicates = get_alert_near_duplicates(alert, threshold, limit)
+    alerts = {near_duplicate.alert_id: near_duplicate
+              for near_duplicate in get_alerts_by_ids([identifier for identifier, _ in near_duplicates])
+              if near_duplicate.alert_customer_id == alert.alert_customer_id}
+
+    return [(alerts[identifier], similarity) for identifier, similarity in near_duplicates if identifier in alerts]
+
+
+def _check_alerts_batch_update(alert_ids: List[int], updates: dict) -> dict:
+    if not alert_ids:
+        raise BusinessProcessingError('No alert IDs provided')
+
+    for field in updates:
+        if field not in ALERTS_BATCH_UPDATABLE_FIELDS:
+            raise BusinessProcessingError(f'Field {field} cannot be updated in batch')
+
+    # The values are deserialized to the types of the columns, so that they are written and compared to the
+    # current values of the alerts as with the single alert update
+    try:
+        alert = AlertSchema().load(updates, partial=True, transient=True)
+    except ValidationError as e:
+        raise BusinessProcessingError('Data error', e.normalized_messages())
+
+    updates = {field: getattr(alert, field) for field in updates}
+
+    rows = get_alerts_fields_values(alert_ids, [])
+    missing_ids = set(alert_ids) - {row.alert_id for row in rows}
+    if missing_ids:
+        raise BusinessProcessingError(f'Alert with ID {min(missing_ids)} not found')
+
+    customers = {row.alert_customer_id for row in rows}
+    if 'alert_customer_id' in updates:
+        customers.add(updates['alert_customer_id'])
+
+    for customer_id in customers:
+        if not user_has_client_access(current_user.id, customer_id):
+            raise PermissionDeniedError('User not entitled to update alerts for the client')
+
+    return updates
+
+
+def alerts_update_batch(alert_ids: List[int], updates: dict) -> List[Alert]:
+    """
+    Update multiple alerts with set-based statements. The alerts without owner are assigned to the
+    current user, unless the owner is part of the updates. History is appended to each alert, while
+    the activity and the hook are recorded once for the whole batch.
+
+    args:
+        alert_ids (list): The IDs of the alerts to update
+        updates (dict): The new values of the fields
+
+    returns:
+        list: The alerts updated
+    """
+    updates = _check_alerts_batch_update(alert_ids, updates)
+
+    history_actions = {}
+    changed_fields = set()
+    rows = get_alerts_fields_values(alert_ids, list(updates))
+    for row in rows:
+        activity_data = [f'"{key}"' for key, value in updates.items() if getattr(row, key) != value]
+        if activity_data:
+            history_actions.setdefault(f"updated alert: {','.join(activity_data)}", []).append(row.alert_id)
+            changed_fields.update(activity_data)
+
+    default_owner_id = None if 'alert_owner_id' in updates else current_user.id
+
+    update_alerts_batch(alert_ids, updates, default_owner_id=default_owner_id,
+                        history_actions=history_actions, user=current_user)
+
+    alerts = get_alerts_by_ids(alert_ids)
+    if set(updates) & set(ALERTS_MINHASH_FIELDS):
+        refresh_alerts_minhash(alerts)
+
+    alerts = call_modules_hook('on_postload_alert_update', data=alerts)
+
+    # Alerts moved to another customer are also notified to the customer they left
+    notify_alerts_changed('updated', rows)
+    notify_alerts_changed('updated', alerts)
+
+    if changed_fields:
+        track_activity(f"updated {len(alert_ids)} alerts in batch: {','.join(sorted(changed_fields))}",
+                       ctx_less=True)
+
+    return alerts
+
+
+def alerts_update_batch_in_background(alert_ids: List[int], updates: dict) -> str:
+    """
+    Check a batch update and run it in the background by chunks. Progress is reported with the
+    alerts_batch_update_progress Socket.IO event of the /alerts namespace, emitted to the room of the requesting user.
+
+    args:
+        alert_ids (list): The IDs of the alerts to update
+        updates (dict): The new values of the fields
+
+    returns:
+        str: The identifier of the background task
+    """
+    _check_alerts_batch_update(alert_ids, updates)
+
+    task = task_alerts_update_batch.delay(alert_ids, updates, current_user.id)
+
+    return task.id
+
+
+def _get_pending_ingestions_count() -> int:
+    # The queue depth is shared by all the ingestion requests, so it is only read every few seconds
+    count = cache.get(_PENDING_INGESTIONS_CACHE_KEY)
+    if count is None:
+        count = get_pending_alert_ingestions_count()
+        cache.set(_PENDING_INGESTIONS_CACHE_KEY, count, timeout=_PENDING_INGESTIONS_CACHE_TIMEOUT)
+
+    return count
+
+
+def alerts_check_ingestion_rate(alerts_data) -> None:
+    """
+    Take the alerts of an ingestion request from the rate limits of the API key of the current user and of the
+    sources of the alerts. The request is refused beforehand when the asynchronous ingestion queue is lagging.
+    The alerts are not validated, so that a flood is shed before any other work.
+
+    args:
+        alerts_data: The alert, or list of alerts, of the request
+
+    raises:
+        RateLimitedError: When the alerts must not be ingested now, with the number of seconds to wait
+    """
+    alerts = alerts_data if isinstance(alerts_data, list) else [alerts_data]
+    rate_limiter = get_ingestion_rate_limiter()
+
+    max_pending = app.config.get('ALERTS_INGESTION_MAX_PENDING')
+    if max_pending and _get_pending_ingestions_count() >= max_pending:
+        rate_limiter.record_rejected(len(alerts))
+        raise RateLimitedError('The alerts ingestion queue is full', _BACKPRESSURE_RETRY_AFTER)
+
+    sources = Counter(alert.get('alert_source') for alert in alerts if isinstance(alert, dict))
+    requests = [('api_key', current_user.id, len(alerts))]
+    requests.extend(('source', source, count) for source, count in sources.items())
+
+    retry_after, scope = rate_limiter.acquire(requests, len(alerts))
+    if scope == 'api_key':
+        raise RateLimitedError('Alerts ingestion rate limit of the API key exceeded', math.ceil(retry_after))
+
+    if scope == 'source':
+        raise RateLimitedError('Alerts ingestion rate limit of the alert source exceeded', math.ceil(retry_after))
+
+
+def alerts_get_ingestion_statistics() -> dict:
+    """
+    Get the number of alerts accepted, throttled per scope and rejected by the current process since its start,
+    along with the number of alerts waiting in the asynchronous ingestion queue
+
+    returns:
+        dict: The statistics
+    """
+    return {
+        **get_ingestion_rate_limiter().get_statistics(),
+        'pending': get_pending_alert_ingestions_count()
+    }
+
+
+def alerts_enqueue(alerts_data: List[dict]) -> AlertIngestionTicket:
+    """
+    Validate a batch of alerts and spool it for asynchronous ingestion by the worker.
+    Persistence, similarity caching and hooks are run by the worker.
+
+    args:
+        alerts_data (list): The alerts, in the same format as the one expected by /alerts/add
+
+    returns:
+        AlertIngestionTicket: The ticket which can be used to track the ingestion
+    """
+    _check_batch_size(alerts_data)
+    alerts_check_creation(alerts_data)
+
+    ticket = create_alert_ingestion_ticket(alerts_data, current_user.id)
+
+    task_alerts_ingest.delay(ticket.ticket_id)
+
+    return ticket
+
+
+def alerts_get_ingestion_ticket(ticket_uuid) -> AlertIngestionTicket:
+    ticket = get_alert_ingestion_ticket(ticket_uuid)
+    if not ticket:
+        raise ObjectNotFoundError()
+
+    if ticket.user_id != current_user.id and not ac_current_user_has_permission(Permissions.server_administrator):
+        raise ObjectNotFoundError()
+
+    return ticket
+
+
+@celery.task(bind=True)
+def task_alerts_ingest(self, ticket_id, reclaim_stale=False):
+    """
+    Ingest a spooled batch of alerts on behalf of the user who submitted it
+
+    :param self: Task instance
+    :param ticket_id: Identifier of the ingestion ticket
+    :param reclaim_stale: Whether a ticket stale in the processing state can be claimed again
+    :return: A task status
+    """
+    stale_before = None
+    if reclaim_stale:
+        stale_before = datetime.utcnow() - timedelta(minutes=_ALERTS_INGESTION_PROCESSING_TIMEOUT_MINUTES)
+
+    ticket = claim_alert_ingestion_ticket(ticket_id, stale_before)
+    if not ticket:
+        return IStatus.I2Success(message=f'Ingestion ticket #{ticket_id} already handled')
+
+    # The ingestion is done in the name of the user who submitted the alerts, so access checks,
+    # history and activities stay consistent with the synchronous endpoints
+    with app.test_request_context():
+        login_user(ticket.user)
+        session['permissions'] = ac_get_effective_permissions_of_user(ticket.user)
+
+        try:
+            alerts = alerts_create_batch(ticket.payload)
+
+        except BusinessProcessingError as e:
+            fail_alert_ingestion_ticket(ticket, {'message': e.get_message(), 'data': e.get_data()})
+            return IStatus.I2Error(message=f'Ingestion ticket #{ticket_id} failed: {e.get_message()}')
+
+        except Exception as e:
+            app.logger.exception(e)
+            fail_alert_ingestion_ticket(ticket, {'message': 'Unexpected error server-side', 'data': str(e)})
+            return IStatus.I2Error(message=f'Ingestion ticket #{ticket_id} failed')
+
+    complete_alert_ingestion_ticket(ticket, [alert.alert_id for alert in alerts])
+
+    return IStatus.I2Success(message=f'Ingestion ticket #{ticket_id} completed')
+
+
+@celery.task
+def task_alerts_requeue_stale_ingestions():
+    """
+    Requeue the ingestion tickets which are still pending after a while, i.e. which task was lost, and the
+    tickets still processing after a while, i.e. which worker crashed. The latter are failed after a few attempts
+    """
+    now = datetime.utcnow()
+    claimed_before = now - timedelta(minutes=_ALERTS_INGESTION_PROCESSING_TIMEOUT_MINUTES)
+
+    failed_count = fail_stale_alert_ingestion_tickets(claimed_before, _ALERTS_INGESTION_MAX_ATTEMPTS)
+    if failed_count:
+        app.logger.warning(f'{failed_count} alert ingestion tickets failed after {_ALERTS_INGESTION_MAX_ATTEMPTS} attempts')
+
+    for ticket_id in get_stale_alert_ingestion_tickets_ids(now - timedelta(minutes=10), claimed_before):
+        task_alerts_ingest.delay(ticket_id, reclaim_stale=True)
+
+
+@celery.on_after_finalize.connect
+def setup_periodic_alerts_ingestion_checks(sender, **kwargs):
+    sender.add_periodic_task(
+        crontab(minute='*/10'),
+        task_alerts_requeue_stale_ingestions.s(),
+        name='iris_alerts_requeue_stale_ingestions'
+    )
+
+
+@celery.task
+def task_prune_similar_alerts_cache():
+    """
+    Delete the similar alerts cache entries older than the configured retention, and the log of the deletions
+    older than a day, which the correlation indexes rebuilt since no longer read
+    """
+    older_than = datetime.utcnow() - timedelta(days=app.config.get('ALERTS_SIMILARITY_CACHE_RETENTION_DAYS'))
+    deleted = prune_similar_alerts_cache(older_than)
+    app.logger.info(f'Pruned {deleted} similar alerts cache entries older than {older_than}')
+
+    prune_similar_alerts_cache_deletions(datetime.utcnow() - timedelta(days=1))
+
+
+@celery.on_after_finalize.connect
+def setup_periodic_similar_alerts_cache_pruning(sender, **kwargs):
+    sender.add_periodic_task(
+        crontab(minute='30', hour='3'),
+        task_prune_similar_alerts_cache.s(),
+        name='iris_alerts_prune_similar_alerts_cache'
+    )
+
+
+@celery.task
+def task_backfill_alerts_minhash():
+    """
+    Compute the MinHash signatures of the alerts which have none, e.g. ingested before the clustering was enabled,
+    so that they are found as near duplicates of the other alerts.
+    Can be run on demand with: celery -A app.celery call app.business.alerts.task_backfill_alerts_minhash
+    """
+    if not app.config.get('ALERTS_CLUSTERING_ENABLED'):
+        return
+
+    processed_before = None
+    while True:
+        processed_before = backfill_alerts_minhash(processed_before, _ALERTS_MINHASH_BACKFILL_BATCH_SIZE)
+        if processed_before is None:
+            break
+
+    app.logger.info('Backfilled the MinHash signatures of the alerts')
+
+
+@celery.on_after_finalize.connect
+def setup_periodic_alerts_minhash_backfill(sender, **kwargs):
+    sender.add_periodic_task(
+        crontab(minute='0', hour='6'),
+        task_backfill_alerts_minhash.s(),
+        name='iris_alerts_backfill_minhash'
+    )
+
+
+def alerts_archive(older_than_months: int) -> int:
+    """
+    Move the closed alerts older than a number of months and not linked to a case to the alerts archive
+
+    args:
+        older_than_months (int): Age of the alerts to archive, in months
+
+    returns:
+        int: The number of alerts archived
+    """
+    older_than = datetime.utcnow() - timedelta(days=30 * older_than_months)
+
+    status_ids = []
+    for status_name in ALERTS_ARCHIVABLE_STATUSES:
+        status = get_alert_status_by_name(status_name)
+        if status:
+            status_ids.append(status.status_id)
+
+    return archive_alerts(older_than, status_ids)
+
+
+@celery.task
+def task_archive_alerts(older_than_months=None):
+    """
+    Archive the closed alerts older than the given number of months, or than the configured one.
+    Can be run on demand with: celery -A app.celery call app.business.alerts.task_archive_alerts --args='[12]'
+    """
+    if older_than_months is None:
+        older_than_months = app.config.get('ALERTS_ARCHIVE_AFTER_MONTHS')
+
+    if not older_than_months:
+        return
+
+    archived = alerts_archive(int(older_than_months))
+    app.logger.info(f'Archived {archived} alerts older than {older_than_months} months')
+
+
+@celery.on_after_finalize.connect
+def setup_periodic_alerts_archival(sender, **kwargs):
+    sender.add_periodic_task(
+        crontab(minute='0', hour='4'),
+        task_archive_alerts.s(),
+        name='iris_archive_alerts'
+    )
+
+
+@celery.task(bind=True)
+def task_alerts_update_batch(self, alert_ids, updates, user_id):
+    """
+    Update alerts by chunks on behalf of the user who requested it, reporting the progress to that user over Socket.IO
+
+    :param self: Task instance
+    :param alert_ids: Identifiers of the alerts to update
+    :param updates: New values of the fields
+    :param user_id: Identifier of the user who requested the update
+    :return: A task status
+    """
+    user = db.session.get(User, user_id)
+    total = len(alert_ids)
+    processed = 0
+
+    with app.test_request_context():
+        login_user(user)
+        session['permissions'] = ac_get_effective_permissions_of_user(user)
+
+        for chunk_start in range(0, total, _ALERTS_BATCH_UPDATE_CHUNK_SIZE):
+            chunk = alert_ids[chunk_start:chunk_start + _ALERTS_BATCH_UPDATE_CHUNK_SIZE]
+            try:
+                alerts_update_batch(chunk, updates)
+
+            except BusinessProcessingError as e:
+                socket_io.emit('alerts_batch_update_progress', json.dumps({
+                    'task_id': self.request.id,
+                    'processed': processed,
+                    'total': total,
+                    'error': e.get_message()
+                }), namespace='/alerts', to=get_alerts_user_room(user_id))
+                return IStatus.I2Error(message=f'Batch update failed after {processed} alerts: {e.get_message()}')
+
+            processed += len(chunk)
+            self.update_state(state='PROGRESS', meta={'processed': processed, 'total': total})
+            socket_io.emit('alerts_batch_update_progress', json.dumps({
+                'task_id': self.request.id,
+                'processed': processed,
+                'total': total
+            }), namespace='/alerts', to=get_alerts_user_room(user_id))
+
+    return IStatus.I2Success(message=f'Updated {processed} alerts')
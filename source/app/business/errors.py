@@ -37,6 +37,20 @@ class ObjectNotFoundError(BusinessProcessingError):
         super().__init__('Object not found')
 
 
+class PermissionDeniedError(BusinessProcessingError):
+    pass
+
+
+class RateLimitedError(BusinessProcessingError):
+
+    def __init__(self, message, retry_after: int):
+        super().__init__(message)
+        self._retry_after = retry_after
+
+    def get_retry_after(self):
+        return self._retry_after
+
+
 class UnhandledBusinessError(BusinessProcessingError):
 
     def __init__(self, message, data=None):
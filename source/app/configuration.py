@@ -479,6 +479,91 @@ class Config:
     CACHE_TYPE = "SimpleCache"
     CACHE_DEFAULT_TIMEOUT = 300
 
+    """ Alerts ingestion
+    """
+    ALERTS_BATCH_MAX_SIZE = int(config.load('IRIS', 'ALERTS_BATCH_MAX_SIZE', fallback=1000))
+    ALERTS_BATCH_UPDATE_BACKGROUND_THRESHOLD = int(config.load('IRIS', 'ALERTS_BATCH_UPDATE_BACKGROUND_THRESHOLD',
+                                                               fallback=1000))
+
+    """ Alerts ingestion rate limits
+    Rates are in alerts per second, for each API key and each alert source. A rate of 0 disables the limit
+    """
+    ALERTS_RATE_LIMIT_PER_KEY = float(config.load('IRIS', 'ALERTS_RATE_LIMIT_PER_KEY', fallback=0))
+    ALERTS_RATE_LIMIT_PER_KEY_BURST = int(config.load('IRIS', 'ALERTS_RATE_LIMIT_PER_KEY_BURST', fallback=1000))
+    ALERTS_RATE_LIMIT_PER_SOURCE = float(config.load('IRIS', 'ALERTS_RATE_LIMIT_PER_SOURCE', fallback=0))
+    ALERTS_RATE_LIMIT_PER_SOURCE_BURST = int(config.load('IRIS', 'ALERTS_RATE_LIMIT_PER_SOURCE_BURST', fallback=1000))
+    ALERTS_INGESTION_MAX_PENDING = int(config.load('IRIS', 'ALERTS_INGESTION_MAX_PENDING', fallback=0))
+
+    """ Alerts deduplication
+    """
+    ALERTS_DEDUP_WINDOW = int(config.load('IRIS', 'ALERTS_DEDUP_WINDOW', fallback=0))
+    ALERTS_DEDUP_FINGERPRINT_FIELDS = config.load('IRIS', 'ALERTS_DEDUP_FINGERPRINT_FIELDS',
+                                                  fallback='alert_source_ref,alert_title')
+
+    """ Alerts listing
+    """
+    ALERTS_COUNT_CACHE_TIMEOUT = int(config.load('IRIS', 'ALERTS_COUNT_CACHE_TIMEOUT', fallback=60))
+    ALERTS_FILTER_CACHE_TIMEOUT = int(config.load('IRIS', 'ALERTS_FILTER_CACHE_TIMEOUT', fallback=300))
+
+    """ Alerts similarity
+    """
+    ALERTS_SIMILARITY_CACHE_RETENTION_DAYS = int(config.load('IRIS', 'ALERTS_SIMILARITY_CACHE_RETENTION_DAYS',
+                                                             fallback=90))
+    ALERTS_CORRELATION_INDEX_ENABLED = config.load('IRIS', 'ALERTS_CORRELATION_INDEX_ENABLED', fallback=False) == 'True'
+    ALERTS_CORRELATION_INDEX_REFRESH_INTERVAL = float(config.load('IRIS', 'ALERTS_CORRELATION_INDEX_REFRESH_INTERVAL',
+                                                                  fallback=5))
+    ALERTS_CORRELATION_INDEX_REBUILD_INTERVAL = int(config.load('IRIS', 'ALERTS_CORRELATION_INDEX_REBUILD_INTERVAL',
+                                                                fallback=3600))
+    # The deletions of the similar alerts cache are only logged for a day
+    if ALERTS_CORRELATION_INDEX_REBUILD_INTERVAL >= 86400:
+        raise Exception('ALERTS_CORRELATION_INDEX_REBUILD_INTERVAL must be less than a day')
+
+    """ Alerts clustering
+    Near duplicate alerts are found with MinHash signatures of their text and IOCs, indexed by LSH buckets
+    """
+    ALERTS_CLUSTERING_ENABLED = config.load('IRIS', 'ALERTS_CLUSTERING_ENABLED', fallback=False) == 'True'
+    ALERTS_CLUSTERING_NUM_PERM = int(config.load('IRIS', 'ALERTS_CLUSTERING_NUM_PERM', fallback=64))
+    ALERTS_CLUSTERING_BANDS = int(config.load('IRIS', 'ALERTS_CLUSTERING_BANDS', fallback=16))
+    ALERTS_CLUSTERING_THRESHOLD = float(config.load('IRIS', 'ALERTS_CLUSTERING_THRESHOLD', fallback=0.5))
+    if ALERTS_CLUSTERING_BANDS <= 0 or ALERTS_CLUSTERING_NUM_PERM % ALERTS_CLUSTERING_BANDS:
+        raise Exception('ALERTS_CLUSTERING_BANDS must divide ALERTS_CLUSTERING_NUM_PERM')
+
+    """ Alerts archival
+    """
+    ALERTS_ARCHIVE_AFTER_MONTHS = int(config.load('IRIS', 'ALERTS_ARCHIVE_AFTER_MONTHS', fallback=0))
+
+    """ Alerts notifications
+    """
+    ALERTS_CHANGES_COALESCE_WINDOW = float(config.load('IRIS', 'ALERTS_CHANGES_COALESCE_WINDOW', fallback=2))
+
+    """ Custom dashboards
+    The widgets of a dashboard are executed concurrently, each bounded by the timeout in seconds, and their results
+    are cached per access scope
+    """
+    CUSTOM_DASHBOARD_WIDGET_WORKERS = int(config.load('IRIS', 'CUSTOM_DASHBOARD_WIDGET_WORKERS', fallback=4))
+    CUSTOM_DASHBOARD_WIDGET_TIMEOUT = float(config.load('IRIS', 'CUSTOM_DASHBOARD_WIDGET_TIMEOUT', fallback=15))
+    CUSTOM_DASHBOARD_CACHE_TIMEOUT = int(config.load('IRIS', 'CUSTOM_DASHBOARD_CACHE_TIMEOUT', fallback=60))
+    CUSTOM_DASHBOARD_CACHE_MAX_ENTRIES = int(config.load('IRIS', 'CUSTOM_DASHBOARD_CACHE_MAX_ENTRIES', fallback=1000))
+
+    """ Live dashboards
+    The custom dashboards and statistics followed over Socket.IO are refreshed at this interval in seconds
+    """
+    DASHBOARDS_LIVE_UPDATES_INTERVAL = float(config.load('IRIS', 'DASHBOARDS_LIVE_UPDATES_INTERVAL', fallback=10))
+
+    """ Statistics rollups
+    Hourly and daily alerts and cases counts, kept current by the worker, answer the eligible dashboard widgets
+    """
+    STATISTICS_ROLLUPS_ENABLED = config.load('IRIS', 'STATISTICS_ROLLUPS_ENABLED', fallback='False') == 'True'
+    STATISTICS_ROLLUPS_BATCH_HOURS = int(config.load('IRIS', 'STATISTICS_ROLLUPS_BATCH_HOURS', fallback=500))
+
+    """ Blob store
+    Raw alerts and events payloads above the minimum size are stored compressed on the filesystem
+    """
+    BLOB_STORE_ENABLED = config.load('IRIS', 'BLOB_STORE_ENABLED', fallback='True') == 'True'
+    BLOB_STORE_PATH = config.load('IRIS', 'BLOB_STORE_PATH', fallback="/home/iris/server_data/blobs")
+    BLOB_STORE_MIN_SIZE = int(config.load('IRIS', 'BLOB_STORE_MIN_SIZE', fallback=4096))
+    BLOB_STORE_COMPRESSION_LEVEL = int(config.load('IRIS', 'BLOB_STORE_COMPRESSION_LEVEL', fallback=3))
+
     log.info(f'IRIS Server {IRIS_VERSION}')
     log.info(f'Min. API version supported: {API_MIN_VERSION}')
     log.info(f'Max. API version supported: {API_MAX_VERSION}')
@@ -0,0 +1,225 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from datetime import datetime
+from sqlalchemy import delete
+from sqlalchemy import insert
+from sqlalchemy import literal
+from sqlalchemy import select
+from sqlalchemy import tuple_
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Tuple
+
+from app import db
+from app.datamgmt.case.case_assets_db import get_unspecified_analysis_status_id
+from app.datamgmt.states import update_assets_state
+from app.datamgmt.states import update_ioc_state
+from app.models.alerts import Alert
+from app.models.cases import CaseTags
+from app.models.models import CaseAssets
+from app.models.models import Ioc
+from app.models.models import IocAssetLink
+from app.models.models import Tags
+
+# Columns copied from the IOCs and assets of the alerts which already belong to another case
+_IOC_COPIED_COLUMNS = ('ioc_value', 'ioc_type_id', 'ioc_description', 'ioc_tags', 'ioc_misp', 'ioc_tlp_id',
+                       'custom_attributes', 'ioc_enrichment')
+_ASSET_COPIED_COLUMNS = ('asset_name', 'asset_description', 'asset_domain', 'asset_ip', 'asset_info',
+                         'asset_compromise_status_id', 'asset_type_id', 'asset_tags', 'custom_attributes',
+                         'asset_enrichment')
+
+
+def add_case_tags(case_id: int, case_tags: str) -> None:
+    """
+    Add comma separated tags to a case, creating the missing ones, without committing the transaction
+
+    args:
+        case_id (int): The ID of the case
+        case_tags (str): The comma separated tags
+    """
+    titles = {title.strip() for title in (case_tags or '').split(',') if title.strip()}
+    if not titles:
+        return
+
+    creation_date = datetime.now()
+    db.session.execute(pg_insert(Tags.__table__).values([
+        {'tag_title': title, 'tag_creation_date': creation_date} for title in sorted(titles)
+    ]).on_conflict_do_nothing(index_elements=['tag_title']))
+
+    db.session.execute(pg_insert(CaseTags.__table__).from_select(
+        ['case_id', 'tag_id'],
+        select(literal(case_id), Tags.id).where(Tags.tag_title.in_(titles))
+    ).on_conflict_do_nothing())
+
+
+def _import_iocs(case_id: int, iocs_by_key: Dict[tuple, Ioc], user_id: int) -> Tuple[Dict[tuple, int], bool]:
+    if not iocs_by_key:
+        return {}, False
+
+    case_iocs = {}
+    rows = db.session.query(Ioc.ioc_id, Ioc.ioc_value, Ioc.ioc_type_id).filter(
+        Ioc.case_id == case_id,
+        tuple_(Ioc.ioc_value, Ioc.ioc_type_id).in_(list(iocs_by_key))
+    ).order_by(Ioc.ioc_id).all()
+    for ioc_id, ioc_value, ioc_type_id in rows:
+        case_iocs.setdefault((ioc_value, ioc_type_id), ioc_id)
+
+    ioc_table = Ioc.__table__
+    returned_columns = (ioc_table.c.ioc_id, ioc_table.c.ioc_value, ioc_table.c.ioc_type_id)
+    imported_rows = []
+
+    # The IOCs of the alerts which are not in a case yet are moved to the case, the others are copied
+    unassigned_ids = [ioc.ioc_id for key, ioc in iocs_by_key.items() if key not in case_iocs and ioc.case_id is None]
+    if unassigned_ids:
+        imported_rows.extend(db.session.execute(
+            update(ioc_table).where(
+                ioc_table.c.ioc_id.in_(unassigned_ids),
+                ioc_table.c.case_id.is_(None)
+            ).values(case_id=case_id, user_id=user_id).returning(*returned_columns)
+        ).all())
+
+    claimed_keys = {(ioc_value, ioc_type_id) for _, ioc_value, ioc_type_id in imported_rows}
+    copies = [{**{column: getattr(ioc, column) for column in _IOC_COPIED_COLUMNS},
+               'case_id': case_id, 'user_id': user_id}
+              for key, ioc in iocs_by_key.items() if key not in case_iocs and key not in claimed_keys]
+    if copies:
+        imported_rows.extend(db.session.execute(insert(ioc_table).returning(*returned_columns), copies).all())
+
+    for ioc_id, ioc_value, ioc_type_id in imported_rows:
+        case_iocs.setdefault((ioc_value, ioc_type_id), ioc_id)
+
+    return case_iocs, bool(imported_rows)
+
+
+def _import_assets(case_id: int, assets_by_key: Dict[tuple, CaseAssets],
+                   user_id: int) -> Tuple[Dict[tuple, int], Dict[tuple, int]]:
+    if not assets_by_key:
+        return {}, {}
+
+    case_assets = {}
+    rows = db.session.query(CaseAssets.asset_id, CaseAssets.asset_name, CaseAssets.asset_type_id).filter(
+        CaseAssets.case_id == case_id,
+        tuple_(CaseAssets.asset_name, CaseAssets.asset_type_id).in_(list(assets_by_key))
+    ).order_by(CaseAssets.asset_id).all()
+    for asset_id, asset_name, asset_type_id in rows:
+        case_assets.setdefault((asset_name, asset_type_id), asset_id)
+
+    now = datetime.utcnow()
+    case_values = {'case_id': case_id, 'user_id': user_id, 'analysis_status_id': get_unspecified_analysis_status_id(),
+                   'date_added': now, 'date_update': now}
+    asset_table = CaseAssets.__table__
+    returned_columns = (asset_table.c.asset_id, asset_table.c.asset_name, asset_table.c.asset_type_id)
+    imported_rows = []
+
+    # The assets of the alerts which are not in a case yet are moved to the case, the others are copied
+    unassigned_ids = [asset.asset_id for key, asset in assets_by_key.items()
+                      if key not in case_assets and asset.case_id is None]
+    if unassigned_ids:
+        imported_rows.extend(db.session.execute(
+            update(asset_table).where(
+                asset_table.c.asset_id.in_(unassigned_ids),
+                asset_table.c.case_id.is_(None)
+            ).values(**case_values).returning(*returned_columns)
+        ).all())
+
+    claimed_keys = {(asset_name, asset_type_id) for _, asset_name, asset_type_id in imported_rows}
+    copies = [{**{column: getattr(asset, column) for column in _ASSET_COPIED_COLUMNS}, **case_values}
+              for key, asset in assets_by_key.items() if key not in case_assets and key not in claimed_keys]
+    if copies:
+        imported_rows.extend(db.session.execute(insert(asset_table).returning(*returned_columns), copies).all())
+
+    imported_assets = {(asset_name, asset_type_id): asset_id for asset_id, asset_name, asset_type_id in imported_rows}
+    for key, asset_id in imported_assets.items():
+        case_assets.setdefault(key, asset_id)
+
+    return case_assets, imported_assets
+
+
+def import_alerts_objects_in_case(alerts: List[Alert], case_id: int, iocs_uuids: Iterable[str],
+                                  assets_uuids: Iterable[str], user_id: int) -> Dict[int, Tuple[List[int], List[int]]]:
+    """
+    Import the selected IOCs and assets of alerts in a case, without committing the transaction. The IOCs and
+    assets already in the case, with the same value or name and type, are reused. The others are resolved with
+    one query per type and imported with set-based statements, whatever the number of alerts and objects.
+    The imported assets are linked to the imported IOCs of the first alert they belong to.
+
+    args:
+        alerts (list): The alerts, with their IOCs and assets
+        case_id (int): The ID of the case
+        iocs_uuids (list): The UUIDs of the IOCs of the alerts to import
+        assets_uuids (list): The UUIDs of the assets of the alerts to import
+        user_id (int): The ID of the user importing the objects
+
+    returns:
+        dict: The IDs of the IOCs and of the assets of the case, per alert ID
+    """
+    selected_iocs = {str(ioc_uuid) for ioc_uuid in iocs_uuids or []}
+    selected_assets = {str(asset_uuid) for asset_uuid in assets_uuids or []}
+
+    alerts_iocs_keys = {}
+    alerts_assets_keys = {}
+    iocs_by_key = {}
+    assets_by_key = {}
+    for alert in alerts:
+        alert_iocs_keys = alerts_iocs_keys.setdefault(alert.alert_id, [])
+        for ioc in alert.iocs if selected_iocs else []:
+            if str(ioc.ioc_uuid) in selected_iocs:
+                key = (ioc.ioc_value, ioc.ioc_type_id)
+                iocs_by_key.setdefault(key, ioc)
+                alert_iocs_keys.append(key)
+
+        alert_assets_keys = alerts_assets_keys.setdefault(alert.alert_id, [])
+        for asset in alert.assets if selected_assets else []:
+            if str(asset.asset_uuid) in selected_assets:
+                key = (asset.asset_name, asset.asset_type_id)
+                assets_by_key.setdefault(key, asset)
+                alert_assets_keys.append(key)
+
+    case_iocs, iocs_imported = _import_iocs(case_id, iocs_by_key, user_id)
+    case_assets, imported_assets = _import_assets(case_id, assets_by_key, user_id)
+
+    alerts_links = {}
+    ioc_asset_links = []
+    linked_assets = set()
+    for alert in alerts:
+        ioc_links = list(dict.fromkeys(case_iocs[key] for key in alerts_iocs_keys[alert.alert_id]))
+        asset_links = list(dict.fromkeys(case_assets[key] for key in alerts_assets_keys[alert.alert_id]))
+        alerts_links[alert.alert_id] = (ioc_links, asset_links)
+
+        for key in alerts_assets_keys[alert.alert_id]:
+            if key in imported_assets and key not in linked_assets:
+                linked_assets.add(key)
+                ioc_asset_links.extend({'ioc_id': ioc_id, 'asset_id': imported_assets[key]} for ioc_id in ioc_links)
+
+    if imported_assets:
+        db.session.execute(delete(IocAssetLink.__table__).where(
+            IocAssetLink.__table__.c.asset_id.in_(list(imported_assets.values()))
+        ))
+    if ioc_asset_links:
+        db.session.execute(insert(IocAssetLink.__table__), ioc_asset_links)
+
+    if iocs_imported:
+        update_ioc_state(caseid=case_id, userid=user_id)
+    if imported_assets:
+        update_assets_state(caseid=case_id, userid=user_id)
+
+    return alerts_links
@@ -0,0 +1,268 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from sqlalchemy import delete
+from sqlalchemy import exists
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm import selectinload
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from app import app
+from app import db
+from app.iris_engine.alerts.minhash import MinHasher
+from app.iris_engine.alerts.minhash import estimate_similarity
+from app.iris_engine.alerts.minhash import get_iocs_tokens
+from app.iris_engine.alerts.minhash import get_lsh_buckets_hashes
+from app.iris_engine.alerts.minhash import get_text_shingles
+from app.iris_engine.alerts.minhash import pack_signature
+from app.iris_engine.alerts.minhash import unpack_signature
+from app.models.alerts import Alert
+from app.models.alerts import AlertLshBucket
+from app.models.alerts import AlertMinHashSignature
+
+# Maximum number of candidates sharing a bucket with an alert whose signatures are compared
+_MAX_CANDIDATES = 5000
+
+# Fields of the alerts their signatures and buckets are computed from
+ALERTS_MINHASH_FIELDS = ('alert_title', 'alert_description', 'alert_customer_id', 'iocs')
+
+_minhasher = None
+
+
+def _get_minhasher() -> MinHasher:
+    global _minhasher
+
+    num_perm = app.config.get('ALERTS_CLUSTERING_NUM_PERM')
+    if _minhasher is None or _minhasher.num_perm != num_perm:
+        _minhasher = MinHasher(num_perm)
+
+    return _minhasher
+
+
+def _get_signatures_buckets(text_signature: Optional[List[int]], iocs_signature: Optional[List[int]]) -> List[int]:
+    bands = app.config.get('ALERTS_CLUSTERING_BANDS')
+    buckets = []
+    if text_signature:
+        buckets.extend(get_lsh_buckets_hashes('text', text_signature, bands))
+    if iocs_signature:
+        buckets.extend(get_lsh_buckets_hashes('iocs', iocs_signature, bands))
+
+    return buckets
+
+
+def build_alert_minhash_entries(alert_id: int, customer_id: int, title: str, description: str,
+                                iocs: Iterable[tuple]) -> Tuple[Optional[dict], List[dict]]:
+    """
+    Compute the MinHash signatures of an alert and their LSH buckets
+
+    args:
+        alert_id (int): The ID of the alert
+        customer_id (int): The ID of the customer of the alert
+        title (str): The title of the alert
+        description (str): The description of the alert
+        iocs (list): The (IOC value, IOC type ID) pairs of the alert
+
+    returns:
+        tuple: The signatures entry, or None if the alert has neither text nor IOCs, and the buckets entries
+    """
+    minhasher = _get_minhasher()
+    text_signature = minhasher.signature(get_text_shingles(f'{title or ""} {description or ""}'))
+    iocs_signature = minhasher.signature(get_iocs_tokens(iocs))
+    if text_signature is None and iocs_signature is None:
+        return None, []
+
+    signature_entry = {
+        'alert_id': alert_id,
+        'customer_id': customer_id,
+        'text_signature': pack_signature(text_signature) if text_signature else None,
+        'iocs_signature': pack_signature(iocs_signature) if iocs_signature else None
+    }
+    buckets_entries = [{'customer_id': customer_id, 'bucket_hash': bucket_hash, 'alert_id': alert_id}
+                       for bucket_hash in set(_get_signatures_buckets(text_signature, iocs_signature))]
+
+    return signature_entry, buckets_entries
+
+
+def add_alerts_minhash_entries(signatures_entries: List[dict], buckets_entries: List[dict]) -> None:
+    """
+    Add the signatures and buckets of alerts to the current transaction, without committing it
+    """
+    if signatures_entries:
+        db.session.execute(pg_insert(AlertMinHashSignature).on_conflict_do_nothing(), signatures_entries)
+    if buckets_entries:
+        db.session.execute(insert(AlertLshBucket), buckets_entries)
+
+
+def cache_alert_minhash(alert: Alert) -> None:
+    """
+    Compute and store the signatures and buckets of an alert, with its IOCs
+    """
+    signature_entry, buckets_entries = build_alert_minhash_entries(
+        alert.alert_id, alert.alert_customer_id, alert.alert_title, alert.alert_description,
+        [(ioc.ioc_value, ioc.ioc_type_id) for ioc in alert.iocs]
+    )
+    if signature_entry is None:
+        return
+
+    # A concurrent computation of the same alert keeps its buckets, so that they are not duplicated
+    inserted = db.session.execute(
+        pg_insert(AlertMinHashSignature).values(**signature_entry).on_conflict_do_nothing().returning(
+            AlertMinHashSignature.alert_id)
+    ).first()
+    if inserted and buckets_entries:
+        db.session.execute(insert(AlertLshBucket), buckets_entries)
+
+    db.session.commit()
+
+
+def refresh_alerts_minhash(alerts: List[Alert]) -> None:
+    """
+    Replace the signatures and buckets of alerts whose title, description, IOCs or customer changed. When the
+    clustering is disabled they are only removed, and computed again when the near duplicates are requested
+    """
+    alert_ids = [alert.alert_id for alert in alerts]
+    db.session.execute(delete(AlertLshBucket).where(AlertLshBucket.alert_id.in_(alert_ids)))
+    db.session.execute(delete(AlertMinHashSignature).where(AlertMinHashSignature.alert_id.in_(alert_ids)))
+
+    if app.config.get('ALERTS_CLUSTERING_ENABLED'):
+        signatures_entries = []
+        buckets_entries = []
+        for alert in alerts:
+            signature_entry, alert_buckets_entries = build_alert_minhash_entries(
+                alert.alert_id, alert.alert_customer_id, alert.alert_title, alert.alert_description,
+                [(ioc.ioc_value, ioc.ioc_type_id) for ioc in alert.iocs]
+            )
+            if signature_entry is not None:
+                signatures_entries.append(signature_entry)
+                buckets_entries.extend(alert_buckets_entries)
+
+        add_alerts_minhash_entries(signatures_entries, buckets_entries)
+
+    db.session.commit()
+
+
+def backfill_alerts_minhash(before_alert_id: Optional[int], batch_size: int) -> Optional[int]:
+    """
+    Compute the signatures and buckets of a batch of alerts which have none, e.g. ingested before the clustering
+    was enabled, from the most recent ones. The alerts with neither text nor IOCs keep having no signatures, so
+    the batches are walked with the ID of the last alert processed rather than by looking for missing signatures.
+
+    args:
+        before_alert_id (int): Only alerts with a lower ID are processed, or None to start from the most recent
+        batch_size (int): The maximum number of alerts processed in the transaction
+
+    returns:
+        int: The lowest ID of the alerts processed, to pass to the next batch, or None when all were processed
+    """
+    query = db.session.query(Alert).options(
+        load_only(Alert.alert_id, Alert.alert_customer_id, Alert.alert_title, Alert.alert_description),
+        selectinload(Alert.iocs)
+    ).filter(
+        ~exists().where(AlertMinHashSignature.alert_id == Alert.alert_id)
+    )
+    if before_alert_id is not None:
+        query = query.filter(Alert.alert_id < before_alert_id)
+
+    alerts = query.order_by(Alert.alert_id.desc()).limit(batch_size).all()
+    if not alerts:
+        return None
+
+    signatures_entries = []
+    buckets_entries = {}
+    for alert in alerts:
+        signature_entry, alert_buckets_entries = build_alert_minhash_entries(
+            alert.alert_id, alert.alert_customer_id, alert.alert_title, alert.alert_description,
+            [(ioc.ioc_value, ioc.ioc_type_id) for ioc in alert.iocs]
+        )
+        if signature_entry is not None:
+            signatures_entries.append(signature_entry)
+            buckets_entries[alert.alert_id] = alert_buckets_entries
+
+    # The alerts whose signatures were computed concurrently keep their buckets, so that they are not duplicated
+    if signatures_entries:
+        inserted_ids = db.session.execute(
+            pg_insert(AlertMinHashSignature).values(signatures_entries).on_conflict_do_nothing().returning(
+                AlertMinHashSignature.alert_id)
+        ).scalars().all()
+        inserted_buckets_entries = [entry for alert_id in inserted_ids for entry in buckets_entries[alert_id]]
+        if inserted_buckets_entries:
+            db.session.execute(insert(AlertLshBucket), inserted_buckets_entries)
+
+    db.session.commit()
+
+    return alerts[-1].alert_id
+
+
+def get_alert_near_duplicates(alert: Alert, threshold: float, limit: int) -> List[Tuple[int, float]]:
+    """
+    Get the alerts of the same customer whose text or IOCs are near duplicates of the ones of an alert. The
+    candidates are the alerts sharing an LSH bucket with the alert, which signatures are then compared.
+    The signatures of the alert are computed on the fly if they are missing, e.g. for alerts ingested
+    before the clustering was enabled.
+
+    args:
+        alert (Alert): The alert
+        threshold (float): The minimum estimated Jaccard similarity of the text or the IOCs
+        limit (int): The maximum number of alerts to return
+
+    returns:
+        list: The (alert ID, similarity) pairs, the most similar first
+    """
+    signature = db.session.get(AlertMinHashSignature, alert.alert_id)
+    if signature is None:
+        cache_alert_minhash(alert)
+        signature = db.session.get(AlertMinHashSignature, alert.alert_id)
+        if signature is None:
+            return []
+
+    text_signature = unpack_signature(signature.text_signature) if signature.text_signature else None
+    iocs_signature = unpack_signature(signature.iocs_signature) if signature.iocs_signature else None
+
+    candidates_ids = db.session.query(AlertLshBucket.alert_id).filter(
+        AlertLshBucket.customer_id == alert.alert_customer_id,
+        AlertLshBucket.bucket_hash.in_(_get_signatures_buckets(text_signature, iocs_signature)),
+        AlertLshBucket.alert_id != alert.alert_id
+    ).distinct().limit(_MAX_CANDIDATES).scalar_subquery()
+
+    candidates = db.session.query(
+        AlertMinHashSignature.alert_id,
+        AlertMinHashSignature.text_signature,
+        AlertMinHashSignature.iocs_signature
+    ).filter(
+        AlertMinHashSignature.alert_id.in_(candidates_ids)
+    ).all()
+
+    near_duplicates = []
+    for candidate_id, candidate_text_signature, candidate_iocs_signature in candidates:
+        similarity = 0.0
+        if text_signature and candidate_text_signature:
+            similarity = estimate_similarity(text_signature, unpack_signature(candidate_text_signature))
+        if iocs_signature and candidate_iocs_signature:
+            similarity = max(similarity, estimate_similarity(iocs_signature, unpack_signature(candidate_iocs_signature)))
+
+        if similarity >= threshold:
+            near_duplicates.append((candidate_id, similarity))
+
+    near_duplicates.sort(key=lambda near_duplicate: (-near_duplicate[1], -near_duplicate[0]))
+
+    return near_duplicates[:limit]
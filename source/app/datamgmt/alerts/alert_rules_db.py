@@ -0,0 +1,92 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from datetime import datetime
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from app import db
+from app.models.alerts import AlertRule
+from app.models.alerts import AlertRuleAggregate
+
+
+def get_alert_rule(rule_id: int) -> AlertRule:
+    return db.session.get(AlertRule, rule_id)
+
+
+def get_alert_rules() -> List[AlertRule]:
+    return db.session.query(AlertRule).order_by(AlertRule.rule_order, AlertRule.rule_id).all()
+
+
+def save_alert_rule(rule: AlertRule) -> None:
+    # The engines of all the processes compile the rules again when their last update time changes
+    rule.rule_updated_at = datetime.utcnow()
+    db.session.add(rule)
+    db.session.commit()
+
+
+def delete_alert_rule(rule: AlertRule) -> None:
+    db.session.delete(rule)
+    db.session.commit()
+
+
+def get_alert_rule_aggregates(rule_id: int, since: datetime = None) -> List[AlertRuleAggregate]:
+    query = db.session.query(AlertRuleAggregate).filter(AlertRuleAggregate.rule_id == rule_id)
+    if since is not None:
+        query = query.filter(AlertRuleAggregate.bucket_start >= since)
+
+    return query.order_by(AlertRuleAggregate.bucket_start.desc(), AlertRuleAggregate.alerts_count.desc()).all()
+
+
+def record_alert_rules_hits(hits: Dict[int, int], aggregates: Dict[Tuple[int, int, str], int]) -> None:
+    """
+    Add the hits of a batch of alerts to the counters of the rules, with a statement per rule and a single upsert
+    of the aggregates into the bucket of the current hour
+
+    args:
+        hits (dict): The number of hits, per rule ID
+        aggregates (dict): The number of aggregated alerts, per (rule ID, customer ID, alert title)
+    """
+    now = datetime.utcnow()
+
+    # Updating the counters locks the rules, so that they cannot be deleted before their aggregates are inserted
+    existing_rules = set()
+    for rule_id, count in sorted(hits.items()):
+        existing_rules.update(db.session.execute(update(AlertRule).where(AlertRule.rule_id == rule_id).values(
+            rule_hit_count=AlertRule.rule_hit_count + count,
+            rule_last_hit_at=now
+        ).returning(AlertRule.rule_id)).scalars())
+
+    aggregates = {key: count for key, count in aggregates.items() if key[0] in existing_rules}
+    if aggregates:
+        bucket_start = now.replace(minute=0, second=0, microsecond=0)
+        statement = pg_insert(AlertRuleAggregate).values([
+            {'rule_id': rule_id, 'customer_id': customer_id, 'alert_title': alert_title,
+             'bucket_start': bucket_start, 'alerts_count': count, 'last_seen_at': now}
+            for (rule_id, customer_id, alert_title), count in sorted(aggregates.items())
+        ])
+        db.session.execute(statement.on_conflict_do_update(
+            index_elements=['rule_id', 'customer_id', 'alert_title', 'bucket_start'],
+            set_={'alerts_count': AlertRuleAggregate.alerts_count + statement.excluded.alerts_count,
+                  'last_seen_at': statement.excluded.last_seen_at}
+        ))
+
+    db.session.commit()
@@ -15,33 +15,42 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with this program; if not, write to the Free Software Foundation,
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
-from copy import deepcopy
-
+import base64
+import hashlib
 import json
+import math
 from datetime import datetime, timedelta
 from flask_login import current_user
-from sqlalchemy import desc, asc, func, tuple_, or_, not_, and_
-from sqlalchemy.orm import aliased, make_transient, selectinload
-from typing import List, Tuple
+from sqlalchemy import desc, asc, func, tuple_, or_, not_, and_, bindparam
+from sqlalchemy import delete
+from sqlalchemy import insert
+from sqlalchemy import text
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import aliased, selectinload, defer, undefer
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 import app
+from app import cache
 from app import db
-from app.datamgmt.case.case_assets_db import create_asset
-from app.datamgmt.case.case_assets_db import set_ioc_links
-from app.datamgmt.case.case_assets_db import get_unspecified_analysis_status_id
+from app.datamgmt.alerts.alert_case_import_db import add_case_tags
+from app.datamgmt.alerts.alert_case_import_db import import_alerts_objects_in_case
+from app.datamgmt.alerts.alert_clustering_db import add_alerts_minhash_entries
+from app.datamgmt.alerts.alert_clustering_db import build_alert_minhash_entries
 from app.datamgmt.case.case_events_db import update_event_assets
 from app.datamgmt.case.case_events_db import update_event_iocs
-from app.datamgmt.case.case_iocs_db import add_ioc
 from app.datamgmt.manage.manage_access_control_db import get_user_clients_id
 from app.datamgmt.manage.manage_case_state_db import get_case_state_by_name
 from app.datamgmt.manage.manage_case_templates_db import get_case_template_by_id
 from app.datamgmt.manage.manage_case_templates_db import case_template_post_modifier
+from app.datamgmt.partitions import create_monthly_partition
+from app.datamgmt.partitions import drop_monthly_partitions
 from app.datamgmt.states import update_timeline_state
 from app.iris_engine.access_control.utils import ac_current_user_has_permission
+from app.iris_engine.alerts.correlation import get_alerts_correlation_index
 from app.iris_engine.utils.common import parse_bf_date_format
 from app.models.cases import Cases
 from app.models.models import EventCategory
-from app.models.models import Tags
 from app.models.models import AssetsType
 from app.models.models import Comments
 from app.models.models import CaseAssets
@@ -49,16 +58,26 @@ from app.models.models import alert_assets_association
 from app.models.models import alert_iocs_association
 from app.models.models import Ioc
 from app.models.models import Client
+from app.models.models import CaseClassification
+from app.models.models import ObjectHistory
 from app.models.alerts import Alert
 from app.models.alerts import AlertStatus
 from app.models.alerts import AlertCaseAssociation
 from app.models.alerts import SimilarAlertsCache
+from app.models.alerts import SimilarAlertsCacheDeletion
 from app.models.alerts import AlertResolutionStatus
 from app.models.alerts import AlertSimilarity
+from app.models.alerts import AlertIngestionTicket
+from app.models.alerts import AlertArchive
+from app.models.alerts import AlertsGeneration
+from app.models.alerts import AlertsGenerationLog
+from app.models.alerts import AlertIngestionStatusList
 from app.models.alerts import Severity
 from app.models.authorization import Permissions
 from app.models.authorization import User
 from app.schema.marshables import EventSchema
+from app.schema.marshables import AlertSchema
+from app.schema.marshables import CommentSchema
 from app.util import add_obj_history_entry
 
 
@@ -143,7 +162,199 @@ def combine_conditions(conditions, logical_operator):
         return None
 
 
-def get_filtered_alerts(
+ALERTS_COUNT_MODES = ('exact', 'estimated', 'cached', 'none')
+
+# Loader options applied to the alerts list, depending on the fields which are serialized
+ALERTS_LIST_RELATIONSHIPS_LOADERS = {
+    'severity': [selectinload(Alert.severity)],
+    'status': [selectinload(Alert.status)],
+    'customer': [selectinload(Alert.customer)],
+    'classification': [selectinload(Alert.classification)],
+    'owner': [selectinload(Alert.owner)],
+    'resolution_status': [selectinload(Alert.resolution_status)],
+    'cases': [selectinload(Alert.cases)],
+    'comments': [selectinload(Alert.comments)],
+    'iocs': [selectinload(Alert.iocs).selectinload(Ioc.ioc_type),
+             selectinload(Alert.iocs).selectinload(Ioc.tlp)],
+    'assets': [selectinload(Alert.assets).selectinload(CaseAssets.asset_type),
+               selectinload(Alert.assets).selectinload(CaseAssets.analysis_status)]
+}
+
+ALERTS_LIST_DEFERRABLE_COLUMNS = {
+    'alert_source_content': Alert.alert_source_content,
+    'modification_history': Alert.modification_history
+}
+
+
+def _get_alerts_search_vector():
+    """
+    Full-text vector of the alerts, which must stay identical to the idx_alerts_search_tsv index expression
+    """
+    return func.to_tsvector('simple', func.coalesce(Alert.alert_title, '') + ' ' +
+                            func.coalesce(Alert.alert_description, ''))
+
+
+def _get_alerts_list_loader_options(fields: List[str] = None):
+    """
+    Build the loader options of the alerts list so that only the relationships and heavy columns
+    which are serialized are fetched
+    """
+    if fields is None:
+        return [
+            selectinload(Alert.severity),
+            selectinload(Alert.status),
+            selectinload(Alert.customer),
+            selectinload(Alert.cases),
+            selectinload(Alert.iocs),
+            selectinload(Alert.assets)
+        ]
+
+    options = []
+    for field, loaders in ALERTS_LIST_RELATIONSHIPS_LOADERS.items():
+        if field in fields:
+            options.extend(loaders)
+
+    for field, column in ALERTS_LIST_DEFERRABLE_COLUMNS.items():
+        options.append(undefer(column) if field in fields else defer(column))
+
+    return options
+
+
+class AlertsPage:
+    """
+    Page of alerts returned when the alerts are not paginated with an exact offset pagination.
+    It exposes the same attributes as the Flask-SQLAlchemy Pagination object, plus the cursor
+    of the next page when keyset pagination is used. The total is None when it was not requested.
+    """
+    def __init__(self, items, page, per_page, total, has_next, next_cursor=None):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.has_next = has_next
+        self.next_cursor = next_cursor
+
+    @property
+    def pages(self):
+        if self.total is None:
+            return None
+
+        return math.ceil(self.total / self.per_page) if self.per_page else 0
+
+    @property
+    def next_num(self):
+        if not self.has_next or self.page is None:
+            return None
+
+        return self.page + 1
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+def encode_alerts_cursor(alert: Alert) -> str:
+    """
+    Encode the position of an alert in the alerts list into an opaque cursor
+    """
+    position = [alert.alert_source_event_time.isoformat(), alert.alert_id]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_alerts_cursor(cursor: str):
+    """
+    Decode a cursor produced by encode_alerts_cursor
+
+    raises:
+        ValueError: if the cursor is invalid
+    """
+    try:
+        event_time, alert_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(event_time), int(alert_id)
+
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+
+
+def _count_alerts(query, count: str):
+    """
+    Count the alerts matching a query, either exactly, from the cache, or from the planner estimate
+    """
+    if count == 'none':
+        return None
+
+    query = query.order_by(None)
+
+    if count == 'estimated':
+        statement = query.with_entities(Alert.alert_id).statement
+        compiled = statement.compile(dialect=db.engine.dialect, compile_kwargs={'render_postcompile': True})
+        plan = db.session.connection().exec_driver_sql(f'EXPLAIN (FORMAT JSON) {compiled}',
+                                                       compiled.params).scalar()
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    if count == 'cached':
+        statement = query.with_entities(Alert.alert_id).statement
+        compiled = statement.compile(dialect=db.engine.dialect, compile_kwargs={'render_postcompile': True})
+        key = hashlib.sha256(f'{compiled}{sorted(compiled.params.items())}'.encode()).hexdigest()
+        key = f'iris_alerts_count_{key}'
+
+        total = cache.get(key)
+        if total is None:
+            total = query.count()
+            cache.set(key, total, timeout=app.app.config.get('ALERTS_COUNT_CACHE_TIMEOUT'))
+
+        return total
+
+    return query.count()
+
+
+def get_alerts_generations(customer_ids: List[int] = None) -> List[Tuple[int, int]]:
+    """
+    Get the write counters of the alerts of some customers. Customers whose alerts were never written have no counter
+
+    args:
+        customer_ids (list): The IDs of the customers, or None for all the customers
+
+    returns:
+        list: The (customer_id, generation) pairs, ordered by customer
+    """
+    counters = db.session.query(AlertsGeneration.customer_id, AlertsGeneration.generation)
+    logged_writes = db.session.query(
+        AlertsGenerationLog.customer_id, func.count().label('generation')
+    ).group_by(AlertsGenerationLog.customer_id)
+
+    if customer_ids is not None:
+        counters = counters.filter(AlertsGeneration.customer_id.in_(customer_ids))
+        logged_writes = logged_writes.filter(AlertsGenerationLog.customer_id.in_(customer_ids))
+
+    generations = counters.union_all(logged_writes).subquery()
+    query = db.session.query(
+        generations.c.customer_id, func.sum(generations.c.generation).label('generation')
+    ).group_by(generations.c.customer_id).order_by(generations.c.customer_id)
+
+    return [(row.customer_id, int(row.generation)) for row in query.all()]
+
+
+def compact_alerts_generations() -> int:
+    """
+    Fold the logged writes to the alerts into the counters of their customers. The generations are left unchanged,
+    as the logged writes are moved by a single statement.
+
+    returns:
+        int: The number of customers whose counter was updated
+    """
+    result = db.session.execute(text("""
+        WITH moved AS (DELETE FROM alerts_generation_log RETURNING customer_id)
+        INSERT INTO alerts_generation (customer_id, generation)
+        SELECT customer_id, count(*) FROM moved GROUP BY customer_id ORDER BY customer_id
+        ON CONFLICT (customer_id) DO UPDATE SET generation = alerts_generation.generation + EXCLUDED.generation
+    """))
+    db.session.commit()
+
+    return result.rowcount
+
+
+def filter_alerts_query(
+        query,
         start_date: str = None,
         end_date: str = None,
         source_start_date: str = None,
@@ -162,48 +373,20 @@ def get_filtered_alerts(
         assets: List[str] = None,
         iocs: List[str] = None,
         resolution_status: List[int] = None,
-        logical_operator: str = 'and',  # Logical operator: 'and', 'or', 'not'
-        page: int = 1,
-        per_page: int = 10,
-        sort: str = 'desc',
+        logical_operator: str = 'and',
         current_user_id: int = None,
         source_reference=None,
-        custom_conditions: List[dict] = None):
+        custom_conditions: List[dict] = None,
+        search: str = None):
     """
-    Get a list of alerts that match the given filter conditions
+    Apply the filter conditions of the alerts list to a query selecting alerts. See get_filtered_alerts for the
+    description of the conditions
 
     args:
-        start_date (datetime): The start date of the alert creation time
-        end_date (datetime): The end date of the alert creation time
-        title (str): The title of the alert
-        description (str): The description of the alert
-        status (str): The status of the alert
-        severity (str): The severity of the alert
-        owner (str): The owner of the alert
-        source (str): The source of the alert
-        tags (str): The tags of the alert
-        case_id (int): The case id of the alert
-        client (int): The client id of the alert
-        classification (int): The classification id of the alert
-        alert_ids (int): The alert ids
-        assets (list): The assets of the alert
-        iocs (list): The iocs of the alert
-        resolution_status (list): The resolution status of the alert
-        logical_operator (str): Logical operator to combine conditions ('and', 'or', 'not')
-        page (int): The page number
-        per_page (int): The number of alerts per page
-        sort (str): The sort order
-        current_user_id (int): The ID of the current user
-        source_reference (str): Alert source reference
-        custom_conditions (list): Custom conditions to be applied (e.g., NOT client AND owner_id in [1,2,3])
-
-    returns:
-        list: A list of alerts that match the given filter conditions
-        ...
-        fields (List[str]): The list of fields to include in the output
+        query: The query selecting alerts
 
     returns:
-        dict: Dictionary with pagination info and list of serialized alerts
+        The filtered query, or None if the custom conditions cannot be parsed
     """
     conditions = []
 
@@ -225,6 +408,9 @@ def get_filtered_alerts(
     if description is not None:
         conditions.append(Alert.alert_description.ilike(f'%{description}%'))
 
+    if search is not None:
+        conditions.append(_get_alerts_search_vector().bool_op('@@')(func.websearch_to_tsquery('simple', search)))
+
     if status is not None:
         conditions.append(Alert.alert_status_id == status)
 
@@ -278,17 +464,6 @@ def get_filtered_alerts(
         if clients_filters is not None:
             conditions.append(Alert.alert_customer_id.in_(clients_filters))
 
-    query = db.session.query(
-        Alert
-    ).options(
-        selectinload(Alert.severity),
-        selectinload(Alert.status),
-        selectinload(Alert.customer),
-        selectinload(Alert.cases),
-        selectinload(Alert.iocs),
-        selectinload(Alert.assets)
-    )
-
     # Apply custom conditions if provided
     if custom_conditions:
         if isinstance(custom_conditions, str):
@@ -343,28 +518,212 @@ def get_filtered_alerts(
                 condition = build_condition(field, operator, value)
                 conditions.append(condition)
 
-        # Combine conditions
     combined_conditions = combine_conditions(conditions, logical_operator)
 
+    if combined_conditions is not None:
+        query = query.filter(combined_conditions)
+
+    return query
+
+
+def get_filtered_alerts(
+        start_date: str = None,
+        end_date: str = None,
+        source_start_date: str = None,
+        source_end_date: str = None,
+        title: str = None,
+        description: str = None,
+        status: int = None,
+        severity: int = None,
+        owner: int = None,
+        source: str = None,
+        tags: str = None,
+        case_id: int = None,
+        client: int = None,
+        classification: int = None,
+        alert_ids: List[int] = None,
+        assets: List[str] = None,
+        iocs: List[str] = None,
+        resolution_status: List[int] = None,
+        logical_operator: str = 'and',  # Logical operator: 'and', 'or', 'not'
+        page: int = 1,
+        per_page: int = 10,
+        sort: str = 'desc',
+        current_user_id: int = None,
+        source_reference=None,
+        custom_conditions: List[dict] = None,
+        cursor: str = None,
+        count: str = None,
+        fields: List[str] = None,
+        search: str = None):
+    """
+    Get a list of alerts that match the given filter conditions
+
+    args:
+        start_date (datetime): The start date of the alert creation time
+        end_date (datetime): The end date of the alert creation time
+        title (str): The title of the alert
+        description (str): The description of the alert
+        status (str): The status of the alert
+        severity (str): The severity of the alert
+        owner (str): The owner of the alert
+        source (str): The source of the alert
+        tags (str): The tags of the alert
+        case_id (int): The case id of the alert
+        client (int): The client id of the alert
+        classification (int): The classification id of the alert
+        alert_ids (int): The alert ids
+        assets (list): The assets of the alert
+        iocs (list): The iocs of the alert
+        resolution_status (list): The resolution status of the alert
+        logical_operator (str): Logical operator to combine conditions ('and', 'or', 'not')
+        page (int): The page number
+        per_page (int): The number of alerts per page
+        sort (str): The sort order
+        current_user_id (int): The ID of the current user
+        source_reference (str): Alert source reference
+        custom_conditions (list): Custom conditions to be applied (e.g., NOT client AND owner_id in [1,2,3])
+        cursor (str): Cursor of the page to fetch with keyset pagination. An empty string fetches the first page.
+                      When set, page is ignored
+        count (str): How the total is computed: 'exact', 'estimated' (from the planner), 'cached' or 'none'.
+                     Defaults to 'exact' with offset pagination and 'none' with keyset pagination
+        fields (list): The fields which are serialized. Only the matching relationships and heavy columns are loaded.
+                       When None, the historical set of relationships is loaded
+        search (str): Keywords searched in the title and description of the alerts, in web search syntax
+
+    returns:
+        list: A list of alerts that match the given filter conditions
+        ...
+        fields (List[str]): The list of fields to include in the output
+
+    returns:
+        dict: Dictionary with pagination info and list of serialized alerts
+    """
+    if count is None:
+        count = 'none' if cursor is not None else 'exact'
+
+    if count not in ALERTS_COUNT_MODES:
+        raise ValueError(f'Invalid count mode. Expected one of {", ".join(ALERTS_COUNT_MODES)}')
+
+    cursor_position = decode_alerts_cursor(cursor) if cursor else None
+
+    query = db.session.query(
+        Alert
+    ).options(
+        *_get_alerts_list_loader_options(fields)
+    )
+
+    query = filter_alerts_query(query, start_date=start_date, end_date=end_date, source_start_date=source_start_date,
+                                source_end_date=source_end_date, title=title, description=description, status=status,
+                                severity=severity, owner=owner, source=source, tags=tags, case_id=case_id,
+                                client=client, classification=classification, alert_ids=alert_ids, assets=assets,
+                                iocs=iocs, resolution_status=resolution_status, logical_operator=logical_operator,
+                                current_user_id=current_user_id, source_reference=source_reference,
+                                custom_conditions=custom_conditions, search=search)
+    if query is None:
+        return None
+
     order_func = desc if sort == "desc" else asc
 
     try:
-        # Query the alerts using the filter conditions
+        query = query.order_by(
+            order_func(Alert.alert_source_event_time),
+            order_func(Alert.alert_id)
+        )
+
+        if cursor is None and count == 'exact':
+            return query.paginate(page=page, per_page=per_page, error_out=False)
+
+        total = _count_alerts(query, count)
+
+        if cursor is None:
+            items = query.limit(per_page + 1).offset((page - 1) * per_page).all()
+            return AlertsPage(items[:per_page], page, per_page, total, has_next=len(items) > per_page)
 
-        if combined_conditions is not None:
-            query = query.filter(combined_conditions)
+        if cursor_position is not None:
+            position = tuple_(Alert.alert_source_event_time, Alert.alert_id)
+            if sort == 'desc':
+                query = query.filter(position < tuple_(*cursor_position))
+            else:
+                query = query.filter(position > tuple_(*cursor_position))
 
-        filtered_alerts = query.order_by(
-            order_func(Alert.alert_source_event_time)
-        ).paginate(page=page, per_page=per_page, error_out=False)
+        items = query.limit(per_page + 1).all()
+        has_next = len(items) > per_page
+        items = items[:per_page]
 
-        return filtered_alerts
+        return AlertsPage(items, None, per_page, total, has_next=has_next,
+                          next_cursor=encode_alerts_cursor(items[-1]) if has_next else None)
 
     except Exception as e:
         app.app.logger.exception(f"Error getting alerts: {str(e)}")
         return None
 
 
+# Columns of the alerts which are exported
+ALERTS_EXPORT_COLUMNS = ('alert_id', 'alert_uuid', 'alert_title', 'alert_description', 'alert_source',
+                         'alert_source_ref', 'alert_source_link', 'alert_source_event_time', 'alert_creation_time',
+                         'alert_tags', 'alert_note', 'alert_context', 'alert_customer_id', 'alert_severity_id',
+                         'alert_status_id', 'alert_owner_id', 'alert_classification_id', 'alert_resolution_status_id')
+
+# Names of the objects related to the alerts which are exported
+ALERTS_EXPORT_RELATED_NAMES = ('customer_name', 'severity_name', 'status_name', 'owner_login', 'classification_name',
+                               'resolution_status_name')
+
+
+def get_filtered_alerts_export_rows(filters: dict, sort: str = 'desc', include_source_content: bool = False,
+                                    batch_size: int = 1000) -> Iterator:
+    """
+    Stream the alerts matching the filter conditions of the alerts list as flat rows, without loading the alerts
+    nor their relationships. The rows are fetched by batches from a server side cursor, so the memory used does not
+    depend on the number of alerts.
+
+    args:
+        filters (dict): The filter conditions, as accepted by get_filtered_alerts
+        sort (str): The sort order on the source event time
+        include_source_content (bool): Whether to fetch the inline source content and the reference of the
+                                       offloaded one
+        batch_size (int): The number of rows fetched at once
+
+    returns:
+        Iterator: The rows, with the ALERTS_EXPORT_COLUMNS and the ALERTS_EXPORT_RELATED_NAMES
+    """
+    severity = aliased(Severity)
+    status = aliased(AlertStatus)
+    customer = aliased(Client)
+    owner = aliased(User)
+    classification = aliased(CaseClassification)
+    resolution_status = aliased(AlertResolutionStatus)
+
+    columns = [getattr(Alert, column) for column in ALERTS_EXPORT_COLUMNS]
+    columns += [
+        customer.name.label('customer_name'),
+        severity.severity_name.label('severity_name'),
+        status.status_name.label('status_name'),
+        owner.user.label('owner_login'),
+        classification.name.label('classification_name'),
+        resolution_status.resolution_status_name.label('resolution_status_name')
+    ]
+    if include_source_content:
+        columns += [Alert._alert_source_content.label('alert_source_content'), Alert.alert_source_content_ref]
+
+    query = db.session.query(*columns).select_from(Alert)
+    query = query.outerjoin(customer, customer.client_id == Alert.alert_customer_id)
+    query = query.outerjoin(severity, severity.severity_id == Alert.alert_severity_id)
+    query = query.outerjoin(status, status.status_id == Alert.alert_status_id)
+    query = query.outerjoin(owner, owner.id == Alert.alert_owner_id)
+    query = query.outerjoin(classification, classification.id == Alert.alert_classification_id)
+    query = query.outerjoin(resolution_status,
+                            resolution_status.resolution_status_id == Alert.alert_resolution_status_id)
+
+    query = filter_alerts_query(query, **filters)
+    if query is None:
+        raise ValueError('Invalid custom conditions')
+
+    order_func = desc if sort == 'desc' else asc
+    query = query.order_by(order_func(Alert.alert_source_event_time), order_func(Alert.alert_id))
+
+    return iter(query.yield_per(batch_size))
+
 
 def add_alert(
         title,
@@ -422,6 +781,94 @@ def get_alert_by_id(alert_id: int) -> Alert:
     )
 
 
+def get_alerts_by_ids(alert_ids: List[int]) -> List[Alert]:
+    """
+    Get multiple alerts from the database
+
+    args:
+        alert_ids (List[int]): The IDs of the alerts
+
+    returns:
+        list: The alerts that were retrieved from the database
+    """
+    return (
+        db.session.query(Alert)
+        .options(selectinload(Alert.iocs), selectinload(Alert.assets))
+        .filter(Alert.alert_id.in_(alert_ids))
+        .all()
+    )
+
+
+def get_alerts_fields_values(alert_ids: List[int], fields: List[str]):
+    """
+    Get the current values of some fields of multiple alerts, without loading the alerts
+
+    args:
+        alert_ids (List[int]): The IDs of the alerts
+        fields (List[str]): The names of the columns to fetch
+
+    returns:
+        list: Rows with the alert_id, alert_customer_id, alert_owner_id and requested fields of each alert
+    """
+    columns = [Alert.alert_id, Alert.alert_customer_id, Alert.alert_owner_id]
+    columns += [getattr(Alert, field) for field in fields if field not in ('alert_customer_id', 'alert_owner_id')]
+
+    return db.session.query(*columns).filter(Alert.alert_id.in_(alert_ids)).all()
+
+
+def update_alerts_batch(alert_ids: List[int], updates: dict, default_owner_id: int = None,
+                        history_actions: dict = None, user: User = None) -> None:
+    """
+    Update multiple alerts with set-based statements: one UPDATE for the fields, one to assign the alerts
+    without owner, and a single multi-row insert of the history entries
+
+    args:
+        alert_ids (List[int]): The IDs of the alerts to update
+        updates (dict): The new values of the columns
+        default_owner_id (int): Owner assigned to the alerts which have none, if any
+        history_actions (dict): The alerts IDs, per history action to append to the alerts history
+        user (User): The user the history entries are attributed to
+
+    returns:
+        None
+    """
+    try:
+        if updates:
+            db.session.execute(
+                update(Alert).where(Alert.alert_id.in_(alert_ids)).values(**updates),
+                execution_options={'synchronize_session': False}
+            )
+
+        if default_owner_id is not None:
+            db.session.execute(
+                update(Alert).where(
+                    Alert.alert_id.in_(alert_ids),
+                    Alert.alert_owner_id.is_(None)
+                ).values(alert_owner_id=default_owner_id),
+                execution_options={'synchronize_session': False}
+            )
+
+        history_entries = [
+            {
+                'object_type': Alert.__tablename__,
+                'object_id': alert_id,
+                'user_name': user.user,
+                'user_id': user.id,
+                'action': action
+            }
+            for action, action_alert_ids in (history_actions or {}).items()
+            for alert_id in action_alert_ids
+        ]
+        if history_entries:
+            db.session.execute(insert(ObjectHistory), history_entries)
+
+        db.session.commit()
+
+    except Exception:
+        db.session.rollback()
+        raise
+
+
 def get_unspecified_event_category():
     """
     Get the id of the 'Unspecified' event category
@@ -456,6 +903,8 @@ def create_case_from_alerts(alerts: List[Alert], iocs_list: List[str], assets_li
     if note:
         escalation_note = f"\n\n### Escalation note\n\n{note}\n\n"
 
+    case_template_title_prefix = ""
+
     if template_id is not None and template_id != 0 and template_id != '':
         case_template = get_case_template_by_id(template_id)
         if case_template:
@@ -477,42 +926,16 @@ def create_case_from_alerts(alerts: List[Alert], iocs_list: List[str], assets_li
 
     case.save()
 
-    for tag in case_tags.split(','):
-        tag = Tags(tag_title=tag)
-        tag = tag.save()
-        case.tags.append(tag)
+    add_case_tags(case.case_id, case_tags)
 
-    db.session.commit()
+    # Import the selected IOCs and assets of all the alerts at once
+    alerts_links = import_alerts_objects_in_case(alerts, case.case_id, iocs_list, assets_list, current_user.id)
 
     # Link the alert to the case
     for alert in alerts:
         alert.cases.append(case)
 
-        ioc_links = []
-        asset_links = []
-
-        # Add the IOCs to the case
-        for ioc_uuid in iocs_list:
-            for alert_ioc in alert.iocs:
-                if str(alert_ioc.ioc_uuid) == ioc_uuid:
-
-                    add_ioc(alert_ioc, current_user.id, case.case_id)
-                    ioc_links.append(alert_ioc.ioc_id)
-
-        # Add the assets to the case
-        for asset_uuid in assets_list:
-            for alert_asset in alert.assets:
-                if str(alert_asset.asset_uuid) == asset_uuid:
-                    alert_asset.analysis_status_id = get_unspecified_analysis_status_id()
-
-                    asset = create_asset(asset=alert_asset,
-                                         caseid=case.case_id,
-                                         user_id=current_user.id
-                                         )
-                    asset.asset_uuid = alert_asset.asset_uuid
-
-                    set_ioc_links(ioc_links, asset.asset_id)
-                    asset_links.append(asset.asset_id)
+        ioc_links, asset_links = alerts_links[alert.alert_id]
 
         # Add event to timeline
         if import_as_event:
@@ -608,85 +1031,15 @@ def create_case_from_alert(alert: Alert, iocs_list: List[str], assets_list: List
 
     case.save()
 
-    for tag in case_tags.split(','):
-        tag = Tags(tag_title=tag)
-        tag = tag.save()
-        case.tags.append(tag)
+    add_case_tags(case.case_id, case_tags)
 
     case.severity_id = alert.alert_severity_id
 
-    db.session.commit()
-
     # Link the alert to the case
     alert.cases.append(case)
 
-    ioc_links = []
-    asset_links = []
-
-    # Add the IOCs to the case
-    for ioc_uuid in iocs_list:
-        for alert_ioc in alert.iocs:
-            if str(alert_ioc.ioc_uuid) == ioc_uuid:
-
-                # Make sure we don't have an existing IOC already
-                tmp_ioc = Ioc.query.filter(
-                    Ioc.case_id == case.case_id,
-                    Ioc.ioc_value == alert_ioc.ioc_value,
-                    Ioc.ioc_type_id == alert_ioc.ioc_type_id
-                ).first()
-
-                if tmp_ioc:
-                    # Skip as we already have it in the case
-                    ioc_links.append(tmp_ioc.ioc_id)
-                    continue
-
-                if alert_ioc.case_id is not None:
-                    # Make a deep copy of the ioc
-                    # prevent the ioc to conflict with the existing ioc
-                    new_alert_ioc = deepcopy(alert_ioc)
-                    make_transient(new_alert_ioc)
-
-                    new_alert_ioc.ioc_id = None
-                    new_alert_ioc.ioc_uuid = ioc_uuid
-                    new_alert_ioc.user_id = current_user.id
-                    new_alert_ioc.case_id = case.case_id
-
-                    db.session.add(new_alert_ioc)
-                    db.session.commit()
-
-                    alert_ioc = new_alert_ioc
-
-                add_ioc(alert_ioc, current_user.id, case.case_id)
-                ioc_links.append(alert_ioc.ioc_id)
-
-    # Add the assets to the case
-    for asset_uuid in assets_list:
-        for alert_asset in alert.assets:
-            if str(alert_asset.asset_uuid) == asset_uuid:
-                alert_asset.analysis_status_id = get_unspecified_analysis_status_id()
-
-                if alert_asset.case_id is not None:
-                    # Make a deep copy of the asset
-                    # prevent the asset to conflict with the existing asset
-                    new_alert_asset = deepcopy(alert_asset)
-                    make_transient(new_alert_asset)
-
-                    new_alert_asset.asset_id = None
-                    new_alert_asset.asset_uuid = asset_uuid
-
-                    db.session.add(new_alert_asset)
-                    db.session.commit()
-
-                    alert_asset = new_alert_asset
-
-                asset = create_asset(asset=alert_asset,
-                                     caseid=case.case_id,
-                                     user_id=current_user.id
-                                     )
-                asset.asset_uuid = alert_asset.asset_uuid
-
-                set_ioc_links(ioc_links, asset.asset_id)
-                asset_links.append(asset.asset_id)
+    ioc_links, asset_links = import_alerts_objects_in_case([alert], case.case_id, iocs_list, assets_list,
+                                                           current_user.id)[alert.alert_id]
 
     # Add event to timeline
     if import_as_event:
@@ -747,115 +1100,91 @@ def merge_alert_in_case(alert: Alert, case: Cases, iocs_list: List[str],
         alert (Alert): The Alert
         case (Cases): The Case
         iocs_list (list): The list of IOCs
-        case_title (str): The title of the case
         assets_list (list): The list of assets
         note (str): The note to add to the case
         import_as_event (bool): Whether to import the alert as an event
         case_tags (str): The tags to add to the case
     """
-    if case in alert.cases:
-        return case
+    merge_alerts_in_case([alert], case, iocs_list=iocs_list, assets_list=assets_list, note=note,
+                         import_as_event=import_as_event, case_tags=case_tags)
 
-    escalation_note = ""
-    if note:
-        escalation_note = f"\n\n### Escalation note\n\n{note}\n\n"
 
-    case.description += f"\n\n*Alert [#{alert.alert_id}](/alerts?alert_ids={alert.alert_id}) escalated by {current_user.name}*\n\n{escalation_note}"
-
-    for tag in case_tags.split(',') if case_tags else []:
-        tag = Tags(tag_title=tag).save()
-        case.tags.append(tag)
-
-    # Link the alert to the case
-    alert.cases.append(case)
-
-    ioc_links = []
-    asset_links = []
-
-    # Add the IOCs to the case
-    for ioc_uuid in iocs_list:
-        for alert_ioc in alert.iocs:
-            if str(alert_ioc.ioc_uuid) == ioc_uuid:
-
-                tmp_ioc = Ioc.query.filter(
-                    Ioc.case_id == case.case_id,
-                    Ioc.ioc_value == alert_ioc.ioc_value,
-                    Ioc.ioc_type_id == alert_ioc.ioc_type_id
-                ).first()
-
-                if tmp_ioc:
-                    alert_ioc = tmp_ioc
+def merge_alerts_in_case(alerts: List[Alert], case: Cases, iocs_list: List[str],
+                         assets_list: List[str], note: str, import_as_event: bool, case_tags: str):
+    """
+    Merge alerts in a case, within a single transaction. The IOCs and assets of all the alerts are imported
+    at once, the alerts already merged in the case being skipped.
 
-                add_ioc(alert_ioc, current_user.id, case.case_id)
-                ioc_links.append(alert_ioc.ioc_id)
+    args:
+        alerts (list): The Alerts
+        case (Cases): The Case
+        iocs_list (list): The list of IOCs
+        assets_list (list): The list of assets
+        note (str): The note to add to the case, for each alert
+        import_as_event (bool): Whether to import the alerts as events
+        case_tags (str): The tags to add to the case
+    """
+    alerts = [alert for alert in alerts if case not in alert.cases]
+    if not alerts:
+        return
 
-    # Add the assets to the case
-    for asset_uuid in assets_list:
-        for alert_asset in alert.assets:
-            # Filter selected assets by the user
-            if str(alert_asset.asset_uuid) == asset_uuid:
+    escalation_note = ""
+    if note:
+        escalation_note = f"\n\n### Escalation note\n\n{note}\n\n"
 
-                alert_asset.analysis_status_id = get_unspecified_analysis_status_id()
+    add_case_tags(case.case_id, case_tags)
 
-                tmp_asset = CaseAssets.query.filter(and_(
-                    CaseAssets.asset_name == alert_asset.asset_name,
-                    CaseAssets.asset_type_id == alert_asset.asset_type_id,
-                    CaseAssets.case_id == case.case_id
-                )).first()
+    alerts_links = import_alerts_objects_in_case(alerts, case.case_id, iocs_list, assets_list, current_user.id)
 
-                if tmp_asset:
-                    asset = tmp_asset
-                else:
-                    asset = create_asset(asset=alert_asset,
-                                         caseid=case.case_id,
-                                         user_id=current_user.id
-                                         )
+    for alert in alerts:
+        case.description += f"\n\n*Alert [#{alert.alert_id}](/alerts?alert_ids={alert.alert_id}) escalated by {current_user.name}*\n\n{escalation_note}"
 
-                    set_ioc_links(ioc_links, asset.asset_id)
+        # Link the alert to the case
+        alert.cases.append(case)
 
-                asset_links.append(asset.asset_id)
+        ioc_links, asset_links = alerts_links[alert.alert_id]
 
-    # Add event to timeline
-    if import_as_event:
-        unspecified_cat = get_unspecified_event_category()
+        # Add event to timeline
+        if import_as_event:
+            unspecified_cat = get_unspecified_event_category()
 
-        event_schema = EventSchema()
-        event = event_schema.load({
-            'event_title': f"[ALERT] {alert.alert_title}",
-            'event_content': alert.alert_description,
-            'event_source': alert.alert_source,
-            'event_raw': json.dumps(alert.alert_source_content, indent=4),
-            'event_date': alert.alert_source_event_time.strftime("%Y-%m-%dT%H:%M:%S.%f"),
-            'event_date_wtz': alert.alert_source_event_time.strftime("%Y-%m-%dT%H:%M:%S.%f"),
-            'event_iocs': ioc_links,
-            'event_assets': asset_links,
-            'event_tags': alert.alert_tags,
-            'event_tz': '+00:00',
-            'event_category_id': unspecified_cat.id,
-            'event_in_graph': True,
-            'event_in_summary': True
-        }, session=db.session)
+            event_schema = EventSchema()
+            event = event_schema.load({
+                'event_title': f"[ALERT] {alert.alert_title}",
+                'event_content': alert.alert_description,
+                'event_source': alert.alert_source,
+                'event_raw': json.dumps(alert.alert_source_content, indent=4),
+                'event_date': alert.alert_source_event_time.strftime("%Y-%m-%dT%H:%M:%S.%f"),
+                'event_date_wtz': alert.alert_source_event_time.strftime("%Y-%m-%dT%H:%M:%S.%f"),
+                'event_iocs': ioc_links,
+                'event_assets': asset_links,
+                'event_tags': alert.alert_tags,
+                'event_tz': '+00:00',
+                'event_category_id': unspecified_cat.id,
+                'event_in_graph': True,
+                'event_in_summary': True
+            }, session=db.session)
 
-        event.case_id = case.case_id
-        event.user_id = current_user.id
-        event.event_added = datetime.utcnow()
+            event.case_id = case.case_id
+            event.user_id = current_user.id
+            event.event_added = datetime.utcnow()
 
-        add_obj_history_entry(event, 'created')
+            add_obj_history_entry(event, 'created')
 
-        db.session.add(event)
-        update_timeline_state(caseid=case.case_id)
+            db.session.add(event)
+            update_timeline_state(caseid=case.case_id)
 
-        event.category = [unspecified_cat]
+            event.category = [unspecified_cat]
 
-        update_event_assets(event_id=event.event_id,
-                            caseid=case.case_id,
-                            assets_list=asset_links,
-                            iocs_list=ioc_links,
-                            sync_iocs_assets=False)
+            update_event_assets(event_id=event.event_id,
+                                caseid=case.case_id,
+                                assets_list=asset_links,
+                                iocs_list=ioc_links,
+                                sync_iocs_assets=False)
 
-        update_event_iocs(event_id=event.event_id,
-                          caseid=case.case_id,
-                          iocs_list=ioc_links)
+            update_event_iocs(event_id=event.event_id,
+                              caseid=case.case_id,
+                              iocs_list=ioc_links)
 
     db.session.commit()
 
@@ -961,7 +1290,51 @@ def search_alert_resolution_by_name(resolution_status_name: str, exact_match: Fa
         AlertResolutionStatus.resolution_status_name.ilike(f"%{resolution_status_name}%")).all()
 
 
-def cache_similar_alert(customer_id, assets, iocs, alert_id, creation_date):
+def get_similar_alerts_cache_key_hash(kind: str, value: str, type_id: int = None) -> int:
+    """
+    Get the hashed match key of a similar alerts cache entry. The value is normalized, so that
+    matching is case and surrounding whitespace insensitive. Must stay identical to the SQL backfill
+    of the 5e9a1c3f7d20 migration.
+
+    args:
+        kind (str): 'asset' or 'ioc'
+        value (str): The asset name or IOC value
+        type_id (int): The asset or IOC type ID
+
+    returns:
+        int: The first 64 bits of the MD5 of the match key, as a signed integer
+    """
+    normalized_value = (value or '').strip(' \t\r\n').lower()
+    key = f"{kind}|{type_id if type_id is not None else ''}|{normalized_value}"
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big', signed=True)
+
+
+def _build_similar_alerts_cache_entries(customer_id, assets, iocs, alert_id) -> List[dict]:
+    # The creation date of the entries is left to the database: it is the partition key of the table
+    entries = []
+    for asset in assets:
+        entries.append({
+            'customer_id': customer_id,
+            'asset_name': asset.get('asset_name'),
+            'asset_type_id': asset.get('asset_type_id'),
+            'alert_id': alert_id,
+            'match_key_hash': get_similar_alerts_cache_key_hash('asset', asset.get('asset_name'),
+                                                                asset.get('asset_type_id'))
+        })
+
+    for ioc in iocs:
+        entries.append({
+            'customer_id': customer_id,
+            'ioc_value': ioc.get('ioc_value'),
+            'ioc_type_id': ioc.get('ioc_type_id'),
+            'alert_id': alert_id,
+            'match_key_hash': get_similar_alerts_cache_key_hash('ioc', ioc.get('ioc_value'), ioc.get('ioc_type_id'))
+        })
+
+    return entries
+
+
+def cache_similar_alert(customer_id, assets, iocs, alert_id):
     """
     Cache similar alerts
 
@@ -970,26 +1343,376 @@ def cache_similar_alert(customer_id, assets, iocs, alert_id, creation_date):
         assets (list): The list of assets
         iocs (list): The list of IOCs
         alert_id (int): The ID of the alert
-        creation_date (datetime): The creation date of the alert
 
     returns:
         None
 
     """
-    for asset in assets:
-        cache_entry = SimilarAlertsCache(customer_id=customer_id, asset_name=asset['asset_name'],
-                                         asset_type_id=asset["asset_type_id"], alert_id=alert_id,
-                                         created_at=creation_date)
-        db.session.add(cache_entry)
+    cache_entries = _build_similar_alerts_cache_entries(customer_id, assets, iocs, alert_id)
+    if cache_entries:
+        db.session.execute(insert(SimilarAlertsCache), cache_entries)
 
-    for ioc in iocs:
-        cache_entry = SimilarAlertsCache(customer_id=customer_id, ioc_value=ioc['ioc_value'],
-                                         ioc_type_id=ioc['ioc_type_id'], alert_id=alert_id,
-                                         created_at=creation_date)
-        db.session.add(cache_entry)
+    db.session.commit()
+
+
+def prune_similar_alerts_cache(older_than: datetime, batch_size: int = 10000) -> int:
+    """
+    Delete the similar alerts cache entries created before a date. The monthly partitions entirely older
+    than the date are dropped, then the other entries are deleted by batches to keep the transactions,
+    and the locks they hold, short.
+
+    args:
+        older_than (datetime): Entries created before this date are deleted
+        batch_size (int): Number of entries deleted per transaction
+
+    returns:
+        int: The number of entries deleted row by row
+    """
+    # Whole months are dropped with their partition, the remaining entries are deleted row by row
+    drop_monthly_partitions('similar_alerts_cache', older_than)
+
+    deleted = 0
+    while True:
+        entries_ids = db.session.query(SimilarAlertsCache.id).filter(
+            SimilarAlertsCache.created_at < older_than
+        ).limit(batch_size).scalar_subquery()
+
+        result = db.session.execute(
+            SimilarAlertsCache.__table__.delete().where(SimilarAlertsCache.id.in_(entries_ids))
+        )
+        db.session.commit()
+
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+
+
+def prune_similar_alerts_cache_deletions(older_than: datetime) -> int:
+    """
+    Delete the log of the similar alerts cache deletions older than a date. The correlation indexes only read the
+    deletions made since their last full build.
+
+    args:
+        older_than (datetime): Deletions logged before this date are deleted
+
+    returns:
+        int: The number of deletions deleted
+    """
+    result = db.session.execute(
+        delete(SimilarAlertsCacheDeletion).where(SimilarAlertsCacheDeletion.deleted_at < older_than)
+    )
+    db.session.commit()
+
+    return result.rowcount
+
+
+def get_alert_fingerprint(alert_data: dict, fields: str) -> Optional[int]:
+    """
+    Get the fingerprint identifying the duplicates of an alert, from its raw data
+
+    args:
+        alert_data (dict): The alert, in the format expected by /alerts/add
+        fields (str): The comma separated fields making up the fingerprint, along with the customer
+
+    returns:
+        int: The first 64 bits of the MD5 of the fingerprint fields, as a signed integer, or None if the alert
+             has no valid customer
+    """
+    try:
+        customer_id = int(alert_data.get('alert_customer_id'))
+    except (TypeError, ValueError):
+        return None
+
+    values = [str(alert_data.get(field.strip()) or '').strip() for field in fields.split(',') if field.strip()]
+    key = json.dumps([customer_id] + values)
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big', signed=True)
+
+
+def get_alerts_ids_by_fingerprints(keys: Set[Tuple[int, int]], since: datetime,
+                                   excluded_statuses: List[str] = None) -> Dict[Tuple[int, int], int]:
+    """
+    Get the most recent alerts seen since a date, matching customers and fingerprints
+
+    args:
+        keys (set): The (customer ID, fingerprint) pairs
+        since (datetime): The date the alerts must have been seen since
+        excluded_statuses (list): The names of the statuses of the alerts to ignore
+
+    returns:
+        dict: The ID of the matching alert, per (customer ID, fingerprint)
+    """
+    if not keys:
+        return {}
+
+    query = db.session.query(
+        Alert.alert_customer_id,
+        Alert.alert_fingerprint,
+        func.max(Alert.alert_id)
+    ).filter(
+        tuple_(Alert.alert_customer_id, Alert.alert_fingerprint).in_(list(keys)),
+        Alert.alert_last_seen_at >= since
+    )
+
+    if excluded_statuses:
+        query = query.filter(not_(Alert.alert_status_id.in_(
+            db.session.query(AlertStatus.status_id).filter(AlertStatus.status_name.in_(excluded_statuses))
+        )))
+
+    rows = query.group_by(Alert.alert_customer_id, Alert.alert_fingerprint).all()
+    return {(customer_id, fingerprint): alert_id for customer_id, fingerprint, alert_id in rows}
+
+
+def _register_alerts_duplicates(duplicates: Dict[int, int], seen_at: datetime) -> None:
+    db.session.execute(
+        update(Alert.__table__).where(
+            Alert.__table__.c.alert_id == bindparam('duplicated_alert_id')
+        ).values(
+            alert_occurrences=Alert.__table__.c.alert_occurrences + bindparam('duplicates_count'),
+            alert_last_seen_at=seen_at
+        ),
+        [{'duplicated_alert_id': alert_id, 'duplicates_count': count}
+         for alert_id, count in sorted(duplicates.items())]
+    )
+
+
+def register_alerts_duplicates(duplicates: Dict[int, int]) -> None:
+    """
+    Count duplicates of existing alerts in their occurrences, instead of creating them
+
+    args:
+        duplicates (dict): The number of duplicates, per ID of the duplicated alert
+    """
+    _register_alerts_duplicates(duplicates, datetime.utcnow())
+    db.session.commit()
+
+
+def create_alerts_batch(alerts_entries: List[Tuple[Alert, List[dict], List[dict]]],
+                        duplicates: Dict[int, int] = None) -> List[Alert]:
+    """
+    Create multiple alerts within a single transaction
+
+    args:
+        alerts_entries (list): Tuples of (alert, raw iocs list, raw assets list), the alerts being already loaded
+        duplicates (dict): The number of duplicates of existing alerts in the batch, per ID of the duplicated alert,
+                           which are counted in the same transaction
+
+    returns:
+        list: The alerts created
+    """
+    creation_time = datetime.utcnow()
+    alerts = []
+
+    try:
+        if duplicates:
+            _register_alerts_duplicates(duplicates, creation_time)
+
+        for alert, _, _ in alerts_entries:
+            alert.alert_creation_time = creation_time
+            alert.alert_last_seen_at = creation_time
+            if alert.alert_source_event_time is None:
+                alert.alert_source_event_time = creation_time
+
+            add_obj_history_entry(alert, 'Alert created')
+            db.session.add(alert)
+            alerts.append(alert)
+
+        # Single flush to get the identifiers of the alerts, their IOCs, assets and associations
+        db.session.flush()
+
+        cache_entries = []
+        for alert, iocs_list, assets_list in alerts_entries:
+            cache_entries.extend(_build_similar_alerts_cache_entries(alert.alert_customer_id, assets_list, iocs_list,
+                                                                     alert.alert_id))
+
+        if cache_entries:
+            db.session.execute(insert(SimilarAlertsCache), cache_entries)
+
+        if app.app.config.get('ALERTS_CLUSTERING_ENABLED'):
+            signatures_entries = []
+            buckets_entries = []
+            for alert, iocs_list, _ in alerts_entries:
+                signature_entry, alert_buckets_entries = build_alert_minhash_entries(
+                    alert.alert_id, alert.alert_customer_id, alert.alert_title, alert.alert_description,
+                    [(ioc.get('ioc_value'), ioc.get('ioc_type_id')) for ioc in iocs_list]
+                )
+                if signature_entry is not None:
+                    signatures_entries.append(signature_entry)
+                    buckets_entries.extend(alert_buckets_entries)
+
+            add_alerts_minhash_entries(signatures_entries, buckets_entries)
+
+        db.session.commit()
+
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return alerts
+
+
+def create_alert_ingestion_ticket(alerts_data: List[dict], user_id: int) -> AlertIngestionTicket:
+    """
+    Spool a batch of alerts to be ingested asynchronously
+
+    args:
+        alerts_data (list): The raw alerts payload
+        user_id (int): The ID of the user who submitted the alerts
+
+    returns:
+        AlertIngestionTicket: The ticket tracking the ingestion
+    """
+    ticket = AlertIngestionTicket()
+    ticket.status = AlertIngestionStatusList.pending
+    ticket.payload = alerts_data
+    ticket.alerts_count = len(alerts_data)
+    ticket.user_id = user_id
+
+    db.session.add(ticket)
+    db.session.commit()
+
+    return ticket
+
+
+def get_alert_ingestion_ticket(ticket_uuid) -> AlertIngestionTicket:
+    """
+    Get an alert ingestion ticket from its UUID
+
+    args:
+        ticket_uuid (str): The UUID of the ticket
+
+    returns:
+        AlertIngestionTicket: The ticket
+    """
+    return AlertIngestionTicket.query.filter(AlertIngestionTicket.ticket_uuid == ticket_uuid).first()
+
+
+def claim_alert_ingestion_ticket(ticket_id: int, stale_before: datetime = None) -> AlertIngestionTicket:
+    """
+    Atomically move a pending ticket to the processing state, so a ticket is processed only once.
+    A ticket claimed before stale_before, whose worker most likely crashed, can be claimed again
+
+    args:
+        ticket_id (int): The ID of the ticket
+        stale_before (datetime): The date before which a processing ticket is considered as stale
+
+    returns:
+        AlertIngestionTicket: The ticket if it was claimed, None otherwise
+    """
+    claimable = AlertIngestionTicket.status == AlertIngestionStatusList.pending
+    if stale_before is not None:
+        claimable = or_(claimable, and_(AlertIngestionTicket.status == AlertIngestionStatusList.processing,
+                                        AlertIngestionTicket.claimed_at < stale_before))
+
+    result = db.session.execute(
+        update(AlertIngestionTicket)
+        .where(AlertIngestionTicket.ticket_id == ticket_id, claimable)
+        .values(status=AlertIngestionStatusList.processing,
+                claimed_at=datetime.utcnow(),
+                attempts=AlertIngestionTicket.attempts + 1)
+    )
+    db.session.commit()
+
+    if result.rowcount != 1:
+        return None
+
+    return db.session.get(AlertIngestionTicket, ticket_id)
+
+
+def complete_alert_ingestion_ticket(ticket: AlertIngestionTicket, alert_ids: List[int]) -> None:
+    """
+    Mark an ingestion ticket as completed and release its payload
+
+    args:
+        ticket (AlertIngestionTicket): The ticket
+        alert_ids (list): The IDs of the alerts created
+    """
+    ticket.status = AlertIngestionStatusList.completed
+    ticket.alert_ids = alert_ids
+    ticket.payload = None
+    ticket.processed_at = datetime.utcnow()
+    db.session.commit()
+
+
+def fail_alert_ingestion_ticket(ticket: AlertIngestionTicket, error: dict) -> None:
+    """
+    Mark an ingestion ticket as failed. The payload is kept for investigation
+
+    args:
+        ticket (AlertIngestionTicket): The ticket
+        error (dict): The error details
+    """
+    db.session.rollback()
+    ticket.status = AlertIngestionStatusList.failed
+    ticket.error = error
+    ticket.processed_at = datetime.utcnow()
+    db.session.commit()
+
+
+def get_stale_alert_ingestion_tickets_ids(older_than: datetime, claimed_before: datetime) -> List[int]:
+    """
+    Get the IDs of the tickets still pending since the given date, i.e. which task was most likely lost,
+    and of the tickets claimed before the given date, i.e. which worker most likely crashed
+
+    args:
+        older_than (datetime): The date before which a pending ticket is considered as stale
+        claimed_before (datetime): The date before which a processing ticket is considered as stale
+
+    returns:
+        list: The IDs of the stale tickets
+    """
+    tickets = AlertIngestionTicket.query.with_entities(
+        AlertIngestionTicket.ticket_id
+    ).filter(
+        or_(
+            and_(AlertIngestionTicket.status == AlertIngestionStatusList.pending,
+                 AlertIngestionTicket.created_at < older_than),
+            and_(AlertIngestionTicket.status == AlertIngestionStatusList.processing,
+                 AlertIngestionTicket.claimed_at < claimed_before)
+        )
+    ).all()
+
+    return [ticket.ticket_id for ticket in tickets]
+
+
+def fail_stale_alert_ingestion_tickets(claimed_before: datetime, max_attempts: int) -> int:
+    """
+    Mark as failed the stale processing tickets which were already claimed max_attempts times, so a payload
+    which keeps crashing the workers is not retried forever
 
+    args:
+        claimed_before (datetime): The date before which a processing ticket is considered as stale
+        max_attempts (int): The number of claims after which a stale ticket is failed
+
+    returns:
+        int: The number of tickets failed
+    """
+    result = db.session.execute(
+        update(AlertIngestionTicket)
+        .where(AlertIngestionTicket.status == AlertIngestionStatusList.processing,
+               AlertIngestionTicket.claimed_at < claimed_before,
+               AlertIngestionTicket.attempts >= max_attempts)
+        .values(status=AlertIngestionStatusList.failed,
+                error={'message': f'Ingestion did not complete after {max_attempts} attempts'},
+                processed_at=datetime.utcnow())
+    )
     db.session.commit()
 
+    return result.rowcount
+
+
+def get_pending_alert_ingestions_count() -> int:
+    """
+    Get the number of alerts waiting in the asynchronous ingestion queue, including the ones being processed
+
+    returns:
+        int: The number of alerts
+    """
+    return db.session.query(
+        func.coalesce(func.sum(AlertIngestionTicket.alerts_count), 0)
+    ).filter(
+        AlertIngestionTicket.status.in_([AlertIngestionStatusList.pending, AlertIngestionStatusList.processing])
+    ).scalar()
+
 
 def register_related_alerts(new_alert=None, assets_list=None, iocs_list=None):
     """
@@ -1055,6 +1778,10 @@ def delete_similar_alert_cache(alert_id):
     SimilarAlertsCache.query.filter(SimilarAlertsCache.alert_id == alert_id).delete()
     db.session.commit()
 
+    correlation_index = get_alerts_correlation_index()
+    if correlation_index is not None:
+        correlation_index.remove_alerts([alert_id])
+
 
 def delete_related_alert_cache(alert_id):
     """
@@ -1087,6 +1814,10 @@ def delete_similar_alerts_cache(alert_ids: List[int]):
     SimilarAlertsCache.query.filter(SimilarAlertsCache.alert_id.in_(alert_ids)).delete()
     db.session.commit()
 
+    correlation_index = get_alerts_correlation_index()
+    if correlation_index is not None:
+        correlation_index.remove_alerts(alert_ids)
+
 
 def delete_related_alerts_cache(alert_ids: List[int]):
     """
@@ -1120,29 +1851,79 @@ def get_related_alerts(customer_id, assets, iocs, details=False):
     returns:
         bool: True if the alert is related to another alert, False otherwise
     """
-    asset_names = [asset.asset_name for asset in assets]
-    ioc_values = [ioc.ioc_value for ioc in iocs]
-
-    similar_assets = SimilarAlertsCache.query.filter(
-        SimilarAlertsCache.customer_id == customer_id,
-        SimilarAlertsCache.asset_name.in_(asset_names)
-    ).all()
-
-    similar_iocs = SimilarAlertsCache.query.filter(
+    assets_keys = {get_similar_alerts_cache_key_hash('asset', asset.asset_name, asset.asset_type_id)
+                   for asset in assets}
+    iocs_keys = {get_similar_alerts_cache_key_hash('ioc', ioc.ioc_value, ioc.ioc_type_id) for ioc in iocs}
+
+    # Bounded by the retention, so that only the partitions which can hold entries are scanned
+    retention_start = datetime.utcnow() - timedelta(days=app.app.config.get('ALERTS_SIMILARITY_CACHE_RETENTION_DAYS'))
+    similar_entries = db.session.query(
+        SimilarAlertsCache.alert_id,
+        SimilarAlertsCache.match_key_hash
+    ).filter(
         SimilarAlertsCache.customer_id == customer_id,
-        SimilarAlertsCache.ioc_value.in_(ioc_values)
+        SimilarAlertsCache.match_key_hash.in_(assets_keys | iocs_keys),
+        SimilarAlertsCache.created_at >= retention_start
     ).all()
 
     similarities = {
-        'assets': [asset.alert_id for asset in similar_assets],
-        'iocs': [ioc.alert_id for ioc in similar_iocs]
+        'assets': [alert_id for alert_id, key_hash in similar_entries if key_hash in assets_keys],
+        'iocs': [alert_id for alert_id, key_hash in similar_entries if key_hash in iocs_keys]
     }
 
     return similarities
 
 
+def _get_related_alerts_from_index(correlation_index, customer_id, assets, iocs, alert_status_filter, since,
+                                   number_of_results):
+    """
+    Get the alerts related to the given assets and IOCs from the in-memory correlation index. Returns the same
+    rows as the similar alerts cache query: (alert, asset name, IOC value, match key hash, asset icon), or None
+    while the index is not built yet. The names displayed are the ones of the assets and IOCs of the current alert.
+    """
+    assets_by_key = {get_similar_alerts_cache_key_hash('asset', asset.asset_name, asset.asset_type_id): asset
+                     for asset in assets}
+    iocs_by_key = {get_similar_alerts_cache_key_hash('ioc', ioc.ioc_value, ioc.ioc_type_id): ioc for ioc in iocs}
+
+    matches = correlation_index.lookup(customer_id, assets_by_key.keys() | iocs_by_key.keys(), since=since)
+    if matches is None:
+        return None
+
+    # Most recent alerts first, fetched by chunks until enough of them pass the status filter
+    candidates_ids = sorted(matches, reverse=True)
+    related_alerts = []
+    alerts_count = 0
+
+    for chunk_start in range(0, len(candidates_ids), 1000):
+        query = Alert.query.filter(
+            Alert.alert_id.in_(candidates_ids[chunk_start:chunk_start + 1000])
+        ).options(
+            selectinload(Alert.status),
+            selectinload(Alert.resolution_status)
+        ).order_by(desc(Alert.alert_id))
+
+        if alert_status_filter:
+            query = query.filter(Alert.alert_status_id.in_(alert_status_filter))
+
+        for alert in query.limit(number_of_results - alerts_count).all():
+            for key_hash in matches[alert.alert_id]:
+                if key_hash in assets_by_key:
+                    asset = assets_by_key[key_hash]
+                    asset_icon = asset.asset_type.asset_icon_not_compromised if asset.asset_type else None
+                    related_alerts.append((alert, asset.asset_name, None, key_hash, asset_icon))
+                else:
+                    related_alerts.append((alert, None, iocs_by_key[key_hash].ioc_value, key_hash, None))
+
+            alerts_count += 1
+
+        if alerts_count >= number_of_results:
+            break
+
+    return related_alerts
+
+
 def get_related_alerts_details(customer_id, assets, iocs, open_alerts, closed_alerts, open_cases, closed_cases,
-                               days_back=30, number_of_results=200):
+                               days_back=30, number_of_results=200, source_alert=None, near_duplicates=None):
     """
     Get the details of the related alerts
 
@@ -1156,18 +1937,21 @@ def get_related_alerts_details(customer_id, assets, iocs, open_alerts, closed_al
         closed_cases (bool): Include closed cases
         days_back (int): The number of days to look back
         number_of_results (int): The maximum number of alerts to return
+        source_alert (Alert): The alert the near duplicates are linked to
+        near_duplicates (list): The (alert, similarity) pairs of the near duplicates of the alert
 
     returns:
         dict: The details of the related alerts with matched assets and/or IOCs
     """
-    if not assets and not iocs:
+    if not assets and not iocs and not near_duplicates:
         return {
             'nodes': [],
             'edges': []
         }
 
-    asset_names = [(asset.asset_name, asset.asset_type_id) for asset in assets]
-    ioc_values = [(ioc.ioc_value, ioc.ioc_type_id) for ioc in iocs]
+    assets_keys = {get_similar_alerts_cache_key_hash('asset', asset.asset_name, asset.asset_type_id)
+                   for asset in assets}
+    iocs_keys = {get_similar_alerts_cache_key_hash('ioc', ioc.ioc_value, ioc.ioc_type_id) for ioc in iocs}
 
     asset_type_alias = aliased(AssetsType)
     alert_status_filter = []
@@ -1184,46 +1968,63 @@ def get_related_alerts_details(customer_id, assets, iocs, open_alerts, closed_al
         ).filter(AlertStatus.status_name.in_(['Closed', 'Merged', 'Escalated'])).all()
         alert_status_filter += [status_id[0] for status_id in closed_alert_status_ids]
 
-    conditions = and_(
-        SimilarAlertsCache.customer_id == customer_id,
-        and_(or_(
-            tuple_(SimilarAlertsCache.asset_name, SimilarAlertsCache.asset_type_id).in_(asset_names),
-            tuple_(SimilarAlertsCache.ioc_value, SimilarAlertsCache.ioc_type_id).in_(ioc_values)
-        ),
-        SimilarAlertsCache.created_at >= (func.now() - timedelta(days=days_back))
+    related_alerts = None
+    correlation_index = get_alerts_correlation_index()
+    if correlation_index is not None:
+        related_alerts = _get_related_alerts_from_index(correlation_index, customer_id, assets, iocs,
+                                                        alert_status_filter,
+                                                        datetime.utcnow() - timedelta(days=days_back),
+                                                        number_of_results)
+
+    if related_alerts is None:
+        conditions = and_(
+            SimilarAlertsCache.customer_id == customer_id,
+            SimilarAlertsCache.match_key_hash.in_(assets_keys | iocs_keys),
+            SimilarAlertsCache.created_at >= (func.now() - timedelta(days=days_back))
         )
-    )
 
-    if alert_status_filter:
-        conditions = and_(conditions, Alert.alert_status_id.in_(alert_status_filter))
-
-    related_alerts = (
-        db.session.query(Alert, SimilarAlertsCache.asset_name, SimilarAlertsCache.ioc_value,
-                         asset_type_alias.asset_icon_not_compromised)
-        .join(SimilarAlertsCache, Alert.alert_id == SimilarAlertsCache.alert_id)
-        .outerjoin(Alert.resolution_status)
-        .outerjoin(asset_type_alias, SimilarAlertsCache.asset_type_id == asset_type_alias.asset_id)
-        .filter(conditions)
-        .limit(number_of_results)
-        .all()
-    )
+        if alert_status_filter:
+            conditions = and_(conditions, Alert.alert_status_id.in_(alert_status_filter))
+
+        related_alerts = (
+            db.session.query(Alert, SimilarAlertsCache.asset_name, SimilarAlertsCache.ioc_value,
+                             SimilarAlertsCache.match_key_hash, asset_type_alias.asset_icon_not_compromised)
+            .join(SimilarAlertsCache, Alert.alert_id == SimilarAlertsCache.alert_id)
+            .outerjoin(Alert.resolution_status)
+            .outerjoin(asset_type_alias, SimilarAlertsCache.asset_type_id == asset_type_alias.asset_id)
+            .filter(conditions)
+            .limit(number_of_results)
+            .all()
+        )
 
     alerts_dict = {}
 
-    for alert, asset_name, ioc_value, asset_icon_not_compromised in related_alerts:
+    for alert, asset_name, ioc_value, key_hash, asset_icon_not_compromised in related_alerts:
         if alert.alert_id not in alerts_dict:
             alerts_dict[alert.alert_id] = {'alert': alert, 'assets': [], 'iocs': []}
 
-        if any(name == asset_name for name, _ in asset_names):
+        if key_hash in assets_keys:
             asset_info = {'asset_name': asset_name, 'icon': asset_icon_not_compromised}
             alerts_dict[alert.alert_id]['assets'].append(asset_info)
 
-        if any(value == ioc_value for value, _ in ioc_values):
+        if key_hash in iocs_keys:
             alerts_dict[alert.alert_id]['iocs'].append(ioc_value)
 
     nodes = []
     edges = []
 
+    # Near duplicates are linked to the alert by an edge labelled with their estimated similarity
+    if near_duplicates:
+        alerts_dict.setdefault(source_alert.alert_id, {'alert': source_alert, 'assets': [], 'iocs': []})
+        for near_duplicate, similarity in near_duplicates:
+            alerts_dict.setdefault(near_duplicate.alert_id, {'alert': near_duplicate, 'assets': [], 'iocs': []})
+            edges.append({
+                'from': f'alert_{source_alert.alert_id}',
+                'to': f'alert_{near_duplicate.alert_id}',
+                'label': f'{similarity:.0%}',
+                'dashes': [2, 6]
+            })
+
     added_assets = set()
     added_iocs = set()
     added_cases = set()
@@ -1545,6 +2346,10 @@ def delete_alerts(alert_ids: List[int]) -> tuple[bool, str]:
         remove_case_alerts_by_ids(alert_ids)
 
         Comments.query.filter(Comments.comment_alert_id.in_(alert_ids)).delete()
+        ObjectHistory.query.filter(
+            ObjectHistory.object_type == Alert.__tablename__,
+            ObjectHistory.object_id.in_(alert_ids)
+        ).delete(synchronize_session=False)
         Alert.query.filter(Alert.alert_id.in_(alert_ids)).delete()
 
     except Exception as e:
@@ -1555,6 +2360,127 @@ def delete_alerts(alert_ids: List[int]) -> tuple[bool, str]:
     return True, ""
 
 
+def archive_alerts(older_than: datetime, status_ids: List[int], batch_size: int = 500) -> int:
+    """
+    Move the alerts created before a date and in one of the given statuses to the alerts archive. The alerts linked
+    to a case are kept, as deleting them would remove them from their cases.
+    Each batch is snapshotted in the archive, then deleted from the alerts along with its caches and associations.
+
+    args:
+        older_than (datetime): Alerts created before this date are archived
+        status_ids (list): The statuses of the alerts to archive
+        batch_size (int): Number of alerts archived per transaction
+
+    returns:
+        int: The number of alerts archived
+    """
+    archived = 0
+    partitions_months = set()
+
+    while True:
+        alerts = Alert.query.options(
+            selectinload(Alert.iocs),
+            selectinload(Alert.assets),
+            selectinload(Alert.comments)
+        ).filter(
+            Alert.alert_creation_time < older_than,
+            Alert.alert_status_id.in_(status_ids),
+            ~Alert.cases.any()
+        ).order_by(Alert.alert_id).limit(batch_size).all()
+
+        if not alerts:
+            return archived
+
+        # Rows of months without a partition would otherwise land in the default partition
+        for month in {alert.alert_creation_time.date().replace(day=1) for alert in alerts} - partitions_months:
+            create_monthly_partition('alerts_archive', month)
+            partitions_months.add(month)
+
+        archive_entries = []
+        for alert in alerts:
+            alert_data = AlertSchema().dump(alert)
+            alert_data['comments'] = CommentSchema(many=True).dump(alert.comments)
+
+            archive_entries.append({
+                'alert_id': alert.alert_id,
+                'alert_uuid': alert.alert_uuid,
+                'alert_title': alert.alert_title,
+                'alert_source': alert.alert_source,
+                'alert_source_ref': alert.alert_source_ref,
+                'alert_tags': alert.alert_tags,
+                'alert_customer_id': alert.alert_customer_id,
+                'alert_severity_id': alert.alert_severity_id,
+                'alert_status_id': alert.alert_status_id,
+                'alert_resolution_status_id': alert.alert_resolution_status_id,
+                'alert_source_event_time': alert.alert_source_event_time,
+                'alert_creation_time': alert.alert_creation_time,
+                'alert_data': alert_data
+            })
+
+        alert_ids = [alert.alert_id for alert in alerts]
+
+        # An archive entry may already exist if a previous run failed after archiving
+        db.session.execute(pg_insert(AlertArchive).on_conflict_do_nothing(), archive_entries)
+        db.session.commit()
+
+        success, message = delete_alerts(alert_ids)
+        if not success:
+            raise Exception(f'Unable to delete the archived alerts: {message}')
+
+        db.session.commit()
+        archived += len(alert_ids)
+
+
+def get_archived_alerts(page: int, per_page: int, client: int = None, title: str = None,
+                        source_reference: str = None, start_date: str = None, end_date: str = None,
+                        current_user_id: int = None):
+    """
+    Search the alerts archive. Providing a creation date range restricts the search to the matching partitions.
+
+    args:
+        page (int): The page number
+        per_page (int): The number of alerts per page
+        client (int): The client id of the alerts
+        title (str): The title of the alerts
+        source_reference (str): The source reference of the alerts
+        start_date (str): The start date of the alert creation time
+        end_date (str): The end date of the alert creation time
+        current_user_id (int): The ID of the current user
+
+    returns:
+        Pagination: The archived alerts
+    """
+    query = AlertArchive.query
+
+    if client is not None:
+        query = query.filter(AlertArchive.alert_customer_id == client)
+
+    if title is not None:
+        query = query.filter(AlertArchive.alert_title.ilike(f'%{title}%'))
+
+    if source_reference is not None:
+        query = query.filter(AlertArchive.alert_source_ref.like(f'%{source_reference}%'))
+
+    if start_date is not None:
+        start_date = parse_bf_date_format(start_date)
+        if start_date:
+            query = query.filter(AlertArchive.alert_creation_time >= start_date)
+
+    if end_date is not None:
+        end_date = parse_bf_date_format(end_date)
+        if end_date:
+            query = query.filter(AlertArchive.alert_creation_time <= end_date)
+
+    if current_user_id is not None and not ac_current_user_has_permission(Permissions.server_administrator):
+        clients_filters = get_user_clients_id(current_user_id)
+        if clients_filters is not None:
+            query = query.filter(AlertArchive.alert_customer_id.in_(clients_filters))
+
+    return query.order_by(
+        desc(AlertArchive.alert_creation_time)
+    ).paginate(page=page, per_page=per_page, error_out=False)
+
+
 def get_alert_status_by_name(name: str) -> AlertStatus:
     """
     Get the alert status by name
@@ -0,0 +1,118 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import time
+from sqlalchemy import Text
+from sqlalchemy import cast
+from sqlalchemy import func
+from typing import List
+
+from app import app
+from app import db
+from app.iris_engine.utils.blob_store import BlobStore
+from app.iris_engine.utils.blob_store import get_blob_store
+from app.models.alerts import Alert
+from app.models.cases import CasesEvent
+
+# Offloadable payloads: (model, identifier column, inline column, reference column, synonym name)
+_OFFLOADABLE_PAYLOADS = [
+    (Alert, Alert.alert_id, Alert._alert_source_content, Alert.alert_source_content_ref, 'alert_source_content'),
+    (CasesEvent, CasesEvent.event_id, CasesEvent._event_raw, CasesEvent.event_raw_ref, 'event_raw')
+]
+
+
+def offload_inline_payloads(batch_size: int = 500) -> int:
+    """
+    Move to the blob store the payloads still stored inline while above the minimum size, such as the payloads
+    created before the blob store was enabled
+
+    args:
+        batch_size (int): The number of rows offloaded per transaction
+
+    returns:
+        int: The number of payloads offloaded
+    """
+    if not app.config.get('BLOB_STORE_ENABLED'):
+        return 0
+
+    offloaded = 0
+    for model, identifier, inline_column, reference_column, attribute in _OFFLOADABLE_PAYLOADS:
+        last_identifier = 0
+        while True:
+            rows = model.query.filter(
+                identifier > last_identifier,
+                reference_column.is_(None),
+                inline_column.isnot(None),
+                func.octet_length(cast(inline_column, Text)) >= app.config.get('BLOB_STORE_MIN_SIZE')
+            ).order_by(identifier).limit(batch_size).all()
+
+            if not rows:
+                break
+
+            # Assigning the payload again goes through the synonym, which offloads it
+            for row in rows:
+                setattr(row, attribute, getattr(row, attribute))
+
+            db.session.commit()
+
+            offloaded += len(rows)
+            last_identifier = getattr(rows[-1], identifier.key)
+
+    return offloaded
+
+
+def _delete_unreferenced_blobs(blob_store: BlobStore, digests: List[str]) -> int:
+    referenced = set()
+    for _, _, _, reference_column, _ in _OFFLOADABLE_PAYLOADS:
+        referenced.update(digest for digest, in db.session.query(reference_column).filter(
+            reference_column.in_(digests)
+        ).distinct())
+
+    unreferenced = set(digests) - referenced
+    for digest in unreferenced:
+        blob_store.delete(digest)
+
+    return len(unreferenced)
+
+
+def prune_blob_store(grace_period: int = 86400, batch_size: int = 1000) -> int:
+    """
+    Delete the blobs which are no longer referenced, such as the payloads of deleted alerts and events.
+    Blobs written or reused during the grace period are kept, as the rows referencing them may not be committed yet
+
+    args:
+        grace_period (int): Number of seconds during which a blob is kept, even when not referenced
+        batch_size (int): The number of blobs checked per query
+
+    returns:
+        int: The number of blobs deleted
+    """
+    blob_store = get_blob_store()
+
+    deleted = 0
+    digests = []
+    for digest in blob_store.iter_digests(older_than=time.time() - grace_period):
+        digests.append(digest)
+        if len(digests) >= batch_size:
+            deleted += _delete_unreferenced_blobs(blob_store, digests)
+            digests = []
+
+    if digests:
+        deleted += _delete_unreferenced_blobs(blob_store, digests)
+
+    return deleted
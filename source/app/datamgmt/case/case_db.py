@@ -17,16 +17,22 @@
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
 import binascii
+from typing import List
+from typing import Tuple
 from sqlalchemy import and_
 
 from sqlalchemy import exists
+from sqlalchemy import func
 from sqlalchemy import select
+from sqlalchemy import text
 
 from app import db
 from app.datamgmt.manage.manage_tags_db import add_db_tag
 from app.models.authorization import User
 from app.models.cases import CaseProtagonist
 from app.models.cases import Cases
+from app.models.cases import CasesGeneration
+from app.models.cases import CasesGenerationLog
 from app.models.models import CaseTemplateReport, ReviewStatus
 from app.models.models import Client
 from app.models.models import Languages
@@ -209,3 +215,48 @@ def get_review_id_from_name(review_name):
         return status.id
 
     return None
+
+
+def get_cases_generations(client_ids: List[int] = None) -> List[Tuple[int, int]]:
+    """
+    Get the write counters of the cases of some clients. Clients whose cases were never written have no counter
+
+    args:
+        client_ids (list): The IDs of the clients, or None for all the clients
+
+    returns:
+        list: The (client_id, generation) pairs, ordered by client
+    """
+    counters = db.session.query(CasesGeneration.client_id, CasesGeneration.generation)
+    logged_writes = db.session.query(
+        CasesGenerationLog.client_id, func.count().label('generation')
+    ).group_by(CasesGenerationLog.client_id)
+
+    if client_ids is not None:
+        counters = counters.filter(CasesGeneration.client_id.in_(client_ids))
+        logged_writes = logged_writes.filter(CasesGenerationLog.client_id.in_(client_ids))
+
+    generations = counters.union_all(logged_writes).subquery()
+    query = db.session.query(
+        generations.c.client_id, func.sum(generations.c.generation).label('generation')
+    ).group_by(generations.c.client_id).order_by(generations.c.client_id)
+
+    return [(row.client_id, int(row.generation)) for row in query.all()]
+
+
+def compact_cases_generations() -> int:
+    """
+    Fold the logged writes to the cases into the counters of their clients, in a single statement
+
+    returns:
+        int: The number of clients whose counter was updated
+    """
+    result = db.session.execute(text("""
+        WITH moved AS (DELETE FROM cases_generation_log RETURNING client_id)
+        INSERT INTO cases_generation (client_id, generation)
+        SELECT client_id, count(*) FROM moved GROUP BY client_id ORDER BY client_id
+        ON CONFLICT (client_id) DO UPDATE SET generation = cases_generation.generation + EXCLUDED.generation
+    """))
+    db.session.commit()
+
+    return result.rowcount
@@ -1,18 +1,27 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
 from decimal import Decimal
 import math
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Set
 
 from flask_login import current_user
-from sqlalchemy import func, or_, select, cast, Integer, case, literal
+from psycopg2.errors import QueryCanceled
+from sqlalchemy import func, or_, select, cast, Integer, case, literal, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Query, aliased
 
+from app import app
 from app import db
 from app.datamgmt.manage.manage_access_control_db import get_user_clients_id
+from app.datamgmt.statistics.rollups_db import get_alerts_rollup_source
 from app.iris_engine.access_control.utils import ac_current_user_has_permission, ac_get_fast_user_cases_access
+from app.iris_engine.access_control.utils import ac_user_has_permission
 from app.models.alerts import Alert, AlertResolutionStatus, AlertStatus, Severity
 from app.models.alerts import AlertCaseAssociation
 from app.models.cases import Cases, CaseTags, CasesEvent
@@ -36,6 +45,14 @@ class QueryExecutionError(Exception):
     """Raised when a widget cannot be executed due to an invalid configuration."""
 
 
+@dataclass
+class WidgetAccessScope:
+    """Data scope of a user, resolved once and shared by the widgets of a dashboard."""
+    is_administrator: bool
+    client_ids: List[int] = field(default_factory=list)
+    case_ids: List[int] = field(default_factory=list)
+
+
 @dataclass
 class WidgetQueryResult:
     chart_type: str
@@ -373,6 +390,21 @@ class _WidgetQueryBuilder:
             self.add_group_by(expr, label)
 
 
+# Widgets counting alerts grouped by these columns and by a coarse enough time bucket are answered from the rollups
+_ROLLUP_DIMENSION_COLUMNS = {
+    'alert_customer_id',
+    'alert_status_id',
+    'alert_severity_id',
+    'alert_classification_id',
+    'alert_resolution_status_id',
+    'alert_owner_id',
+    'alert_source'
+}
+_ROLLUP_COUNTED_COLUMNS = {'alert_id', 'alert_uuid'}
+_ROLLUP_TIME_BUCKETS = {'', 'hour', 'day', 'week', 'month', 'year'}
+_ROLLUP_DAILY_TIME_BUCKETS = {'', 'day', 'week', 'month', 'year'}
+
+
 def _between_dates(column, start: Optional[datetime], end: Optional[datetime]):
     expressions = []
     if start is not None:
@@ -699,9 +731,11 @@ class WidgetQueryExecutor:
         }
     }
 
-    def __init__(self, definition: Dict[str, Any]):
+    def __init__(self, definition: Dict[str, Any], access_scope: Optional[WidgetAccessScope] = None):
         self.definition = definition or {}
+        self.access_scope = access_scope
         self.builder = _WidgetQueryBuilder()
+        self._rollup_source = None
         options = self.definition.get('options') or {}
         self.time_column_spec = options.get('time_column') or 'alerts.alert_creation_time'
         self._normalized_time_column_spec = self._normalize_table_column_value(self.time_column_spec)
@@ -718,8 +752,13 @@ class WidgetQueryExecutor:
         if not self.builder.chart_type:
             raise QueryExecutionError('Missing chart type in widget definition.')
 
-        for field in widgets_fields:
-            self._add_field(field)
+        if self.access_scope is None:
+            self.access_scope = resolve_widget_access_scope()
+
+        self._rollup_source = self._get_rollup_source(timeframe)
+
+        for field_definition in widgets_fields:
+            self._add_field(field_definition)
 
         for group_entry in self.definition.get('group_by', []) or []:
             self._apply_group_by(group_entry)
@@ -729,8 +768,10 @@ class WidgetQueryExecutor:
         for filter_entry in self.definition.get('filters', []) or []:
             self._apply_filter(filter_entry)
 
-        start, end = timeframe
-        self._apply_timeframe(start, end)
+        # The rows of the rollup source are already restricted to the timeframe
+        if self._rollup_source is None:
+            start, end = timeframe
+            self._apply_timeframe(start, end)
         self._apply_access_filters()
 
         query = self._build_query()
@@ -748,6 +789,59 @@ class WidgetQueryExecutor:
             select_labels=self.builder.select_labels
         )
 
+    def _is_rollup_eligible(self, timeframe: Tuple[Optional[datetime], Optional[datetime]]) -> bool:
+        if not app.config.get('STATISTICS_ROLLUPS_ENABLED'):
+            return False
+
+        start, end = timeframe
+        if start is None or end is None:
+            return False
+
+        # Alerts reachable through the cases of a user cannot be told apart in the rollups
+        scope = self.access_scope
+        if not scope.is_administrator and (scope.case_ids or not scope.client_ids):
+            return False
+
+        if self._normalized_time_column_spec != 'alerts.alert_creation_time':
+            return False
+
+        if self.time_bucket not in _ROLLUP_TIME_BUCKETS:
+            return False
+
+        for field_definition in self.definition.get('fields') or []:
+            if not isinstance(field_definition, dict) or field_definition.get('table') != 'alerts':
+                return False
+            if (field_definition.get('aggregation') or '').lower() != 'count' or field_definition.get('filter'):
+                return False
+            if field_definition.get('column') not in _ROLLUP_COUNTED_COLUMNS:
+                return False
+
+        for group_entry in self.definition.get('group_by', []) or []:
+            if self._is_time_column(group_entry):
+                if not self.time_bucket:
+                    return False
+                continue
+            if not isinstance(group_entry, str) or '.' not in group_entry:
+                return False
+            table_name, column_name = self._parse_table_column(group_entry)
+            if table_name != 'alerts' or column_name not in _ROLLUP_DIMENSION_COLUMNS:
+                return False
+
+        for filter_definition in self.definition.get('filters', []) or []:
+            if not isinstance(filter_definition, dict) or filter_definition.get('table') != 'alerts':
+                return False
+            if filter_definition.get('column') not in _ROLLUP_DIMENSION_COLUMNS:
+                return False
+
+        return True
+
+    def _get_rollup_source(self, timeframe: Tuple[Optional[datetime], Optional[datetime]]):
+        if not self._is_rollup_eligible(timeframe):
+            return None
+
+        start, end = timeframe
+        return get_alerts_rollup_source(start, end, daily=self.time_bucket in _ROLLUP_DAILY_TIME_BUCKETS)
+
     def _get_table(self, table_name: str) -> Dict[str, Any]:
         table = self._TABLES.get(table_name)
         if not table:
@@ -760,6 +854,8 @@ class WidgetQueryExecutor:
         column = columns.get(column_name)
         if column is None:
             raise QueryExecutionError(f"Column '{column_name}' is not allowed for table '{table_name}'.")
+        if self._rollup_source is not None:
+            return self._rollup_source.c[column_name]
         if table_name in {'case_owner', 'case_creator', 'case_reviewer', 'case_tags', 'tags', 'case_assets', 'case_asset_types', 'case_iocs', 'case_ioc_types', 'case_events', 'case_notes', 'case_tasks', 'review_status'}:
             self.builder.add_join('cases')
         if table_name == 'tags':
@@ -840,22 +936,17 @@ class WidgetQueryExecutor:
         self._promote_time_group()
 
     def _apply_access_filters(self):
-        if ac_current_user_has_permission(Permissions.server_administrator):
-            return
-
-        user_id = getattr(current_user, 'id', None)
-        if not user_id:
-            # Without a logged-in user we cannot determine scope; deny by default.
-            self.builder.filters.append(Alert.alert_id == -1)
+        scope = self.access_scope or resolve_widget_access_scope()
+        if scope.is_administrator:
             return
 
-        client_ids = get_user_clients_id(user_id) or []
-        case_ids = ac_get_fast_user_cases_access(user_id) or []
+        client_ids = scope.client_ids
+        case_ids = scope.case_ids
 
         access_conditions = []
 
         if client_ids:
-            access_conditions.append(Alert.alert_customer_id.in_(client_ids))
+            access_conditions.append(self._get_column('alerts', 'alert_customer_id').in_(client_ids))
 
         if case_ids:
             case_alerts_subquery = select(AlertCaseAssociation.alert_id).where(
@@ -879,7 +970,7 @@ class WidgetQueryExecutor:
                 raise QueryExecutionError('Widgets must contain at least one aggregated field or grouping column.')
 
         query = db.session.query(*self.builder.selects)
-        query = query.select_from(Alert)
+        query = query.select_from(self._rollup_source if self._rollup_source is not None else Alert)
         for join_table in self.builder.joins:
             table = self._get_table(join_table)
             join_callable = table.get('join')
@@ -970,6 +1061,9 @@ class WidgetQueryExecutor:
     def _build_aggregate_expression(self, aggregation: str, column, filter_expression):
         normalized = aggregation.lower()
 
+        if self._rollup_source is not None:
+            return func.coalesce(func.sum(self._rollup_source.c.alerts_count), 0)
+
         if filter_expression is not None:
             if normalized == 'count':
                 return func.coalesce(func.sum(case((filter_expression, 1), else_=0)), 0)
@@ -1045,11 +1139,153 @@ class WidgetQueryExecutor:
         return func.date_trunc(bucket, column)
 
 
-def execute_widget(definition: Dict[str, Any], timeframe: Tuple[Optional[datetime], Optional[datetime]]) -> WidgetQueryResult:
-    executor = WidgetQueryExecutor(definition)
+def resolve_widget_access_scope(user: Optional[User] = None) -> WidgetAccessScope:
+    """Resolve the access scope of the current user, or of the given user outside of a request."""
+    if user is None:
+        is_administrator = ac_current_user_has_permission(Permissions.server_administrator)
+        user_id = getattr(current_user, 'id', None)
+    else:
+        is_administrator = ac_user_has_permission(user, Permissions.server_administrator)
+        user_id = user.id
+
+    if is_administrator:
+        return WidgetAccessScope(is_administrator=True)
+
+    if not user_id:
+        # Without a logged-in user we cannot determine scope; deny by default.
+        return WidgetAccessScope(is_administrator=False)
+
+    return WidgetAccessScope(
+        is_administrator=False,
+        client_ids=get_user_clients_id(user_id) or [],
+        case_ids=ac_get_fast_user_cases_access(user_id) or []
+    )
+
+
+def execute_widget(
+    definition: Dict[str, Any],
+    timeframe: Tuple[Optional[datetime], Optional[datetime]],
+    access_scope: Optional[WidgetAccessScope] = None
+) -> WidgetQueryResult:
+    executor = WidgetQueryExecutor(definition, access_scope)
     return executor.execute(timeframe)
 
 
+_widget_executor: Optional[ThreadPoolExecutor] = None
+_widget_executor_lock = threading.Lock()
+# Widgets submitted to the executor by all the requests and not started yet
+_widget_backlog = 0
+
+# Extra time given to a widget over its statement timeout, to fetch and format its rows
+_WIDGET_TIMEOUT_GRACE = 1
+
+
+def _get_widget_executor() -> ThreadPoolExecutor:
+    global _widget_executor
+
+    with _widget_executor_lock:
+        if _widget_executor is None:
+            # Shared by all the requests of the process, so it also bounds the connections used by the widgets
+            _widget_executor = ThreadPoolExecutor(max_workers=app.config.get('CUSTOM_DASHBOARD_WIDGET_WORKERS'),
+                                                  thread_name_prefix='iris-dashboard-widget')
+
+    return _widget_executor
+
+
+def _update_widget_backlog(change: int) -> int:
+    global _widget_backlog
+
+    with _widget_executor_lock:
+        _widget_backlog += change
+        return _widget_backlog
+
+
+class _WidgetRun:
+    """Tracks when a widget submitted to the executor starts running, its timeout being measured from then."""
+
+    def __init__(self, start_deadline: float):
+        # Time by which the widget should have started, given the widgets queued before it
+        self.start_deadline = start_deadline
+        self.started_at: Optional[float] = None
+        self._started = threading.Event()
+
+    def start(self) -> None:
+        _update_widget_backlog(-1)
+        self.started_at = time.monotonic()
+        self._started.set()
+
+    def wait_started(self, timeout: Optional[float] = None) -> bool:
+        return self._started.wait(timeout)
+
+
+def _execute_widget_in_context(
+    definition: Dict[str, Any],
+    timeframe: Tuple[Optional[datetime], Optional[datetime]],
+    access_scope: WidgetAccessScope,
+    timeout: float,
+    run: _WidgetRun
+) -> Dict[str, Any]:
+    run.start()
+
+    # The application context gives the thread its own scoped session, removed when the context is popped
+    with app.app_context():
+        try:
+            # The query is cancelled server side, so a slow widget does not keep holding its worker and connection
+            db.session.execute(text("SELECT set_config('statement_timeout', :timeout, true)"),
+                               {'timeout': str(int(timeout * 1000))})
+            result = execute_widget(definition, timeframe, access_scope)
+        except OperationalError as exc:
+            if isinstance(exc.orig, QueryCanceled):
+                raise QueryExecutionError('Widget execution timed out.') from exc
+            raise
+
+        return format_widget_payload(result, definition, timeframe)
+
+
+def execute_widgets(
+    definitions: List[Dict[str, Any]],
+    timeframe: Tuple[Optional[datetime], Optional[datetime]],
+    access_scope: WidgetAccessScope
+) -> List[Tuple[Optional[Dict[str, Any]], Optional[Exception]]]:
+    """
+    Executes and formats widgets concurrently, returning the payload or the error of each widget, in order.
+
+    The executor is shared with the other requests, so the timeout of a widget is measured from when it starts
+    running. Until then, a widget waits for the rounds of the widgets queued before it, by any request, each
+    running widget being cancelled by its statement timeout.
+    """
+    timeout = app.config.get('CUSTOM_DASHBOARD_WIDGET_TIMEOUT')
+    workers = app.config.get('CUSTOM_DASHBOARD_WIDGET_WORKERS')
+    executor = _get_widget_executor()
+
+    submitted = []
+    for definition in definitions:
+        rounds = math.ceil(_update_widget_backlog(1) / workers)
+        run = _WidgetRun(time.monotonic() + rounds * (timeout + _WIDGET_TIMEOUT_GRACE))
+        future = executor.submit(_execute_widget_in_context, definition, timeframe, access_scope, timeout, run)
+        submitted.append((future, run))
+
+    results = []
+    for future, run in submitted:
+        try:
+            if not run.wait_started(max(0, run.start_deadline - time.monotonic())):
+                if future.cancel():
+                    _update_widget_backlog(-1)
+                    raise FutureTimeoutError()
+
+                # The widget started meanwhile
+                run.wait_started()
+
+            deadline = run.started_at + timeout + _WIDGET_TIMEOUT_GRACE
+            results.append((future.result(timeout=max(0, deadline - time.monotonic())), None))
+        except FutureTimeoutError:
+            results.append((None, QueryExecutionError('Widget execution timed out.')))
+        except Exception as exc:  # noqa: BLE001
+            results.append((None, exc))
+
+    return results
+
+
 def format_widget_payload(
     result: WidgetQueryResult,
     definition: Optional[Dict[str, Any]] = None,
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+from app import app
+from app.datamgmt.alerts.alerts_db import get_alerts_generations
+from app.datamgmt.case.case_db import get_cases_generations
+from app.datamgmt.custom_dashboard.query_engine import WidgetAccessScope
+from app.datamgmt.custom_dashboard.query_engine import _floor_datetime_to_bucket
+from app.datamgmt.custom_dashboard.query_engine import execute_widgets
+from app.models.models import CustomDashboardWidget
+
+
+# Tables joined from the alerts only, whose widgets are not affected by the writes to the cases
+_ALERTS_TABLES = {
+    'alerts',
+    'client',
+    'alert_resolution_status',
+    'alert_status',
+    'severities',
+    'case_classification',
+    'alert_owner',
+    'alert_assets',
+    'alert_asset_types',
+    'alert_iocs',
+    'alert_ioc_types'
+}
+
+
+class WidgetResultStore:
+    """In-memory LRU store of widget payloads, whose entries expire after a time to live."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, now: Optional[float] = None) -> Optional[Any]:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._entries[key] = (now + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_store: Optional[WidgetResultStore] = None
+_store_lock = threading.Lock()
+
+# Hits and misses of the cache, per widget UUID
+_widgets_statistics: Dict[str, Dict[str, int]] = {}
+
+
+def _get_store() -> Optional[WidgetResultStore]:
+    global _store
+
+    if not app.config.get('CUSTOM_DASHBOARD_CACHE_TIMEOUT'):
+        return None
+
+    with _store_lock:
+        if _store is None:
+            _store = WidgetResultStore(app.config.get('CUSTOM_DASHBOARD_CACHE_MAX_ENTRIES'),
+                                       app.config.get('CUSTOM_DASHBOARD_CACHE_TIMEOUT'))
+
+    return _store
+
+
+def _get_generations(access_scope: WidgetAccessScope) -> List[List[Tuple[int, int]]]:
+    client_ids = None
+
+    # Alerts reachable through the cases of a user can belong to any client
+    if not access_scope.is_administrator and not access_scope.case_ids:
+        client_ids = list(access_scope.client_ids)
+
+    return [
+        [tuple(row) for row in get_alerts_generations(client_ids)],
+        [tuple(row) for row in get_cases_generations(client_ids)]
+    ]
+
+
+def _round_timeframe(definition: Dict[str, Any],
+                     timeframe: Tuple[Optional[datetime], Optional[datetime]]) -> List[Optional[str]]:
+    time_bucket = definition.get('time_bucket')
+    time_bucket = time_bucket.strip().lower() if isinstance(time_bucket, str) and time_bucket.strip() else 'minute'
+
+    return [_floor_datetime_to_bucket(value, time_bucket).isoformat() if value else None for value in timeframe]
+
+
+def _get_widget_tables(definition: Dict[str, Any]) -> Set[Optional[str]]:
+    options = definition.get('options') if isinstance(definition.get('options'), dict) else {}
+    references = [options.get('time_column') or 'alerts.alert_creation_time', *(definition.get('group_by') or [])]
+
+    tables = set()
+    for entry in [*(definition.get('fields') or []), *(definition.get('filters') or [])]:
+        entry = entry if isinstance(entry, dict) else {}
+        tables.add(entry.get('table'))
+        if isinstance(entry.get('filter'), dict):
+            tables.add(entry['filter'].get('table'))
+
+    for reference in references:
+        tables.add(reference.split('.')[0].strip().lower() if isinstance(reference, str) else None)
+
+    return tables
+
+
+def get_widget_cache_key(definition: Dict[str, Any], timeframe: Tuple[Optional[datetime], Optional[datetime]],
+                         access_scope: WidgetAccessScope, generations: List[List[Tuple[int, int]]]) -> str:
+    scope = None if access_scope.is_administrator else [sorted(access_scope.client_ids),
+                                                        sorted(access_scope.case_ids)]
+    if _get_widget_tables(definition) <= _ALERTS_TABLES:
+        generations = [generations[0], []]
+
+    key = json.dumps([definition, _round_timeframe(definition, timeframe), scope, generations],
+                     sort_keys=True, default=str)
+
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _record_access(widget_uuid: str, hit: bool):
+    with _store_lock:
+        statistics = _widgets_statistics.setdefault(widget_uuid, {'hits': 0, 'misses': 0})
+        statistics['hits' if hit else 'misses'] += 1
+
+
+def execute_widgets_cached(
+    widgets: List[CustomDashboardWidget],
+    definitions: List[Dict[str, Any]],
+    timeframe: Tuple[Optional[datetime], Optional[datetime]],
+    access_scope: WidgetAccessScope
+) -> List[Tuple[Optional[Dict[str, Any]], Optional[Exception], bool]]:
+    """
+    Executes the widgets missing from the result cache, returning the payload or the error of each widget,
+    and whether it was served from the cache.
+
+    The cache key covers the widget definition, the timeframe rounded to the widget time bucket, the access scope
+    of the user and the alerts and cases generations of this scope, so a write to the alerts or cases in scope
+    leads to new keys. The cases generations are left out for the widgets reading no case table. Errors are not
+    cached.
+    """
+    store = _get_store()
+    if store is None:
+        return [(data, error, False) for data, error in execute_widgets(definitions, timeframe, access_scope)]
+
+    generations = _get_generations(access_scope)
+    keys = [get_widget_cache_key(definition, timeframe, access_scope, generations) for definition in definitions]
+
+    results: List[Optional[Tuple[Optional[Dict[str, Any]], Optional[Exception], bool]]] = []
+    missing = []
+    for index, (widget, key) in enumerate(zip(widgets, keys)):
+        payload = store.get(key)
+        _record_access(str(widget.widget_uuid), payload is not None)
+        if payload is None:
+            missing.append(index)
+            results.append(None)
+        else:
+            results.append((payload, None, True))
+
+    executed = execute_widgets([definitions[index] for index in missing], timeframe, access_scope)
+    for index, (data, error) in zip(missing, executed):
+        if error is None:
+            store.set(keys[index], data)
+        results[index] = (data, error, False)
+
+    return results
+
+
+class WidgetsLiveState:
+    """
+    Cache keys of the widgets of a dashboard followed by a live subscriber. As the keys cover the alerts and cases
+    generations read by each widget, refreshing only executes the widgets whose key changed since the last refresh.
+    The access scope is given on each refresh, a change of the accesses of the subscriber changing the keys.
+    """
+
+    def __init__(self):
+        self._keys: Dict[str, str] = {}
+
+    def refresh(
+        self,
+        widgets: List[CustomDashboardWidget],
+        definitions: List[Dict[str, Any]],
+        timeframe: Tuple[Optional[datetime], Optional[datetime]],
+        access_scope: WidgetAccessScope
+    ) -> List[Tuple[CustomDashboardWidget, Optional[Dict[str, Any]], Optional[Exception]]]:
+        generations = _get_generations(access_scope)
+
+        keys = {}
+        stale = []
+        for widget, definition in zip(widgets, definitions):
+            widget_uuid = str(widget.widget_uuid)
+            keys[widget_uuid] = get_widget_cache_key(definition, timeframe, access_scope, generations)
+            if self._keys.get(widget_uuid) != keys[widget_uuid]:
+                stale.append((widget, definition))
+
+        # Failed widgets are only executed again once their data changes, rather than on each refresh
+        self._keys = keys
+        if not stale:
+            return []
+
+        results = execute_widgets_cached([widget for widget, _ in stale], [definition for _, definition in stale],
+                                         timeframe, access_scope)
+
+        return [(widget, data, error) for (widget, _), (data, error, _) in zip(stale, results)]
+
+
+def get_widgets_cache_statistics(widgets: List[CustomDashboardWidget]) -> Dict[str, Dict[str, int]]:
+    with _store_lock:
+        return {
+            str(widget.widget_uuid): dict(_widgets_statistics.get(str(widget.widget_uuid), {'hits': 0, 'misses': 0}))
+            for widget in widgets
+        }
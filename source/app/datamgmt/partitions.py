@@ -0,0 +1,171 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import re
+from datetime import date
+from datetime import datetime
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from typing import List
+
+from app import app
+from app import db
+
+# Tables partitioned by month on a server side creation date, with their partition key
+MONTHLY_PARTITIONED_TABLES = {
+    'similar_alerts_cache': 'created_at',
+    'alerts_archive': 'alert_creation_time'
+}
+
+_PARTITION_NAME_REGEX = re.compile(r'^(?P<table>.+)_p(?P<year>\d{4})(?P<month>\d{2})$')
+
+
+def _month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def get_default_partition_ddl(table_name: str) -> str:
+    return f'CREATE TABLE IF NOT EXISTS {table_name}_default PARTITION OF {table_name} DEFAULT'
+
+
+def get_monthly_partition_name(table_name: str, month: date) -> str:
+    return f'{table_name}_p{month.year:04d}{month.month:02d}'
+
+
+def get_monthly_partition_ddl(table_name: str, month: date) -> str:
+    """
+    Get the statement creating the partition of a table holding the rows of a month
+    """
+    month = _month_start(month)
+    return (f'CREATE TABLE IF NOT EXISTS {get_monthly_partition_name(table_name, month)} '
+            f'PARTITION OF {table_name} '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')")
+
+
+def list_monthly_partitions(table_name: str) -> List[date]:
+    """
+    List the monthly partitions of a table
+
+    returns:
+        list: The first day of the month held by each partition, in chronological order
+    """
+    rows = db.session.execute(text(
+        'SELECT child.relname FROM pg_inherits '
+        'JOIN pg_class parent ON pg_inherits.inhparent = parent.oid '
+        'JOIN pg_class child ON pg_inherits.inhrelid = child.oid '
+        'WHERE parent.relname = :table_name'
+    ), {'table_name': table_name}).scalars().all()
+
+    months = []
+    for partition_name in rows:
+        match = _PARTITION_NAME_REGEX.match(partition_name)
+        if match and match.group('table') == table_name:
+            months.append(date(int(match.group('year')), int(match.group('month')), 1))
+
+    return sorted(months)
+
+
+def _get_default_partition_rows_count(table_name: str, month: date) -> int:
+    partition_key = MONTHLY_PARTITIONED_TABLES[table_name]
+    return db.session.execute(text(
+        f'SELECT count(*) FROM {table_name}_default WHERE {partition_key} >= :start AND {partition_key} < :end'
+    ), {'start': month, 'end': _add_months(month, 1)}).scalar()
+
+
+def _move_default_partition_rows(table_name: str, month: date) -> None:
+    """
+    Create the partition of a month from the rows of that month held by the default partition, which would
+    otherwise prevent its creation. The default partition is locked against writes until the partition is attached.
+    """
+    partition_key = MONTHLY_PARTITIONED_TABLES[table_name]
+    partition_name = get_monthly_partition_name(table_name, month)
+    bounds = {'start': month, 'end': _add_months(month, 1)}
+
+    db.session.execute(text(f'LOCK TABLE {table_name}_default IN EXCLUSIVE MODE'))
+    db.session.execute(text(
+        f'CREATE TABLE {partition_name} (LIKE {table_name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+    ))
+    db.session.execute(text(
+        f'INSERT INTO {partition_name} SELECT * FROM {table_name}_default '
+        f'WHERE {partition_key} >= :start AND {partition_key} < :end'
+    ), bounds)
+    db.session.execute(text(
+        f'DELETE FROM {table_name}_default WHERE {partition_key} >= :start AND {partition_key} < :end'
+    ), bounds)
+    db.session.execute(text(
+        f"ALTER TABLE {table_name} ATTACH PARTITION {partition_name} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+    ))
+
+
+def create_monthly_partition(table_name: str, month: date) -> bool:
+    """
+    Create the partition of a table holding the rows of a month, if it does not exist yet. The rows of the month
+    which landed in the default partition meanwhile are moved to it.
+
+    returns:
+        bool: True if the partition exists afterward
+    """
+    month = _month_start(month)
+    try:
+        if month not in list_monthly_partitions(table_name) and _get_default_partition_rows_count(table_name, month):
+            _move_default_partition_rows(table_name, month)
+        else:
+            db.session.execute(text(get_monthly_partition_ddl(table_name, month)))
+
+        db.session.commit()
+        return True
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        app.logger.error(f'Unable to create partition {get_monthly_partition_name(table_name, month)}: {e}')
+        return False
+
+
+def create_monthly_partitions(table_name: str, months_ahead: int = 2) -> None:
+    """
+    Create the partitions of a table for the current month and the following ones, so that rows
+    never land in the default partition
+    """
+    current_month = _month_start(datetime.utcnow())
+    for offset in range(months_ahead + 1):
+        create_monthly_partition(table_name, _add_months(current_month, offset))
+
+
+def drop_monthly_partitions(table_name: str, older_than: datetime) -> int:
+    """
+    Drop the partitions of a table which only hold rows older than a date
+
+    returns:
+        int: The number of partitions dropped
+    """
+    dropped = 0
+    for month in list_monthly_partitions(table_name):
+        if _add_months(month, 1) > older_than.date():
+            break
+
+        db.session.execute(text(f'DROP TABLE IF EXISTS {get_monthly_partition_name(table_name, month)}'))
+        db.session.commit()
+        dropped += 1
+
+    return dropped
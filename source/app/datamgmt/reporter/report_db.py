@@ -22,6 +22,7 @@ from sqlalchemy import desc
 
 from app.datamgmt.case.case_notes_db import get_notes_from_group
 from app.datamgmt.case.case_notes_db import get_case_note_comments
+from app.iris_engine.utils.blob_store import get_blob_store
 from app.models.models import AnalysisStatus
 from app.models.models import CompromiseStatus
 from app.models.models import TaskAssignee
@@ -218,6 +219,7 @@ def export_case_tm_json(case_id):
         CasesEvent.event_tags,
         CasesEvent.event_source,
         CasesEvent.event_raw,
+        CasesEvent.event_raw_ref,
         CasesEvent.custom_attributes,
         EventCategory.name.label('category'),
         User.name.label('last_edited_by'),
@@ -241,6 +243,10 @@ def export_case_tm_json(case_id):
         ras = row._asdict()
         ras['assets'] = None
 
+        event_raw_ref = ras.pop('event_raw_ref')
+        if event_raw_ref:
+            ras['event_raw'] = get_blob_store().get(event_raw_ref).decode('utf-8')
+
         as_list = CaseEventsAssets.query.with_entities(
             CaseAssets.asset_id,
             CaseAssets.asset_name,
@@ -0,0 +1,276 @@
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timedelta
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from sqlalchemy import BigInteger
+from sqlalchemy import DateTime
+from sqlalchemy import and_
+from sqlalchemy import column
+from sqlalchemy import delete
+from sqlalchemy import exists
+from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import literal
+from sqlalchemy import or_
+from sqlalchemy import select
+from sqlalchemy import union_all
+from sqlalchemy import values
+
+from app import db
+from app.models.alerts import Alert
+from app.models.alerts import AlertsRollup
+from app.models.alerts import AlertsRollupDirtyHour
+from app.models.cases import Cases
+from app.models.cases import CasesRollup
+from app.models.cases import CasesRollupDirtyHour
+
+_HOUR = timedelta(hours=1)
+_DAY = timedelta(days=1)
+
+
+@dataclass(frozen=True)
+class _Rollup:
+    rollup: Any
+    dirty_hours: Any
+    time_column: Any
+    # Column of the rollup, and column of the source table it is computed from
+    dimensions: Tuple[Tuple[str, Any], ...]
+    count_column: str
+    # Serializes the refreshes of the rollup, which recompute shared days
+    lock_key: int
+
+
+ALERTS_ROLLUP = _Rollup(
+    rollup=AlertsRollup.__table__,
+    dirty_hours=AlertsRollupDirtyHour.__table__,
+    time_column=Alert.alert_creation_time,
+    dimensions=(
+        ('customer_id', Alert.alert_customer_id),
+        ('status_id', Alert.alert_status_id),
+        ('severity_id', Alert.alert_severity_id),
+        ('classification_id', Alert.alert_classification_id),
+        ('resolution_status_id', Alert.alert_resolution_status_id),
+        ('owner_id', Alert.alert_owner_id),
+        ('source', Alert.alert_source)
+    ),
+    count_column='alerts_count',
+    lock_key=0x1215_0001
+)
+
+CASES_ROLLUP = _Rollup(
+    rollup=CasesRollup.__table__,
+    dirty_hours=CasesRollupDirtyHour.__table__,
+    time_column=Cases.initial_date,
+    dimensions=(
+        ('client_id', Cases.client_id),
+        ('status_id', Cases.status_id),
+        ('severity_id', Cases.severity_id),
+        ('classification_id', Cases.classification_id),
+        ('owner_id', Cases.owner_id)
+    ),
+    count_column='cases_count',
+    lock_key=0x1215_0002
+)
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(value: datetime) -> datetime:
+    floored = _floor_hour(value)
+    return floored if floored == value else floored + _HOUR
+
+
+def _floor_day(value: datetime) -> datetime:
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _ceil_day(value: datetime) -> datetime:
+    floored = _floor_day(value)
+    return floored if floored == value else floored + _DAY
+
+
+def refresh_rollup(rollup: _Rollup, max_hours: int) -> int:
+    """
+    Recompute the rollup rows of the oldest dirty hours, then of the days holding them
+
+    args:
+        rollup: The rollup to refresh, ALERTS_ROLLUP or CASES_ROLLUP
+        max_hours (int): The maximum number of hours recomputed, to bound the duration of the transaction
+
+    returns:
+        int: The number of hours recomputed
+    """
+    if not db.session.execute(select(func.pg_try_advisory_xact_lock(rollup.lock_key))).scalar():
+        db.session.rollback()
+        return 0
+
+    # Only the markers of committed writes are deleted, and these writes are read by the statements below.
+    # The markers of the writes still uncommitted are left, so that their hours are recomputed again later
+    dirty_hours = rollup.dirty_hours
+    oldest_hours = select(dirty_hours.c.bucket_start).distinct().order_by(dirty_hours.c.bucket_start).limit(max_hours)
+    hours = sorted(set(db.session.execute(
+        delete(dirty_hours).where(dirty_hours.c.bucket_start.in_(oldest_hours)).returning(dirty_hours.c.bucket_start)
+    ).scalars().all()))
+
+    if not hours:
+        db.session.commit()
+        return 0
+
+    table = rollup.rollup
+    columns = ['granularity', 'bucket_start', *[name for name, _ in rollup.dimensions], rollup.count_column]
+
+    # The alerts of a dirty hour are found with a range scan on their time column
+    hours_values = values(column('bucket_start', DateTime), name='rollup_hours').data([(hour,) for hour in hours])
+    source_table = rollup.time_column.table
+    hourly_counts = select(
+        literal('hour'),
+        hours_values.c.bucket_start,
+        *[source_column for _, source_column in rollup.dimensions],
+        func.count()
+    ).select_from(
+        hours_values.join(source_table, and_(rollup.time_column >= hours_values.c.bucket_start,
+                                             rollup.time_column < hours_values.c.bucket_start + _HOUR))
+    ).group_by(
+        hours_values.c.bucket_start,
+        *[source_column for _, source_column in rollup.dimensions]
+    )
+
+    db.session.execute(delete(table).where(table.c.granularity == 'hour', table.c.bucket_start.in_(hours)))
+    db.session.execute(insert(table).from_select(columns, hourly_counts))
+
+    days = sorted({_floor_day(hour) for hour in hours})
+    day_column = func.date_trunc('day', table.c.bucket_start)
+    daily_counts = select(
+        literal('day'),
+        day_column,
+        *[table.c[name] for name, _ in rollup.dimensions],
+        func.sum(table.c[rollup.count_column])
+    ).where(
+        table.c.granularity == 'hour',
+        table.c.bucket_start >= days[0],
+        table.c.bucket_start < days[-1] + _DAY,
+        day_column.in_(days)
+    ).group_by(
+        day_column,
+        *[table.c[name] for name, _ in rollup.dimensions]
+    )
+
+    db.session.execute(delete(table).where(table.c.granularity == 'day', table.c.bucket_start.in_(days)))
+    db.session.execute(insert(table).from_select(columns, daily_counts))
+    db.session.commit()
+
+    return len(hours)
+
+
+def get_rollup_source(rollup: _Rollup, start: datetime, end: datetime, daily: bool):
+    """
+    Get the rows of the source table between two dates, pre-aggregated as much as possible. The full days and hours
+    are read from the rollup, while the hours still dirty and the partial hours at the ends are read from the
+    source table. The rows are exact, as the dirty hours are marked in the same transactions as the writes.
+    An hour can be marked several times, so the marks are deduplicated before reading its source rows.
+
+    The columns are named after the columns of the source table, along with the count of rows.
+
+    args:
+        rollup: The rollup to read, ALERTS_ROLLUP or CASES_ROLLUP
+        start (datetime): The start of the range, included
+        end (datetime): The end of the range, included
+        daily (bool): Whether the daily rows can be used, i.e. whether the rows are grouped by day or coarser
+
+    returns:
+        The subquery of the rows, or None when the range does not hold any full hour
+    """
+    hours_start = _ceil_hour(start)
+    hours_end = _floor_hour(end)
+    if hours_start >= hours_end:
+        return None
+
+    days_start = _ceil_day(hours_start)
+    days_end = _floor_day(hours_end)
+    daily = daily and days_start < days_end
+
+    table = rollup.rollup
+    dirty_hours = rollup.dirty_hours
+    source_table = rollup.time_column.table
+    time_name = rollup.time_column.key
+
+    def rollup_rows(granularity):
+        return select(
+            *[table.c[name].label(source_column.key) for name, source_column in rollup.dimensions],
+            table.c.bucket_start.label(time_name),
+            table.c[rollup.count_column]
+        ).where(table.c.granularity == granularity)
+
+    def source_rows():
+        return select(
+            *[source_column for _, source_column in rollup.dimensions],
+            rollup.time_column,
+            literal(1, BigInteger).label(rollup.count_column)
+        )
+
+    def has_dirty_hours(day_column):
+        return exists().where(dirty_hours.c.bucket_start >= day_column,
+                              dirty_hours.c.bucket_start < day_column + _DAY)
+
+    hourly_rows = rollup_rows('hour').where(
+        table.c.bucket_start >= hours_start,
+        table.c.bucket_start < hours_end,
+        ~exists().where(dirty_hours.c.bucket_start == table.c.bucket_start)
+    )
+
+    parts = []
+    if daily:
+        parts.append(rollup_rows('day').where(
+            table.c.bucket_start >= days_start,
+            table.c.bucket_start < days_end,
+            ~has_dirty_hours(table.c.bucket_start)
+        ))
+
+        # Hours outside of the days read above
+        hourly_rows = hourly_rows.where(or_(
+            table.c.bucket_start < days_start,
+            table.c.bucket_start >= days_end,
+            has_dirty_hours(func.date_trunc('day', table.c.bucket_start))
+        ))
+
+    parts.append(hourly_rows)
+
+    dirty_hours_in_range = select(dirty_hours.c.bucket_start).where(
+        dirty_hours.c.bucket_start >= hours_start,
+        dirty_hours.c.bucket_start < hours_end
+    ).distinct().subquery()
+
+    parts.append(source_rows().select_from(
+        dirty_hours_in_range.join(source_table,
+                                  and_(rollup.time_column >= dirty_hours_in_range.c.bucket_start,
+                                       rollup.time_column < dirty_hours_in_range.c.bucket_start + _HOUR))
+    ))
+
+    parts.append(source_rows().where(or_(
+        and_(rollup.time_column >= start, rollup.time_column < hours_start),
+        and_(rollup.time_column >= hours_end, rollup.time_column <= end)
+    )))
+
+    return union_all(*parts).subquery(f'{table.name}_source')
+
+
+def get_rollup_dirty_hours_count(rollup: _Rollup) -> int:
+    return db.session.query(func.count(rollup.dirty_hours.c.bucket_start.distinct())).scalar()
+
+
+def refresh_rollups(max_hours: int) -> List[int]:
+    return [refresh_rollup(rollup, max_hours) for rollup in (ALERTS_ROLLUP, CASES_ROLLUP)]
+
+
+def get_alerts_rollup_source(start: datetime, end: datetime, daily: bool) -> Optional[Any]:
+    return get_rollup_source(ALERTS_ROLLUP, start, end, daily)
+
+
+def get_cases_rollup_source(start: datetime, end: datetime, daily: bool) -> Optional[Any]:
+    return get_rollup_source(CASES_ROLLUP, start, end, daily)
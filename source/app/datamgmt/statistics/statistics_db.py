@@ -2,16 +2,27 @@ from dataclasses import dataclass
 from typing import Set
 
 from flask_login import current_user
+from sqlalchemy import DateTime
+from sqlalchemy import Integer
 from sqlalchemy import and_
-from sqlalchemy import distinct
+from sqlalchemy import cast
+from sqlalchemy import exists
+from sqlalchemy import extract
 from sqlalchemy import func
+from sqlalchemy import literal
 from sqlalchemy import or_
 from sqlalchemy import select
+from sqlalchemy import true
 from sqlalchemy.orm import aliased
 
+from app import app
 from app import db
+from app.datamgmt.alerts.alerts_db import get_alerts_generations
+from app.datamgmt.case.case_db import get_cases_generations
 from app.datamgmt.manage.manage_access_control_db import get_user_clients_id
+from app.datamgmt.statistics.rollups_db import get_cases_rollup_source
 from app.iris_engine.access_control.utils import ac_current_user_has_permission, ac_get_fast_user_cases_access
+from app.iris_engine.access_control.utils import ac_user_has_permission
 from app.models.alerts import Alert
 from app.models.alerts import AlertCaseAssociation
 from app.models.alerts import AlertResolutionStatus
@@ -23,11 +34,11 @@ from app.models.models import CaseClassification
 from app.models.models import CaseReceivedFile
 from app.models.models import CaseStatus
 from app.models.models import EvidenceTypes
+from app.models.models import ObjectHistory
 import re
 from datetime import datetime, timedelta
 from datetime import timezone
 import json
-from collections import defaultdict
 
 
 _OPEN_ALERT_STATUS_NAMES = (
@@ -38,6 +49,9 @@ _OPEN_ALERT_STATUS_NAMES = (
     'Unspecified'
 )
 
+_CONTAIN_CUSTOM_KEYS = ['containment_time', 'contained_at']
+_RECOVER_CUSTOM_KEYS = ['recovery_time', 'recovered_at']
+
 _STATUS_CHANGE_REGEX = re.compile(r'"alert_status_id"\s+from\s+"([^\"]*)"\s+to\s+"([^\"]*)"', re.IGNORECASE)
 
 _CASE_STATUS_LABELS = {
@@ -66,11 +80,20 @@ class _AccessScope:
         return bool(self.client_ids or self.case_ids)
 
 
-def _get_access_scope() -> _AccessScope:
-    if ac_current_user_has_permission(Permissions.server_administrator):
+def _get_access_scope(user: User = None) -> _AccessScope:
+    """
+    Get the access scope of the current user, or of the given user outside of a request
+    """
+    if user is None:
+        is_administrator = ac_current_user_has_permission(Permissions.server_administrator)
+        user_id = getattr(current_user, 'id', None)
+    else:
+        is_administrator = ac_user_has_permission(user, Permissions.server_administrator)
+        user_id = user.id
+
+    if is_administrator:
         return _AccessScope(True, set(), set())
 
-    user_id = getattr(current_user, 'id', None)
     if not user_id:
         return _AccessScope(False, set(), set())
 
@@ -80,6 +103,20 @@ def _get_access_scope() -> _AccessScope:
     return _AccessScope(False, client_ids, case_ids)
 
 
+def get_statistics_generations(scope: _AccessScope, client_id=None):
+    """
+    Get the alerts and cases write counters of the clients visible in the statistics, which change with the statistics
+    """
+    client_ids = None
+    if client_id:
+        client_ids = [client_id]
+    # Alerts and cases reachable through the cases of a user can belong to any client
+    elif not scope.allow_all and not scope.case_ids:
+        client_ids = sorted(scope.client_ids)
+
+    return [get_alerts_generations(client_ids), get_cases_generations(client_ids)]
+
+
 def _apply_alert_access(query, scope: _AccessScope):
     if scope.allow_all:
         return query
@@ -337,27 +374,6 @@ def _alert_handled_timestamp(modification_history, open_status_ids, open_status_
     return None
 
 
-def _alert_second_history_timestamp(modification_history):
-    history = _normalize_history(modification_history)
-    if not history:
-        return None
-
-    entries = []
-    for key, value in history.items():
-        try:
-            timestamp = float(key)
-        except (TypeError, ValueError):
-            continue
-        entries.append((timestamp, value))
-
-    if len(entries) < 2:
-        return None
-
-    entries.sort(key=lambda item: item[0])
-    second_entry_ts = entries[1][0]
-    return datetime.fromtimestamp(second_entry_ts, tz=timezone.utc).replace(tzinfo=None)
-
-
 def _get_alert_status_ids_by_names(names):
     if not names:
         return []
@@ -395,60 +411,45 @@ def _extract_custom_timestamp(custom_attributes, keys):
     return None
 
 
-def _extract_history_timestamp(history, keywords):
-    if not history:
-        return None
+def _seconds_between(later, earlier):
+    return extract('epoch', later - earlier)
 
-    data = history
-    if isinstance(history, str):
-        try:
-            data = json.loads(history)
-        except ValueError:
-            return None
 
-    if not isinstance(data, dict):
-        return None
+def _time_bucket_expression(column, bucket):
+    if bucket in ('5minute', '15minute'):
+        step = 5 if bucket == '5minute' else 15
+        remainder = cast(func.date_part('minute', column), Integer) % step
+        return func.date_trunc('minute', column) - func.make_interval(0, 0, 0, 0, 0, remainder)
 
-    matches = []
+    if bucket in ('minute', 'hour', 'week'):
+        return func.date_trunc(bucket, column)
 
-    for ts_raw, details in data.items():
-        action = ''
-        if isinstance(details, dict):
-            action = details.get('action', '') or ''
-        else:
-            action = str(details)
+    return func.date_trunc('day', column)
 
-        action_lower = action.lower()
-        if not any(keyword in action_lower for keyword in keywords):
-            continue
 
-        try:
-            ts_float = float(ts_raw)
-        except (TypeError, ValueError):
-            continue
+def _history_timestamp(column):
+    return func.timezone('UTC', column)
 
-        matches.append(datetime.fromtimestamp(ts_float, tz=timezone.utc).replace(tzinfo=None))
 
-    if not matches:
-        return None
+def _count_where(condition):
+    if condition is None:
+        return literal(0)
 
-    return min(matches)
+    return func.count().filter(condition)
 
 
-def _get_case_phase_timestamp(case_obj, keywords, custom_keys):
-    ts = _extract_custom_timestamp(case_obj.custom_attributes, custom_keys)
-    if ts:
-        return ts
+def _as_float(value):
+    if value is None:
+        return None
 
-    return _extract_history_timestamp(case_obj.modification_history, keywords)
+    return float(value)
 
 
-def _average_seconds(durations):
-    values = [delta.total_seconds() for delta in durations if delta is not None]
-    if not values:
+def _average(total, count):
+    if not count:
         return None
 
-    return sum(values) / len(values)
+    return float(total) / count
 
 
 def _duration_payload(avg_seconds):
@@ -482,8 +483,8 @@ def _build_case_filters(client_id, severity_filter, case_status_filter):
     return filters
 
 
-def _build_kpi_payload(start_dt, end_dt, client_id, severity_filter, case_status_filter):
-    access_scope = _get_access_scope()
+def _build_kpi_payload(start_dt, end_dt, client_id, severity_filter, case_status_filter, access_scope=None):
+    access_scope = access_scope or _get_access_scope()
     alert_filters = []
     if client_id:
         alert_filters.append(Alert.alert_customer_id == client_id)
@@ -495,19 +496,6 @@ def _build_kpi_payload(start_dt, end_dt, client_id, severity_filter, case_status
         alert_query = alert_query.filter(*alert_filters)
     alert_query = _apply_alert_access(alert_query, access_scope)
 
-    alert_rows = alert_query.with_entities(
-        Alert.alert_id,
-        Alert.alert_source_event_time,
-        Alert.alert_creation_time,
-        Alert.alert_resolution_status_id,
-        Alert.alert_status_id,
-        Alert.alert_owner_id,
-        Alert.modification_history,
-        Alert.alert_severity_id
-    ).all()
-
-    total_alerts = len(alert_rows)
-
     open_alert_status_ids = set(_get_alert_status_ids_by_names(_OPEN_ALERT_STATUS_NAMES))
     alert_windows = {
         '2h': end_dt - timedelta(hours=2),
@@ -515,12 +503,6 @@ def _build_kpi_payload(start_dt, end_dt, client_id, severity_filter, case_status
         '48h': end_dt - timedelta(hours=48)
     }
     alert_window_keys = list(alert_windows.keys())
-    new_alerts_since = {key: 0 for key in alert_windows}
-    new_unassigned_alerts_since = {key: 0 for key in alert_windows}
-    high_priority_alerts = {
-        '2h': 0,
-        '24h': 0
-    }
 
     high_critical_severity_rows = Severity.query.with_entities(Severity.severity_id).filter(
         func.lower(Severity.severity_name).in_(('high', 'critical'))
@@ -545,65 +527,77 @@ def _build_kpi_payload(start_dt, end_dt, client_id, severity_filter, case_status
     new_status_ids = _get_alert_status_ids_by_names(['New'])
     new_status_id = new_status_ids[0] if new_status_ids else None
 
-    alert_mttd_deltas = []
-    alert_mttr_deltas = []
-    false_positive_alerts = 0
-    escalated_alerts = 0
-    resolution_unknown_alerts = 0
-    new_status_alerts = 0
-
     timeframe_delta = end_dt - start_dt
     bucket_key, bucket_step, chart_time_unit = _determine_time_series_bucket(timeframe_delta)
 
-    created_counts = defaultdict(int)
-
-    for row in alert_rows:
-        source_time = _safe_datetime(row.alert_source_event_time)
-        creation_time = _safe_datetime(row.alert_creation_time)
-
-        if source_time and creation_time and creation_time >= source_time:
-            alert_mttd_deltas.append(creation_time - source_time)
-
-        if false_positive_resolution_id and row.alert_resolution_status_id == false_positive_resolution_id:
-            false_positive_alerts += 1
-
-        if escalated_status_id and row.alert_status_id == escalated_status_id:
-            escalated_alerts += 1
-
-        if row.alert_resolution_status_id is None or row.alert_resolution_status_id in unknown_resolution_status_ids:
-            resolution_unknown_alerts += 1
-
-        if new_status_id and row.alert_status_id == new_status_id:
-            new_status_alerts += 1
-
-        if creation_time:
-            creation_bucket = _floor_to_bucket(creation_time, bucket_key)
-            if creation_bucket:
-                created_counts[creation_bucket] += 1
-            for window_key, threshold in alert_windows.items():
-                if creation_time >= threshold:
-                    new_alerts_since[window_key] += 1
-                    if row.alert_owner_id is None and (not open_alert_status_ids or row.alert_status_id in open_alert_status_ids):
-                        new_unassigned_alerts_since[window_key] += 1
-
-            if high_critical_severity_ids and row.alert_severity_id in high_critical_severity_ids:
-                condition_matched = row.alert_owner_id is None
-                if not condition_matched and new_status_id and row.alert_status_id == new_status_id:
-                    condition_matched = True
-
-                if condition_matched:
-                    for window_key in ('2h', '24h'):
-                        threshold = alert_windows.get(window_key)
-                        if threshold and creation_time >= threshold:
-                            high_priority_alerts[window_key] += 1
+    # Every alert metric is computed in a single pass over the alerts of the timeframe, only the totals being returned
+    unassigned_conditions = [Alert.alert_owner_id.is_(None)]
+    if open_alert_status_ids:
+        unassigned_conditions.append(Alert.alert_status_id.in_(open_alert_status_ids))
+
+    high_priority_condition = None
+    if high_critical_severity_ids:
+        pending_condition = Alert.alert_owner_id.is_(None)
+        if new_status_id:
+            pending_condition = or_(pending_condition, Alert.alert_status_id == new_status_id)
+        high_priority_condition = and_(Alert.alert_severity_id.in_(high_critical_severity_ids), pending_condition)
+
+    # The alerts are remediated on their first modification following their creation
+    second_history_entry = select(
+        _history_timestamp(ObjectHistory.ts).label('ts')
+    ).where(
+        ObjectHistory.object_type == 'alerts',
+        ObjectHistory.object_id == Alert.alert_id
+    ).order_by(ObjectHistory.ts, ObjectHistory.id).offset(1).limit(1).lateral('stats_alert_second_history')
+
+    alert_has_case = exists().where(AlertCaseAssociation.alert_id == Alert.alert_id)
+
+    alert_metrics_entities = [
+        func.count().label('total'),
+        func.avg(_seconds_between(Alert.alert_creation_time, Alert.alert_source_event_time)).filter(
+            Alert.alert_creation_time >= Alert.alert_source_event_time
+        ).label('mean_time_to_detect'),
+        func.avg(_seconds_between(second_history_entry.c.ts, Alert.alert_creation_time)).filter(
+            second_history_entry.c.ts >= Alert.alert_creation_time
+        ).label('mean_time_to_remediate'),
+        _count_where(Alert.alert_resolution_status_id == false_positive_resolution_id
+                     if false_positive_resolution_id else None).label('false_positive'),
+        _count_where(Alert.alert_status_id == escalated_status_id if escalated_status_id else None).label('escalated'),
+        _count_where(or_(Alert.alert_resolution_status_id.is_(None),
+                         Alert.alert_resolution_status_id.in_(unknown_resolution_status_ids))).label('resolution_unknown'),
+        _count_where(Alert.alert_status_id == new_status_id if new_status_id else None).label('status_new'),
+        _count_where(alert_has_case).label('with_cases')
+    ]
+    for window_key, threshold in alert_windows.items():
+        alert_metrics_entities.extend([
+            _count_where(Alert.alert_creation_time >= threshold).label(f'new_{window_key}'),
+            _count_where(and_(Alert.alert_creation_time >= threshold,
+                              *unassigned_conditions)).label(f'new_unassigned_{window_key}')
+        ])
+    for window_key in ('2h', '24h'):
+        alert_metrics_entities.append(
+            _count_where(and_(Alert.alert_creation_time >= alert_windows[window_key], high_priority_condition)
+                         if high_priority_condition is not None else None).label(f'high_priority_{window_key}')
+        )
 
-        second_history_timestamp = _alert_second_history_timestamp(row.modification_history)
-        if creation_time and second_history_timestamp and second_history_timestamp >= creation_time:
-            alert_mttr_deltas.append(second_history_timestamp - creation_time)
+    alert_metrics = alert_query.outerjoin(second_history_entry, true()).with_entities(*alert_metrics_entities).one()
+
+    total_alerts = alert_metrics.total
+    false_positive_alerts = alert_metrics.false_positive
+    escalated_alerts = alert_metrics.escalated
+    resolution_unknown_alerts = alert_metrics.resolution_unknown
+    new_status_alerts = alert_metrics.status_new
+    alerts_with_cases = alert_metrics.with_cases
+    new_alerts_since = {key: getattr(alert_metrics, f'new_{key}') for key in alert_window_keys}
+    new_unassigned_alerts_since = {key: getattr(alert_metrics, f'new_unassigned_{key}') for key in alert_window_keys}
+    high_priority_alerts = {key: getattr(alert_metrics, f'high_priority_{key}') for key in ('2h', '24h')}
+
+    creation_bucket = _time_bucket_expression(Alert.alert_creation_time, bucket_key)
+    created_counts = dict(
+        alert_query.with_entities(creation_bucket, func.count()).group_by(creation_bucket).all()
+    )
 
-    unassigned_alerts_query = Alert.query.filter(Alert.alert_owner_id.is_(None))
-    if open_alert_status_ids:
-        unassigned_alerts_query = unassigned_alerts_query.filter(Alert.alert_status_id.in_(open_alert_status_ids))
+    unassigned_alerts_query = Alert.query.filter(*unassigned_conditions)
     if client_id:
         unassigned_alerts_query = unassigned_alerts_query.filter(Alert.alert_customer_id == client_id)
     if severity_filter:
@@ -612,21 +606,8 @@ def _build_kpi_payload(start_dt, end_dt, client_id, severity_filter, case_status
     unassigned_alerts_query = _apply_alert_access(unassigned_alerts_query, access_scope)
     unassigned_alerts_total = unassigned_alerts_query.count()
 
-    alerts_with_case_query = db.session.query(func.count(distinct(AlertCaseAssociation.alert_id))).join(
-        Alert, Alert.alert_id == AlertCaseAssociation.alert_id
-    ).filter(and_(Alert.alert_creation_time >= start_dt, Alert.alert_creation_time <= end_dt))
-
-    if client_id:
-        alerts_with_case_query = alerts_with_case_query.filter(Alert.alert_customer_id == client_id)
-    if severity_filter:
-        alerts_with_case_query = alerts_with_case_query.filter(Alert.alert_severity_id == severity_filter)
-
-    alerts_with_case_query = _apply_alert_access(alerts_with_case_query, access_scope)
-
-    alerts_with_cases = alerts_with_case_query.scalar() or 0
-
-    mean_time_to_detect_seconds = _average_seconds(alert_mttd_deltas)
-    mean_time_to_remediate_alerts_seconds = _average_seconds(alert_mttr_deltas)
+    mean_time_to_detect_seconds = _as_float(alert_metrics.mean_time_to_detect)
+    mean_time_to_remediate_alerts_seconds = _as_float(alert_metrics.mean_time_to_remediate)
     detection_coverage_percent = _percentage(alerts_with_cases, total_alerts)
     incident_escalation_rate_percent = _percentage(escalated_alerts, total_alerts)
     alert_false_positive_rate_percent = _percentage(false_positive_alerts, total_alerts)
@@ -639,76 +620,92 @@ def _build_kpi_payload(start_dt, end_dt, client_id, severity_filter, case_status
     if case_filters:
         cases_detected_query = cases_detected_query.filter(*case_filters)
     cases_detected_query = _apply_case_access(cases_detected_query, access_scope)
-    incidents_detected = cases_detected_query.count()
-
-    cases_resolved_query = Cases.query.filter(Cases.close_date.isnot(None))
-    if case_filters:
-        cases_resolved_query = cases_resolved_query.filter(*case_filters)
-    cases_resolved_query = cases_resolved_query.filter(
-        Cases.close_date >= start_dt.date(),
-        Cases.close_date <= end_dt.date()
-    )
-    cases_resolved_query = _apply_case_access(cases_resolved_query, access_scope)
-    incidents_resolved = cases_resolved_query.count()
-
-    false_positive_cases_query = Cases.query.filter(
-        Cases.status_id == CaseStatus.false_positive.value,
-        Cases.initial_date >= start_dt,
-        Cases.initial_date <= end_dt
-    )
-    if case_filters:
-        false_positive_cases_query = false_positive_cases_query.filter(*case_filters)
-    false_positive_cases_query = _apply_case_access(false_positive_cases_query, access_scope)
-    false_positive_cases = false_positive_cases_query.count()
 
-    cases_for_mttr_query = Cases.query.with_entities(Cases.initial_date, Cases.close_date)
-    if case_filters:
-        cases_for_mttr_query = cases_for_mttr_query.filter(*case_filters)
-    cases_for_mttr_query = cases_for_mttr_query.filter(
-        Cases.close_date.isnot(None),
-        Cases.close_date >= start_dt.date(),
-        Cases.close_date <= end_dt.date()
+    # The containment and recovery times are the first matching modifications, unless set in custom attributes
+    phase_history = select(
+        func.min(_history_timestamp(ObjectHistory.ts)).filter(
+            func.lower(ObjectHistory.action).contains('contain')
+        ).label('contain_time'),
+        func.min(_history_timestamp(ObjectHistory.ts)).filter(
+            func.lower(ObjectHistory.action).contains('recover')
+        ).label('recover_time')
+    ).where(
+        ObjectHistory.object_type == 'cases',
+        ObjectHistory.object_id == Cases.case_id
+    ).lateral('stats_case_phase_history')
+
+    has_custom_phase_times = or_(
+        func.json_typeof(Cases.custom_attributes).is_not_distinct_from('string'),
+        *[Cases.custom_attributes[key].isnot(None) for key in _CONTAIN_CUSTOM_KEYS + _RECOVER_CUSTOM_KEYS]
     )
-    cases_for_mttr_query = _apply_case_access(cases_for_mttr_query, access_scope)
+    contained = and_(~has_custom_phase_times, phase_history.c.contain_time >= Cases.initial_date)
+    recovered = and_(~has_custom_phase_times, phase_history.c.recover_time >= Cases.initial_date)
+
+    case_metrics = cases_detected_query.outerjoin(phase_history, true()).with_entities(
+        func.count().label('total'),
+        _count_where(Cases.status_id == CaseStatus.false_positive.value).label('false_positive'),
+        _count_where(Cases.severity_id.is_(None)).label('unspecified_severity'),
+        func.coalesce(func.sum(_seconds_between(phase_history.c.contain_time, Cases.initial_date)).filter(
+            contained), 0).label('contain_seconds'),
+        _count_where(contained).label('contained'),
+        func.coalesce(func.sum(_seconds_between(phase_history.c.recover_time, Cases.initial_date)).filter(
+            recovered), 0).label('recover_seconds'),
+        _count_where(recovered).label('recovered')
+    ).one()
+
+    incidents_detected = case_metrics.total
+    false_positive_cases = case_metrics.false_positive
+    unspecified_severity_count = case_metrics.unspecified_severity
+
+    contain_seconds, contained_cases = float(case_metrics.contain_seconds), case_metrics.contained
+    recover_seconds, recovered_cases = float(case_metrics.recover_seconds), case_metrics.recovered
+
+    # Custom attributes hold free form timestamps, so the few cases defining them are read here
+    custom_phase_rows = cases_detected_query.outerjoin(phase_history, true()).filter(
+        has_custom_phase_times
+    ).with_entities(
+        Cases.initial_date,
+        Cases.custom_attributes,
+        phase_history.c.contain_time,
+        phase_history.c.recover_time
+    ).all()
 
-    mttr_deltas = []
-    for initial_date, close_date in cases_for_mttr_query:
+    for initial_date, custom_attributes, history_contain_time, history_recover_time in custom_phase_rows:
         start_time = _safe_datetime(initial_date)
-        if not start_time or not close_date:
-            continue
-        close_dt = datetime.combine(close_date, datetime.min.time())
-        close_time = _safe_datetime(close_dt)
-        if close_time and close_time >= start_time:
-            mttr_deltas.append(close_time - start_time)
-
-    cases_for_phase_query = Cases.query
-    if case_filters:
-        cases_for_phase_query = cases_for_phase_query.filter(*case_filters)
-    cases_for_phase_query = cases_for_phase_query.filter(
-        and_(Cases.initial_date >= start_dt, Cases.initial_date <= end_dt)
-    )
-    cases_for_phase_query = _apply_case_access(cases_for_phase_query, access_scope)
-    cases_for_phase = cases_for_phase_query.all()
-
-    mttc_deltas = []
-    mttrv_deltas = []
-
-    for case_obj in cases_for_phase:
-        start_time = _safe_datetime(case_obj.initial_date)
         if not start_time:
             continue
 
-        contain_time = _get_case_phase_timestamp(case_obj, ['contain'], ['containment_time', 'contained_at'])
+        contain_time = _extract_custom_timestamp(custom_attributes, _CONTAIN_CUSTOM_KEYS) or history_contain_time
         if contain_time and contain_time >= start_time:
-            mttc_deltas.append(contain_time - start_time)
+            contain_seconds += (contain_time - start_time).total_seconds()
+            contained_cases += 1
 
-        recover_time = _get_case_phase_timestamp(case_obj, ['recover'], ['recovery_time', 'recovered_at'])
+        recover_time = _extract_custom_timestamp(custom_attributes, _RECOVER_CUSTOM_KEYS) or history_recover_time
         if recover_time and recover_time >= start_time:
-            mttrv_deltas.append(recover_time - start_time)
+            recover_seconds += (recover_time - start_time).total_seconds()
+            recovered_cases += 1
+
+    cases_resolved_query = Cases.query.filter(Cases.close_date.isnot(None))
+    if case_filters:
+        cases_resolved_query = cases_resolved_query.filter(*case_filters)
+    cases_resolved_query = cases_resolved_query.filter(
+        Cases.close_date >= start_dt.date(),
+        Cases.close_date <= end_dt.date()
+    )
+    cases_resolved_query = _apply_case_access(cases_resolved_query, access_scope)
 
-    mean_time_to_respond_seconds = _average_seconds(mttr_deltas)
-    mean_time_to_contain_seconds = _average_seconds(mttc_deltas)
-    mean_time_to_recover_seconds = _average_seconds(mttrv_deltas)
+    close_time = cast(Cases.close_date, DateTime)
+    resolved_metrics = cases_resolved_query.with_entities(
+        func.count().label('total'),
+        func.avg(_seconds_between(close_time, Cases.initial_date)).filter(
+            close_time >= Cases.initial_date
+        ).label('mean_time_to_respond')
+    ).one()
+    incidents_resolved = resolved_metrics.total
+
+    mean_time_to_respond_seconds = _as_float(resolved_metrics.mean_time_to_respond)
+    mean_time_to_contain_seconds = _average(contain_seconds, contained_cases)
+    mean_time_to_recover_seconds = _average(recover_seconds, recovered_cases)
 
     false_positive_rate_percent = _percentage(false_positive_cases, incidents_detected)
 
@@ -722,16 +719,6 @@ def _build_kpi_payload(start_dt, end_dt, client_id, severity_filter, case_status
     severity_query = severity_query.group_by(Severity.severity_name)
     severity_counts = severity_query.all()
 
-    unspecified_severity_count_query = Cases.query.filter(
-        Cases.severity_id.is_(None),
-        Cases.initial_date >= start_dt,
-        Cases.initial_date <= end_dt
-    )
-    if case_filters:
-        unspecified_severity_count_query = unspecified_severity_count_query.filter(*case_filters)
-    unspecified_severity_count_query = _apply_case_access(unspecified_severity_count_query, access_scope)
-    unspecified_severity_count = unspecified_severity_count_query.count()
-
     alert_severity_rows = alert_query.outerjoin(
         Severity, Alert.alert_severity_id == Severity.severity_id
     ).with_entities(
@@ -988,29 +975,84 @@ def _build_kpi_payload(start_dt, end_dt, client_id, severity_filter, case_status
     }
 
 
-def _build_classification_payload(start_dt, end_dt, client_id, severity_filter, case_status_filter):
-    access_scope = _get_access_scope()
-    case_filters = _build_case_filters(client_id, severity_filter, case_status_filter)
+def _get_cases_rollup_source(start_dt, end_dt, access_scope: _AccessScope):
+    """
+    Get the cases opened between two dates from the cases rollup, when it is enabled and can apply the access scope.
+    Cases reachable through the cases access of a user cannot be told apart in the rollup, which counts per client.
+    """
+    if not app.config.get('STATISTICS_ROLLUPS_ENABLED'):
+        return None
 
-    base_case_query = Cases.query.filter(and_(Cases.initial_date >= start_dt, Cases.initial_date <= end_dt))
-    if case_filters:
-        base_case_query = base_case_query.filter(*case_filters)
-    base_case_query = _apply_case_access(base_case_query, access_scope)
-    total_cases = base_case_query.count()
+    if not access_scope.allow_all and (access_scope.case_ids or not access_scope.client_ids):
+        return None
 
-    classification_query = db.session.query(
-        CaseClassification.name,
-        func.count(Cases.case_id)
-    ).select_from(Cases).outerjoin(
-        CaseClassification, Cases.classification_id == CaseClassification.id
-    ).filter(and_(Cases.initial_date >= start_dt, Cases.initial_date <= end_dt))
+    return get_cases_rollup_source(start_dt, end_dt, daily=True)
 
-    if case_filters:
-        classification_query = classification_query.filter(*case_filters)
 
-    classification_query = _apply_case_access(classification_query, access_scope)
-    classification_query = classification_query.group_by(CaseClassification.name)
-    rows = classification_query.all()
+def _get_cases_rollup_counts(cases_source, group_column, client_id, severity_filter, case_status_filter,
+                             access_scope: _AccessScope):
+    query = db.session.query(group_column, func.sum(cases_source.c.cases_count))
+
+    if client_id:
+        query = query.filter(cases_source.c.client_id == client_id)
+    if severity_filter:
+        query = query.filter(cases_source.c.severity_id == severity_filter)
+    if case_status_filter is not None:
+        query = query.filter(cases_source.c.status_id == case_status_filter)
+    if not access_scope.allow_all:
+        query = query.filter(cases_source.c.client_id.in_(list(access_scope.client_ids)))
+
+    return query
+
+
+def _build_classification_payload(start_dt, end_dt, client_id, severity_filter, case_status_filter, access_scope=None):
+    access_scope = access_scope or _get_access_scope()
+    cases_source = _get_cases_rollup_source(start_dt, end_dt, access_scope)
+
+    if cases_source is not None:
+        classification_query = _get_cases_rollup_counts(
+            cases_source, CaseClassification.name, client_id, severity_filter, case_status_filter, access_scope
+        ).select_from(cases_source).outerjoin(
+            CaseClassification, cases_source.c.classification_id == CaseClassification.id
+        ).group_by(CaseClassification.name)
+
+        status_query = _get_cases_rollup_counts(
+            cases_source, cases_source.c.status_id, client_id, severity_filter, case_status_filter, access_scope
+        ).group_by(cases_source.c.status_id)
+
+    else:
+        case_filters = _build_case_filters(client_id, severity_filter, case_status_filter)
+
+        classification_query = db.session.query(
+            CaseClassification.name,
+            func.count(Cases.case_id)
+        ).select_from(Cases).outerjoin(
+            CaseClassification, Cases.classification_id == CaseClassification.id
+        ).filter(and_(Cases.initial_date >= start_dt, Cases.initial_date <= end_dt))
+
+        if case_filters:
+            classification_query = classification_query.filter(*case_filters)
+
+        classification_query = _apply_case_access(classification_query, access_scope)
+        classification_query = classification_query.group_by(CaseClassification.name)
+
+        status_query = db.session.query(
+            Cases.status_id,
+            func.count(Cases.case_id)
+        ).filter(and_(Cases.initial_date >= start_dt, Cases.initial_date <= end_dt))
+
+        if case_filters:
+            status_query = status_query.filter(*case_filters)
+
+        status_query = _apply_case_access(status_query, access_scope)
+        status_query = status_query.group_by(Cases.status_id)
+
+    # The counts summed from the rollup are decimals
+    rows = [(name, int(count)) for name, count in classification_query.all()]
+    status_rows = [(status_id, int(count)) for status_id, count in status_query.all()]
+
+    # Each case has a single classification, so the total is the sum of the grouped counts
+    total_cases = sum(count for _, count in rows)
 
     items = []
     for name, count in rows:
@@ -1022,18 +1064,6 @@ def _build_classification_payload(start_dt, end_dt, client_id, severity_filter,
 
     items.sort(key=lambda item: item['count'], reverse=True)
 
-    status_query = db.session.query(
-        Cases.status_id,
-        func.count(Cases.case_id)
-    ).filter(and_(Cases.initial_date >= start_dt, Cases.initial_date <= end_dt))
-
-    if case_filters:
-        status_query = status_query.filter(*case_filters)
-
-    status_query = _apply_case_access(status_query, access_scope)
-    status_query = status_query.group_by(Cases.status_id)
-    status_rows = status_query.all()
-
     status_items = []
     for status_id, count in status_rows:
         status_items.append({
@@ -1061,8 +1091,8 @@ def _build_classification_payload(start_dt, end_dt, client_id, severity_filter,
     }
 
 
-def _build_evidence_payload(start_dt, end_dt, client_id, severity_filter, case_status_filter):
-    access_scope = _get_access_scope()
+def _build_evidence_payload(start_dt, end_dt, client_id, severity_filter, case_status_filter, access_scope=None):
+    access_scope = access_scope or _get_access_scope()
     case_filters = _build_case_filters(client_id, severity_filter, case_status_filter)
 
     conditions = [
@@ -1070,28 +1100,6 @@ def _build_evidence_payload(start_dt, end_dt, client_id, severity_filter, case_s
         CaseReceivedFile.date_added <= end_dt
     ]
 
-    base_evidence_query = db.session.query(CaseReceivedFile.id).join(
-        Cases, Cases.case_id == CaseReceivedFile.case_id
-    ).filter(*conditions)
-
-    if case_filters:
-        base_evidence_query = base_evidence_query.filter(*case_filters)
-
-    base_evidence_query = _apply_case_access(base_evidence_query, access_scope)
-
-    total_evidences = base_evidence_query.count()
-
-    total_size_query = db.session.query(func.coalesce(func.sum(CaseReceivedFile.file_size), 0)).join(
-        Cases, Cases.case_id == CaseReceivedFile.case_id
-    ).filter(*conditions)
-
-    if case_filters:
-        total_size_query = total_size_query.filter(*case_filters)
-
-    total_size_query = _apply_case_access(total_size_query, access_scope)
-
-    total_size = total_size_query.scalar() or 0
-
     distribution_query = db.session.query(
         EvidenceTypes.name,
         func.count(CaseReceivedFile.id),
@@ -1109,6 +1117,10 @@ def _build_evidence_payload(start_dt, end_dt, client_id, severity_filter, case_s
     distribution_query = distribution_query.group_by(EvidenceTypes.name)
     rows = distribution_query.all()
 
+    # Each evidence has a single type, so the totals are the sums of the grouped counts and sizes
+    total_evidences = sum(count for _, count, _ in rows)
+    total_size = sum(size_bytes or 0 for _, _, size_bytes in rows)
+
     items = []
     for name, count, size_bytes in rows:
         items.append({
@@ -0,0 +1,284 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from sqlalchemy import func
+from sqlalchemy import select
+
+from app import app
+from app import db
+from app import socket_io
+from app.models.alerts import SimilarAlertsCache
+from app.models.alerts import SimilarAlertsCacheDeletion
+
+log = app.logger
+
+
+def _to_timestamp(value: datetime) -> int:
+    return int(value.replace(tzinfo=timezone.utc).timestamp())
+
+
+class CorrelationPostings:
+    """
+    Compact inverted index of the similar alerts cache. For each customer, the entries of the last full build are
+    held in three arrays sorted by match key hash: the hashes, the alert IDs and the entries creation timestamps.
+    The entries added since are held in a small per key delta, merged into the arrays by the next full build.
+    Deleted alerts are masked until the next full build, so that deletions do not have to scan the arrays.
+    """
+
+    def __init__(self):
+        self._customers: Dict[int, Tuple[array, array, array]] = {}
+        self._delta: Dict[int, Dict[int, List[Tuple[int, int]]]] = {}
+        self._removed_alerts: Set[int] = set()
+
+    @classmethod
+    def from_sorted_entries(cls, entries: Iterable[Tuple[int, int, int, datetime]]) -> 'CorrelationPostings':
+        """
+        Build the postings from entries (customer ID, match key hash, alert ID, creation date),
+        sorted by customer ID then match key hash
+        """
+        postings = cls()
+        current_customer = None
+        keys = alerts = timestamps = None
+        for customer_id, key_hash, alert_id, created_at in entries:
+            if customer_id != current_customer:
+                keys, alerts, timestamps = array('q'), array('q'), array('q')
+                postings._customers[customer_id] = (keys, alerts, timestamps)
+                current_customer = customer_id
+
+            keys.append(key_hash)
+            alerts.append(alert_id)
+            timestamps.append(_to_timestamp(created_at))
+
+        return postings
+
+    def add(self, customer_id: int, key_hash: int, alert_id: int, created_at: datetime) -> None:
+        self._delta.setdefault(customer_id, {}).setdefault(key_hash, []).append((alert_id, _to_timestamp(created_at)))
+
+    def remove_alerts(self, alerts_ids: Iterable[int]) -> None:
+        self._removed_alerts.update(alerts_ids)
+
+    def lookup(self, customer_id: int, keys_hashes: Iterable[int], since: datetime = None) -> Dict[int, Set[int]]:
+        since_timestamp = _to_timestamp(since) if since is not None else None
+        keys, alerts, timestamps = self._customers.get(customer_id, ((), (), ()))
+        delta = self._delta.get(customer_id, {})
+
+        matches = {}
+        for key_hash in keys_hashes:
+            postings = []
+            position = bisect_left(keys, key_hash)
+            while position < len(keys) and keys[position] == key_hash:
+                postings.append((alerts[position], timestamps[position]))
+                position += 1
+
+            postings.extend(delta.get(key_hash, ()))
+
+            for alert_id, timestamp in postings:
+                if alert_id in self._removed_alerts:
+                    continue
+
+                if since_timestamp is None or timestamp >= since_timestamp:
+                    matches.setdefault(alert_id, set()).add(key_hash)
+
+        return matches
+
+    def __len__(self):
+        return (sum(len(keys) for keys, _, _ in self._customers.values()) +
+                sum(len(entries) for delta in self._delta.values() for entries in delta.values()))
+
+
+class AlertsCorrelationIndex:
+    """
+    In-memory inverted index of the similar alerts cache, kept by a background task of the web process so that
+    related alerts lookups never wait for the database.
+
+    The task builds the postings from the similar_alerts_cache table, then catches up at a short interval with
+    the entries inserted and the alerts deleted since, including by other processes. The changes are read from
+    the transaction IDs stamped on the entries and on the deletions log: every transaction older than the oldest
+    one still running at the previous catch up was read then, so entries committed out of order are not missed.
+    The postings are rebuilt periodically, aside of the ones answering the lookups, to drop the pruned entries.
+    Lookups return None until the first build completes, the caller then querying the database.
+    """
+
+    def __init__(self, refresh_interval: float, rebuild_interval: float, retention_days: int):
+        self._refresh_interval = refresh_interval
+        self._rebuild_interval = rebuild_interval
+        self._retention_days = retention_days
+        self._lock = threading.Lock()
+        self._postings: Optional[CorrelationPostings] = None
+        self._running = False
+        self._built_at = None
+        # Oldest transaction possibly uncommitted at the last catch up, and the ones above it already read
+        self._horizon = None
+        self._read_entries_txids: Set[int] = set()
+
+    def _ensure_running(self) -> None:
+        with self._lock:
+            if self._running:
+                return
+
+            self._running = True
+
+        socket_io.start_background_task(self._run)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                with app.app_context():
+                    if self._built_at is None or time.monotonic() - self._built_at > self._rebuild_interval:
+                        self._rebuild()
+                    else:
+                        self._catch_up()
+
+            except Exception as e:
+                log.warning(f'Unable to refresh the alerts correlation index: {e}')
+
+            socket_io.sleep(self._refresh_interval)
+
+    @staticmethod
+    def _get_horizon() -> int:
+        return db.session.execute(select(func.txid_snapshot_xmin(func.txid_current_snapshot()))).scalar()
+
+    @staticmethod
+    def _entries_query():
+        return select(
+            SimilarAlertsCache.customer_id,
+            SimilarAlertsCache.match_key_hash,
+            SimilarAlertsCache.alert_id,
+            SimilarAlertsCache.created_at,
+            SimilarAlertsCache.txid
+        ).where(
+            SimilarAlertsCache.match_key_hash.isnot(None)
+        )
+
+    def _rebuild(self) -> None:
+        horizon = self._get_horizon()
+        read_txids = set()
+
+        def entries():
+            older_than = datetime.utcnow() - timedelta(days=self._retention_days)
+            rows = db.session.execute(self._entries_query().where(
+                SimilarAlertsCache.created_at >= older_than
+            ).order_by(
+                SimilarAlertsCache.customer_id,
+                SimilarAlertsCache.match_key_hash
+            ).execution_options(yield_per=50000))
+
+            for customer_id, key_hash, alert_id, created_at, txid in rows:
+                if txid is not None and txid >= horizon:
+                    read_txids.add(txid)
+                yield customer_id, key_hash, alert_id, created_at
+
+        postings = CorrelationPostings.from_sorted_entries(entries())
+
+        # The deletions committed during the build are applied by the next catch up
+        with self._lock:
+            self._postings = postings
+            self._horizon = horizon
+            self._read_entries_txids = read_txids
+
+        db.session.commit()
+        self._built_at = time.monotonic()
+        log.info(f'Alerts correlation index built with {len(postings)} entries')
+
+    def _catch_up(self) -> None:
+        horizon = self._get_horizon()
+
+        new_entries = db.session.execute(self._entries_query().where(
+            SimilarAlertsCache.txid >= self._horizon
+        )).all()
+        deletions = db.session.execute(select(SimilarAlertsCacheDeletion.alert_id).where(
+            SimilarAlertsCacheDeletion.txid >= self._horizon
+        )).scalars().all()
+        db.session.commit()
+
+        with self._lock:
+            for customer_id, key_hash, alert_id, created_at, txid in new_entries:
+                if txid not in self._read_entries_txids:
+                    self._postings.add(customer_id, key_hash, alert_id, created_at)
+
+            # Removing an alert twice is harmless, so the deletions are not deduplicated
+            self._postings.remove_alerts(deletions)
+
+            self._read_entries_txids = {txid for *_, txid in new_entries if txid >= horizon}
+            self._horizon = horizon
+
+    def lookup(self, customer_id: int, keys_hashes: Iterable[int],
+               since: datetime = None) -> Optional[Dict[int, Set[int]]]:
+        """
+        Get the alerts of a customer carrying any of the given match keys
+
+        args:
+            customer_id (int): The ID of the customer
+            keys_hashes (list): The match key hashes to look up
+            since (datetime): Only return the alerts cached after this date
+
+        returns:
+            dict: The matched keys hashes, per alert ID, or None while the index is not built yet
+        """
+        self._ensure_running()
+
+        with self._lock:
+            if self._postings is None:
+                return None
+
+            return self._postings.lookup(customer_id, keys_hashes, since)
+
+    def remove_alerts(self, alerts_ids: Iterable[int]):
+        """
+        Remove alerts from the index right away, without waiting for the deletions to be caught up
+
+        args:
+            alerts_ids (list): The IDs of the alerts to remove
+        """
+        with self._lock:
+            if self._postings is not None:
+                self._postings.remove_alerts(alerts_ids)
+
+
+_correlation_index = None
+
+
+def get_alerts_correlation_index():
+    """
+    Get the correlation index of the current process, or None when the correlation index is disabled
+    """
+    global _correlation_index
+
+    if not app.config.get('ALERTS_CORRELATION_INDEX_ENABLED'):
+        return None
+
+    if _correlation_index is None:
+        _correlation_index = AlertsCorrelationIndex(app.config.get('ALERTS_CORRELATION_INDEX_REFRESH_INTERVAL'),
+                                                    app.config.get('ALERTS_CORRELATION_INDEX_REBUILD_INTERVAL'),
+                                                    app.config.get('ALERTS_SIMILARITY_CACHE_RETENTION_DAYS'))
+
+    return _correlation_index
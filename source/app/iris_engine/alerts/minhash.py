@@ -0,0 +1,155 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import hashlib
+import random
+import re
+import struct
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+
+# Mersenne prime used as modulus of the universal hash functions simulating the permutations
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def _hash_token(token: str) -> int:
+    return int.from_bytes(hashlib.md5(token.encode()).digest()[:4], 'little')
+
+
+def get_text_shingles(text: str, size: int = 3) -> Set[str]:
+    """
+    Get the word shingles of a text, i.e. its sequences of consecutive words, case insensitively
+
+    args:
+        text (str): The text
+        size (int): The number of words of the shingles
+
+    returns:
+        set: The shingles. A text shorter than the shingle size is a single shingle
+    """
+    words = _WORD_PATTERN.findall((text or '').lower())
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+
+    return {' '.join(words[index:index + size]) for index in range(len(words) - size + 1)}
+
+
+def get_iocs_tokens(iocs: Iterable[tuple]) -> Set[str]:
+    """
+    Get the tokens of a set of IOCs, normalized the same way as the similar alerts cache match keys
+
+    args:
+        iocs (list): The (IOC value, IOC type ID) pairs
+
+    returns:
+        set: The tokens
+    """
+    tokens = set()
+    for value, type_id in iocs:
+        normalized_value = (value or '').strip(' \t\r\n').lower()
+        if normalized_value:
+            tokens.add(f"{type_id if type_id is not None else ''}|{normalized_value}")
+
+    return tokens
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures, whose proportion of equal values estimates the Jaccard similarity of the sets
+    they were computed from. The permutations are simulated by universal hash functions drawn from a fixed seed,
+    so that signatures computed by different processes are comparable.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        generator = random.Random(seed)
+        self._permutations = [(generator.randint(1, _MERSENNE_PRIME - 1), generator.randint(0, _MERSENNE_PRIME - 1))
+                              for _ in range(num_perm)]
+
+    @property
+    def num_perm(self) -> int:
+        return len(self._permutations)
+
+    def signature(self, tokens: Iterable[str]) -> Optional[List[int]]:
+        """
+        Compute the signature of a set of tokens
+
+        args:
+            tokens (list): The tokens
+
+        returns:
+            list: The 32 bits minimum hash per permutation, or None for an empty set
+        """
+        hashes = {_hash_token(token) for token in tokens}
+        if not hashes:
+            return None
+
+        return [min((a * value + b) % _MERSENNE_PRIME for value in hashes) & _MAX_HASH
+                for a, b in self._permutations]
+
+
+def pack_signature(signature: List[int]) -> bytes:
+    return struct.pack(f'<{len(signature)}I', *signature)
+
+
+def unpack_signature(data: bytes) -> List[int]:
+    return list(struct.unpack(f'<{len(data) // 4}I', data))
+
+
+def estimate_similarity(signature: List[int], other_signature: List[int]) -> float:
+    """
+    Estimate the Jaccard similarity of the sets two signatures were computed from
+
+    returns:
+        float: The proportion of equal values of the signatures, 0 if they have different lengths
+    """
+    if not signature or len(signature) != len(other_signature):
+        return 0.0
+
+    return sum(1 for value, other_value in zip(signature, other_signature) if value == other_value) / len(signature)
+
+
+def get_lsh_buckets_hashes(kind: str, signature: List[int], bands: int) -> List[int]:
+    """
+    Get the locality sensitive hashing buckets of a signature. The signature is split in bands of consecutive
+    values, each band being hashed into a bucket, so that signatures sharing a bucket are candidate near
+    duplicates. Two sets of Jaccard similarity s share at least one bucket with a probability of
+    1 - (1 - s^r)^b, with b bands of r values.
+
+    args:
+        kind (str): The kind of the signature, so that buckets of different kinds do not collide
+        signature (list): The signature
+        bands (int): The number of bands, dividing the signature length
+
+    returns:
+        list: The bucket hashes, as signed 64 bits integers
+    """
+    if bands <= 0 or len(signature) % bands:
+        raise ValueError(f'{bands} bands do not divide a signature of {len(signature)} values')
+
+    rows = len(signature) // bands
+    buckets = []
+    for band in range(bands):
+        band_data = f'{kind}|{band}|'.encode() + pack_signature(signature[band * rows:(band + 1) * rows])
+        buckets.append(int.from_bytes(hashlib.md5(band_data).digest()[:8], 'big', signed=True))
+
+    return buckets
@@ -0,0 +1,184 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import json
+import threading
+from flask_login import current_user
+from flask_socketio import join_room
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Set
+from typing import Tuple
+
+from app import app
+from app import socket_io
+from app.datamgmt.manage.manage_access_control_db import get_user_clients_id
+from app.iris_engine.access_control.utils import ac_current_user_has_permission
+from app.models.authorization import Permissions
+
+ALERTS_CHANGES = ('new', 'updated', 'deleted')
+
+# Above this number of ranges, the changes of a kind are reported as a single range from the lowest to the highest id
+_ALERTS_CHANGED_MAX_RANGES = 50
+
+
+# Room of the server administrators, who see the alerts of every customer
+ALERTS_ADMINISTRATORS_ROOM = 'alerts-administrators'
+
+
+def get_alerts_customer_room(customer_id: int) -> str:
+    return f'alerts-customer-{customer_id}'
+
+
+def get_alerts_user_room(user_id: int) -> str:
+    """
+    Get the room of a user in the /alerts namespace, receiving the events of the operations the user requested
+    """
+    return f'alerts-user-{user_id}'
+
+
+def get_alerts_changed_rooms(customer_id: int) -> List[str]:
+    """
+    Get the rooms the alerts_changed events of a customer are emitted to. A client in several of them
+    receives the event once
+    """
+    return [get_alerts_customer_room(customer_id), ALERTS_ADMINISTRATORS_ROOM]
+
+
+def _get_ids_ranges(alert_ids: Set[int]) -> List[List[int]]:
+    ranges = []
+    for alert_id in sorted(alert_ids):
+        if ranges and alert_id == ranges[-1][1] + 1:
+            ranges[-1][1] = alert_id
+        else:
+            ranges.append([alert_id, alert_id])
+
+    if len(ranges) > _ALERTS_CHANGED_MAX_RANGES:
+        return [[ranges[0][0], ranges[-1][1]]]
+
+    return ranges
+
+
+def get_alerts_changed_payload(customer_id: int, changes: Dict[str, Set[int]]) -> dict:
+    """
+    Build the alerts_changed event of a customer. An alert deleted within the window is only reported as deleted,
+    and an alert created within the window is not reported as updated.
+    """
+    deleted = changes['deleted']
+    new = changes['new'] - deleted
+    updated = changes['updated'] - deleted - new
+
+    payload = {'customer_id': customer_id}
+    for change, alert_ids in (('new', new), ('updated', updated), ('deleted', deleted)):
+        payload[change] = {
+            'count': len(alert_ids),
+            'ranges': _get_ids_ranges(alert_ids)
+        }
+
+    return payload
+
+
+class AlertsChangesCoalescer:
+    """
+    Coalesce the alerts changes over a short window, so that a storm of alerts results in a single alerts_changed
+    event per customer rather than one event per alert. The event is emitted to the room of the customer in the
+    /alerts namespace, which the users with access to the customer join when connecting, and to the room of the
+    server administrators.
+
+    The first change of a window schedules a background flush, the following ones are only buffered.
+    """
+
+    def __init__(self, window: float):
+        self._window = window
+        self._lock = threading.Lock()
+        self._changes: Dict[int, Dict[str, Set[int]]] = {}
+        self._flush_scheduled = False
+
+    def record(self, change: str, customer_id: int, alert_ids: Iterable[int]) -> None:
+        with self._lock:
+            customer_changes = self._changes.setdefault(customer_id, {kind: set() for kind in ALERTS_CHANGES})
+            customer_changes[change].update(alert_ids)
+
+            if self._flush_scheduled:
+                return
+
+            self._flush_scheduled = True
+
+        if self._window <= 0:
+            self.flush()
+        else:
+            socket_io.start_background_task(self._flush_after_window)
+
+    def _flush_after_window(self) -> None:
+        socket_io.sleep(self._window)
+        self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            changes = self._changes
+            self._changes = {}
+            self._flush_scheduled = False
+
+        for customer_id, customer_changes in changes.items():
+            socket_io.emit('alerts_changed', json.dumps(get_alerts_changed_payload(customer_id, customer_changes)),
+                           namespace='/alerts', to=get_alerts_changed_rooms(customer_id))
+
+
+_alerts_changes_coalescer = AlertsChangesCoalescer(app.config.get('ALERTS_CHANGES_COALESCE_WINDOW'))
+
+
+def notify_alerts_changed(change: str, alerts: Iterable) -> None:
+    """
+    Record alerts changes, to be notified with the next alerts_changed event of their customers
+
+    args:
+        change (str): The kind of change, one of ALERTS_CHANGES
+        alerts (Iterable): The alerts, or rows with their alert_id and alert_customer_id
+    """
+    notify_alerts_ids_changed(change, [(alert.alert_id, alert.alert_customer_id) for alert in alerts])
+
+
+def notify_alerts_ids_changed(change: str, alerts_ids: Iterable[Tuple[int, int]]) -> None:
+    """
+    Record alerts changes from the alerts IDs, for the alerts which can no longer be loaded, such as deleted ones
+
+    args:
+        change (str): The kind of change, one of ALERTS_CHANGES
+        alerts_ids (Iterable): Pairs of alert ID and customer ID of the alerts
+    """
+    alerts_per_customer: Dict[int, Set[int]] = {}
+    for alert_id, customer_id in alerts_ids:
+        alerts_per_customer.setdefault(customer_id, set()).add(alert_id)
+
+    for customer_id, alert_ids in alerts_per_customer.items():
+        _alerts_changes_coalescer.record(change, customer_id, alert_ids)
+
+
+@socket_io.on('connect', namespace='/alerts')
+def socket_alerts_connect(auth=None):
+    if not current_user.is_authenticated:
+        return False
+
+    join_room(get_alerts_user_room(current_user.id))
+
+    if ac_current_user_has_permission(Permissions.server_administrator):
+        join_room(ALERTS_ADMINISTRATORS_ROOM)
+
+    for customer_id in get_user_clients_id(current_user.id):
+        join_room(get_alerts_customer_room(customer_id))
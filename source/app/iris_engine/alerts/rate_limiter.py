@@ -0,0 +1,173 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+
+from app import app
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a fixed rate, up to its capacity. A request bigger than the capacity
+    is let through when the bucket is full, putting it in debt, so large batches are delayed rather than refused.
+    """
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated_at = now
+
+    def _refill(self, now: float):
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    def get_wait_time(self, cost: float, now: float) -> float:
+        """
+        Get the number of seconds to wait before the bucket holds enough tokens for a request
+
+        args:
+            cost (float): The number of tokens of the request
+            now (float): The current monotonic time
+
+        returns:
+            float: The time to wait, 0 when the request can be let through right away
+        """
+        self._refill(now)
+        missing = min(cost, self._capacity) - self._tokens
+        if missing <= 0:
+            return 0
+
+        return missing / self._rate
+
+    def consume(self, cost: float):
+        self._tokens -= cost
+
+
+class IngestionRateLimiter:
+    """
+    Token buckets limiting the number of alerts ingested per second, for each key of each scope, e.g. each API key
+    and each alert source. A request takes tokens from all of its buckets, or from none of them when one of them
+    is short, so a throttled request does not consume the budget of its other scopes.
+
+    The buckets live in the memory of the current process. The least recently used ones are evicted beyond the
+    maximum number of buckets, which only resets them to full.
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[float, float]], max_buckets: int = 10000):
+        self._limits = {scope: limit for scope, limit in limits.items() if limit[0] > 0}
+        self._max_buckets = max_buckets
+        self._lock = threading.Lock()
+        self._buckets: OrderedDict = OrderedDict()
+        self._accepted = 0
+        self._throttled = {scope: 0 for scope in self._limits}
+        self._rejected = 0
+
+    def _get_bucket(self, scope: str, key, now: float) -> TokenBucket:
+        bucket = self._buckets.get((scope, key))
+        if bucket is None:
+            rate, capacity = self._limits[scope]
+            bucket = TokenBucket(rate, max(capacity, rate), now)
+            self._buckets[(scope, key)] = bucket
+            if len(self._buckets) > self._max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end((scope, key))
+
+        return bucket
+
+    def acquire(self, requests: Iterable[Tuple[str, object, int]], count: int) -> Tuple[float, Optional[str]]:
+        """
+        Take the tokens of a request from its buckets
+
+        args:
+            requests (list): The scope, key and number of tokens taken from each bucket
+            count (int): The number of alerts of the request, for the statistics
+
+        returns:
+            tuple: The time to wait before retrying and the scope which throttled the request,
+                   or 0 and None when the request is let through
+        """
+        now = time.monotonic()
+        with self._lock:
+            buckets = []
+            retry_after = 0
+            throttling_scope = None
+            for scope, key, cost in requests:
+                if scope not in self._limits:
+                    continue
+
+                bucket = self._get_bucket(scope, key, now)
+                wait_time = bucket.get_wait_time(cost, now)
+                if wait_time > retry_after:
+                    retry_after = wait_time
+                    throttling_scope = scope
+
+                buckets.append((bucket, cost))
+
+            if throttling_scope:
+                self._throttled[throttling_scope] += count
+                return retry_after, throttling_scope
+
+            for bucket, cost in buckets:
+                bucket.consume(cost)
+
+            self._accepted += count
+            return 0, None
+
+    def record_rejected(self, count: int):
+        """
+        Count alerts refused for another reason than the rate limits, such as the ingestion queue backpressure
+        """
+        with self._lock:
+            self._rejected += count
+
+    def get_statistics(self) -> dict:
+        with self._lock:
+            return {
+                'accepted': self._accepted,
+                'throttled': dict(self._throttled),
+                'rejected': self._rejected,
+                'buckets': len(self._buckets)
+            }
+
+
+_rate_limiter = None
+
+
+def get_ingestion_rate_limiter() -> IngestionRateLimiter:
+    """
+    Get the ingestion rate limiter of the current process. A scope with a rate of 0 is not limited,
+    but its alerts are still counted.
+    """
+    global _rate_limiter
+
+    if _rate_limiter is None:
+        _rate_limiter = IngestionRateLimiter({
+            'api_key': (app.config.get('ALERTS_RATE_LIMIT_PER_KEY'), app.config.get('ALERTS_RATE_LIMIT_PER_KEY_BURST')),
+            'source': (app.config.get('ALERTS_RATE_LIMIT_PER_SOURCE'),
+                       app.config.get('ALERTS_RATE_LIMIT_PER_SOURCE_BURST'))
+        })
+
+    return _rate_limiter
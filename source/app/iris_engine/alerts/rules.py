@@ -0,0 +1,334 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import re
+import threading
+from collections import Counter
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from sqlalchemy import func
+
+from app import app
+from app import db
+from app.models.alerts import AlertRule
+
+log = app.logger
+
+ALERT_RULES_ACTIONS = ('drop', 'aggregate', 'assign')
+
+ALERT_RULES_OPERATORS = ('equals', 'regex')
+
+# Fields of the alerts the rules can match on. The source content is matched with a dotted path under this prefix
+ALERT_RULES_FIELDS = ('alert_source', 'alert_title', 'alert_tags', 'ioc_value')
+ALERT_RULES_CONTENT_PREFIX = 'alert_source_content.'
+
+
+class _Condition(NamedTuple):
+    field: str
+    operator: str
+    values: frozenset
+    pattern: Optional[re.Pattern]
+
+    def matches(self, field_values: List[str]) -> bool:
+        if self.operator == 'equals':
+            return any(value in self.values for value in field_values)
+
+        return any(self.pattern.search(value) for value in field_values)
+
+
+class _CompiledRule(NamedTuple):
+    rule_id: int
+    customer_id: Optional[int]
+    action: str
+    owner_id: Optional[int]
+    conditions: Tuple[_Condition, ...]
+
+
+def compile_alert_rule_conditions(conditions) -> Tuple[_Condition, ...]:
+    """
+    Compile the conditions of a rule, which all have to match for the rule to match. Each condition is a dict with:
+        - field: one of ALERT_RULES_FIELDS, or a dotted path in the source content prefixed by
+                 ALERT_RULES_CONTENT_PREFIX
+        - operator: 'equals', matching any of the values exactly, or 'regex', searching the pattern
+        - value: a string, or a list of strings with 'equals'
+
+    raises:
+        ValueError: if the conditions are invalid
+    """
+    if not isinstance(conditions, list) or not conditions:
+        raise ValueError('Expected a non empty list of conditions')
+
+    compiled = []
+    for condition in conditions:
+        if not isinstance(condition, dict):
+            raise ValueError('Expected a condition object')
+
+        field = condition.get('field')
+        if field not in ALERT_RULES_FIELDS and not (isinstance(field, str) and
+                                                    field.startswith(ALERT_RULES_CONTENT_PREFIX) and
+                                                    len(field) > len(ALERT_RULES_CONTENT_PREFIX)):
+            raise ValueError(f'Invalid field {field}')
+
+        operator = condition.get('operator')
+        value = condition.get('value')
+        if operator == 'equals':
+            values = value if isinstance(value, list) else [value]
+            if not all(isinstance(item, str) for item in values):
+                raise ValueError('Expected a string or a list of strings as value')
+
+            compiled.append(_Condition(field, operator, frozenset(values), None))
+
+        elif operator == 'regex':
+            if not isinstance(value, str):
+                raise ValueError('Expected a string as value')
+
+            try:
+                pattern = re.compile(value)
+            except re.error as e:
+                raise ValueError(f'Invalid regex {value}: {e}')
+
+            compiled.append(_Condition(field, operator, frozenset(), pattern))
+
+        else:
+            raise ValueError(f'Invalid operator {operator}. Expected one of {", ".join(ALERT_RULES_OPERATORS)}')
+
+    return tuple(compiled)
+
+
+def _get_content_values(content, path: List[str]) -> List[str]:
+    for key in path:
+        if not isinstance(content, dict):
+            return []
+        content = content.get(key)
+
+    if content is None or isinstance(content, dict):
+        return []
+
+    if isinstance(content, list):
+        return [str(item) for item in content if item is not None and not isinstance(item, (dict, list))]
+
+    return [str(content)]
+
+
+def _get_field_values(alert_data: dict, field: str) -> List[str]:
+    if field == 'alert_tags':
+        tags = alert_data.get('alert_tags')
+        return [tag.strip() for tag in tags.split(',') if tag.strip()] if isinstance(tags, str) else []
+
+    if field == 'ioc_value':
+        iocs = alert_data.get('alert_iocs')
+        if not isinstance(iocs, list):
+            return []
+
+        return [ioc['ioc_value'] for ioc in iocs if isinstance(ioc, dict) and isinstance(ioc.get('ioc_value'), str)]
+
+    if field.startswith(ALERT_RULES_CONTENT_PREFIX):
+        path = field[len(ALERT_RULES_CONTENT_PREFIX):].split('.')
+        return _get_content_values(alert_data.get('alert_source_content'), path)
+
+    value = alert_data.get(field)
+    return [value] if isinstance(value, str) else []
+
+
+def get_alert_customer_id(alert_data: dict) -> Optional[int]:
+    try:
+        return int(alert_data.get('alert_customer_id'))
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_combinable(pattern: re.Pattern) -> bool:
+    # Group references, numbered or named, need a group, and the flags other than the default are set inline
+    return pattern.groups == 0 and not pattern.flags & ~re.UNICODE
+
+
+class AlertRulesMatcher:
+    """
+    Rules compiled for a fast evaluation against many alerts. The rules are evaluated in order and the first one
+    whose conditions all match applies.
+
+    Each rule is indexed on its first condition: values matched exactly are looked up in a hash table, and
+    the patterns of the regex conditions on a same field are combined in a single regex, whose search skips
+    all of them at once when none matches. Patterns with groups or inline flags are searched one by one instead,
+    as combining them would renumber their group references or apply their flags to the other patterns.
+    Only the rules selected by their indexed condition are then evaluated in full.
+    """
+
+    def __init__(self, rules: List[_CompiledRule]):
+        self._rules = rules
+        self._equals_index: Dict[str, Dict[str, List[int]]] = {}
+        self._regex_index: Dict[str, Tuple[Optional[re.Pattern], List[int]]] = {}
+        self._separate_regex_index: Dict[str, List[Tuple[re.Pattern, int]]] = {}
+
+        regex_rules: Dict[str, List[int]] = {}
+        for rule_index, rule in enumerate(rules):
+            condition = rule.conditions[0]
+            if condition.operator == 'equals':
+                field_index = self._equals_index.setdefault(condition.field, {})
+                for value in condition.values:
+                    field_index.setdefault(value, []).append(rule_index)
+            elif _is_combinable(condition.pattern):
+                regex_rules.setdefault(condition.field, []).append(rule_index)
+            else:
+                self._separate_regex_index.setdefault(condition.field, []).append((condition.pattern, rule_index))
+
+        for field, rules_indexes in regex_rules.items():
+            try:
+                combined = re.compile('|'.join(f'(?:{rules[rule_index].conditions[0].pattern.pattern})'
+                                               for rule_index in rules_indexes))
+            except re.error:
+                # The rules are then all evaluated in full
+                combined = None
+
+            self._regex_index[field] = (combined, rules_indexes)
+
+    def match(self, alert_data: dict) -> Optional[_CompiledRule]:
+        """
+        Get the rule applying to an alert
+
+        args:
+            alert_data (dict): The alert, in the format expected by /alerts/add
+
+        returns:
+            The first matching rule, or None
+        """
+        customer_id = get_alert_customer_id(alert_data)
+        if customer_id is None:
+            return None
+
+        fields_values = {}
+
+        def get_values(field):
+            if field not in fields_values:
+                fields_values[field] = _get_field_values(alert_data, field)
+            return fields_values[field]
+
+        candidates = set()
+        for field, field_index in self._equals_index.items():
+            for value in get_values(field):
+                candidates.update(field_index.get(value, ()))
+
+        for field, (combined, rules_indexes) in self._regex_index.items():
+            values = get_values(field)
+            if combined is None or any(combined.search(value) for value in values):
+                candidates.update(rules_indexes)
+
+        for field, patterns in self._separate_regex_index.items():
+            values = get_values(field)
+            for pattern, rule_index in patterns:
+                if any(pattern.search(value) for value in values):
+                    candidates.add(rule_index)
+
+        for rule_index in sorted(candidates):
+            rule = self._rules[rule_index]
+            if rule.customer_id is not None and rule.customer_id != customer_id:
+                continue
+
+            if all(condition.matches(get_values(condition.field)) for condition in rule.conditions):
+                return rule
+
+        return None
+
+
+class AlertRulesEngine:
+    """
+    Apply the enabled alert rules to alerts about to be ingested. The rules are compiled once per process, and
+    compiled again whenever they change, which is detected with the number of rules and their last update time.
+    The hits are counted per rule and written once per batch of alerts.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._matcher = None
+
+    def _refresh(self):
+        version = tuple(db.session.query(func.count(AlertRule.rule_id), func.max(AlertRule.rule_updated_at)).one())
+        if version == self._version:
+            return
+
+        rules = []
+        query = db.session.query(AlertRule).filter(
+            AlertRule.rule_enabled.is_(True)
+        ).order_by(AlertRule.rule_order, AlertRule.rule_id)
+
+        for rule in query.all():
+            try:
+                conditions = compile_alert_rule_conditions(rule.rule_conditions)
+            except ValueError as e:
+                log.warning(f'Skipping alert rule #{rule.rule_id}: {e}')
+                continue
+
+            rules.append(_CompiledRule(rule.rule_id, rule.rule_customer_id, rule.rule_action, rule.rule_owner_id,
+                                       conditions))
+
+        self._matcher = AlertRulesMatcher(rules)
+        self._version = version
+        log.info(f'Alert rules compiled with {len(rules)} enabled rules')
+
+    def apply(self, alerts_data: list) -> Tuple[list, Counter, Counter]:
+        """
+        Apply the rules to alerts. Dropped and aggregated alerts are removed, assigned alerts get the owner of the
+        rule. Alerts which are not objects are kept as they are, to be rejected by the validation.
+
+        args:
+            alerts_data (list): The alerts, in the format expected by /alerts/add
+
+        returns:
+            tuple: The alerts to create, the number of hits per rule ID, and the number of aggregated alerts per
+                   (rule ID, customer ID, alert title)
+        """
+        with self._lock:
+            self._refresh()
+            matcher = self._matcher
+
+        kept = []
+        hits = Counter()
+        aggregates = Counter()
+        for alert_data in alerts_data:
+            rule = matcher.match(alert_data) if isinstance(alert_data, dict) else None
+            if rule is None:
+                kept.append(alert_data)
+                continue
+
+            hits[rule.rule_id] += 1
+            if rule.action == 'assign':
+                kept.append({**alert_data, 'alert_owner_id': rule.owner_id})
+
+            elif rule.action == 'aggregate':
+                title = alert_data.get('alert_title')
+                aggregates[(rule.rule_id, get_alert_customer_id(alert_data),
+                            title if isinstance(title, str) else '')] += 1
+
+        return kept, hits, aggregates
+
+
+_alert_rules_engine = None
+
+
+def get_alert_rules_engine() -> AlertRulesEngine:
+    global _alert_rules_engine
+
+    if _alert_rules_engine is None:
+        _alert_rules_engine = AlertRulesEngine()
+
+    return _alert_rules_engine
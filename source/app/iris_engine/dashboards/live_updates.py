@@ -0,0 +1,252 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timedelta
+from flask import request
+from flask_login import current_user
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from app import app
+from app import db
+from app import socket_io
+from app.iris_engine.access_control.utils import ac_user_has_permission
+from app.models.authorization import Permissions
+from app.models.authorization import User
+
+LIVE_UPDATES_NAMESPACE = '/dashboards'
+
+log = app.logger
+
+
+@dataclass
+class LiveSubscription:
+    """
+    A page followed by a Socket.IO client. The refresh callable returns the update to push to the client,
+    or None when nothing changed since its previous call.
+    """
+    sid: str
+    name: str
+    refresh: Callable[[], Optional[Dict[str, Any]]]
+
+
+class LiveAccessRevoked(Exception):
+    """Raised by a refresh callable when the user of the subscription can no longer access the subscribed page"""
+    pass
+
+
+def get_live_user(user_id: int, *permissions: Permissions) -> User:
+    """
+    Reload the user of a subscription, so that each refresh applies the current permissions and accesses of the user
+    rather than the ones they had when subscribing
+
+    args:
+        user_id (int): The ID of the subscribed user
+        permissions (Permissions): The permissions of which the user must still have one
+
+    returns:
+        User: The user, or raises LiveAccessRevoked when the user was deactivated or lost the permissions
+    """
+    user = db.session.get(User, user_id)
+    if user is None or not user.active:
+        raise LiveAccessRevoked()
+
+    if permissions and not any(ac_user_has_permission(user, permission) for permission in permissions):
+        raise LiveAccessRevoked()
+
+    return user
+
+
+def _get_payload_digest(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def get_payloads_delta(digests: Dict[str, str], payloads: Dict[str, Any],
+                       keys: Iterable[str] = None) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Compare payloads with the digests of the payloads previously sent, and record their new digests
+
+    args:
+        digests (dict): The digests of the payloads previously sent, per key. Updated in place
+        payloads (dict): The recomputed payloads, per key
+        keys (Iterable): All the current keys, if only some payloads were recomputed
+
+    returns:
+        tuple: The payloads which changed, and the keys which no longer exist
+    """
+    current_keys = set(payloads) if keys is None else set(keys) | set(payloads)
+
+    removed = [key for key in digests if key not in current_keys]
+    for key in removed:
+        del digests[key]
+
+    changed = {}
+    for key, payload in payloads.items():
+        digest = _get_payload_digest(payload)
+        if digests.get(key) != digest:
+            digests[key] = digest
+            changed[key] = payload
+
+    return changed, removed
+
+
+def get_live_timeframe_args(data: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """
+    Get the timeframe of a subscription. A subscription with a range in seconds follows the current time, its end
+    being rounded to the minute so that its updates only change once per minute when the data does not.
+    """
+    try:
+        range_seconds = float(data.get('range_seconds') or 0)
+    except (TypeError, ValueError):
+        range_seconds = 0
+
+    if range_seconds <= 0:
+        return {'start': data.get('start'), 'end': data.get('end')}
+
+    end = datetime.utcnow().replace(second=0, microsecond=0)
+    return {'start': (end - timedelta(seconds=range_seconds)).isoformat(), 'end': end.isoformat()}
+
+
+class LiveSubscriptions:
+    """
+    Subscriptions of the Socket.IO clients of this process. While subscriptions exist, a background task refreshes
+    them at a fixed interval and pushes to each client the updates of its subscriptions, as live_update events.
+    A subscription which fails to refresh, or whose user lost access to the page, is dropped and its client is sent
+    a live_closed event.
+    """
+
+    def __init__(self, interval: float, emit: Callable = None):
+        self._interval = interval
+        self._emit = emit or self._emit_to_client
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[Tuple[str, str], LiveSubscription] = {}
+        self._running = False
+
+    @staticmethod
+    def _emit_to_client(event: str, data: Dict[str, Any], sid: str) -> None:
+        socket_io.emit(event, json.dumps(data, default=str), namespace=LIVE_UPDATES_NAMESPACE, to=sid)
+
+    @property
+    def enabled(self) -> bool:
+        return self._interval > 0
+
+    def subscribe(self, subscription: LiveSubscription) -> None:
+        with self._lock:
+            self._subscriptions[(subscription.sid, subscription.name)] = subscription
+            if self._running:
+                return
+
+            self._running = True
+
+        socket_io.start_background_task(self._run)
+
+    def unsubscribe(self, sid: str, name: str = None) -> None:
+        with self._lock:
+            for key in list(self._subscriptions):
+                if key[0] == sid and (name is None or key[1] == name):
+                    del self._subscriptions[key]
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+    def _run(self) -> None:
+        while True:
+            socket_io.sleep(self._interval)
+            with self._lock:
+                if not self._subscriptions:
+                    self._running = False
+                    return
+
+            with app.app_context():
+                self.poll()
+
+    def poll(self) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.values())
+
+        for subscription in subscriptions:
+            try:
+                update = subscription.refresh()
+
+            except LiveAccessRevoked:
+                db.session.rollback()
+                self.unsubscribe(subscription.sid, subscription.name)
+                self._emit('live_closed', {'subscription': subscription.name, 'message': 'Access denied'},
+                           subscription.sid)
+                continue
+
+            except Exception as e:
+                # The subscriptions share the session, which must not be left in a failed transaction
+                db.session.rollback()
+                log.warning(f'Unable to refresh live subscription {subscription.name}: {e}')
+                self.unsubscribe(subscription.sid, subscription.name)
+                self._emit('live_closed', {'subscription': subscription.name}, subscription.sid)
+                continue
+
+            if update is not None:
+                self._emit('live_update', {'subscription': subscription.name, **update}, subscription.sid)
+
+
+_live_subscriptions = LiveSubscriptions(app.config.get('DASHBOARDS_LIVE_UPDATES_INTERVAL'))
+
+
+def live_updates_enabled() -> bool:
+    return _live_subscriptions.enabled
+
+
+def live_subscribe(name: str, refresh: Callable[[], Optional[Dict[str, Any]]]) -> None:
+    """
+    Subscribe the Socket.IO client of the current request to the updates returned by the refresh callable.
+    The callable runs in the background task, outside of the request, and is called once here so that its
+    first update in the background only covers the changes made after the subscription.
+
+    args:
+        name (str): The name of the subscription, replacing the subscription of the client with the same name
+        refresh (Callable): Returns the update to push, or None when nothing changed
+    """
+    refresh()
+    _live_subscriptions.subscribe(LiveSubscription(request.sid, name, refresh))
+
+
+@socket_io.on('connect', namespace=LIVE_UPDATES_NAMESPACE)
+def socket_live_updates_connect(auth=None):
+    if not current_user.is_authenticated or not _live_subscriptions.enabled:
+        return False
+
+
+@socket_io.on('unsubscribe', namespace=LIVE_UPDATES_NAMESPACE)
+def socket_live_updates_unsubscribe(data):
+    name = data.get('subscription') if isinstance(data, dict) else None
+    if name:
+        _live_subscriptions.unsubscribe(request.sid, name)
+
+
+@socket_io.on('disconnect', namespace=LIVE_UPDATES_NAMESPACE)
+def socket_live_updates_disconnect():
+    _live_subscriptions.unsubscribe(request.sid)
@@ -29,7 +29,11 @@ from app.datamgmt.manage.manage_users_db import add_user_to_organisation
 from app.datamgmt.manage.manage_users_db import user_exists
 from app.iris_engine.access_control.utils import ac_add_users_multi_effective_access
 from app.models.cases import Cases
+from app.models.alerts import AlertStatus
+from app.models.alerts import Severity
+from app.models.models import AssetsType
 from app.models.models import Client
+from app.models.models import IocType
 from app.models.models import get_or_create
 from app.models.authorization import CaseAccessLevel
 from app.models.authorization import User
@@ -81,6 +85,54 @@ def gen_demo_users(count, seed_user):
               ''.join(random.choices(string.ascii_letters, k=64))
 
 
+def gen_demo_alerts(count, customers_ids, seed_alerts, iocs_pool_size=500, assets_pool_size=200):
+    """
+    Generate synthetic alerts, in the format expected by /alerts/add. The IOCs and assets are drawn from
+    pools shared by all the alerts, so that the alerts correlate as they would in production.
+    """
+    ioc_types = {ioc_type.type_name: ioc_type.type_id
+                 for ioc_type in IocType.query.filter(IocType.type_name.in_(['ip-any', 'sha256'])).all()}
+    assets_types_ids = [asset_type.asset_id for asset_type in AssetsType.query.order_by(AssetsType.asset_id).all()]
+    severities_ids = [severity.severity_id for severity in Severity.query.order_by(Severity.severity_id).all()]
+    open_statuses_ids = [status.status_id for status in AlertStatus.query.filter(
+        AlertStatus.status_name.in_(['New', 'Assigned', 'In progress', 'Pending'])
+    ).order_by(AlertStatus.status_id).all()]
+
+    random.seed(seed_alerts, version=2)
+
+    sources = ['EDR', 'SIEM', 'IDS', 'Mail gateway', 'Proxy', 'Cloud trail']
+    title_templates = ['Suspicious process {} on {}', 'Malware {} detected on {}', 'Outbound beacon to {} from {}',
+                       'Failed logins burst for {} on {}', 'Phishing link {} clicked on {}']
+    iocs_pool = [(f'{random.randint(1, 223)}.{random.randint(0, 255)}.{random.randint(0, 255)}.'
+                  f'{random.randint(1, 254)}', ioc_types['ip-any']) if index % 2 else
+                 (''.join(random.choices('0123456789abcdef', k=64)), ioc_types['sha256'])
+                 for index in range(iocs_pool_size)]
+    assets_pool = [(f'host-{index:05d}', random.choice(assets_types_ids)) for index in range(assets_pool_size)]
+
+    for i in range(count):
+        asset_name, asset_type_id = random.choice(assets_pool)
+        alert_iocs = random.sample(iocs_pool, k=random.randint(0, 5))
+        alert_assets = random.sample(assets_pool, k=random.randint(0, 2))
+
+        yield {
+            'alert_title': random.choice(title_templates).format(random.choice(alert_iocs)[0][:16] if alert_iocs
+                                                                  else 'unknown', asset_name),
+            'alert_description': f'Synthetic alert {i} raised for {asset_name}',
+            'alert_source': random.choice(sources),
+            'alert_source_ref': f'REF-{seed_alerts}-{i}',
+            'alert_source_content': {'index': i, 'raw': ''.join(random.choices(string.ascii_letters, k=256))},
+            'alert_severity_id': random.choice(severities_ids),
+            'alert_status_id': random.choice(open_statuses_ids),
+            'alert_customer_id': random.choice(customers_ids),
+            'alert_tags': ','.join(random.sample(['demo', 'synthetic', 'lateral', 'c2', 'phishing'], k=2)),
+            'alert_iocs': [{'ioc_value': ioc_value, 'ioc_type_id': ioc_type_id, 'ioc_tlp_id': 2,
+                            'ioc_description': '', 'ioc_tags': ''}
+                           for ioc_value, ioc_type_id in alert_iocs],
+            'alert_assets': [{'asset_name': name, 'asset_type_id': type_id, 'asset_description': ''}
+                             for name, type_id in [(asset_name, asset_type_id)] + alert_assets]
+        }
+
+
 def create_demo_users(def_org, gadm, ganalystes, users_count, seed_user, adm_count, seed_adm):
     users = {
         'admins': [],
@@ -0,0 +1,44 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+
+from celery.schedules import crontab
+
+from app import app
+from app import celery
+from app.datamgmt.blob_store_db import offload_inline_payloads
+from app.datamgmt.blob_store_db import prune_blob_store
+
+
+@celery.task
+def task_maintain_blob_store():
+    """
+    Move the large payloads still stored inline to the blob store, then delete the blobs no longer referenced
+    """
+    offloaded = offload_inline_payloads()
+    deleted = prune_blob_store()
+    app.logger.info(f'Blob store maintenance: {offloaded} payloads offloaded, {deleted} blobs deleted')
+
+
+@celery.on_after_finalize.connect
+def setup_periodic_blob_store_maintenance(sender, **kwargs):
+    sender.add_periodic_task(
+        crontab(minute='0', hour='5'),
+        task_maintain_blob_store.s(),
+        name='iris_maintain_blob_store'
+    )
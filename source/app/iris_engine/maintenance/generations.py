@@ -0,0 +1,42 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+
+from celery.schedules import crontab
+
+from app import celery
+from app.datamgmt.alerts.alerts_db import compact_alerts_generations
+from app.datamgmt.case.case_db import compact_cases_generations
+
+
+@celery.task
+def task_compact_generations():
+    """
+    Fold the logged writes into the write counters, so that the generations are read from few rows
+    """
+    compact_alerts_generations()
+    compact_cases_generations()
+
+
+@celery.on_after_finalize.connect
+def setup_periodic_generations_compaction(sender, **kwargs):
+    sender.add_periodic_task(
+        crontab(minute='*'),
+        task_compact_generations.s(),
+        name='iris_compact_generations'
+    )
@@ -0,0 +1,42 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+
+from celery.schedules import crontab
+
+from app import celery
+from app.datamgmt.partitions import MONTHLY_PARTITIONED_TABLES
+from app.datamgmt.partitions import create_monthly_partitions
+
+
+@celery.task
+def task_maintain_partitions():
+    """
+    Create ahead the monthly partitions of the partitioned tables
+    """
+    for table_name in MONTHLY_PARTITIONED_TABLES:
+        create_monthly_partitions(table_name)
+
+
+@celery.on_after_finalize.connect
+def setup_periodic_partitions_maintenance(sender, **kwargs):
+    sender.add_periodic_task(
+        crontab(minute='0', hour='2'),
+        task_maintain_partitions.s(),
+        name='iris_maintain_partitions'
+    )
@@ -0,0 +1,53 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+
+from celery.schedules import crontab
+
+from app import app
+from app import celery
+from app.datamgmt.statistics.rollups_db import refresh_rollups
+
+
+@celery.task
+def task_refresh_rollups():
+    """
+    Recompute the statistics rollups of the hours modified since the last refresh
+    """
+    if not app.config.get('STATISTICS_ROLLUPS_ENABLED'):
+        return
+
+    refreshed = 0
+    batch_hours = app.config.get('STATISTICS_ROLLUPS_BATCH_HOURS')
+    while True:
+        hours = sum(refresh_rollups(batch_hours))
+        if not hours:
+            break
+        refreshed += hours
+
+    if refreshed:
+        app.logger.info(f'Refreshed {refreshed} hours of statistics rollups')
+
+
+@celery.on_after_finalize.connect
+def setup_periodic_rollups_refresh(sender, **kwargs):
+    sender.add_periodic_task(
+        crontab(minute='*'),
+        task_refresh_rollups.s(),
+        name='iris_refresh_rollups'
+    )
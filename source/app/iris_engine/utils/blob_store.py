@@ -0,0 +1,186 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Iterator
+
+import zstandard
+from sqlalchemy.orm import synonym
+
+from app import app
+
+log = app.logger
+
+_DIGEST_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+class BlobStore:
+    """
+    Content-addressed store of zstd compressed payloads, backed by the filesystem.
+
+    Payloads are identified by the SHA-256 of their uncompressed content, so identical payloads are stored
+    once. They are written to a temporary file then renamed, so that readers never see a partial blob.
+    """
+
+    def __init__(self, root_path: str, compression_level: int = 3):
+        self._root_path = Path(root_path)
+        self._compression_level = compression_level
+
+    def _get_path(self, digest: str) -> Path:
+        if not _DIGEST_PATTERN.match(digest):
+            raise ValueError(f'Invalid blob digest {digest}')
+
+        return self._root_path / digest[:2] / digest[2:4] / f'{digest}.zst'
+
+    def put(self, data: bytes) -> str:
+        """
+        Store a payload, unless it is already stored
+
+        args:
+            data (bytes): The uncompressed payload
+
+        returns:
+            str: The digest referencing the payload
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._get_path(digest)
+        try:
+            # Refreshing the modification time protects the reused blob from a concurrent pruning
+            os.utime(path)
+            return digest
+        except FileNotFoundError:
+            pass
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        compressed = zstandard.ZstdCompressor(level=self._compression_level).compress(data)
+
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as blob_file:
+                blob_file.write(compressed)
+            os.replace(temporary_path, path)
+
+        except Exception:
+            Path(temporary_path).unlink(missing_ok=True)
+            raise
+
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """
+        Read a whole payload
+
+        args:
+            digest (str): The digest of the payload
+
+        returns:
+            bytes: The uncompressed payload
+        """
+        with open(self._get_path(digest), 'rb') as blob_file:
+            return zstandard.ZstdDecompressor().decompress(blob_file.read())
+
+    def stream(self, digest: str, chunk_size: int = 65536) -> Iterator[bytes]:
+        """
+        Read a payload by chunks, without holding it in memory
+
+        args:
+            digest (str): The digest of the payload
+            chunk_size (int): The size of the uncompressed chunks
+
+        returns:
+            Iterator: The uncompressed chunks of the payload
+        """
+        with open(self._get_path(digest), 'rb') as blob_file:
+            yield from zstandard.ZstdDecompressor().read_to_iter(blob_file, write_size=chunk_size)
+
+    def delete(self, digest: str) -> None:
+        self._get_path(digest).unlink(missing_ok=True)
+
+    def iter_digests(self, older_than: float = None) -> Iterator[str]:
+        """
+        List the digests of the stored payloads
+
+        args:
+            older_than (float): Only list the payloads written before this timestamp, if provided
+
+        returns:
+            Iterator: The digests
+        """
+        for path in self._root_path.glob('*/*/*.zst'):
+            if older_than is not None and path.stat().st_mtime >= older_than:
+                continue
+
+            yield path.stem
+
+
+def get_blob_store() -> BlobStore:
+    return BlobStore(app.config.get('BLOB_STORE_PATH'), app.config.get('BLOB_STORE_COMPRESSION_LEVEL'))
+
+
+def offloaded_synonym(column_attribute: str, reference_attribute: str, dumps=None, loads=None):
+    """
+    Synonym of a column whose large values are offloaded to the blob store, the row only keeping their digest.
+    Queries on the synonym only see the values stored inline, while offloaded values are loaded on first access.
+
+    args:
+        column_attribute (str): The mapped attribute of the column holding the inline values
+        reference_attribute (str): The mapped attribute of the column holding the digest of the offloaded values
+        dumps: Serializes a value to a string, if the values are not strings
+        loads: Deserializes a value from a string, if the values are not strings
+
+    returns:
+        The synonym, to be declared on the model
+    """
+    cache_attribute = f'{column_attribute}_offloaded'
+
+    def get_value(obj):
+        digest = getattr(obj, reference_attribute)
+        if digest is None:
+            return getattr(obj, column_attribute)
+
+        cached = obj.__dict__.get(cache_attribute)
+        if cached is None or cached[0] != digest:
+            try:
+                data = get_blob_store().get(digest).decode('utf-8')
+            except (OSError, ValueError, zstandard.ZstdError) as e:
+                log.warning(f'Unable to read blob {digest}: {e}')
+                return None
+
+            cached = (digest, loads(data) if loads else data)
+            obj.__dict__[cache_attribute] = cached
+
+        return cached[1]
+
+    def set_value(obj, value):
+        if value is not None and app.config.get('BLOB_STORE_ENABLED'):
+            data = (dumps(value) if dumps else value).encode('utf-8')
+            if len(data) >= app.config.get('BLOB_STORE_MIN_SIZE'):
+                digest = get_blob_store().put(data)
+                setattr(obj, reference_attribute, digest)
+                setattr(obj, column_attribute, None)
+                obj.__dict__[cache_attribute] = (digest, value)
+                return
+
+        setattr(obj, reference_attribute, None)
+        setattr(obj, column_attribute, value)
+
+    return synonym(column_attribute, descriptor=property(get_value, set_value))
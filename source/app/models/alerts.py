@@ -16,24 +16,32 @@
 #  along with this program; if not, write to the Free Software Foundation,
 #  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
-from datetime import datetime
+import json
 
 import uuid
 from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy import BigInteger
+from sqlalchemy import Boolean
+from sqlalchemy import DDL
 from sqlalchemy import String
 from sqlalchemy import Column
 from sqlalchemy import DateTime
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
+from sqlalchemy import LargeBinary
 from sqlalchemy import Text
+from sqlalchemy import event
 from sqlalchemy import text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
 from app import db
+from app.iris_engine.utils.blob_store import offloaded_synonym
 from app.models.models import alert_assets_association
 from app.models.models import alert_iocs_association
+from app.models.models import history_column_property
 
 
 class AlertCaseAssociation(db.Model):
@@ -54,7 +62,10 @@ class Alert(db.Model):
     alert_source = Column(Text)
     alert_source_ref = Column(Text)
     alert_source_link = Column(Text)
-    alert_source_content = Column(JSON)
+    _alert_source_content = Column('alert_source_content', JSON(none_as_null=True))
+    alert_source_content_ref = Column(Text, index=True)
+    alert_source_content = offloaded_synonym('_alert_source_content', 'alert_source_content_ref',
+                                             dumps=json.dumps, loads=json.loads)
     alert_severity_id = Column(ForeignKey('severities.severity_id'), nullable=False)
     alert_status_id = Column(ForeignKey('alert_status.status_id'), nullable=False)
     alert_context = Column(JSON)
@@ -63,10 +74,13 @@ class Alert(db.Model):
     alert_note = Column(Text)
     alert_tags = Column(Text)
     alert_owner_id = Column(ForeignKey('user.id'))
-    modification_history = Column(JSON)
+    modification_history = history_column_property('alerts', alert_id)
     alert_customer_id = Column(ForeignKey('client.client_id'), nullable=False)
     alert_classification_id = Column(ForeignKey('case_classification.id'))
     alert_resolution_status_id = Column(ForeignKey('alert_resolution_status.resolution_status_id'), nullable=True)
+    alert_fingerprint = Column(BigInteger)
+    alert_occurrences = Column(Integer, nullable=False, default=1, server_default=text('1'))
+    alert_last_seen_at = Column(DateTime)
 
     owner = relationship('User', foreign_keys=[alert_owner_id])
     severity = relationship('Severity')
@@ -81,6 +95,72 @@ class Alert(db.Model):
     assets = relationship('CaseAssets', secondary=alert_assets_association, back_populates='alerts')
     iocs = relationship('Ioc', secondary=alert_iocs_association, back_populates='alerts')
 
+    __table_args__ = (
+        Index('ix_alerts_customer_fingerprint_last_seen', 'alert_customer_id', 'alert_fingerprint',
+              'alert_last_seen_at'),
+    )
+
+
+class AlertsGeneration(db.Model):
+    """
+    Counter of the writes to the alerts of a customer, so that results computed from the alerts of some customers
+    stay valid as long as the counters of these customers are unchanged. The generation of a customer is this
+    counter plus the number of its rows in alerts_generation_log, which are periodically folded into it.
+    """
+    __tablename__ = 'alerts_generation'
+
+    customer_id = Column(BigInteger, primary_key=True)
+    generation = Column(BigInteger, nullable=False, server_default=text('0'))
+
+
+class AlertsGenerationLog(db.Model):
+    """
+    Writes to the alerts not yet counted in alerts_generation. Database triggers append a row per customer on every
+    statement writing the alerts, their comments or their links to cases, IOCs and assets. Concurrent writers
+    only ever insert, so they never wait on each other for a counter.
+    """
+    __tablename__ = 'alerts_generation_log'
+
+    id = Column(BigInteger, primary_key=True)
+    customer_id = Column(BigInteger, nullable=False, index=True)
+
+
+class AlertsRollup(db.Model):
+    """
+    Number of alerts created per hour or per day, for each combination of customer, status, severity,
+    classification, resolution status, owner and source. Rows are recomputed from the alerts of the hours
+    listed in alerts_rollup_dirty_hours, and the days from their hourly rows.
+    """
+    __tablename__ = 'alerts_rollup'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    granularity = Column(Text, nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    customer_id = Column(BigInteger)
+    status_id = Column(Integer)
+    severity_id = Column(Integer)
+    classification_id = Column(Integer)
+    resolution_status_id = Column(Integer)
+    owner_id = Column(Integer)
+    source = Column(Text)
+    alerts_count = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index('ix_alerts_rollup_granularity_bucket_start', 'granularity', 'bucket_start'),
+    )
+
+
+class AlertsRollupDirtyHour(db.Model):
+    """
+    Hour whose alerts changed since its rollup rows were computed. Rows are appended by database triggers on every
+    statement writing the alerts, so the rollups of an hour are only trusted while it is not listed here. An hour
+    is listed once per write, so that concurrent writers of the same hour do not wait on each other.
+    """
+    __tablename__ = 'alerts_rollup_dirty_hours'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    bucket_start = Column(DateTime, nullable=False, index=True)
+
 
 class Severity(db.Model):
     __tablename__ = 'severities'
@@ -109,30 +189,94 @@ class AlertResolutionStatus(db.Model):
 class SimilarAlertsCache(db.Model):
     __tablename__ = 'similar_alerts_cache'
 
-    id = Column(BigInteger, primary_key=True)
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
     customer_id = Column(BigInteger, ForeignKey('client.client_id'), nullable=False)
     asset_name = Column(Text, nullable=True)
     ioc_value = Column(Text, nullable=True)
     alert_id = Column(BigInteger, ForeignKey('alerts.alert_id'), nullable=False)
-    created_at = Column(DateTime, nullable=False, server_default=text("now()"))
+    # Partition key, hence part of the primary key. Set by the database, so that it follows the insertion time
+    created_at = Column(DateTime, primary_key=True, nullable=False, server_default=text("now()"))
 
     asset_type_id = Column(Integer, ForeignKey('assets_type.asset_id'), nullable=True)
     ioc_type_id = Column(Integer, ForeignKey('ioc_type.type_id'), nullable=True)
+    match_key_hash = Column(BigInteger, nullable=True)
+    # Transaction which inserted the entry, from which the correlation indexes catch up
+    txid = Column(BigInteger, nullable=True, server_default=text('txid_current()'))
 
     alert = relationship('Alert')
     customer = relationship('Client')
     asset_type = relationship('AssetsType')
     ioc_type = relationship('IocType')
 
+    __table_args__ = (
+        Index('ix_similar_alerts_cache_customer_key_created', 'customer_id', 'match_key_hash', 'created_at'),
+        Index('ix_similar_alerts_cache_alert_id', 'alert_id'),
+        Index('ix_similar_alerts_cache_created_at', 'created_at'),
+        Index('ix_similar_alerts_cache_txid', 'txid'),
+        {'postgresql_partition_by': 'RANGE (created_at)'}
+    )
+
     def __init__(self, customer_id, alert_id, asset_name=None, ioc_value=None, asset_type_id=None, ioc_type_id=None,
-                 created_at=None):
+                 created_at=None, match_key_hash=None):
         self.customer_id = customer_id
         self.asset_name = asset_name
         self.ioc_value = ioc_value
         self.alert_id = alert_id
         self.asset_type_id = asset_type_id
         self.ioc_type_id = ioc_type_id
-        self.created_at = created_at if created_at else datetime.utcnow()
+        self.created_at = created_at
+        self.match_key_hash = match_key_hash
+
+
+event.listen(SimilarAlertsCache.__table__, 'after_create',
+             DDL('CREATE TABLE IF NOT EXISTS similar_alerts_cache_default PARTITION OF similar_alerts_cache DEFAULT'))
+
+
+class SimilarAlertsCacheDeletion(db.Model):
+    """
+    Alert whose similar alerts cache entries were deleted. Rows are inserted by a database trigger on the similar
+    alerts cache, so that the correlation indexes of all the processes forget the alert, and pruned after a day.
+    """
+    __tablename__ = 'similar_alerts_cache_deletion'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    alert_id = Column(BigInteger, nullable=False)
+    txid = Column(BigInteger, nullable=False, server_default=text('txid_current()'), index=True)
+    deleted_at = Column(DateTime, nullable=False, server_default=text('now()'))
+
+
+class AlertArchive(db.Model):
+    """
+    Closed alerts moved out of the alerts table once they are old enough. The table is partitioned by month on
+    the creation time of the alerts, and holds a full snapshot of each alert along with the columns it is
+    searched on.
+    """
+    __tablename__ = 'alerts_archive'
+
+    alert_id = Column(BigInteger, primary_key=True)
+    alert_uuid = Column(UUID(as_uuid=True), nullable=False)
+    alert_title = Column(Text, nullable=False)
+    alert_source = Column(Text)
+    alert_source_ref = Column(Text)
+    alert_tags = Column(Text)
+    alert_customer_id = Column(BigInteger, nullable=False)
+    alert_severity_id = Column(Integer)
+    alert_status_id = Column(Integer)
+    alert_resolution_status_id = Column(Integer)
+    alert_source_event_time = Column(DateTime)
+    # Partition key, hence part of the primary key
+    alert_creation_time = Column(DateTime, primary_key=True, nullable=False)
+    archived_at = Column(DateTime, nullable=False, server_default=text("now()"))
+    alert_data = Column(JSONB, nullable=False)
+
+    __table_args__ = (
+        Index('ix_alerts_archive_customer_creation_time', 'alert_customer_id', 'alert_creation_time'),
+        {'postgresql_partition_by': 'RANGE (alert_creation_time)'}
+    )
+
+
+event.listen(AlertArchive.__table__, 'after_create',
+             DDL('CREATE TABLE IF NOT EXISTS alerts_archive_default PARTITION OF alerts_archive DEFAULT'))
 
 
 class AlertSimilarity(db.Model):
@@ -149,3 +293,108 @@ class AlertSimilarity(db.Model):
     similar_alert = relationship("Alert", foreign_keys=[similar_alert_id])
     matching_asset = relationship("CaseAssets")
     matching_ioc = relationship("Ioc")
+
+
+class AlertIngestionStatusList:
+    pending = "pending"
+    processing = "processing"
+    completed = "completed"
+    failed = "failed"
+
+
+class AlertIngestionTicket(db.Model):
+    __tablename__ = 'alert_ingestion_ticket'
+
+    ticket_id = Column(BigInteger, primary_key=True)
+    ticket_uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, nullable=False,
+                         server_default=text('gen_random_uuid()'), unique=True)
+    status = Column(Text, nullable=False, default=AlertIngestionStatusList.pending)
+    payload = Column(JSON)
+    alerts_count = Column(Integer, nullable=False, default=0)
+    alert_ids = Column(JSON)
+    error = Column(JSON)
+    user_id = Column(ForeignKey('user.id'), nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=text("now()"))
+    claimed_at = Column(DateTime)
+    attempts = Column(Integer, nullable=False, default=0, server_default=text('0'))
+    processed_at = Column(DateTime)
+
+    user = relationship('User')
+
+    __table_args__ = (
+        Index('ix_alert_ingestion_ticket_status_created_at', 'status', 'created_at'),
+    )
+
+
+class AlertRule(db.Model):
+    """
+    Rule applied to the alerts before they are ingested. The conditions are described by
+    app.iris_engine.alerts.rules.compile_alert_rule_conditions, and the action is one of:
+        - drop: the alert is discarded
+        - aggregate: the alert is discarded, and counted in the alert_rule_aggregates
+        - assign: the alert is created with the owner of the rule
+    """
+    __tablename__ = 'alert_rules'
+
+    rule_id = Column(BigInteger, primary_key=True)
+    rule_name = Column(Text, nullable=False)
+    rule_description = Column(Text)
+    rule_enabled = Column(Boolean, nullable=False, default=True, server_default=text('true'))
+    rule_order = Column(Integer, nullable=False, default=0, server_default=text('0'))
+    rule_customer_id = Column(ForeignKey('client.client_id', ondelete='CASCADE'), nullable=True)
+    rule_conditions = Column(JSON, nullable=False)
+    rule_action = Column(Text, nullable=False)
+    rule_owner_id = Column(ForeignKey('user.id', ondelete='SET NULL'), nullable=True)
+    rule_hit_count = Column(BigInteger, nullable=False, default=0, server_default=text('0'))
+    rule_last_hit_at = Column(DateTime)
+    rule_created_at = Column(DateTime, nullable=False, server_default=text("now()"))
+    rule_updated_at = Column(DateTime, nullable=False, server_default=text("now()"))
+
+    customer = relationship('Client')
+    owner = relationship('User')
+
+
+class AlertRuleAggregate(db.Model):
+    """
+    Number of alerts discarded by an aggregate rule, per customer, alert title and hour
+    """
+    __tablename__ = 'alert_rule_aggregates'
+
+    rule_id = Column(BigInteger, ForeignKey('alert_rules.rule_id', ondelete='CASCADE'), primary_key=True)
+    customer_id = Column(BigInteger, primary_key=True)
+    alert_title = Column(Text, primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    alerts_count = Column(BigInteger, nullable=False, server_default=text('0'))
+    last_seen_at = Column(DateTime, nullable=False, server_default=text("now()"))
+
+
+class AlertMinHashSignature(db.Model):
+    """
+    MinHash signatures of an alert, packed as little endian unsigned 32 bits integers: one over the word shingles
+    of its title and description, the other over its IOCs. Either is NULL when the alert has no such content.
+    """
+    __tablename__ = 'alert_minhash_signatures'
+
+    alert_id = Column(BigInteger, ForeignKey('alerts.alert_id', ondelete='CASCADE'), primary_key=True)
+    customer_id = Column(BigInteger, nullable=False)
+    text_signature = Column(LargeBinary)
+    iocs_signature = Column(LargeBinary)
+    created_at = Column(DateTime, nullable=False, server_default=text("now()"))
+
+
+class AlertLshBucket(db.Model):
+    """
+    Locality sensitive hashing bucket of an alert signature. Alerts of a customer sharing a bucket are candidate
+    near duplicates
+    """
+    __tablename__ = 'alert_lsh_buckets'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    customer_id = Column(BigInteger, nullable=False)
+    bucket_hash = Column(BigInteger, nullable=False)
+    alert_id = Column(BigInteger, ForeignKey('alerts.alert_id', ondelete='CASCADE'), nullable=False)
+
+    __table_args__ = (
+        Index('ix_alert_lsh_buckets_customer_bucket', 'customer_id', 'bucket_hash'),
+        Index('ix_alert_lsh_buckets_alert_id', 'alert_id'),
+    )
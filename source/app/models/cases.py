@@ -26,6 +26,7 @@ from sqlalchemy import Column
 from sqlalchemy import Date
 from sqlalchemy import DateTime
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import String
 from sqlalchemy import Text
@@ -38,6 +39,7 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.orm import backref
 
 from app import db
+from app.iris_engine.utils.blob_store import offloaded_synonym
 from app.datamgmt.states import update_assets_state
 from app.datamgmt.states import update_evidences_state
 from app.datamgmt.states import update_ioc_state
@@ -45,6 +47,7 @@ from app.datamgmt.states import update_notes_state
 from app.datamgmt.states import update_tasks_state
 from app.datamgmt.states import update_timeline_state
 from app.models.models import Client
+from app.models.models import history_column_property
 
 
 class Cases(db.Model):
@@ -71,7 +74,7 @@ class Cases(db.Model):
     review_status_id = Column(ForeignKey('review_status.id'), nullable=True)
     severity_id = Column(ForeignKey('severities.severity_id'), nullable=True)
 
-    modification_history = Column(JSON)
+    modification_history = history_column_property('cases', case_id)
 
     client = relationship('Client')
     user = relationship('User', foreign_keys=[user_id])
@@ -169,6 +172,57 @@ class CaseTags(db.Model):
     tag_id = Column(ForeignKey('tags.id'), primary_key=True, nullable=False, index=True)
 
 
+class CasesGeneration(db.Model):
+    """
+    Counter of the writes to the cases of a client, like the alerts generation. The generation of a client is this
+    counter plus the number of its rows in cases_generation_log, which are periodically folded into it.
+    """
+    __tablename__ = 'cases_generation'
+
+    client_id = Column(BigInteger, primary_key=True)
+    generation = Column(BigInteger, nullable=False, server_default=text('0'))
+
+
+class CasesGenerationLog(db.Model):
+    """
+    Writes to the cases not yet counted in cases_generation. Database triggers append a row per client on every
+    statement writing the cases, their tags, events, notes, tasks, assets, IOCs or evidences.
+    """
+    __tablename__ = 'cases_generation_log'
+
+    id = Column(BigInteger, primary_key=True)
+    client_id = Column(BigInteger, nullable=False, index=True)
+
+
+class CasesRollup(db.Model):
+    """
+    Number of cases opened per hour or per day, for each combination of client, status, severity, classification
+    and owner. Maintained like the alerts rollup, from the hours listed in cases_rollup_dirty_hours.
+    """
+    __tablename__ = 'cases_rollup'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    granularity = Column(Text, nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    client_id = Column(BigInteger)
+    status_id = Column(Integer)
+    severity_id = Column(Integer)
+    classification_id = Column(Integer)
+    owner_id = Column(Integer)
+    cases_count = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index('ix_cases_rollup_granularity_bucket_start', 'granularity', 'bucket_start'),
+    )
+
+
+class CasesRollupDirtyHour(db.Model):
+    __tablename__ = 'cases_rollup_dirty_hours'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    bucket_start = Column(DateTime, nullable=False, index=True)
+
+
 class CasesEvent(db.Model):
     __tablename__ = "cases_events"
 
@@ -180,13 +234,15 @@ class CasesEvent(db.Model):
     event_title = Column(Text)
     event_source = Column(Text)
     event_content = Column(Text)
-    event_raw = Column(Text)
+    _event_raw = Column('event_raw', Text)
+    event_raw_ref = Column(Text, index=True)
+    event_raw = offloaded_synonym('_event_raw', 'event_raw_ref')
     event_date = Column(DateTime)
     event_added = Column(DateTime)
     event_in_graph = Column(Boolean)
     event_in_summary = Column(Boolean)
     user_id = Column(ForeignKey('user.id'))
-    modification_history = Column(JSONB)
+    modification_history = history_column_property('cases_events', event_id)
     event_color = Column(Text)
     event_tags = Column(Text)
     event_tz = Column(Text)
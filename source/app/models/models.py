@@ -23,8 +23,10 @@ import uuid
 from sqlalchemy import BigInteger, UniqueConstraint, Table
 from sqlalchemy import Boolean
 from sqlalchemy import Column
+from sqlalchemy import DDL
 from sqlalchemy import DateTime
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import LargeBinary
 from sqlalchemy import Sequence
@@ -32,13 +34,18 @@ from sqlalchemy import String
 from sqlalchemy import TIMESTAMP
 from sqlalchemy import Text
 from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy import select
 from sqlalchemy import text
 from sqlalchemy.dialects.postgresql import JSON, JSONB
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import column_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import column
 from sqlalchemy.sql import func
+from sqlalchemy.sql import table
 
 from app import app
 from app import db
@@ -150,6 +157,60 @@ class AssetsType(db.Model):
     asset_icon_compromised = Column(String(255))
 
 
+class ObjectHistory(db.Model):
+    """
+    Append-only modification history of the alerts, cases and case objects.
+    The legacy JSON shape is rebuilt by the object_modification_history view
+    """
+    __tablename__ = 'object_history'
+
+    id = Column(BigInteger, primary_key=True)
+    object_type = Column(Text, nullable=False)
+    object_id = Column(BigInteger, nullable=False)
+    ts = Column(DateTime(timezone=True), nullable=False, server_default=text("now()"))
+    user_name = Column(Text)
+    user_id = Column(Integer)
+    action = Column(Text)
+
+    __table_args__ = (
+        Index('ix_object_history_object_type_object_id_ts', 'object_type', 'object_id', 'ts'),
+    )
+
+
+OBJECT_MODIFICATION_HISTORY_VIEW_DDL = """
+CREATE OR REPLACE VIEW object_modification_history AS
+SELECT object_type, object_id,
+       json_object_agg(extract(epoch FROM ts)::text,
+                       json_build_object('user', user_name, 'user_id', user_id, 'action', action)
+                       ORDER BY ts, id) AS modification_history
+FROM object_history
+GROUP BY object_type, object_id
+"""
+
+event.listen(ObjectHistory.__table__, 'after_create', DDL(OBJECT_MODIFICATION_HISTORY_VIEW_DDL))
+
+object_modification_history = table(
+    'object_modification_history',
+    column('object_type', Text),
+    column('object_id', BigInteger),
+    column('modification_history', JSON)
+)
+
+
+def history_column_property(object_type, object_id):
+    """
+    Read-only modification history of an object, in the legacy {timestamp: entry} shape. It is deferred, so that
+    the history is only aggregated by the queries and schemas which return it
+    """
+    return column_property(
+        select(object_modification_history.c.modification_history).where(
+            object_modification_history.c.object_type == object_type,
+            object_modification_history.c.object_id == object_id
+        ).correlate_except(object_modification_history).scalar_subquery(),
+        deferred=True
+    )
+
+
 alert_assets_association = Table(
     'alert_assets_association',
     db.Model.metadata,
@@ -185,7 +246,7 @@ class CaseAssets(db.Model):
     analysis_status_id = Column(ForeignKey('analysis_status.id'))
     custom_attributes = Column(JSON)
     asset_enrichment = Column(JSONB)
-    modification_history = Column(JSON)
+    modification_history = history_column_property('case_assets', asset_id)
 
     case = relationship('Cases')
     user = relationship('User')
@@ -444,7 +505,7 @@ class Ioc(db.Model):
     ioc_tlp_id = Column(ForeignKey('tlp.tlp_id'))
     custom_attributes = Column(JSON)
     ioc_enrichment = Column(JSONB)
-    modification_history = Column(JSON)
+    modification_history = history_column_property('ioc', ioc_id)
 
     case_id = Column(ForeignKey('cases.case_id'), nullable=True)
 
@@ -498,7 +559,7 @@ class DataStoreFile(db.Model):
     file_parent_id = Column(ForeignKey('data_store_path.path_id'), nullable=False)
     file_sha256 = Column(Text)
     added_by_user_id = Column(ForeignKey('user.id'), nullable=False)
-    modification_history = Column(JSON)
+    modification_history = history_column_property('data_store_file', file_id)
     file_case_id = Column(ForeignKey('cases.case_id'), nullable=False)
 
     case = relationship('Cases')
@@ -560,7 +621,7 @@ class Notes(db.Model):
     note_case_id = Column(ForeignKey('cases.case_id'))
     custom_attributes = Column(JSON)
     directory_id = Column(ForeignKey('note_directory.id'), nullable=True)
-    modification_history = Column(JSON)
+    modification_history = history_column_property('notes', note_id)
 
     user = relationship('User')
     case = relationship('Cases')
@@ -651,7 +712,7 @@ class CaseReceivedFile(db.Model):
     type_id = Column(ForeignKey('evidence_type.id'))
     custom_attributes = Column(JSON)
     chain_of_custody = Column(JSON)
-    modification_history = Column(JSON)
+    modification_history = history_column_property('case_received_file', id)
 
     case = relationship('Cases')
     user = relationship('User')
@@ -684,7 +745,7 @@ class CaseTasks(db.Model):
     task_status_id = Column(ForeignKey('task_status.id'))
     task_case_id = Column(ForeignKey('cases.case_id'))
     custom_attributes = Column(JSON)
-    modification_history = Column(JSON)
+    modification_history = history_column_property('case_tasks', id)
 
     case = relationship('Cases')
     user_open = relationship('User', foreign_keys=[task_userid_open])
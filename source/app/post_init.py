@@ -40,6 +40,8 @@ from app.datamgmt.iris_engine.modules_db import iris_module_disable_by_id
 from app.datamgmt.manage.manage_groups_db import add_case_access_to_group
 from app.datamgmt.manage.manage_users_db import add_user_to_group
 from app.datamgmt.manage.manage_users_db import add_user_to_organisation
+from app.datamgmt.partitions import MONTHLY_PARTITIONED_TABLES
+from app.datamgmt.partitions import create_monthly_partitions
 from app.iris_engine.access_control.utils import ac_add_user_effective_access
 from app.iris_engine.demo_builder import create_demo_cases
 from app.iris_engine.access_control.utils import ac_get_mask_analyst
@@ -157,6 +159,10 @@ def run_post_init(development=False):
             alembic_cfg.set_main_option('sqlalchemy.url', app.config['SQLALCHEMY_DATABASE_URI'])
             command.upgrade(alembic_cfg, 'head')
 
+            log.info("Creating partitions")
+            for table_name in MONTHLY_PARTITIONED_TABLES:
+                create_monthly_partitions(table_name)
+
             # Create base server settings if they don't exist
             srv_settings = ServerSettings.query.first()
             if srv_settings is None:
@@ -1734,7 +1740,8 @@ def custom_assets_symlinks():
 def create_directories():
     log.info("Attempting to create data directories")
 
-    for d in ['UPLOADED_PATH', 'TEMPLATES_PATH', 'BACKUP_PATH', 'ASSET_STORE_PATH', 'DATASTORE_PATH']:
+    for d in ['UPLOADED_PATH', 'TEMPLATES_PATH', 'BACKUP_PATH', 'ASSET_STORE_PATH', 'DATASTORE_PATH',
+              'BLOB_STORE_PATH']:
         try:
             log.info(f'Creating directory {d}')
             os.makedirs(app.config.get(d), exist_ok=True)
@@ -31,8 +31,10 @@ from marshmallow import ValidationError
 from marshmallow import EXCLUDE
 from marshmallow import fields
 from marshmallow import post_load
+from marshmallow import pre_dump
 from marshmallow import pre_load
 from marshmallow.validate import Length
+from marshmallow.validate import OneOf
 from marshmallow_sqlalchemy import auto_field
 from pathlib import Path
 from sqlalchemy import func
@@ -54,6 +56,8 @@ from app.datamgmt.manage.manage_attribute_db import merge_custom_attributes
 from app.datamgmt.manage.manage_tags_db import add_db_tag
 from app.datamgmt.case.case_iocs_db import get_ioc_links
 from app.iris_engine.access_control.utils import ac_mask_from_val_list
+from app.iris_engine.alerts.rules import ALERT_RULES_ACTIONS
+from app.iris_engine.alerts.rules import compile_alert_rule_conditions
 from app.models.models import AnalysisStatus
 from app.models.models import CaseClassification
 from app.models.models import SavedFilter
@@ -89,12 +93,17 @@ from app.models.alerts import Alert
 from app.models.alerts import Severity
 from app.models.alerts import AlertStatus
 from app.models.alerts import AlertResolutionStatus
+from app.models.alerts import AlertIngestionTicket
+from app.models.alerts import AlertArchive
+from app.models.alerts import AlertRule
+from app.models.alerts import AlertRuleAggregate
 from app.models.authorization import Group
 from app.models.authorization import Organisation
 from app.models.authorization import User
 from app.models.cases import CaseState
 from app.models.cases import CaseProtagonist
 from app.util import file_sha256sum
+from app.util import load_modification_histories
 from app.util import str_to_bool
 from app.util import assert_type_mml
 from app.util import stream_sha256sum
@@ -171,6 +180,21 @@ def store_icon(file):
     return filename, 'Saved'
 
 
+class ModificationHistorySchemaMixin:
+    """Loads the deferred modification history of the dumped objects with a single query, when it is dumped."""
+
+    @pre_dump(pass_many=True)
+    def load_modification_history(self, data, many, **kwargs):
+        if 'modification_history' not in self.dump_fields:
+            return data
+
+        # The objects may be given as a query or a generator, which can only be iterated once
+        objects = list(data) if many else [data]
+        load_modification_histories(objects)
+
+        return objects if many else data
+
+
 class CaseNoteDirectorySchema(ma.SQLAlchemyAutoSchema):
     """Schema for serializing and deserializing CaseNoteDirectory objects.
 
@@ -425,7 +449,7 @@ class CaseNoteRevisionSchema(ma.SQLAlchemyAutoSchema):
         unknown = EXCLUDE
 
 
-class CaseNoteSchema(ma.SQLAlchemyAutoSchema):
+class CaseNoteSchema(ModificationHistorySchemaMixin, ma.SQLAlchemyAutoSchema):
     """Schema for serializing and deserializing CaseNote objects.
 
     This schema defines the fields to include when serializing and deserializing CaseNote objects.
@@ -677,7 +701,7 @@ class AssetTypeSchema(ma.SQLAlchemyAutoSchema):
         return fpath
 
 
-class CaseAssetsSchema(ma.SQLAlchemyAutoSchema):
+class CaseAssetsSchema(ModificationHistorySchemaMixin, ma.SQLAlchemyAutoSchema):
     """Schema for serializing and deserializing CaseAssets objects.
 
     This schema defines the fields to include when serializing and deserializing CaseAssets objects.
@@ -942,7 +966,7 @@ class TlpSchema(ma.SQLAlchemyAutoSchema):
 
 
 # TODO try to remove IocSchema and replace it by this new schema
-class IocSchemaForAPIV2(ma.SQLAlchemyAutoSchema):
+class IocSchemaForAPIV2(ModificationHistorySchemaMixin, ma.SQLAlchemyAutoSchema):
     """Schema for serializing and deserializing IOC objects.
 
     This schema defines the fields to include when serializing and deserializing IOC objects.
@@ -1041,7 +1065,7 @@ class IocSchemaForAPIV2(ma.SQLAlchemyAutoSchema):
         return data
 
 
-class IocSchema(ma.SQLAlchemyAutoSchema):
+class IocSchema(ModificationHistorySchemaMixin, ma.SQLAlchemyAutoSchema):
     """Schema for serializing and deserializing IOC objects.
 
     This schema defines the fields to include when serializing and deserializing IOC objects.
@@ -1150,7 +1174,7 @@ class UserFullSchema(ma.SQLAlchemyAutoSchema):
         unknown = EXCLUDE
 
 
-class EventSchema(ma.SQLAlchemyAutoSchema):
+class EventSchema(ModificationHistorySchemaMixin, ma.SQLAlchemyAutoSchema):
     """Schema for serializing and deserializing Event objects.
 
     This schema defines the fields to include when serializing and deserializing Event objects.
@@ -1170,11 +1194,14 @@ class EventSchema(ma.SQLAlchemyAutoSchema):
     event_comments_map: List[int] = fields.List(fields.Integer, required=False, allow_none=True)
     event_sync_iocs_assets: bool = fields.Boolean(required=False)
     children = fields.Nested('EventSchema', many=True, required=False)
+    event_raw: str = fields.String(required=False, allow_none=True)
+    event_raw_ref: str = auto_field('event_raw_ref', dump_only=True)
 
     class Meta:
         model = CasesEvent
         load_instance = True
         include_fk = True
+        exclude = ['_event_raw']
         unknown = EXCLUDE
 
     def validate_date(self, event_date: str, event_tz: str):
@@ -1321,7 +1348,7 @@ class DSPathSchema(ma.SQLAlchemyAutoSchema):
         unknown = EXCLUDE
 
 
-class DSFileSchema(ma.SQLAlchemyAutoSchema):
+class DSFileSchema(ModificationHistorySchemaMixin, ma.SQLAlchemyAutoSchema):
     """Schema for serializing and deserializing DataStoreFile objects.
 
     This schema defines the fields to include when serializing and deserializing DataStoreFile objects.
@@ -1617,7 +1644,7 @@ class EvidenceTypeSchema(ma.SQLAlchemyAutoSchema):
         return data
 
 
-class CaseSchema(ma.SQLAlchemyAutoSchema):
+class CaseSchema(ModificationHistorySchemaMixin, ma.SQLAlchemyAutoSchema):
     """Schema for serializing and deserializing Case objects.
 
     This schema defines the fields to include when serializing and deserializing Case objects.
@@ -1932,7 +1959,7 @@ class TaskStatusSchema(ma.SQLAlchemyAutoSchema):
         unknown = EXCLUDE
 
 
-class CaseTaskSchema(ma.SQLAlchemyAutoSchema):
+class CaseTaskSchema(ModificationHistorySchemaMixin, ma.SQLAlchemyAutoSchema):
     """Schema for serializing and deserializing CaseTask objects.
 
     This schema defines the fields to include when serializing and deserializing CaseTask objects.
@@ -2021,7 +2048,7 @@ class CaseTaskSchema(ma.SQLAlchemyAutoSchema):
         return data
 
 
-class CaseEvidenceSchema(ma.SQLAlchemyAutoSchema):
+class CaseEvidenceSchema(ModificationHistorySchemaMixin, ma.SQLAlchemyAutoSchema):
     """Schema for serializing and deserializing CaseEvidence objects.
 
     This schema defines the fields to include when serializing and deserializing CaseEvidence objects.
@@ -2354,7 +2381,7 @@ class EventCategorySchema(ma.SQLAlchemyAutoSchema):
         unknown = EXCLUDE
 
 
-class AlertSchema(ma.SQLAlchemyAutoSchema):
+class AlertSchema(ModificationHistorySchemaMixin, ma.SQLAlchemyAutoSchema):
     """Schema for serializing and deserializing Alert objects.
 
     This schema defines the fields to include when serializing and deserializing Alert objects.
@@ -2369,12 +2396,18 @@ class AlertSchema(ma.SQLAlchemyAutoSchema):
     iocs = ma.Nested(IocSchema, many=True)
     assets = ma.Nested(CaseAssetsSchema, many=True, exclude=['alerts'])
     resolution_status = ma.Nested(AlertResolutionSchema)
+    alert_source_content = fields.Raw(required=False, allow_none=True)
+    alert_source_content_ref = auto_field('alert_source_content_ref', dump_only=True)
+    alert_fingerprint = auto_field('alert_fingerprint', dump_only=True)
+    alert_occurrences = auto_field('alert_occurrences', dump_only=True)
+    alert_last_seen_at = auto_field('alert_last_seen_at', dump_only=True)
 
     class Meta:
         model = Alert
         include_relationships = True
         include_fk = True
         load_instance = True
+        exclude = ['_alert_source_content']
         unknown = EXCLUDE
 
     @pre_load
@@ -2392,6 +2425,75 @@ class AlertSchema(ma.SQLAlchemyAutoSchema):
         return data
 
 
+class AlertIngestionTicketSchema(ma.SQLAlchemyAutoSchema):
+    """Schema for serializing AlertIngestionTicket objects.
+
+    The queued payload is excluded, only the processing state of the ticket is exposed.
+
+    """
+
+    class Meta:
+        model = AlertIngestionTicket
+        include_fk = True
+        exclude = ['payload']
+        load_instance = True
+        unknown = EXCLUDE
+
+
+class AlertArchiveSchema(ma.SQLAlchemyAutoSchema):
+    """Schema for serializing AlertArchive objects.
+
+    The alert_data field holds the snapshot of the alert, as serialized by AlertSchema when it was archived.
+
+    """
+
+    class Meta:
+        model = AlertArchive
+        load_instance = True
+        unknown = EXCLUDE
+
+
+def _validate_alert_rule_conditions(conditions):
+    try:
+        compile_alert_rule_conditions(conditions)
+    except ValueError as e:
+        raise ValidationError(str(e))
+
+
+class AlertRuleSchema(ma.SQLAlchemyAutoSchema):
+    """Schema for serializing and deserializing AlertRule objects.
+
+    The conditions are validated by compiling them, and the hit counters are only dumped.
+
+    """
+    rule_id = auto_field('rule_id', dump_only=True)
+    rule_name = auto_field('rule_name', required=True, validate=Length(min=1))
+    rule_conditions = fields.List(fields.Dict(), required=True, validate=_validate_alert_rule_conditions)
+    rule_action = auto_field('rule_action', required=True, validate=OneOf(ALERT_RULES_ACTIONS))
+    rule_hit_count = auto_field('rule_hit_count', dump_only=True)
+    rule_last_hit_at = auto_field('rule_last_hit_at', dump_only=True)
+    rule_created_at = auto_field('rule_created_at', dump_only=True)
+    rule_updated_at = auto_field('rule_updated_at', dump_only=True)
+
+    class Meta:
+        model = AlertRule
+        include_fk = True
+        load_instance = True
+        unknown = EXCLUDE
+
+
+class AlertRuleAggregateSchema(ma.SQLAlchemyAutoSchema):
+    """Schema for serializing AlertRuleAggregate objects.
+
+    """
+
+    class Meta:
+        model = AlertRuleAggregate
+        include_fk = True
+        load_instance = True
+        unknown = EXCLUDE
+
+
 class SavedFilterSchema(ma.SQLAlchemyAutoSchema):
     """Schema for serializing and deserializing SavedFilter objects.
 
@@ -2463,7 +2565,7 @@ class CaseProtagonistSchema(ma.SQLAlchemyAutoSchema):
 # * POST /api/v2/cases
 # * GET /api/v2/cases/{identifier}
 # TODO The objective could then be to remove CaseSchema and CaseDetailsSchema
-class CaseSchemaForAPIV2(ma.SQLAlchemyAutoSchema):
+class CaseSchemaForAPIV2(ModificationHistorySchemaMixin, ma.SQLAlchemyAutoSchema):
     """Schema for serializing and deserializing Case objects.
 
     This schema defines the fields to include when serializing and deserializing Case objects.
@@ -2543,7 +2645,7 @@ class CaseSchemaForAPIV2(ma.SQLAlchemyAutoSchema):
                                                      field_name="case_customer")
 
 
-class CaseDetailsSchema(ma.SQLAlchemyAutoSchema):
+class CaseDetailsSchema(ModificationHistorySchemaMixin, ma.SQLAlchemyAutoSchema):
     """Schema for serializing and deserializing Case objects in details."""
     client = ma.Nested(CustomerSchema)
     owner = ma.Nested(UserSchema, only=['id', 'user_name', 'user_login', 'user_email'])
@@ -32,10 +32,16 @@ from cryptography.hazmat.primitives import hmac
 from flask_login import current_user
 from pathlib import Path
 from pyunpack import Archive
-from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy import event
+from sqlalchemy import inspect
+from sqlalchemy import select
+from sqlalchemy import tuple_
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app import app
 from app import db
+from app.models.models import ObjectHistory
+from app.models.models import object_modification_history
 
 
 class FileRemover(object):
@@ -70,34 +76,92 @@ def decompress_7z(filename: Path, output_dir):
 
 
 def add_obj_history_entry(obj, action, commit=False):
+    """
+    Append an entry to the modification history of an object. The entry is written to the append-only
+    object_history table with the current transaction, once the object has an identifier.
+    """
     if hasattr(obj, 'modification_history'):
+        db.session.info.setdefault('pending_history_entries', []).append((obj, {
+            'object_type': obj.__tablename__,
+            'ts': datetime.datetime.now(datetime.timezone.utc),
+            'user_name': current_user.user,
+            'user_id': current_user.id,
+            'action': action
+        }))
 
-        if isinstance(obj.modification_history, dict):
-
-            obj.modification_history.update({
-                datetime.datetime.now().timestamp(): {
-                    'user': current_user.user,
-                    'user_id': current_user.id,
-                    'action': action
-                }
-            })
-
-        else:
-
-            obj.modification_history = {
-                datetime.datetime.now().timestamp(): {
-                    'user': current_user.user,
-                    'user_id': current_user.id,
-                    'action': action
-                }
-            }
-    flag_modified(obj, "modification_history")
     if commit:
         db.session.commit()
 
     return obj
 
 
+def _write_pending_history_entries(session):
+    pending_entries = session.info.get('pending_history_entries')
+    if not pending_entries:
+        return
+
+    entries = []
+    remaining_entries = []
+    for obj, entry in pending_entries:
+        identity = inspect(obj).identity
+        if identity is None:
+            # Objects not flushed yet are written by a later flush
+            remaining_entries.append((obj, entry))
+            continue
+
+        entries.append({**entry, 'object_id': identity[0]})
+
+    session.info['pending_history_entries'] = remaining_entries
+    if entries:
+        session.connection().execute(ObjectHistory.__table__.insert(), entries)
+
+
+@event.listens_for(db.session, 'after_flush')
+def _write_history_entries_after_flush(session, flush_context):
+    _write_pending_history_entries(session)
+
+
+@event.listens_for(db.session, 'before_commit')
+def _write_history_entries_before_commit(session):
+    _write_pending_history_entries(session)
+
+
+@event.listens_for(db.session, 'after_commit')
+@event.listens_for(db.session, 'after_rollback')
+def _discard_history_entries(session):
+    session.info.pop('pending_history_entries', None)
+
+
+def load_modification_histories(objects):
+    """
+    Load with a single query the deferred modification history of objects, instead of one query per object
+    """
+    unloaded_objects = {}
+    for obj in objects:
+        state = inspect(obj, raiseerr=False)
+        if state is None or state.identity is None or 'modification_history' not in state.unloaded:
+            continue
+
+        unloaded_objects[(obj.__tablename__, state.identity[0])] = obj
+
+    if not unloaded_objects:
+        return
+
+    histories = dict.fromkeys(unloaded_objects)
+    histories.update({
+        (row.object_type, row.object_id): row.modification_history
+        for row in db.session.execute(
+            select(object_modification_history).where(
+                tuple_(object_modification_history.c.object_type,
+                       object_modification_history.c.object_id).in_(list(unloaded_objects))
+            )
+        )
+    })
+
+    for key, obj in unloaded_objects.items():
+        set_committed_value(obj, 'modification_history', histories[key])
+
+
 def file_sha256sum(file_path):
 
     if not Path(file_path).is_file():
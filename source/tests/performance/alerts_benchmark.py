@@ -0,0 +1,149 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import json
+import math
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Dict
+from typing import List
+
+from sqlalchemy import event
+
+
+def percentile(values: List[float], rank: float) -> float:
+    """
+    Get a percentile of values, with the nearest rank method
+    """
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(rank / 100 * len(ordered)) - 1)]
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Latencies, in milliseconds, and number of SQL queries of the requests of a scenario
+    """
+    name: str
+    latencies: List[float] = field(default_factory=list)
+    queries: List[int] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            'requests': len(self.latencies),
+            'p50_ms': round(percentile(self.latencies, 50), 2),
+            'p95_ms': round(percentile(self.latencies, 95), 2),
+            'queries_per_request': round(percentile(self.queries, 50), 2)
+        }
+
+
+class QueryCounter:
+    """
+    Counts the SQL statements run on an engine, including by the request handlers
+    """
+
+    def __init__(self, engine):
+        self._engine = engine
+        self.count = 0
+
+    def _count(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self._engine, 'before_cursor_execute', self._count)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self._engine, 'before_cursor_execute', self._count)
+
+
+@contextmanager
+def measure(engine, result: BenchmarkResult):
+    """
+    Measure the latency and the number of SQL queries of a request into a result
+    """
+    with QueryCounter(engine) as counter:
+        start = time.perf_counter()
+        yield
+        result.latencies.append((time.perf_counter() - start) * 1000)
+
+    result.queries.append(counter.count)
+
+
+def find_regressions(results: Dict[str, dict], baseline: Dict[str, dict], latency_tolerance: float,
+                     queries_tolerance: int) -> List[str]:
+    """
+    Compare results to a baseline. Latencies are compared relatively, as they depend on the host, while the
+    numbers of queries are compared absolutely. Scenarios missing from the baseline are reported as regressions,
+    so that a new scenario cannot go unchecked.
+
+    args:
+        results (dict): The results, per scenario
+        baseline (dict): The baseline results, per scenario
+        latency_tolerance (float): The relative increase of the p50 and p95 latencies considered a regression
+        queries_tolerance (int): The increase of the number of queries per request considered a regression
+
+    returns:
+        list: The descriptions of the regressions
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        reference = baseline.get(name)
+        if not reference:
+            regressions.append(f'{name}: missing from the baseline')
+            continue
+
+        for metric in ('p50_ms', 'p95_ms'):
+            limit = reference[metric] * (1 + latency_tolerance)
+            if result[metric] > limit:
+                regressions.append(f'{name}: {metric} {result[metric]} exceeds {limit:.2f} '
+                                   f'(baseline {reference[metric]})')
+
+        limit = reference['queries_per_request'] + queries_tolerance
+        if result['queries_per_request'] > limit:
+            regressions.append(f"{name}: queries_per_request {result['queries_per_request']} exceeds {limit} "
+                               f"(baseline {reference['queries_per_request']})")
+
+    return regressions
+
+
+def load_results(path: Path) -> Dict[str, dict]:
+    if not path.exists():
+        raise FileNotFoundError(f'No benchmark baseline at {path}. Record it on the reference host with '
+                                f'IRIS_BENCHMARK_UPDATE_BASELINE=True, then commit it')
+
+    return json.loads(path.read_text())
+
+
+def save_results(path: Path, results: Dict[str, dict]) -> None:
+    path.write_text(json.dumps(results, indent=4, sort_keys=True) + '\n')
+
+
+def format_report(results: Dict[str, dict]) -> str:
+    lines = [f"{'scenario':<24}{'requests':>10}{'p50 ms':>12}{'p95 ms':>12}{'queries':>10}"]
+    for name, result in sorted(results.items()):
+        lines.append(f"{name:<24}{result['requests']:>10}{result['p50_ms']:>12}{result['p95_ms']:>12}"
+                     f"{result['queries_per_request']:>10}")
+
+    return '\n'.join(lines)
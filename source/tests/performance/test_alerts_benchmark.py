@@ -0,0 +1,224 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import logging
+import os
+import random
+import unittest
+from pathlib import Path
+from unittest import TestCase
+
+from flask import session
+from flask_login import login_user
+
+from app import app
+from app import db
+from app.business.alerts import alerts_create_batch
+from app.iris_engine.access_control.utils import ac_get_effective_permissions_of_user
+from app.iris_engine.demo_builder import gen_demo_alerts
+from app.models.alerts import Alert
+from app.models.authorization import User
+from app.models.models import Client
+from app.models.models import get_or_create
+from app.post_init import run_post_init
+from tests.clean_database import clean_db
+from tests.performance.alerts_benchmark import BenchmarkResult
+from tests.performance.alerts_benchmark import find_regressions
+from tests.performance.alerts_benchmark import format_report
+from tests.performance.alerts_benchmark import load_results
+from tests.performance.alerts_benchmark import measure
+from tests.performance.alerts_benchmark import save_results
+
+_DEFAULT_BASELINE_PATH = Path(__file__).parent / 'alerts_benchmark_baseline.json'
+
+
+@unittest.skipUnless(os.environ.get('IRIS_BENCHMARK') == 'True', 'Set IRIS_BENCHMARK=True to run the benchmarks, '
+                                                                  'which wipe the database')
+class TestAlertsBenchmark(TestCase):
+    """
+    Benchmark of the alerts ingestion and triage paths, run in process against the configured PostgreSQL
+    database, which is wiped. The p50 and p95 latencies and the number of SQL queries per request of each
+    scenario are compared to a baseline, which is written instead when IRIS_BENCHMARK_UPDATE_BASELINE=True.
+    The benchmark fails when the baseline is missing, or lacks a scenario.
+
+        IRIS_BENCHMARK=True python -m unittest tests.performance.test_alerts_benchmark
+
+    The dataset size, the number of requests per scenario and the regression tolerances are read from
+    IRIS_BENCHMARK_ALERTS, IRIS_BENCHMARK_REQUESTS, IRIS_BENCHMARK_LATENCY_TOLERANCE and
+    IRIS_BENCHMARK_QUERIES_TOLERANCE.
+    """
+    _results = {}
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._alerts_count = int(os.environ.get('IRIS_BENCHMARK_ALERTS', 20000))
+        cls._requests_count = int(os.environ.get('IRIS_BENCHMARK_REQUESTS', 50))
+        cls._baseline_path = Path(os.environ.get('IRIS_BENCHMARK_BASELINE', _DEFAULT_BASELINE_PATH))
+        cls._random = random.Random(1)
+
+        # Without a baseline, no regression could be detected: fail before wiping the database
+        cls._baseline = None
+        if os.environ.get('IRIS_BENCHMARK_UPDATE_BASELINE') != 'True':
+            cls._baseline = load_results(cls._baseline_path)
+
+        clean_db()
+        run_post_init()
+
+        # The cache would hide the cost of the filters
+        app.config['ALERTS_FILTER_CACHE_TIMEOUT'] = 0
+
+        administrator = User.query.filter(User.user == 'administrator').first()
+        cls._headers = {'Authorization': f'Bearer {administrator.api_key}', 'Content-Type': 'application/json'}
+
+        cls._customers_ids = [get_or_create(db.session, Client, name=f'Client {index}',
+                                            description=f'Description for client {index}').client_id
+                              for index in range(10)]
+        db.session.commit()
+
+        cls._alerts_generator = gen_demo_alerts(cls._alerts_count + 100000, cls._customers_ids, seed_alerts=1)
+
+        logging.info(f'Ingesting {cls._alerts_count} synthetic alerts')
+        with app.test_request_context():
+            login_user(administrator)
+            session['permissions'] = ac_get_effective_permissions_of_user(administrator)
+
+            for offset in range(0, cls._alerts_count, 500):
+                alerts_create_batch(cls._next_alerts(min(500, cls._alerts_count - offset)))
+
+        cls._alerts_ids = [alert_id for alert_id, in db.session.query(Alert.alert_id).all()]
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        logging.info(f'Alerts benchmark results\n{format_report(cls._results)}')
+
+        if os.environ.get('IRIS_BENCHMARK_UPDATE_BASELINE') == 'True':
+            save_results(cls._baseline_path, cls._results)
+
+        clean_db()
+
+    @classmethod
+    def _next_alerts(cls, count):
+        return [next(cls._alerts_generator) for _ in range(count)]
+
+    def _request(self, client, method, path, result, body=None):
+        with measure(db.engine, result):
+            response = client.open(path, method=method, headers=self._headers, json=body)
+
+        self.assertLess(response.status_code, 400, f'{method} {path} => {response.status_code}')
+        return response
+
+    def _check(self, result: BenchmarkResult):
+        self._results[result.name] = result.to_dict()
+        if os.environ.get('IRIS_BENCHMARK_UPDATE_BASELINE') == 'True':
+            return
+
+        regressions = find_regressions({result.name: result.to_dict()}, self._baseline,
+                                       float(os.environ.get('IRIS_BENCHMARK_LATENCY_TOLERANCE', 0.5)),
+                                       int(os.environ.get('IRIS_BENCHMARK_QUERIES_TOLERANCE', 0)))
+        self.assertEqual([], regressions)
+
+    def _sample_alerts_ids(self, count):
+        return self._random.sample(self._alerts_ids, k=count)
+
+    def _get_alert(self, client, alert_id):
+        return client.get(f'/alerts/{alert_id}', headers=self._headers).get_json()['data']
+
+    def test_add_alert(self):
+        result = BenchmarkResult('add_alert')
+        with app.test_client() as client:
+            for alert in self._next_alerts(self._requests_count):
+                self._request(client, 'POST', '/alerts/add', result, alert)
+
+        self._check(result)
+
+    def test_add_alerts_batch(self):
+        result = BenchmarkResult('add_alerts_batch_100')
+        with app.test_client() as client:
+            for _ in range(max(1, self._requests_count // 5)):
+                self._request(client, 'POST', '/api/v2/alerts/batch', result, {'alerts': self._next_alerts(100)})
+
+        self._check(result)
+
+    def test_filter_alerts(self):
+        filters = [
+            {'alert_status_id': 1},
+            {'alert_severity_id': 5, 'alert_customer_id': self._customers_ids[0]},
+            {'alert_title': 'beacon', 'sort': 'asc'},
+            {'alert_tags': 'c2', 'alert_source': 'EDR'},
+            {'source_start_date': '2020-01-01', 'alert_status_id': 2}
+        ]
+        result = BenchmarkResult('filter_alerts')
+        with app.test_client() as client:
+            for index in range(self._requests_count):
+                query_string = {**filters[index % len(filters)], 'page': 1, 'per_page': 50}
+                with measure(db.engine, result):
+                    response = client.get('/api/v2/alerts', headers=self._headers, query_string=query_string)
+                self.assertEqual(200, response.status_code)
+
+        self._check(result)
+
+    def test_similar_alerts(self):
+        result = BenchmarkResult('similar_alerts')
+        with app.test_client() as client:
+            for alert_id in self._sample_alerts_ids(self._requests_count):
+                self._request(client, 'GET', f'/alerts/similarities/{alert_id}?open-alerts=true&closed-alerts=true'
+                                             f'&days-back=180&number-of-nodes=100', result)
+
+        self._check(result)
+
+    def test_update_alerts_batch(self):
+        result = BenchmarkResult('update_alerts_batch_100')
+        with app.test_client() as client:
+            for _ in range(max(1, self._requests_count // 5)):
+                body = {'alert_ids': self._sample_alerts_ids(100),
+                        'updates': {'alert_severity_id': self._random.randint(1, 5)}}
+                self._request(client, 'POST', '/alerts/batch/update', result, body)
+
+        self._check(result)
+
+    def _get_import_lists(self, client, alert_id):
+        alert = self._get_alert(client, alert_id)
+        return {
+            'iocs_import_list': [ioc['ioc_uuid'] for ioc in alert['iocs']],
+            'assets_import_list': [asset['asset_uuid'] for asset in alert['assets']],
+            'import_as_event': True,
+            'case_tags': 'benchmark'
+        }
+
+    def test_escalate_alert(self):
+        result = BenchmarkResult('escalate_alert')
+        with app.test_client() as client:
+            for alert_id in self._sample_alerts_ids(max(1, self._requests_count // 2)):
+                body = {**self._get_import_lists(client, alert_id), 'case_title': f'Benchmark {alert_id}'}
+                self._request(client, 'POST', f'/alerts/escalate/{alert_id}', result, body)
+
+        self._check(result)
+
+    def test_merge_alert(self):
+        result = BenchmarkResult('merge_alert')
+        with app.test_client() as client:
+            alerts_ids = self._sample_alerts_ids(max(1, self._requests_count // 2) + 1)
+            body = {**self._get_import_lists(client, alerts_ids[0]), 'case_title': 'Benchmark merge target'}
+            case_id = client.post(f'/alerts/escalate/{alerts_ids[0]}', headers=self._headers,
+                                  json=body).get_json()['data']['case_id']
+
+            for alert_id in alerts_ids[1:]:
+                body = {**self._get_import_lists(client, alert_id), 'target_case_id': case_id}
+                self._request(client, 'POST', f'/alerts/merge/{alert_id}', result, body)
+
+        self._check(result)
@@ -0,0 +1,57 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from datetime import datetime
+from unittest import TestCase
+
+from app.iris_engine.alerts.correlation import CorrelationPostings
+
+_CREATED_AT = datetime(2026, 1, 1)
+
+
+class TestCorrelationPostings(TestCase):
+
+    def setUp(self) -> None:
+        self._postings = CorrelationPostings.from_sorted_entries([
+            (1, -5, 10, _CREATED_AT),
+            (1, 7, 11, _CREATED_AT),
+            (1, 7, 12, datetime(2026, 2, 1)),
+            (2, 7, 20, _CREATED_AT)
+        ])
+
+    def test_lookup_should_return_the_alerts_of_the_customer_carrying_the_keys(self):
+        self.assertEqual({11: {7}, 12: {7}}, self._postings.lookup(1, [7]))
+
+    def test_lookup_should_return_the_keys_matched_by_each_alert(self):
+        self._postings.add(1, -5, 11, _CREATED_AT)
+        self.assertEqual({-5, 7}, self._postings.lookup(1, [-5, 7])[11])
+
+    def test_lookup_should_not_return_the_alerts_cached_before_since(self):
+        self.assertEqual({12: {7}}, self._postings.lookup(1, [7], since=datetime(2026, 1, 15)))
+
+    def test_lookup_should_return_the_entries_added_after_the_build(self):
+        self._postings.add(3, 7, 30, _CREATED_AT)
+        self.assertEqual({30: {7}}, self._postings.lookup(3, [7]))
+
+    def test_lookup_should_not_return_the_removed_alerts(self):
+        self._postings.remove_alerts([11])
+        self.assertEqual({12: {7}}, self._postings.lookup(1, [7]))
+
+    def test_len_should_count_the_built_and_added_entries(self):
+        self._postings.add(1, 8, 13, _CREATED_AT)
+        self.assertEqual(5, len(self._postings))
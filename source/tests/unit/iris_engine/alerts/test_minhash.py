@@ -0,0 +1,70 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from unittest import TestCase
+
+from app.iris_engine.alerts.minhash import MinHasher
+from app.iris_engine.alerts.minhash import estimate_similarity
+from app.iris_engine.alerts.minhash import get_iocs_tokens
+from app.iris_engine.alerts.minhash import get_lsh_buckets_hashes
+from app.iris_engine.alerts.minhash import get_text_shingles
+from app.iris_engine.alerts.minhash import pack_signature
+from app.iris_engine.alerts.minhash import unpack_signature
+
+
+class TestMinHash(TestCase):
+
+    def test_get_text_shingles_should_return_the_consecutive_words_case_insensitively(self):
+        self.assertEqual({'failed login for', 'login for admin'}, get_text_shingles('Failed login for ADMIN'))
+
+    def test_get_text_shingles_should_return_a_single_shingle_for_a_short_text(self):
+        self.assertEqual({'failed login'}, get_text_shingles('Failed login'))
+
+    def test_get_iocs_tokens_should_normalize_the_values(self):
+        self.assertEqual({'1|10.0.0.1'}, get_iocs_tokens([(' 10.0.0.1 ', 1), ('10.0.0.1', 1), ('', 2)]))
+
+    def test_signature_should_return_none_for_an_empty_set(self):
+        self.assertIsNone(MinHasher(16).signature([]))
+
+    def test_signatures_of_identical_sets_should_be_equal(self):
+        minhasher = MinHasher(64)
+        self.assertEqual(1.0, estimate_similarity(minhasher.signature(['a', 'b']), minhasher.signature(['b', 'a'])))
+
+    def test_estimate_similarity_should_approximate_the_jaccard_similarity(self):
+        minhasher = MinHasher(256)
+        tokens = [f'token{index}' for index in range(100)]
+        similarity = estimate_similarity(minhasher.signature(tokens[:75]), minhasher.signature(tokens[25:]))
+        self.assertAlmostEqual(0.5, similarity, delta=0.15)
+
+    def test_signatures_should_be_comparable_across_hashers_with_the_same_seed(self):
+        self.assertEqual(MinHasher(32).signature(['a', 'b']), MinHasher(32).signature(['a', 'b']))
+
+    def test_unpack_signature_should_return_the_packed_signature(self):
+        signature = MinHasher(16).signature(['a'])
+        self.assertEqual(signature, unpack_signature(pack_signature(signature)))
+
+    def test_get_lsh_buckets_hashes_should_return_one_bucket_per_band(self):
+        self.assertEqual(4, len(get_lsh_buckets_hashes('text', MinHasher(16).signature(['a']), 4)))
+
+    def test_get_lsh_buckets_hashes_should_depend_on_the_kind(self):
+        signature = MinHasher(16).signature(['a'])
+        self.assertNotEqual(get_lsh_buckets_hashes('text', signature, 4), get_lsh_buckets_hashes('iocs', signature, 4))
+
+    def test_get_lsh_buckets_hashes_should_raise_when_the_bands_do_not_divide_the_signature(self):
+        with self.assertRaises(ValueError):
+            get_lsh_buckets_hashes('text', MinHasher(16).signature(['a']), 32)
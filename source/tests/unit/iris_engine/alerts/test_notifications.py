@@ -0,0 +1,53 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from unittest import TestCase
+
+from app.iris_engine.alerts.notifications import ALERTS_ADMINISTRATORS_ROOM
+from app.iris_engine.alerts.notifications import get_alerts_changed_payload
+from app.iris_engine.alerts.notifications import get_alerts_changed_rooms
+from app.iris_engine.alerts.notifications import get_alerts_user_room
+
+
+class TestAlertsNotifications(TestCase):
+
+    def test_get_alerts_changed_payload_should_group_consecutive_ids_in_ranges(self):
+        payload = get_alerts_changed_payload(1, {'new': {3, 1, 2, 7}, 'updated': set(), 'deleted': set()})
+        self.assertEqual([[1, 3], [7, 7]], payload['new']['ranges'])
+
+    def test_get_alerts_changed_payload_should_count_the_changed_alerts(self):
+        payload = get_alerts_changed_payload(1, {'new': {1, 2, 7}, 'updated': set(), 'deleted': set()})
+        self.assertEqual(3, payload['new']['count'])
+
+    def test_get_alerts_changed_payload_should_not_report_deleted_alerts_as_updated(self):
+        payload = get_alerts_changed_payload(1, {'new': set(), 'updated': {1, 2}, 'deleted': {2}})
+        self.assertEqual([[1, 1]], payload['updated']['ranges'])
+
+    def test_get_alerts_changed_payload_should_not_report_new_alerts_as_updated(self):
+        payload = get_alerts_changed_payload(1, {'new': {1}, 'updated': {1, 2}, 'deleted': set()})
+        self.assertEqual(1, payload['updated']['count'])
+
+    def test_get_alerts_changed_payload_should_merge_ranges_above_the_limit(self):
+        payload = get_alerts_changed_payload(1, {'new': set(range(0, 200, 2)), 'updated': set(), 'deleted': set()})
+        self.assertEqual([[0, 198]], payload['new']['ranges'])
+
+    def test_get_alerts_changed_rooms_should_include_the_administrators_room(self):
+        self.assertIn(ALERTS_ADMINISTRATORS_ROOM, get_alerts_changed_rooms(1))
+
+    def test_get_alerts_user_room_should_differ_from_the_alerts_changed_rooms(self):
+        self.assertNotIn(get_alerts_user_room(1), get_alerts_changed_rooms(1))
@@ -0,0 +1,84 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from unittest import TestCase
+
+from app.iris_engine.alerts.rate_limiter import IngestionRateLimiter
+from app.iris_engine.alerts.rate_limiter import TokenBucket
+
+
+class TestRateLimiter(TestCase):
+
+    def test_get_wait_time_should_let_requests_through_up_to_the_capacity(self):
+        bucket = TokenBucket(rate=1, capacity=10, now=0)
+        self.assertEqual(0, bucket.get_wait_time(10, now=0))
+
+    def test_get_wait_time_should_return_the_time_to_refill_the_missing_tokens(self):
+        bucket = TokenBucket(rate=2, capacity=10, now=0)
+        bucket.consume(10)
+        self.assertEqual(2, bucket.get_wait_time(4, now=0))
+
+    def test_get_wait_time_should_account_for_the_refill(self):
+        bucket = TokenBucket(rate=2, capacity=10, now=0)
+        bucket.consume(10)
+        self.assertEqual(0, bucket.get_wait_time(4, now=2))
+
+    def test_get_wait_time_should_let_a_request_bigger_than_the_capacity_through_when_full(self):
+        bucket = TokenBucket(rate=1, capacity=10, now=0)
+        self.assertEqual(0, bucket.get_wait_time(50, now=0))
+
+    def test_acquire_should_throttle_a_key_once_its_burst_is_consumed(self):
+        rate_limiter = IngestionRateLimiter({'api_key': (1, 5)})
+        rate_limiter.acquire([('api_key', 1, 5)], 5)
+        _, scope = rate_limiter.acquire([('api_key', 1, 1)], 1)
+        self.assertEqual('api_key', scope)
+
+    def test_acquire_should_not_throttle_other_keys(self):
+        rate_limiter = IngestionRateLimiter({'api_key': (1, 5)})
+        rate_limiter.acquire([('api_key', 1, 5)], 5)
+        _, scope = rate_limiter.acquire([('api_key', 2, 1)], 1)
+        self.assertIsNone(scope)
+
+    def test_acquire_should_not_consume_the_other_scopes_of_a_throttled_request(self):
+        rate_limiter = IngestionRateLimiter({'api_key': (1, 5), 'source': (1, 5)})
+        rate_limiter.acquire([('source', 'EDR', 5)], 5)
+        rate_limiter.acquire([('api_key', 1, 5), ('source', 'EDR', 5)], 5)
+        _, scope = rate_limiter.acquire([('api_key', 1, 5)], 5)
+        self.assertIsNone(scope)
+
+    def test_acquire_should_ignore_the_scopes_with_a_zero_rate(self):
+        rate_limiter = IngestionRateLimiter({'api_key': (0, 5)})
+        rate_limiter.acquire([('api_key', 1, 100)], 100)
+        _, scope = rate_limiter.acquire([('api_key', 1, 100)], 100)
+        self.assertIsNone(scope)
+
+    def test_get_statistics_should_count_the_alerts_per_outcome(self):
+        rate_limiter = IngestionRateLimiter({'api_key': (1, 5)})
+        rate_limiter.acquire([('api_key', 1, 3)], 3)
+        rate_limiter.acquire([('api_key', 1, 1)], 1)
+        rate_limiter.acquire([('api_key', 1, 4)], 4)
+        rate_limiter.record_rejected(2)
+        statistics = rate_limiter.get_statistics()
+        self.assertEqual((4, {'api_key': 4}, 2),
+                         (statistics['accepted'], statistics['throttled'], statistics['rejected']))
+
+    def test_acquire_should_evict_the_least_recently_used_buckets(self):
+        rate_limiter = IngestionRateLimiter({'source': (1, 5)}, max_buckets=2)
+        for source in ('a', 'b', 'c'):
+            rate_limiter.acquire([('source', source, 1)], 1)
+        self.assertEqual(2, rate_limiter.get_statistics()['buckets'])
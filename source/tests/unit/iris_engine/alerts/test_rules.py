@@ -0,0 +1,80 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from unittest import TestCase
+
+from app.iris_engine.alerts.rules import AlertRulesMatcher
+from app.iris_engine.alerts.rules import _CompiledRule
+from app.iris_engine.alerts.rules import compile_alert_rule_conditions
+
+
+def _rule(rule_id, conditions, customer_id=None):
+    return _CompiledRule(rule_id, customer_id, 'drop', None, compile_alert_rule_conditions(conditions))
+
+
+class TestAlertRulesMatcher(TestCase):
+
+    def test_match_should_return_the_rule_matching_the_source_exactly(self):
+        matcher = AlertRulesMatcher([_rule(1, [{'field': 'alert_source', 'operator': 'equals', 'value': 'edr'}])])
+        self.assertEqual(1, matcher.match({'alert_source': 'edr', 'alert_customer_id': 1}).rule_id)
+
+    def test_match_should_return_none_when_no_rule_matches(self):
+        matcher = AlertRulesMatcher([_rule(1, [{'field': 'alert_source', 'operator': 'equals', 'value': 'edr'}])])
+        self.assertIsNone(matcher.match({'alert_source': 'siem', 'alert_customer_id': 1}))
+
+    def test_match_should_return_the_first_rule_in_order(self):
+        matcher = AlertRulesMatcher([
+            _rule(1, [{'field': 'alert_title', 'operator': 'regex', 'value': 'scan'}]),
+            _rule(2, [{'field': 'alert_title', 'operator': 'regex', 'value': '^Port'}])
+        ])
+        self.assertEqual(1, matcher.match({'alert_title': 'Port scan', 'alert_customer_id': 1}).rule_id)
+
+    def test_match_should_return_the_rule_whose_pattern_has_a_backreference(self):
+        matcher = AlertRulesMatcher([
+            _rule(1, [{'field': 'alert_title', 'operator': 'regex', 'value': r'(a)\1'}]),
+            _rule(2, [{'field': 'alert_title', 'operator': 'regex', 'value': r'(b)\1'}])
+        ])
+        self.assertEqual(2, matcher.match({'alert_title': 'xbb', 'alert_customer_id': 1}).rule_id)
+
+    def test_match_should_not_apply_the_inline_flags_of_a_pattern_to_the_other_rules(self):
+        matcher = AlertRulesMatcher([
+            _rule(1, [{'field': 'alert_title', 'operator': 'regex', 'value': '(?i)scan'}]),
+            _rule(2, [{'field': 'alert_title', 'operator': 'regex', 'value': 'port'}])
+        ])
+        self.assertIsNone(matcher.match({'alert_title': 'PORT', 'alert_customer_id': 1}))
+
+    def test_match_should_require_all_the_conditions(self):
+        matcher = AlertRulesMatcher([_rule(1, [{'field': 'alert_tags', 'operator': 'equals', 'value': 'noise'},
+                                               {'field': 'ioc_value', 'operator': 'equals', 'value': '10.0.0.1'}])])
+        alert_data = {'alert_tags': 'noise,lab', 'alert_iocs': [{'ioc_value': '10.0.0.2'}], 'alert_customer_id': 1}
+        self.assertIsNone(matcher.match(alert_data))
+
+    def test_match_should_match_source_content_paths(self):
+        matcher = AlertRulesMatcher([_rule(1, [{'field': 'alert_source_content.event.rule_id', 'operator': 'equals',
+                                                'value': ['4625', '4771']}])])
+        alert_data = {'alert_source_content': {'event': {'rule_id': 4771}}, 'alert_customer_id': 1}
+        self.assertEqual(1, matcher.match(alert_data).rule_id)
+
+    def test_match_should_ignore_rules_of_other_customers(self):
+        matcher = AlertRulesMatcher([_rule(1, [{'field': 'alert_source', 'operator': 'equals', 'value': 'edr'}],
+                                           customer_id=2)])
+        self.assertIsNone(matcher.match({'alert_source': 'edr', 'alert_customer_id': 1}))
+
+    def test_compile_alert_rule_conditions_should_raise_when_regex_is_invalid(self):
+        with self.assertRaises(ValueError):
+            compile_alert_rule_conditions([{'field': 'alert_title', 'operator': 'regex', 'value': '('}])
@@ -0,0 +1,84 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from unittest import TestCase
+
+from app import app
+from app.iris_engine.dashboards.live_updates import LiveAccessRevoked
+from app.iris_engine.dashboards.live_updates import LiveSubscription
+from app.iris_engine.dashboards.live_updates import LiveSubscriptions
+from app.iris_engine.dashboards.live_updates import get_payloads_delta
+
+
+class TestDashboardsLiveUpdates(TestCase):
+
+    def setUp(self):
+        self._emitted = []
+        self._subscriptions = LiveSubscriptions(10, emit=lambda event, data, sid: self._emitted.append((event, data, sid)))
+        # The background task is not started, the tests polling the subscriptions themselves
+        self._subscriptions._running = True
+
+    def _raise_error(self):
+        raise ValueError('Refresh failed')
+
+    def _revoke_access(self):
+        raise LiveAccessRevoked()
+
+    def test_get_payloads_delta_should_return_the_changed_payloads(self):
+        digests = {}
+        get_payloads_delta(digests, {'kpis': {'total': 1}, 'evidence': {'total': 2}})
+        changed, _ = get_payloads_delta(digests, {'kpis': {'total': 3}, 'evidence': {'total': 2}})
+        self.assertEqual({'kpis': {'total': 3}}, changed)
+
+    def test_get_payloads_delta_should_return_the_removed_keys(self):
+        digests = {}
+        get_payloads_delta(digests, {'1': [1], '2': [2]})
+        _, removed = get_payloads_delta(digests, {'1': [1]}, keys={'1'})
+        self.assertEqual(['2'], removed)
+
+    def test_poll_should_not_emit_when_nothing_changed(self):
+        self._subscriptions.subscribe(LiveSubscription('sid', 'statistics', lambda: None))
+        self._subscriptions.poll()
+        self.assertEqual([], self._emitted)
+
+    def test_poll_should_emit_the_update_of_the_subscription(self):
+        self._subscriptions.subscribe(LiveSubscription('sid', 'statistics', lambda: {'payloads': {'kpis': {}}}))
+        self._subscriptions.poll()
+        self.assertEqual([('live_update', {'subscription': 'statistics', 'payloads': {'kpis': {}}}, 'sid')], self._emitted)
+
+    def test_poll_should_close_the_subscriptions_which_fail(self):
+        self._subscriptions.subscribe(LiveSubscription('sid', 'statistics', self._raise_error))
+        with app.app_context():
+            self._subscriptions.poll()
+        self.assertEqual([('live_closed', {'subscription': 'statistics'}, 'sid')], self._emitted)
+        self.assertEqual(0, len(self._subscriptions))
+
+    def test_poll_should_refresh_the_other_subscriptions_after_a_failure(self):
+        self._subscriptions.subscribe(LiveSubscription('sid', 'statistics', self._raise_error))
+        self._subscriptions.subscribe(LiveSubscription('sid', 'dashboard-1', lambda: {'widgets': []}))
+        with app.app_context():
+            self._subscriptions.poll()
+        self.assertIn(('live_update', {'subscription': 'dashboard-1', 'widgets': []}, 'sid'), self._emitted)
+
+    def test_poll_should_close_the_subscriptions_whose_access_was_revoked(self):
+        self._subscriptions.subscribe(LiveSubscription('sid', 'dashboard-1', self._revoke_access))
+        with app.app_context():
+            self._subscriptions.poll()
+        self.assertEqual([('live_closed', {'subscription': 'dashboard-1', 'message': 'Access denied'}, 'sid')],
+                         self._emitted)
+        self.assertEqual(0, len(self._subscriptions))
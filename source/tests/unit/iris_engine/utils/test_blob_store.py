@@ -0,0 +1,55 @@
+#  IRIS Source Code
+#  Copyright (C) 2026 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import tempfile
+from unittest import TestCase
+
+from app.iris_engine.utils.blob_store import BlobStore
+
+
+class TestBlobStore(TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self._subject = BlobStore(self._directory.name)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_get_should_return_the_stored_payload(self):
+        digest = self._subject.put(b'raw alert payload')
+        self.assertEqual(b'raw alert payload', self._subject.get(digest))
+
+    def test_put_should_store_identical_payloads_once(self):
+        first_digest = self._subject.put(b'raw alert payload')
+        second_digest = self._subject.put(b'raw alert payload')
+        self.assertEqual(first_digest, second_digest)
+        self.assertEqual([first_digest], list(self._subject.iter_digests()))
+
+    def test_stream_should_return_the_whole_payload(self):
+        payload = b'raw event line\n' * 10000
+        digest = self._subject.put(payload)
+        self.assertEqual(payload, b''.join(self._subject.stream(digest, chunk_size=1024)))
+
+    def test_get_should_reject_invalid_digests(self):
+        with self.assertRaises(ValueError):
+            self._subject.get('../../etc/passwd')
+
+    def test_delete_should_remove_the_payload(self):
+        digest = self._subject.put(b'raw alert payload')
+        self._subject.delete(digest)
+        self.assertEqual([], list(self._subject.iter_digests()))
@@ -30,6 +30,11 @@ class DockerCompose:
     def start(self):
         subprocess.check_call(_DOCKER_COMPOSE + ['-f', self._docker_compose_file, 'up', '--detach'], cwd=self._docker_compose_path)
 
+    def execute(self, service, command):
+        return subprocess.Popen(_DOCKER_COMPOSE + ['-f', self._docker_compose_file, 'exec', '-T', service] + command,
+                                cwd=self._docker_compose_path, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, universal_newlines=True)
+
     def extract_all_logs(self):
         return subprocess.check_output(_DOCKER_COMPOSE + ['-f', self._docker_compose_file, 'logs', '--no-color'], cwd=self._docker_compose_path, universal_newlines=True)
 
@@ -74,6 +74,10 @@ class Iris:
         response = self._api.post('/api/v2/cases', body).json()
         return response['case_id']
 
+    def open_database_session(self):
+        return self._docker_compose.execute('db', ['sh', '-c', 'psql --quiet --tuples-only --no-align '
+                                                               '-U "$POSTGRES_USER" -d "$POSTGRES_DB"'])
+
     def execute_graphql_query(self, payload):
         return self._administrator.execute_graphql_query(payload)
 
@@ -0,0 +1,47 @@
+#  IRIS Source Code
+#  Copyright (C) 2023 - DFIR-IRIS
+#  contact@dfir-iris.org
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from time import sleep
+from unittest import TestCase
+from iris import Iris
+
+
+class TestsDatabase(TestCase):
+
+    def setUp(self) -> None:
+        self._subject = Iris()
+
+    def test_alerts_rollup_dirty_hour_should_stay_marked_when_refreshed_while_a_write_to_it_is_uncommitted(self):
+        body = {'alert_title': 'title', 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+        alert_identifier = self._subject.create('/alerts/add', body).json()['data']['alert_id']
+        alert_hour = f"(SELECT date_trunc('hour', alert_creation_time) FROM alerts WHERE alert_id = {alert_identifier})"
+        writer = self._subject.open_database_session()
+        writer.stdin.write(f"BEGIN;\nUPDATE alerts SET alert_note = 'note' WHERE alert_id = {alert_identifier};\n")
+        writer.stdin.flush()
+        sleep(1)
+        # The rollups job deletes the dirty hours markers it recomputes
+        refresh = self._subject.open_database_session()
+        refresh.communicate("SET lock_timeout = '2s';\n"
+                            f"DELETE FROM alerts_rollup_dirty_hours WHERE bucket_start = {alert_hour};\n")
+        writer.communicate('COMMIT;\n')
+        reader = self._subject.open_database_session()
+        markers_count, _ = reader.communicate(
+            f"SELECT count(*) FROM alerts_rollup_dirty_hours WHERE bucket_start = {alert_hour};\n"
+        )
+        self._subject.create(f'/alerts/delete/{alert_identifier}', {})
+        self.assertNotEqual('0', markers_count.strip())
@@ -85,3 +85,248 @@ class TestsRestAlerts(TestCase):
         response = self._subject.create(f'/alerts/merge/{alert_identifier}', body)
         # TODO should be 201
         self.assertEqual(200, response.status_code)
+
+    def test_create_alerts_batch_should_return_201(self):
+        body = {
+            'alerts': [
+                {'alert_title': 'title', 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1},
+                {'alert_title': 'title', 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+            ]
+        }
+        response = self._subject.create('/api/v2/alerts/batch', body)
+        self.assertEqual(201, response.status_code)
+
+    def test_create_alerts_batch_should_create_all_alerts(self):
+        alert_title = f'title{uuid4()}'
+        body = [
+            {'alert_title': alert_title, 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1},
+            {'alert_title': alert_title, 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+        ]
+        self._subject.create('/alerts/batch/add', body)
+        response = self._subject.get('/api/v2/alerts', query_parameters={'alert_title': alert_title}).json()
+        self.assertEqual(2, response['total'])
+
+    def test_create_alerts_batch_should_not_create_any_alert_when_one_is_invalid(self):
+        alert_title = f'title{uuid4()}'
+        body = {
+            'alerts': [
+                {'alert_title': alert_title, 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1},
+                {'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+            ]
+        }
+        self._subject.create('/api/v2/alerts/batch', body)
+        response = self._subject.get('/api/v2/alerts', query_parameters={'alert_title': alert_title}).json()
+        self.assertEqual(0, response['total'])
+
+    def test_create_alerts_ingestion_should_return_202(self):
+        body = {
+            'alerts': [
+                {'alert_title': 'title', 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+            ]
+        }
+        response = self._subject.create('/api/v2/alerts/ingestions', body)
+        self.assertEqual(202, response.status_code)
+
+    def test_get_alerts_ingestions_statistics_should_count_the_accepted_alerts(self):
+        accepted = self._subject.get('/api/v2/alerts/ingestions/statistics').json()['accepted']
+        body = {
+            'alerts': [
+                {'alert_title': 'title', 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+            ]
+        }
+        self._subject.create('/api/v2/alerts/batch', body)
+        response = self._subject.get('/api/v2/alerts/ingestions/statistics').json()
+        self.assertLessEqual(accepted + 1, response['accepted'])
+
+    def test_get_alerts_ingestion_should_return_ticket_status(self):
+        body = {
+            'alerts': [
+                {'alert_title': 'title', 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+            ]
+        }
+        ticket_uuid = self._subject.create('/api/v2/alerts/ingestions', body).json()['ticket_uuid']
+        response = self._subject.get(f'/api/v2/alerts/ingestions/{ticket_uuid}').json()
+        self.assertIn(response['status'], ['pending', 'processing', 'completed'])
+
+    def test_get_alerts_with_cursor_should_return_next_cursor(self):
+        alert_title = f'title{uuid4()}'
+        body = [
+            {'alert_title': alert_title, 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1},
+            {'alert_title': alert_title, 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+        ]
+        self._subject.create('/alerts/batch/add', body)
+        response = self._subject.get('/api/v2/alerts', query_parameters={'alert_title': alert_title,
+                                                                         'per_page': 1, 'cursor': ''}).json()
+        self.assertIsNotNone(response['next_cursor'])
+
+    def test_get_alerts_with_cursor_should_return_the_following_alerts(self):
+        alert_title = f'title{uuid4()}'
+        body = [
+            {'alert_title': alert_title, 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1},
+            {'alert_title': alert_title, 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+        ]
+        self._subject.create('/alerts/batch/add', body)
+        query_parameters = {'alert_title': alert_title, 'per_page': 1, 'cursor': ''}
+        first_page = self._subject.get('/api/v2/alerts', query_parameters=query_parameters).json()
+        query_parameters['cursor'] = first_page['next_cursor']
+        second_page = self._subject.get('/api/v2/alerts', query_parameters=query_parameters).json()
+        self.assertNotEqual(first_page['data'][0]['alert_id'], second_page['data'][0]['alert_id'])
+
+    def test_get_alerts_with_invalid_cursor_should_return_400(self):
+        response = self._subject.get('/api/v2/alerts', query_parameters={'cursor': 'invalid'})
+        self.assertEqual(400, response.status_code)
+
+    def test_get_alerts_should_not_return_iocs_by_default(self):
+        alert_title = f'title{uuid4()}'
+        body = {'alert_title': alert_title, 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+        self._subject.create('/alerts/add', body)
+        response = self._subject.get('/api/v2/alerts', query_parameters={'alert_title': alert_title}).json()
+        self.assertNotIn('iocs', response['data'][0])
+
+    def test_get_alerts_should_return_iocs_when_included(self):
+        alert_title = f'title{uuid4()}'
+        body = {'alert_title': alert_title, 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+        self._subject.create('/alerts/add', body)
+        response = self._subject.get('/api/v2/alerts', query_parameters={'alert_title': alert_title,
+                                                                         'include': 'iocs'}).json()
+        self.assertEqual([], response['data'][0]['iocs'])
+
+    def test_get_alerts_with_invalid_include_should_return_400(self):
+        response = self._subject.get('/api/v2/alerts', query_parameters={'include': 'alert_title'})
+        self.assertEqual(400, response.status_code)
+
+    def test_get_alerts_with_search_should_return_alerts_matching_keywords(self):
+        keyword = f'keyword{uuid4().hex}'
+        body = {'alert_title': f'title {keyword}', 'alert_severity_id': 4, 'alert_status_id': 3,
+                'alert_customer_id': 1}
+        self._subject.create('/alerts/add', body)
+        response = self._subject.get('/api/v2/alerts', query_parameters={'search': keyword}).json()
+        self.assertEqual(1, response['total'])
+
+    def test_get_archived_alerts_should_return_200(self):
+        response = self._subject.get('/api/v2/alerts/archive')
+        self.assertEqual(200, response.status_code)
+
+    def test_update_alerts_batch_should_update_all_alerts(self):
+        alert_title = f'title{uuid4()}'
+        body = [
+            {'alert_title': alert_title, 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1},
+            {'alert_title': alert_title, 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+        ]
+        alert_identifiers = [alert['alert_id'] for alert in self._subject.create('/alerts/batch/add', body).json()['data']]
+        self._subject.create('/alerts/batch/update', {'alert_ids': alert_identifiers, 'updates': {'alert_severity_id': 2}})
+        response = self._subject.get('/api/v2/alerts', query_parameters={'alert_title': alert_title,
+                                                                         'alert_severity_id': 2}).json()
+        self.assertEqual(2, response['total'])
+
+    def test_update_alerts_batch_should_return_400_when_field_cannot_be_updated(self):
+        body = {'alert_title': 'title', 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+        alert_identifier = self._subject.create('/alerts/add', body).json()['data']['alert_id']
+        response = self._subject.create('/alerts/batch/update', {'alert_ids': [alert_identifier],
+                                                                 'updates': {'alert_uuid': str(uuid4())}})
+        self.assertEqual(400, response.status_code)
+
+    def test_update_alerts_batch_should_not_record_history_when_value_is_unchanged(self):
+        body = {'alert_title': 'title', 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+        alert_identifier = self._subject.create('/alerts/add', body).json()['data']['alert_id']
+        self._subject.create('/alerts/batch/update', {'alert_ids': [alert_identifier],
+                                                      'updates': {'alert_severity_id': '4'}})
+        response = self._subject.get(f'/alerts/{alert_identifier}').json()
+        self.assertEqual(1, len(response['data']['modification_history']))
+
+    def test_get_alert_should_return_modification_history_entries(self):
+        body = {'alert_title': 'title', 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+        alert_identifier = self._subject.create('/alerts/add', body).json()['data']['alert_id']
+        self._subject.create(f'/alerts/update/{alert_identifier}', {'alert_severity_id': 2})
+        response = self._subject.get(f'/alerts/{alert_identifier}').json()
+        actions = [entry['action'] for entry in response['data']['modification_history'].values()]
+        self.assertEqual('Alert created', actions[0])
+        self.assertEqual(2, len(actions))
+
+    def test_get_alert_should_return_large_source_content(self):
+        alert_source_content = {'raw': 'x' * 20000}
+        body = {'alert_title': 'title', 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1,
+                'alert_source_content': alert_source_content}
+        alert_identifier = self._subject.create('/alerts/add', body).json()['data']['alert_id']
+        response = self._subject.get(f'/alerts/{alert_identifier}').json()
+        self.assertEqual(alert_source_content, response['data']['alert_source_content'])
+
+    def test_get_alerts_filter_should_show_alert_updated_after_a_cached_filter(self):
+        alert_title = f'title{uuid4()}'
+        body = {'alert_title': alert_title, 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+        alert_identifier = self._subject.create('/alerts/add', body).json()['data']['alert_id']
+        query_parameters = {'alert_title': alert_title, 'alert_severity_id': 2}
+        self._subject.get('/api/v2/alerts', query_parameters=query_parameters)
+        self._subject.create(f'/alerts/update/{alert_identifier}', {'alert_severity_id': 2})
+        response = self._subject.get('/api/v2/alerts', query_parameters=query_parameters).json()
+        self.assertEqual(1, response['total'])
+
+    def test_export_alerts_should_return_one_line_per_alert(self):
+        alert_title = f'title{uuid4()}'
+        body = [
+            {'alert_title': alert_title, 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1},
+            {'alert_title': alert_title, 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+        ]
+        self._subject.create('/alerts/batch/add', body)
+        response = self._subject.get('/api/v2/alerts/export', query_parameters={'alert_title': alert_title})
+        self.assertEqual(2, len(response.text.splitlines()))
+
+    def test_export_alerts_should_return_400_when_format_is_invalid(self):
+        response = self._subject.get('/api/v2/alerts/export', query_parameters={'format': 'xml'})
+        self.assertEqual(400, response.status_code)
+
+    def test_create_alerts_batch_should_not_create_alerts_dropped_by_a_rule(self):
+        alert_source = f'source{uuid4()}'
+        rule = {'rule_name': 'drop', 'rule_action': 'drop',
+                'rule_conditions': [{'field': 'alert_source', 'operator': 'equals', 'value': alert_source}]}
+        rule_identifier = self._subject.create('/api/v2/alerts/rules', rule).json()['rule_id']
+        body = {'alerts': [{'alert_title': 'title', 'alert_source': alert_source, 'alert_severity_id': 4,
+                            'alert_status_id': 3, 'alert_customer_id': 1}]}
+        response = self._subject.create('/api/v2/alerts/batch', body).json()
+        self._subject.delete(f'/api/v2/alerts/rules/{rule_identifier}')
+        self.assertEqual([], response)
+
+    def test_create_alerts_batch_should_not_count_rule_hits_when_batch_is_invalid(self):
+        alert_source = f'source{uuid4()}'
+        rule = {'rule_name': 'drop', 'rule_action': 'drop',
+                'rule_conditions': [{'field': 'alert_source', 'operator': 'equals', 'value': alert_source}]}
+        rule_identifier = self._subject.create('/api/v2/alerts/rules', rule).json()['rule_id']
+        body = {'alerts': [{'alert_title': 'title', 'alert_source': alert_source, 'alert_severity_id': 4,
+                            'alert_status_id': 3, 'alert_customer_id': 1},
+                           {'alert_title': 'title', 'alert_severity_id': 'invalid', 'alert_status_id': 3,
+                            'alert_customer_id': 1}]}
+        self._subject.create('/api/v2/alerts/batch', body)
+        response = self._subject.get(f'/api/v2/alerts/rules/{rule_identifier}').json()
+        self._subject.delete(f'/api/v2/alerts/rules/{rule_identifier}')
+        self.assertEqual(0, response['rule_hit_count'])
+
+    def test_create_alert_rule_should_return_400_when_regex_is_invalid(self):
+        rule = {'rule_name': 'invalid', 'rule_action': 'drop',
+                'rule_conditions': [{'field': 'alert_title', 'operator': 'regex', 'value': '('}]}
+        response = self._subject.create('/api/v2/alerts/rules', rule)
+        self.assertEqual(400, response.status_code)
+
+    def test_create_alert_should_count_one_occurrence(self):
+        body = {'alert_title': 'title', 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1}
+        response = self._subject.create('/alerts/add', body).json()
+        self.assertEqual(1, response['data']['alert_occurrences'])
+
+    def test_get_alert_near_duplicates_should_return_404_when_alert_is_not_found(self):
+        response = self._subject.get('/api/v2/alerts/999999999/near-duplicates')
+        self.assertEqual(404, response.status_code)
+
+    def test_batch_merge_alerts_sharing_an_ioc_should_import_it_once(self):
+        case_identifier = self._subject.create_dummy_case()
+        alert_identifiers = []
+        ioc_uuids = []
+        for _ in range(2):
+            body = {'alert_title': 'title', 'alert_severity_id': 4, 'alert_status_id': 3, 'alert_customer_id': 1,
+                    'alert_iocs': [{'ioc_value': '8.8.8.8', 'ioc_type_id': 1, 'ioc_tlp_id': 2}]}
+            alert = self._subject.create('/alerts/add', body).json()['data']
+            alert_identifiers.append(str(alert['alert_id']))
+            ioc_uuids.append(alert['iocs'][0]['ioc_uuid'])
+        body = {'target_case_id': case_identifier, 'alert_ids': ','.join(alert_identifiers),
+                'iocs_import_list': ioc_uuids, 'assets_import_list': []}
+        self._subject.create('/alerts/batch/merge', body)
+        response = self._subject.get('/case/ioc/list', query_parameters={'cid': case_identifier}).json()
+        self.assertEqual(1, len(response['data']['ioc']))
@@ -13,8 +13,31 @@ async function fetchAlert(alertId) {
     return await response;
 }
 
+// Background batch updates started from this page
+const batchUpdateTasks = new Set();
+
+// Relationships rendered in the alert details, not part of the default list projection.
+// The raw alert content is loaded from the alert details endpoint when it is displayed
+const alertsListInclude = 'iocs,assets,cases,comments';
+
+async function loadAlertRawContent(alertId) {
+    const rawContent = $(`#rawAlertContent-${alertId}`);
+    if (rawContent.data('loaded')) {
+        return;
+    }
+
+    const alertDataReq = await fetchAlert(alertId);
+    if (api_request_failed(alertDataReq)) {
+        return;
+    }
+
+    const alertSourceContent = alertDataReq.data.alert_source_content;
+    rawContent.text(alertSourceContent ? JSON.stringify(alertSourceContent, null, 2) : 'No raw alert content');
+    rawContent.data('loaded', true);
+}
+
 async function fetchMultipleAlerts(alertIds) {
-    const response = get_raw_request_api(`/alerts/filter?cid=${get_caseid()}&alert_ids=${alertIds.join(',')}`);
+    const response = get_raw_request_api(`/alerts/filter?cid=${get_caseid()}&alert_ids=${alertIds.join(',')}&include=${alertsListInclude}`);
     return await response;
 }
 
@@ -653,7 +676,8 @@ function fetchSimilarAlerts(alert_id,
   fetch_open_alerts = true,
   fetch_closed_alerts = false,
   fetch_open_cases = false,
-  fetch_closed_cases = false
+  fetch_closed_cases = false,
+  fetch_near_duplicates = false
     ) {
       const similarAlertsElement = $(`#similarAlerts-${alert_id}`);
       if (!similarAlertsElement.html() || refresh) {
@@ -664,6 +688,7 @@ function fetchSimilarAlerts(alert_id,
           'closed-alerts': fetch_closed_alerts,
           'open-cases': fetch_open_cases,
           'closed-cases': fetch_closed_cases,
+          'near-duplicates': fetch_near_duplicates,
           'days-back': $(`#daysBackGraphFilter-${alert_id}`).val(),
           'number-of-nodes': nb_nodes
         }).toString();
@@ -739,7 +764,7 @@ function escalateOrMergeAlert(alert_id, merge = false, batch = false) {
 
 async function fetchAlerts(page, per_page, filters_string = {}, sort_order= 'desc') {
     return get_raw_request_api(`/api/v2/alerts?page=${page}&per_page=${per_page}
-  &sort=${sort_order}&${filters_string}`);
+  &sort=${sort_order}&include=${alertsListInclude}&${filters_string}`);
 
 }
 
@@ -922,6 +947,7 @@ function renderAlert(alert, expanded=false, modulesOptionsAlertReq,
                             <div class="d-flex mb-3">
                                
                                 <span title="Alert IDs" class=""><small class="text-muted"><i>#${alert.alert_id} - ${alert.alert_uuid}</i></small></span>
+                                ${alert.alert_occurrences > 1 ? `<span title="Last seen ${filterXSS(alert.alert_last_seen_at || '')}" class="badge badge-pill badge-light ml-2">x${alert.alert_occurrences}</span>` : ''}
                             </div>
                         </h6>
                     </div>
@@ -1076,6 +1102,10 @@ function renderAlert(alert, expanded=false, modulesOptionsAlertReq,
                                     <input type="checkbox" name="closed_cases_${alert.alert_id}" class="selectgroup-input filter-graph-alert-checkbox" onclick="refreshAlertRelationships(${alert.alert_id})">
                                     <span class="selectgroup-button">Show closed cases</span>
                                 </label>
+                                <label class="selectgroup-item">
+                                    <input type="checkbox" name="near_duplicates_${alert.alert_id}" class="selectgroup-input filter-graph-alert-checkbox" onclick="refreshAlertRelationships(${alert.alert_id})">
+                                    <span class="selectgroup-button">Show near duplicates</span>
+                                </label>
                             </div>
                             <div class="mt-4">
                                 <div class="input-group ">
@@ -1205,16 +1235,12 @@ function renderAlert(alert, expanded=false, modulesOptionsAlertReq,
               : ''
       }
                     
-                    ${
-          alert.alert_source_content
-              ? `<div class="separator-solid"></div><h3 class="title mt-3 mb-3"><strong>Raw Alert</strong></h3>
+                    <div class="separator-solid"></div><h3 class="title mt-3 mb-3"><strong>Raw Alert</strong></h3>
                            <button class="btn btn-sm btn-outline-dark" type="button" data-toggle="collapse" data-target="#rawAlert-${alert.alert_id}" 
-                           aria-expanded="false" aria-controls="rawAlert-${alert.alert_id}">Toggle Raw Alert</button>
+                           aria-expanded="false" aria-controls="rawAlert-${alert.alert_id}" onclick="loadAlertRawContent(${alert.alert_id});">Toggle Raw Alert</button>
                            <div class="collapse mt-3" id="rawAlert-${alert.alert_id}">
-                             <pre class="pre-scrollable">${filterXSS(JSON.stringify(alert.alert_source_content, null, 2))}</pre>
-                           </div>`
-              : ""
-      }
+                             <pre class="pre-scrollable" id="rawAlertContent-${alert.alert_id}">Loading...</pre>
+                           </div>
                     
                     </div>
                   </div>
@@ -2116,6 +2142,11 @@ async function updateBatchAlerts(data_content= {}) {
 
     return post_request_api('/alerts/batch/update', JSON.stringify(data)).then(function (data) {
         if (notify_auto_api(data)) {
+            if (data.data && data.data.task_id) {
+                // Large selections are updated in the background, wait for the progress events
+                batchUpdateTasks.add(data.data.task_id);
+                return;
+            }
             setFormValuesFromUrl();
         }
     }).always(() => {
@@ -2177,9 +2208,10 @@ function refreshAlertRelationships(alertId) {
     let fetch_closed_alerts = $(`input[name="closed_alerts_${alertId}"]`).prop('checked');
     let fetch_open_cases = $(`input[name="open_cases_${alertId}"]`).prop('checked');
     let fetch_closed_cases = $(`input[name="closed_cases_${alertId}"]`).prop('checked');
+    let fetch_near_duplicates = $(`input[name="near_duplicates_${alertId}"]`).prop('checked');
 
     fetchSimilarAlerts(alertId, true, fetch_open_alerts, fetch_closed_alerts,
-        fetch_open_cases, fetch_closed_cases);
+        fetch_open_cases, fetch_closed_cases, fetch_near_duplicates);
 }
 
 $(document).ready(function () {
@@ -2291,11 +2323,56 @@ $(document).ready(function () {
     $(this).text(allSelected ? 'Select all' : 'Deselect all');
   });
 
-    socket.on('new_alert', function (data) {
-        const badge = $('#newAlertsBadge');
-        const currentCount = parseInt(badge.text()) || 0;
-        badge.text(currentCount + 1).show();
-        badge.attr('title', 'New alerts available');
+    socket.on('alerts_changed', function (data) {
+        const changes = JSON.parse(data);
+
+        if (changes.new.count > 0) {
+            const badge = $('#newAlertsBadge');
+            const currentCount = parseInt(badge.text()) || 0;
+            badge.text(currentCount + changes.new.count).show();
+            badge.attr('title', 'New alerts available');
+        }
+
+        const displayedIds = (ranges) => $('[id^="alertCard-"]').map(function () {
+            return parseInt(this.id.replace('alertCard-', ''));
+        }).get().filter((alertId) => ranges.some(([first, last]) => alertId >= first && alertId <= last));
+
+        if (displayedIds(changes.deleted.ranges).length > 0) {
+            setFormValuesFromUrl();
+            return;
+        }
+
+        const updatedIds = displayedIds(changes.updated.ranges);
+        if (updatedIds.length === 0) {
+            return;
+        }
+
+        // A single request refreshes all the displayed alerts of the batch
+        fetchMultipleAlerts(updatedIds).then((alertsDataReq) => {
+            if (api_request_failed(alertsDataReq)) {
+                return;
+            }
+            for (const alertData of alertsDataReq.data.alerts) {
+                const expanded = $(`#additionalDetails-${alertData.alert_id}`).hasClass('show');
+                refreshAlert(alertData.alert_id, alertData, expanded);
+            }
+        });
+    });
+
+    socket.on('alerts_batch_update_progress', function (data) {
+        const progress = JSON.parse(data);
+        if (!batchUpdateTasks.has(progress.task_id)) {
+            return;
+        }
+        if (progress.error) {
+            batchUpdateTasks.delete(progress.task_id);
+            notify_error(`Batch update stopped after ${progress.processed} of ${progress.total} alerts: ${progress.error}`);
+            setFormValuesFromUrl();
+        } else if (progress.processed === progress.total) {
+            batchUpdateTasks.delete(progress.task_id);
+            notify_success(`Batch update of ${progress.total} alerts done`);
+            setFormValuesFromUrl();
+        }
     });
 
 });
\ No newline at end of file
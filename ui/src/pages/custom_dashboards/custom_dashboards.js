@@ -423,6 +423,10 @@
   let dashboardsCache = [];
   let chartInstances = {};
   let dashboardAutoRefreshTimer = null;
+  let liveSocket = null;
+  let liveSubscription = null;
+  let liveUnavailable = false;
+  let currentDashboardPayload = null;
   let isFetchingDashboardData = false;
   let currentQuickRangeKey = null;
   let canShareDashboards = false;
@@ -4356,6 +4360,8 @@
 
   function clearDashboardViewer() {
     destroyCharts();
+    unsubscribeLiveUpdates();
+    currentDashboardPayload = null;
     currentDashboardId = null;
     updateDashboardState({ lastDashboardId: null });
     $('#dashboardSelector').val('');
@@ -4862,6 +4868,7 @@
     card.append(header);
     card.append(body);
     col.append(card);
+    col.attr('data-widget-id', widget.widget_id);
     return col;
   }
 
@@ -4987,12 +4994,16 @@
         const endDate = timeframe.end ? new Date(timeframe.end) : null;
         updateRangeSummary(startDate, endDate);
         renderDashboardDetail(data);
+        currentDashboardPayload = data;
         if (!isSilent) {
           setViewerLoading(false);
         }
         const timestamp = new Date().toLocaleTimeString();
         const reason = options.reason === 'auto-refresh' ? 'Auto-refreshed' : 'Loaded';
         setViewerStatus(`${reason} at ${timestamp}`, false);
+        if (isAutoRefreshEnabled()) {
+          subscribeLiveUpdates(params);
+        }
       })
       .fail((jqXHR) => {
         if (!isSilent) {
@@ -5019,6 +5030,123 @@
     }
   }
 
+  function isAutoRefreshEnabled() {
+    return $('#dashboardAutoRefresh').is(':checked');
+  }
+
+  function startAutoRefreshTimer(intervalMs = DASHBOARD_AUTO_REFRESH_INTERVAL_MS) {
+    clearAutoRefreshTimer();
+    dashboardAutoRefreshTimer = setInterval(() => {
+      refreshSelectedDashboard({ skipIfLoading: true, silent: true, reason: 'auto-refresh' });
+    }, intervalMs);
+  }
+
+  function collectDashboardWidgets(payload) {
+    const widgetsById = {};
+    const sections = Array.isArray(payload.sections) ? payload.sections : [];
+    const widgets = (Array.isArray(payload.widgets) ? payload.widgets : [])
+      .concat(...sections.map((section) => (Array.isArray(section.widgets) ? section.widgets : [])));
+
+    widgets.forEach((widget) => {
+      widgetsById[widget.widget_id] = widgetsById[widget.widget_id] || [];
+      widgetsById[widget.widget_id].push(widget);
+    });
+    return widgetsById;
+  }
+
+  // Live updates only carry the widgets whose data changed, which are rendered again in place
+  function handleLiveUpdate(raw) {
+    const update = typeof raw === 'string' ? JSON.parse(raw) : raw;
+    if (!update || update.subscription !== liveSubscription || !currentDashboardPayload) {
+      return;
+    }
+
+    const widgetsById = collectDashboardWidgets(currentDashboardPayload);
+    const deltas = Array.isArray(update.widgets) ? update.widgets : [];
+    const removed = Array.isArray(update.removed) ? update.removed : [];
+
+    if (removed.length || deltas.some((delta) => !widgetsById[delta.widget_id])) {
+      refreshSelectedDashboard({ skipIfLoading: true, silent: true, reason: 'auto-refresh' });
+      return;
+    }
+
+    deltas.forEach((delta) => {
+      const widgets = widgetsById[delta.widget_id];
+      widgets.forEach((widget) => {
+        delete widget.data;
+        delete widget.error;
+        Object.assign(widget, delta);
+      });
+
+      if (chartInstances[delta.widget_id]) {
+        chartInstances[delta.widget_id].destroy();
+        delete chartInstances[delta.widget_id];
+      }
+      $(`#dashboardWidgets [data-widget-id="${delta.widget_id}"]`).replaceWith(renderWidget(widgets[widgets.length - 1]));
+    });
+
+    setViewerStatus(`Live updated at ${new Date().toLocaleTimeString()}`, false);
+  }
+
+  function handleLiveUnavailable() {
+    liveSubscription = null;
+    if (isAutoRefreshEnabled() && !dashboardAutoRefreshTimer) {
+      startAutoRefreshTimer();
+    }
+  }
+
+  function getLiveSocket() {
+    if (liveUnavailable || typeof io === 'undefined') {
+      return null;
+    }
+
+    if (!liveSocket) {
+      liveSocket = io.connect('/dashboards');
+      liveSocket.on('live_update', handleLiveUpdate);
+      liveSocket.on('live_closed', handleLiveUnavailable);
+      liveSocket.on('connect_error', () => {
+        liveUnavailable = true;
+        liveSocket.disconnect();
+        liveSocket = null;
+        handleLiveUnavailable();
+      });
+      // The subscriptions of a client are dropped by the server when it disconnects
+      liveSocket.on('disconnect', () => {
+        if (liveSubscription) {
+          liveSubscription = null;
+          liveSocket.once('connect', () => refreshSelectedDashboard({ skipIfLoading: true, silent: true, reason: 'auto-refresh' }));
+        }
+      });
+    }
+    return liveSocket;
+  }
+
+  function subscribeLiveUpdates(params) {
+    const socket = getLiveSocket();
+    if (!socket) {
+      return;
+    }
+
+    unsubscribeLiveUpdates();
+    const dashboardId = currentDashboardId;
+    socket.emit('subscribe_dashboard', Object.assign({ dashboard_id: dashboardId }, params), (response) => {
+      if (!response || response.status !== 'success' || dashboardId !== currentDashboardId) {
+        handleLiveUnavailable();
+        return;
+      }
+      liveSubscription = response.subscription;
+      clearAutoRefreshTimer();
+      setViewerStatus(`Live since ${new Date().toLocaleTimeString()}`, false);
+    });
+  }
+
+  function unsubscribeLiveUpdates() {
+    if (liveSocket && liveSubscription) {
+      liveSocket.emit('unsubscribe', { subscription: liveSubscription });
+    }
+    liveSubscription = null;
+  }
+
   function setAutoRefresh(enabled, options = {}) {
     const checkbox = $('#dashboardAutoRefresh');
     if (checkbox.length) {
@@ -5026,13 +5154,13 @@
     }
 
     clearAutoRefreshTimer();
+    unsubscribeLiveUpdates();
 
+    // The timer is stopped once the dashboard is followed live
     if (enabled) {
       const intervalCandidate = options.intervalMs !== undefined ? Number(options.intervalMs) : DASHBOARD_AUTO_REFRESH_INTERVAL_MS;
       const intervalMs = Number.isFinite(intervalCandidate) && intervalCandidate > 0 ? intervalCandidate : DASHBOARD_AUTO_REFRESH_INTERVAL_MS;
-      dashboardAutoRefreshTimer = setInterval(() => {
-        refreshSelectedDashboard({ skipIfLoading: true, silent: true, reason: 'auto-refresh' });
-      }, intervalMs);
+      startAutoRefreshTimer(intervalMs);
     }
 
     updateDashboardState({ autoRefresh: !!enabled });
@@ -26,6 +26,9 @@ let statsAutoRefreshTimer = null;
 let currentQuickRangeKey = null;
 let currentQuickRangeOptions = null;
 let statsIsRestoring = false;
+let statsLiveSocket = null;
+let statsLiveSubscription = null;
+let statsLiveUnavailable = false;
 
 let lastStatsRequestContext = null;
 let lastAlertFilterMetadata = null;
@@ -1446,8 +1449,12 @@ function setAutoRefresh(enabled, options = {}) {
   }
 
   clearAutoRefreshTimer();
+  if (!enabled) {
+    unsubscribeLiveStatistics();
+  }
 
-  if (enabled) {
+  // The timer is stopped once the statistics are followed live
+  if (enabled && !statsLiveSubscription) {
     const intervalCandidate = options.interval !== undefined ? Number(options.interval) : STATS_AUTO_REFRESH_INTERVAL_MS;
     const intervalMs = !Number.isNaN(intervalCandidate) && intervalCandidate > 0 ? intervalCandidate : STATS_AUTO_REFRESH_INTERVAL_MS;
     statsAutoRefreshTimer = setInterval(() => {
@@ -1600,22 +1607,10 @@ function fetchStatisticsData() {
   })
     .done((data) => {
       if (!notify_auto_api(data, true)) {
-        resetAlertLinkContext();
-        updateQueueSection(null);
-        applyAlertsLinks(null);
-        return;
-      }
-      if (!data.data) {
-        resetAlertLinkContext();
-        updateQueueSection(null);
-        applyAlertsLinks(null);
+        applyKpisPayload(null);
         return;
       }
-      updateAlertLinkContext(data.data);
-      updateTimeframeSummary(data.data.timeframe);
-      updateAlertsSection(data.data);
-      updateCasesMetrics(data.data.metrics);
-      updateQueueSection(data.data.queue || null);
+      applyKpisPayload(data.data);
     })
     .fail((xhr) => {
       resetAlertLinkContext();
@@ -1638,10 +1633,7 @@ function fetchStatisticsData() {
       if (!notify_auto_api(data, true)) {
         return;
       }
-      if (!data.data) {
-        return;
-      }
-      updateCaseCharts(data.data);
+      applyClassificationsPayload(data.data);
     })
     .fail((xhr) => {
       if (xhr && xhr.status === 400 && xhr.responseJSON && xhr.responseJSON.message) {
@@ -1661,10 +1653,7 @@ function fetchStatisticsData() {
       if (!notify_auto_api(data, true)) {
         return;
       }
-      if (!data.data) {
-        return;
-      }
-      updateCasesEvidenceChart(data.data);
+      applyEvidencePayload(data.data);
     })
     .fail((xhr) => {
       if (xhr && xhr.status === 400 && xhr.responseJSON && xhr.responseJSON.message) {
@@ -1677,6 +1666,121 @@ function fetchStatisticsData() {
   $.when(kpiRequest, classificationRequest, evidenceRequest).always(() => {
     setStatsLoading(false);
   });
+
+  if ($('#statsAutoRefresh').is(':checked')) {
+    subscribeLiveStatistics(params);
+  }
+}
+
+function applyKpisPayload(payload) {
+  if (!payload) {
+    resetAlertLinkContext();
+    updateQueueSection(null);
+    applyAlertsLinks(null);
+    return;
+  }
+  updateAlertLinkContext(payload);
+  updateTimeframeSummary(payload.timeframe);
+  updateAlertsSection(payload);
+  updateCasesMetrics(payload.metrics);
+  updateQueueSection(payload.queue || null);
+}
+
+function applyClassificationsPayload(payload) {
+  if (payload) {
+    updateCaseCharts(payload);
+  }
+}
+
+function applyEvidencePayload(payload) {
+  if (payload) {
+    updateCasesEvidenceChart(payload);
+  }
+}
+
+function computeQuickRangeSeconds(rangeOptions) {
+  const now = new Date();
+  return Math.round((now - computeQuickRangeStart(now, rangeOptions)) / 1000);
+}
+
+// Live updates only carry the payloads which changed since the last update
+function handleLiveStatisticsUpdate(raw) {
+  const update = typeof raw === 'string' ? JSON.parse(raw) : raw;
+  if (!update || update.subscription !== statsLiveSubscription || !update.payloads) {
+    return;
+  }
+
+  if (update.payloads.kpis !== undefined) {
+    applyKpisPayload(update.payloads.kpis);
+  }
+  if (update.payloads.classifications !== undefined) {
+    applyClassificationsPayload(update.payloads.classifications);
+  }
+  if (update.payloads.evidence !== undefined) {
+    applyEvidencePayload(update.payloads.evidence);
+  }
+}
+
+function handleLiveStatisticsUnavailable() {
+  statsLiveSubscription = null;
+  if ($('#statsAutoRefresh').is(':checked') && !statsAutoRefreshTimer) {
+    setAutoRefresh(true, { skipFetch: true, persist: false });
+  }
+}
+
+function getStatsLiveSocket() {
+  if (statsLiveUnavailable || typeof io === 'undefined') {
+    return null;
+  }
+
+  if (!statsLiveSocket) {
+    statsLiveSocket = io.connect('/dashboards');
+    statsLiveSocket.on('live_update', handleLiveStatisticsUpdate);
+    statsLiveSocket.on('live_closed', handleLiveStatisticsUnavailable);
+    statsLiveSocket.on('connect_error', () => {
+      statsLiveUnavailable = true;
+      statsLiveSocket.disconnect();
+      statsLiveSocket = null;
+      handleLiveStatisticsUnavailable();
+    });
+    // The subscriptions of a client are dropped by the server when it disconnects
+    statsLiveSocket.on('disconnect', () => {
+      if (statsLiveSubscription) {
+        statsLiveSubscription = null;
+        statsLiveSocket.once('connect', () => fetchStatisticsData());
+      }
+    });
+  }
+  return statsLiveSocket;
+}
+
+function subscribeLiveStatistics(params) {
+  const socket = getStatsLiveSocket();
+  if (!socket) {
+    return;
+  }
+
+  unsubscribeLiveStatistics();
+  const subscriptionParams = $.extend({}, params);
+  if (currentQuickRangeKey && currentQuickRangeOptions) {
+    subscriptionParams.range_seconds = computeQuickRangeSeconds(currentQuickRangeOptions);
+  }
+
+  socket.emit('subscribe_statistics', subscriptionParams, (response) => {
+    if (!response || response.status !== 'success') {
+      handleLiveStatisticsUnavailable();
+      return;
+    }
+    statsLiveSubscription = response.subscription;
+    clearAutoRefreshTimer();
+  });
+}
+
+function unsubscribeLiveStatistics() {
+  if (statsLiveSocket && statsLiveSubscription) {
+    statsLiveSocket.emit('unsubscribe', { subscription: statsLiveSubscription });
+  }
+  statsLiveSubscription = null;
 }
 
 function initStatsPage() {